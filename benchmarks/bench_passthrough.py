@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""CPU cost per tool call with and without raw JSON passthrough.
+
+Calls a list tool through an in-memory MCP client against a respx stand-in
+returning a large transactions page, and reports CPU time per call for the
+default path (decode, structured content, re-encode), streaming, and
+passthrough (upstream text sent as-is).
+
+Usage:
+    python benchmarks/bench_passthrough.py
+    python benchmarks/bench_passthrough.py --calls 200 --items 100 --json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import httpx
+import respx
+from fastmcp import Client, FastMCP
+from fastmcp.server.openapi import RouteMap, MCPType
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from zerion_mcp_server.operations import OperationIndex  # noqa: E402
+from zerion_mcp_server.passthrough import PassthroughToolClient  # noqa: E402
+from zerion_mcp_server.retry_client import RetryAsyncClient  # noqa: E402
+from zerion_mcp_server.streaming import StreamingToolClient  # noqa: E402
+from zerion_mcp_server.tool_schemas import drop_output_schema  # noqa: E402
+
+BASE_URL = "https://api.zerion.test"
+OPERATION = "listWalletTransactions"
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Bench", "version": "1"},
+    "paths": {
+        "/v1/wallets/{address}/transactions/": {
+            "get": {
+                "operationId": OPERATION,
+                "parameters": [
+                    {"name": "address", "in": "path", "required": True, "schema": {"type": "string"}}
+                ],
+                "responses": {"200": {"description": "OK"}}
+            }
+        }
+    }
+}
+
+
+def _transactions(items: int) -> Dict[str, Any]:
+    """Build a transactions page shaped like Zerion's."""
+    transfer = {
+        "fungible_info": {
+            "name": "USD Coin",
+            "symbol": "USDC",
+            "implementations": [{"chain_id": "ethereum", "address": "0x" + "a" * 40, "decimals": 6}]
+        },
+        "direction": "in",
+        "quantity": {"int": "1500000", "decimals": 6, "float": 1.5, "numeric": "1.500000"},
+        "value": 1.5,
+        "price": 1.0,
+        "sender": "0x" + "b" * 40,
+        "recipient": "0x" + "c" * 40
+    }
+    return {
+        "links": {"self": f"{BASE_URL}/v1/wallets/0xabc/transactions/"},
+        "data": [
+            {
+                "type": "transactions",
+                "id": f"tx-{i}",
+                "attributes": {
+                    "operation_type": "trade",
+                    "hash": "0x" + "d" * 64,
+                    "mined_at": "2024-01-01T00:00:00Z",
+                    "transfers": [transfer] * 8
+                }
+            }
+            for i in range(items)
+        ]
+    }
+
+
+def _server(mode: str, client: RetryAsyncClient) -> FastMCP:
+    """Create an MCP server whose tool uses the given response mode."""
+    tool_client: Any = client
+    if mode in ("streaming", "passthrough"):
+        tool_client = StreamingToolClient(client)
+    if mode == "passthrough":
+        tool_client = PassthroughToolClient(tool_client, client, [OPERATION])
+    return FastMCP.from_openapi(
+        openapi_spec=SPEC,
+        client=tool_client,
+        route_maps=[RouteMap(mcp_type=MCPType.TOOL)],
+        mcp_component_fn=drop_output_schema
+    )
+
+
+async def _run(mode: str, calls: int, body: bytes) -> Dict[str, Any]:
+    """Time repeated tool calls in one mode."""
+    client = RetryAsyncClient(base_url=BASE_URL, operations=OperationIndex(SPEC))
+    mcp = _server(mode, client)
+    with respx.mock:
+        respx.get(url__startswith=f"{BASE_URL}/v1/wallets/").mock(
+            return_value=httpx.Response(200, content=body, headers={"content-type": "application/json"})
+        )
+        async with Client(mcp) as mcp_client:
+            await mcp_client.call_tool(OPERATION, {"address": "0xabc"})  # warm-up
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            for _ in range(calls):
+                result = await mcp_client.call_tool(OPERATION, {"address": "0xabc"})
+            cpu, wall = time.process_time() - cpu_start, time.perf_counter() - wall_start
+    await client.aclose()
+    return {
+        "mode": mode,
+        "cpu_ms_per_call": round(cpu / calls * 1000, 3),
+        "wall_ms_per_call": round(wall / calls * 1000, 3),
+        "result_bytes": len(result.content[0].text)
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100, help="Tool calls per mode")
+    parser.add_argument("--items", type=int, default=100, help="Transactions per response")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    body = json.dumps(_transactions(args.items)).encode()
+    results = [await _run(mode, args.calls, body) for mode in ("default", "streaming", "passthrough")]
+
+    if args.json:
+        print(json.dumps({"body_bytes": len(body), "results": results}, indent=2))
+        return
+    print(f"upstream body: {len(body)} bytes, {args.calls} calls per mode")
+    print(f"{'mode':<12} {'cpu ms/call':>12} {'wall ms/call':>13} {'result bytes':>13}")
+    for r in results:
+        print(f"{r['mode']:<12} {r['cpu_ms_per_call']:>12} {r['wall_ms_per_call']:>13} {r['result_bytes']:>13}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
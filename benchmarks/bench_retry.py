@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Retry cost benchmark for RetryAsyncClient.
+
+Replays 429 and 202 scenarios against a respx stand-in for the Zerion API and
+reports, per scenario, how many upstream calls were made and how long the
+request took. Each upstream call burns quota, so a regression in the retry
+paths shows up as a higher call count.
+
+Usage:
+    python benchmarks/bench_retry.py
+    python benchmarks/bench_retry.py --json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+import respx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from zerion_mcp_server.errors import ZerionMCPError  # noqa: E402
+from zerion_mcp_server.retry_client import RetryAsyncClient  # noqa: E402
+
+BASE_URL = "https://api.zerion.test"
+
+RETRY_CONFIG = {
+    "max_attempts": 3,
+    "base_delay": 0.05,
+    "max_delay": 0.2,
+    "exponential_base": 2
+}
+
+INDEXING_CONFIG = {
+    "retry_delay": 0.05,
+    "max_delay": 0.1,
+    "max_retries": 3,
+    "auto_retry": True
+}
+
+# Endpoints hit concurrently for the same new wallet
+WALLET_ENDPOINTS = ["portfolio", "positions/", "transactions/", "pnl/", "nft-portfolio"]
+
+# Scenario name -> (upstream status sequence, concurrent requests, expected upstream calls)
+SCENARIOS = {
+    "200 ok": ([200], 1, 1),
+    "429 once": ([429, 200], 1, 2),
+    "429 twice": ([429, 429, 200], 1, 3),
+    "429 exhausted": ([429] * 10, 1, 1 + RETRY_CONFIG["max_attempts"]),
+    "202 once": ([202, 200], 1, 2),
+    "202 twice": ([202, 202, 200], 1, 3),
+    "202 exhausted": ([202] * 10, 1, 1 + INDEXING_CONFIG["max_retries"]),
+    # 5 initial 202s, one shared poller (202 then 200), 4 waiter re-issues
+    "202 x5 shared": ([202] * 6 + [200] * 10, 5, 11),
+}
+
+
+def _responses(statuses: List[int]) -> List[httpx.Response]:
+    """Build mock upstream responses for a status sequence."""
+    responses = []
+    for status in statuses:
+        headers = {"retry-after": "0"} if status == 429 else {}
+        responses.append(httpx.Response(status, json={"data": []}, headers=headers))
+    return responses
+
+
+async def _call(client: RetryAsyncClient, path: str) -> str:
+    """Make one request and describe its outcome."""
+    try:
+        response = await client.get(path)
+        return str(response.status_code)
+    except ZerionMCPError as e:
+        return type(e).__name__
+
+
+async def run_scenario(name: str, statuses: List[int], concurrency: int) -> Dict[str, Any]:
+    """Run one scenario and measure upstream calls and wall time."""
+    with respx.mock(base_url=BASE_URL, assert_all_called=False) as mock:
+        route = mock.get(url__startswith=f"{BASE_URL}/v1/wallets/0xabc/").mock(
+            side_effect=_responses(statuses)
+        )
+
+        async with RetryAsyncClient(
+            base_url=BASE_URL,
+            retry_config=RETRY_CONFIG,
+            indexing_config=INDEXING_CONFIG
+        ) as client:
+            start = time.perf_counter()
+            outcomes = await asyncio.gather(*[
+                _call(client, f"/v1/wallets/0xabc/{WALLET_ENDPOINTS[i % len(WALLET_ENDPOINTS)]}")
+                for i in range(concurrency)
+            ])
+            elapsed = time.perf_counter() - start
+
+        outcome = ",".join(sorted(set(outcomes)))
+
+        return {
+            "scenario": name,
+            "outcome": outcome,
+            "upstream_calls": route.call_count,
+            "wall_time_sec": round(elapsed, 4)
+        }
+
+
+async def run_all() -> List[Dict[str, Any]]:
+    """Run all scenarios sequentially."""
+    results = []
+    for name, (statuses, concurrency, expected_calls) in SCENARIOS.items():
+        result = await run_scenario(name, statuses, concurrency)
+        result["expected_calls"] = expected_calls
+        results.append(result)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    # Retry warnings are expected in every scenario; keep the report readable
+    logging.getLogger("zerion_mcp_server").setLevel(logging.CRITICAL)
+
+    results = asyncio.run(run_all())
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'scenario':<16} {'outcome':<20} {'calls':>5} {'expected':>8} {'wall (s)':>9}")
+        for r in results:
+            print(
+                f"{r['scenario']:<16} {r['outcome']:<20} {r['upstream_calls']:>5} "
+                f"{r['expected_calls']:>8} {r['wall_time_sec']:>9.4f}"
+            )
+
+    regressions = [r for r in results if r["upstream_calls"] > r["expected_calls"]]
+    for r in regressions:
+        print(
+            f"REGRESSION: {r['scenario']} made {r['upstream_calls']} upstream calls "
+            f"(expected {r['expected_calls']})",
+            file=sys.stderr
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
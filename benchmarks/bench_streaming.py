@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Time-to-first-item and peak memory with and without incremental streaming.
+
+Downloads a large transactions page from a respx stand-in that sends the
+body in chunks with a delay between them (a slow upstream), and reports per
+path:
+
+- first item: seconds until the first data element is available (for the
+  buffered path, when the whole body has been decoded)
+- total: seconds until the complete document is available
+- peak memory: tracemalloc peak while the request runs
+
+Usage:
+    python benchmarks/bench_streaming.py
+    python benchmarks/bench_streaming.py --items 500 --chunk 16384 --delay 0.002 --json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict
+
+import httpx
+import respx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.bench_passthrough import BASE_URL, _transactions  # noqa: E402
+from zerion_mcp_server.retry_client import RetryAsyncClient  # noqa: E402
+from zerion_mcp_server.streaming import JsonArrayParser  # noqa: E402
+
+URL = "/v1/wallets/0xabc/transactions/"
+
+
+def _slow_response(body: bytes, chunk: int, delay: float) -> httpx.Response:
+    """Response whose body arrives in chunks, delay seconds apart."""
+    async def stream() -> AsyncIterator[bytes]:
+        for i in range(0, len(body), chunk):
+            await asyncio.sleep(delay)
+            yield body[i:i + chunk]
+    return httpx.Response(200, content=stream(), headers={"content-type": "application/json"})
+
+
+async def _buffered(client: RetryAsyncClient) -> Dict[str, float]:
+    start = time.perf_counter()
+    document = (await client.request("GET", URL)).json()
+    done = time.perf_counter() - start
+    assert document["data"]
+    return {"first_item_s": done, "total_s": done}
+
+
+async def _streamed(client: RetryAsyncClient) -> Dict[str, float]:
+    start = time.perf_counter()
+    first = None
+
+    async def on_item(item: Any) -> None:
+        nonlocal first
+        if first is None:
+            first = time.perf_counter() - start
+
+    parser = JsonArrayParser()
+    await client.stream_json("GET", URL, parser, on_item=on_item)
+    assert parser.finished
+    return {"first_item_s": first, "total_s": time.perf_counter() - start}
+
+
+async def _run(mode: str, body: bytes, chunk: int, delay: float) -> Dict[str, Any]:
+    """Measure one request in one mode."""
+    client = RetryAsyncClient(base_url=BASE_URL)
+    with respx.mock:
+        respx.get(f"{BASE_URL}{URL}").mock(side_effect=lambda request: _slow_response(body, chunk, delay))
+        tracemalloc.start()
+        timings = await (_buffered(client) if mode == "buffered" else _streamed(client))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    await client.aclose()
+    return {
+        "mode": mode,
+        "first_item_ms": round(timings["first_item_s"] * 1000, 1),
+        "total_ms": round(timings["total_s"] * 1000, 1),
+        "peak_kb": round(peak / 1024)
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=500, help="Transactions in the page")
+    parser.add_argument("--chunk", type=int, default=16384, help="Bytes per upstream chunk")
+    parser.add_argument("--delay", type=float, default=0.002, help="Seconds between chunks")
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    body = json.dumps(_transactions(args.items)).encode()
+    results = [await _run(mode, body, args.chunk, args.delay) for mode in ("buffered", "streaming")]
+
+    if args.json:
+        print(json.dumps({"body_bytes": len(body), "results": results}, indent=2))
+        return
+    print(f"upstream body: {len(body)} bytes in {args.chunk}-byte chunks, {args.delay * 1000:g} ms apart")
+    print(f"{'mode':<10} {'first item ms':>14} {'total ms':>9} {'peak KB':>8}")
+    for r in results:
+        print(f"{r['mode']:<10} {r['first_item_ms']:>14} {r['total_ms']:>9} {r['peak_kb']:>8}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
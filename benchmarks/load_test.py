@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""End-to-end load benchmark for the Zerion MCP server.
+
+Starts the local stand-in Zerion API (benchmarks/mock_zerion.py), launches the
+real MCP server against it over the stdio or HTTP transport, drives a mix of
+tool calls at a fixed concurrency and reports throughput, p50/p95/p99
+latency and upstream calls per tool call.
+
+Usage:
+    python benchmarks/load_test.py --transport stdio --calls 500 --concurrency 16
+    python benchmarks/load_test.py --transport http --latency-ms 40 --p429 0.02 --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import yaml
+from fastmcp import Client
+from fastmcp.client.transports import StdioTransport, StreamableHttpTransport
+
+ROOT = Path(__file__).resolve().parent.parent
+SPEC_PATH = ROOT / "zerion_mcp_server" / "openapi_zerion.yaml"
+
+# Port used by main(transport="http")
+HTTP_PORT = 8000
+
+WALLET = "0x42b9df65b219b3dd36ff330a4dd8f327a6ada990"
+
+# Default tool mix: (tool name, arguments)
+WORKLOAD: List[Tuple[str, Dict[str, Any]]] = [
+    ("getWalletPortfolio", {"address": WALLET}),
+    ("listWalletPositions", {"address": WALLET}),
+    ("listWalletTransactions", {"address": WALLET}),
+    ("getWalletChart", {"address": WALLET, "chart_period": "day"}),
+    ("listChains", {}),
+    ("listGasPrices", {}),
+    ("getFungibleById", {"fungible_id": "eth"}),
+]
+
+
+def free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_http(url: str, timeout: float = 30.0) -> None:
+    """Block until an HTTP endpoint answers."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise TimeoutError(f"{url} did not come up within {timeout}s")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def write_server_config(workdir: Path, mock_url: str) -> Path:
+    """Write the MCP server config pointing at the mock API."""
+    config = {
+        "name": "Zerion API (load test)",
+        "base_url": mock_url,
+        "oas_url": str(SPEC_PATH),
+        "api_key": "Bearer load-test",
+        # Server logs go to stdout, which is the stdio transport's channel
+        "logging": {"level": "CRITICAL", "format": "text"},
+        "quota": {"path": str(workdir / "quota.sqlite3")},
+    }
+    path = workdir / "config.yaml"
+    path.write_text(yaml.safe_dump(config))
+    return path
+
+
+def server_env(config_path: Path) -> Dict[str, str]:
+    """Environment for the MCP server subprocess."""
+    env = {k: v for k, v in os.environ.items() if not k.startswith("ZERION_")}
+    env["CONFIG_PATH"] = str(config_path)
+    env["PYTHONPATH"] = str(ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+async def drive(client: Client, calls: int, concurrency: int) -> Tuple[List[float], int]:
+    """Issue tool calls with bounded concurrency.
+
+    Returns:
+        Per-call latencies in seconds and the number of failed calls.
+    """
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(calls))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            name, arguments = WORKLOAD[i % len(WORKLOAD)]
+            start = time.perf_counter()
+            try:
+                result = await client.call_tool_mcp(name, arguments)
+                if result.isError:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return latencies, errors
+
+
+async def run_load(args: argparse.Namespace, mock_url: str, config_path: Path) -> Dict[str, Any]:
+    """Start the MCP server, warm it up and run the load."""
+    server_proc: Optional[subprocess.Popen] = None
+    env = server_env(config_path)
+    startup = time.perf_counter()
+
+    if args.transport == "stdio":
+        transport = StdioTransport(
+            command=sys.executable,
+            args=["-m", "zerion_mcp_server"],
+            env=env,
+            cwd=str(config_path.parent)
+        )
+    else:
+        server_proc = subprocess.Popen(
+            [sys.executable, "-c", "from zerion_mcp_server import main; main(transport='http')"],
+            env=env,
+            cwd=str(config_path.parent),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+        base = f"http://127.0.0.1:{HTTP_PORT}"
+        wait_for_http(base + "/", timeout=60)
+        transport = StreamableHttpTransport(base + "/mcp/")
+
+    try:
+        async with Client(transport, timeout=120) as client:
+            ready = time.perf_counter() - startup
+            tools = await client.list_tools()
+
+            # Warm up once per tool, then measure from a clean counter
+            await drive(client, len(WORKLOAD), 1)
+            httpx.post(mock_url + "/__reset")
+
+            start = time.perf_counter()
+            latencies, errors = await drive(client, args.calls, args.concurrency)
+            elapsed = time.perf_counter() - start
+    finally:
+        if server_proc is not None:
+            server_proc.terminate()
+            server_proc.wait(timeout=10)
+
+    upstream = httpx.get(mock_url + "/__stats").json()
+    return {
+        "transport": args.transport,
+        "tools_listed": len(tools),
+        "startup_to_ready_sec": round(ready, 3),
+        "calls": args.calls,
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "wall_time_sec": round(elapsed, 3),
+        "throughput_calls_per_sec": round(args.calls / elapsed, 1),
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies) * 1000, 2),
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+        },
+        "upstream_calls": upstream["total_calls"],
+        "upstream_calls_per_tool_call": round(upstream["total_calls"] / args.calls, 3),
+        "upstream_statuses": upstream["statuses"],
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio")
+    parser.add_argument("--calls", type=int, default=200, help="Tool calls to measure")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent in-flight tool calls")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Mock upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=10)
+    parser.add_argument("--p429", type=float, default=0, help="Mock 429 probability")
+    parser.add_argument("--p202", type=float, default=0, help="Mock 202 probability on wallet endpoints")
+    parser.add_argument("--pages", type=int, default=1, help="Pages served by paginated endpoints")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    mock_port = free_port()
+    mock_url = f"http://127.0.0.1:{mock_port}"
+    mock_proc = subprocess.Popen(
+        [
+            sys.executable, str(ROOT / "benchmarks" / "mock_zerion.py"),
+            "--port", str(mock_port),
+            "--latency-ms", str(args.latency_ms),
+            "--jitter-ms", str(args.jitter_ms),
+            "--p429", str(args.p429),
+            "--p202", str(args.p202),
+            "--retry-after", "0",
+            "--pages", str(args.pages),
+            "--seed", str(args.seed),
+        ],
+        stderr=subprocess.DEVNULL
+    )
+
+    try:
+        wait_for_http(mock_url + "/__stats")
+        with tempfile.TemporaryDirectory(prefix="zerion-load-") as workdir:
+            config_path = write_server_config(Path(workdir), mock_url)
+            results = asyncio.run(run_load(args, mock_url, config_path))
+    finally:
+        mock_proc.terminate()
+        mock_proc.wait(timeout=10)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        lat = results["latency_ms"]
+        print(f"transport            {results['transport']} ({results['tools_listed']} tools)")
+        print(f"startup to ready     {results['startup_to_ready_sec']} s")
+        print(f"calls / concurrency  {results['calls']} / {results['concurrency']} ({results['errors']} errors)")
+        print(f"throughput           {results['throughput_calls_per_sec']} calls/s")
+        print(f"latency (ms)         p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']}  mean {lat['mean']}")
+        print(f"upstream calls       {results['upstream_calls']} "
+              f"({results['upstream_calls_per_tool_call']} per tool call, statuses {results['upstream_statuses']})")
+    return 1 if results["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
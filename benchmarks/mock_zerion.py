@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""Local stand-in Zerion API server generated from openapi_zerion.yaml.
+
+Every operation in the spec gets a route that returns a response body
+synthesized once from its 200 response schema (examples are used where the
+spec has them). Latency, 429/202 injection and pagination depth are
+configurable, and every upstream call is counted so load tests can report
+upstream calls per tool call.
+
+Control endpoints:
+    GET  /__stats   per-operation call and status counts
+    POST /__reset   reset counters
+
+Usage:
+    python benchmarks/mock_zerion.py --port 8790 --latency-ms 40 --p429 0.02 --pages 3
+"""
+
+import argparse
+import asyncio
+import copy
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import yaml
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+SPEC_PATH = Path(__file__).resolve().parent.parent / "zerion_mcp_server" / "openapi_zerion.yaml"
+
+HTTP_METHODS = {"get", "put", "post", "delete", "patch"}
+
+# Recursion guard for self-referencing schemas
+MAX_DEPTH = 8
+
+
+class MockSettings:
+    """Behavior knobs for the mock server.
+
+    Attributes:
+        latency_ms: Base response latency in milliseconds
+        jitter_ms: Uniform random latency added on top of latency_ms
+        p429: Probability of answering 429 Too Many Requests
+        p202: Probability of answering 202 Accepted on wallet endpoints
+        retry_after: Retry-After header value sent with 429 responses
+        pages: Number of pages served by paginated endpoints
+        items_per_page: Items in each page's data array
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        p429: float = 0,
+        p202: float = 0,
+        retry_after: int = 1,
+        pages: int = 1,
+        items_per_page: int = 20,
+        seed: Optional[int] = None
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.p429 = p429
+        self.p202 = p202
+        self.retry_after = retry_after
+        self.pages = pages
+        self.items_per_page = items_per_page
+        self.random = random.Random(seed)
+
+
+def load_spec(path: Path = SPEC_PATH) -> Dict[str, Any]:
+    """Load the OpenAPI spec, using the C YAML loader when available."""
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=loader)
+
+
+class SchemaSynthesizer:
+    """Builds sample JSON values from OpenAPI schemas."""
+
+    def __init__(self, spec: Dict[str, Any], items_per_page: int):
+        self.spec = spec
+        self.items_per_page = items_per_page
+
+    def resolve(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Follow a local $ref."""
+        while isinstance(node, dict) and "$ref" in node:
+            target: Any = self.spec
+            for part in node["$ref"].lstrip("#/").split("/"):
+                target = target[part]
+            node = target
+        return node
+
+    def sample(self, schema: Dict[str, Any], name: str = "", depth: int = 0) -> Any:
+        """Synthesize a value for a schema."""
+        schema = self.resolve(schema or {})
+        if "example" in schema:
+            return copy.deepcopy(schema["example"])
+        if depth > MAX_DEPTH:
+            return None
+
+        if "allOf" in schema:
+            merged: Dict[str, Any] = {}
+            for part in schema["allOf"]:
+                value = self.sample(part, name, depth + 1)
+                if isinstance(value, dict):
+                    merged.update(value)
+            return merged
+        for combinator in ("oneOf", "anyOf"):
+            if combinator in schema:
+                return self.sample(schema[combinator][0], name, depth + 1)
+
+        if "enum" in schema:
+            return schema["enum"][0]
+
+        schema_type = schema.get("type") or ("object" if "properties" in schema else "string")
+        if schema_type == "object":
+            return {
+                prop: self.sample(prop_schema, prop, depth + 1)
+                for prop, prop_schema in (schema.get("properties") or {}).items()
+            }
+        if schema_type == "array":
+            count = self.items_per_page if name == "data" else 2
+            item = schema.get("items") or {}
+            return [self.sample(item, name, depth + 1) for _ in range(count)]
+        if schema_type == "integer":
+            return 1
+        if schema_type == "number":
+            return 1.5
+        if schema_type == "boolean":
+            return True
+        if schema.get("format") == "date-time":
+            return "2025-01-01T00:00:00Z"
+        return name or "string"
+
+
+class MockZerion:
+    """Starlette app serving synthesized responses for every spec operation."""
+
+    def __init__(self, settings: MockSettings, spec: Optional[Dict[str, Any]] = None):
+        self.settings = settings
+        self.spec = spec or load_spec()
+        self.calls: Counter = Counter()
+        self.statuses: Counter = Counter()
+        self._bodies: Dict[str, Any] = {}
+
+        synthesizer = SchemaSynthesizer(self.spec, settings.items_per_page)
+        routes = [
+            Route("/__stats", self.stats, methods=["GET"]),
+            Route("/__reset", self.reset, methods=["POST"]),
+        ]
+        for path, path_item in self.spec.get("paths", {}).items():
+            for method, operation in path_item.items():
+                if method not in HTTP_METHODS or not isinstance(operation, dict):
+                    continue
+                operation_id = operation["operationId"]
+                self._bodies[operation_id] = self._success_body(synthesizer, operation)
+                routes.append(Route(
+                    path,
+                    self._handler(operation_id, paginated=self._is_paginated(operation), wallet="/wallets/" in path),
+                    methods=[method.upper()],
+                    name=operation_id
+                ))
+        self.app = Starlette(routes=routes)
+
+    @staticmethod
+    def _is_paginated(operation: Dict[str, Any]) -> bool:
+        """Check whether an operation takes the page[...] parameters."""
+        return any(
+            p.get("$ref", "").endswith("/Page") or p.get("name") == "page"
+            for p in operation.get("parameters", [])
+        )
+
+    def _success_body(self, synthesizer: SchemaSynthesizer, operation: Dict[str, Any]) -> Any:
+        """Synthesize the 200/201 response body for an operation."""
+        responses = operation.get("responses", {})
+        response = synthesizer.resolve(responses.get("200") or responses.get("201") or {})
+        schema = (response.get("content", {}).get("application/json", {}) or {}).get("schema")
+        return synthesizer.sample(schema) if schema else {"data": None}
+
+    def _handler(self, operation_id: str, paginated: bool, wallet: bool):
+        """Build the request handler for an operation."""
+        settings = self.settings
+
+        async def handler(request: Request) -> Response:
+            self.calls[operation_id] += 1
+
+            latency = settings.latency_ms + settings.random.uniform(0, settings.jitter_ms)
+            if latency:
+                await asyncio.sleep(latency / 1000)
+
+            roll = settings.random.random()
+            if roll < settings.p429:
+                self.statuses[429] += 1
+                return JSONResponse(
+                    {"errors": [{"title": "Too many requests"}]},
+                    status_code=429,
+                    headers={"retry-after": str(settings.retry_after)}
+                )
+            if wallet and roll < settings.p429 + settings.p202:
+                self.statuses[202] += 1
+                return JSONResponse({"data": []}, status_code=202)
+
+            body = self._bodies[operation_id]
+            if paginated and isinstance(body, dict):
+                page = int(request.query_params.get("page[after]", "1") or 1)
+                body = dict(body)
+                links = dict(body.get("links") or {})
+                if page < settings.pages:
+                    links["next"] = str(request.url.include_query_params(**{"page[after]": str(page + 1)}))
+                else:
+                    links.pop("next", None)
+                body["links"] = links
+
+            self.statuses[200] += 1
+            return JSONResponse(body)
+
+        return handler
+
+    async def stats(self, request: Request) -> JSONResponse:
+        """Report call counters."""
+        return JSONResponse({
+            "total_calls": sum(self.calls.values()),
+            "calls": dict(self.calls),
+            "statuses": {str(k): v for k, v in self.statuses.items()}
+        })
+
+    async def reset(self, request: Request) -> JSONResponse:
+        """Reset call counters."""
+        self.calls.clear()
+        self.statuses.clear()
+        return JSONResponse({"reset": True})
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command-line options shared with the load generator."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Base upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random latency added on top")
+    parser.add_argument("--p429", type=float, default=0, help="Probability of a 429 response")
+    parser.add_argument("--p202", type=float, default=0, help="Probability of a 202 on wallet endpoints")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After sent with 429s")
+    parser.add_argument("--pages", type=int, default=1, help="Pages served by paginated endpoints")
+    parser.add_argument("--items-per-page", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def settings_from_args(args: argparse.Namespace) -> MockSettings:
+    """Build MockSettings from parsed arguments."""
+    return MockSettings(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        p429=args.p429,
+        p202=args.p202,
+        retry_after=args.retry_after,
+        pages=args.pages,
+        items_per_page=args.items_per_page,
+        seed=args.seed
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import uvicorn
+
+    args = build_parser().parse_args(argv)
+    mock = MockZerion(settings_from_args(args))
+    print(f"Mock Zerion API on http://{args.host}:{args.port} ({len(mock._bodies)} operations)", file=sys.stderr)
+    uvicorn.run(mock.app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
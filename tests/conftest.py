@@ -122,6 +122,7 @@ def clear_env_vars(monkeypatch):
     """
     env_vars = [
         "ZERION_API_KEY",
+        "ZERION_API_KEYS",
         "ZERION_BASE_URL",
         "ZERION_OAS_URL",
         "CONFIG_PATH",
@@ -130,3 +131,18 @@ def clear_env_vars(monkeypatch):
     ]
     for var in env_vars:
         monkeypatch.delenv(var, raising=False)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_home(tmp_path, monkeypatch):
+    """Point '~' at a temporary directory.
+
+    Keeps the quota ledger and tool snapshot under ~/.cache from leaking
+    between tests or into the developer's real cache; a snapshot left by an
+    earlier run would otherwise bypass patched FastMCP.from_openapi calls.
+
+    Args:
+        tmp_path: pytest temporary path fixture.
+        monkeypatch: pytest monkeypatch fixture.
+    """
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Tests for local transaction analytics."""
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+
+from zerion_mcp_server import analytics
+from zerion_mcp_server.analytics import TransactionStore, TransactionTable, analytics_tool
+from zerion_mcp_server.retry_client import RetryAsyncClient
+
+BASE_URL = "https://api.test.com"
+WALLET = "0xabc"
+TRANSACTIONS_URL = f"{BASE_URL}/v1/wallets/{WALLET}/transactions/"
+
+
+def transaction(id_, mined_at, chain, operation, transfers, fee=1.0):
+    return {
+        "type": "transactions",
+        "id": id_,
+        "attributes": {
+            "operation_type": operation,
+            "mined_at": mined_at,
+            "fee": {"value": fee},
+            "transfers": [
+                {
+                    "direction": direction,
+                    "value": value,
+                    "sender": counterparty if direction == "in" else WALLET,
+                    "recipient": WALLET if direction == "in" else counterparty,
+                    "fungible_info": {"symbol": symbol}
+                }
+                for direction, value, counterparty, symbol in transfers
+            ]
+        },
+        "relationships": {"chain": {"data": {"type": "chains", "id": chain}}}
+    }
+
+
+TRANSACTIONS = [
+    transaction("t5", "2024-05-03T10:00:00+00:00", "arbitrum", "trade",
+                [("out", 100.0, "0xrouter", "USDC"), ("in", 99.0, "0xrouter", "ETH")]),
+    transaction("t4", "2024-05-02T12:00:00+00:00", "arbitrum", "trade",
+                [("out", 50.0, "0xrouter", "USDC"), ("in", 51.0, "0xrouter", "ARB")]),
+    transaction("t3", "2024-05-02T09:00:00+00:00", "base", "send", [("out", 20.0, "0xfriend", "USDC")]),
+    transaction("t2", "2024-04-30T09:00:00+00:00", "arbitrum", "trade",
+                [("out", 10.0, "0xrouter", "USDC"), ("in", 10.0, "0xrouter", "ETH")]),
+    transaction("t1", "2024-04-01T09:00:00+00:00", "ethereum", "approve", [], fee=5.0),
+]
+
+
+@pytest.fixture
+def table():
+    table = TransactionTable()
+    table.extend(TRANSACTIONS)
+    return table
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run a test with the vectorized and the pure-Python aggregation."""
+    if request.param == "numpy" and analytics._numpy() is None:
+        pytest.skip("numpy not installed")
+    if request.param == "python":
+        monkeypatch.setattr(analytics, "_numpy", lambda: None)
+    return request.param
+
+
+def groups(summary):
+    key = summary["group_by"]
+    return {group[key]: group for group in summary["groups"]}
+
+
+class TestTransactionTable:
+    """Tests for filtering and grouping the columnar table."""
+
+    def test_group_by_operation_type(self, table, backend):
+        """Test counts, flows and fees per operation type."""
+        summary = table.summarize("operation_type")
+
+        trade = groups(summary)["trade"]
+        assert summary["transactions"] == 5
+        assert (trade["transactions"], trade["transfers"]) == (3, 6)
+        assert (trade["in"], trade["out"], trade["fees"]) == (160.0, 160.0, 3.0)
+        assert summary["totals"]["fees"] == 9.0
+        assert summary["groups"][0]["operation_type"] == "trade"
+
+    def test_filtered_swap_volume(self, table, backend):
+        """Test "how much did this wallet swap on Arbitrum in May"."""
+        summary = table.summarize(
+            "chain", chain_id="arbitrum", operation_type="trade", since=1714521600, until=1717200000
+        )
+
+        assert summary["transactions"] == 2
+        assert summary["totals"]["volume"] == 300.0
+        assert summary["first_mined_at"] == "2024-05-02T12:00:00Z"
+
+    def test_group_by_day(self, table, backend):
+        """Test that days are returned in order, limited to the most recent."""
+        summary = table.summarize("day", top=2)
+
+        assert [g["day"] for g in summary["groups"]] == ["2024-05-02", "2024-05-03"]
+        assert summary["groups_total"] == 4
+        assert summary["groups"][0]["transactions"] == 2
+
+    def test_top_counterparties(self, table, backend):
+        """Test that counterparties are ranked by volume and transactions counted once."""
+        summary = table.summarize("counterparty")
+
+        assert [g["counterparty"] for g in summary["groups"]] == ["0xrouter", "0xfriend"]
+        assert summary["groups"][0]["transactions"] == 3
+        assert summary["groups"][0]["transfers"] == 6
+        assert summary["transactions"] == 5
+        assert "fees" not in summary["totals"]
+
+    def test_unknown_filter_matches_nothing(self, table, backend):
+        """Test that a chain never seen yields an empty summary."""
+        summary = table.summarize("chain", chain_id="solana")
+
+        assert summary["transactions"] == 0
+        assert summary["groups"] == []
+
+    def test_duplicates_and_malformed_skipped(self, table):
+        """Test that known ids and items without mined_at are not added."""
+        assert table.extend([TRANSACTIONS[0], {"id": "bad", "attributes": {}}]) == 0
+        assert len(table) == 5
+
+
+@pytest.mark.asyncio
+class TestTransactionStore:
+    """Tests for downloading and refreshing wallet tables."""
+
+    @respx.mock
+    async def test_download_follows_pages(self):
+        """Test that every page is fetched and the history marked complete."""
+        route = respx.get(TRANSACTIONS_URL).mock(side_effect=[
+            httpx.Response(200, json={"data": TRANSACTIONS[:3], "links": {"next": f"{TRANSACTIONS_URL}?page[after]=c1"}}),
+            httpx.Response(200, json={"data": TRANSACTIONS[3:], "links": {}})
+        ])
+        store = TransactionStore(RetryAsyncClient(base_url=BASE_URL))
+
+        table = await store.table(WALLET)
+
+        assert len(table) == 5
+        assert table.complete is True
+        assert route.calls[1].request.url.params["page[after]"] == "c1"
+        assert route.calls[0].request.url.params["filter[trash]"] == "only_non_trash"
+
+    @respx.mock
+    async def test_refresh_stops_at_known_transaction(self):
+        """Test that a stale table only fetches newer transactions."""
+        new = transaction("t6", "2024-05-04T10:00:00+00:00", "base", "receive", [("in", 5.0, "0xfriend", "USDC")])
+        route = respx.get(TRANSACTIONS_URL).mock(side_effect=[
+            httpx.Response(200, json={"data": TRANSACTIONS, "links": {}}),
+            httpx.Response(200, json={"data": [new] + TRANSACTIONS[:2], "links": {"next": f"{TRANSACTIONS_URL}?page[after]=c1"}})
+        ])
+        store = TransactionStore(RetryAsyncClient(base_url=BASE_URL), ttl=0)
+
+        await store.table(WALLET)
+        table = await store.table(WALLET)
+
+        assert route.call_count == 2
+        assert len(table) == 6
+        assert table.complete is True
+
+    @respx.mock
+    async def test_page_limit_marks_incomplete(self):
+        """Test that hitting max_pages leaves the history incomplete."""
+        respx.get(TRANSACTIONS_URL).mock(return_value=httpx.Response(
+            200, json={"data": TRANSACTIONS[:1], "links": {"next": f"{TRANSACTIONS_URL}?page[after]=c1"}}
+        ))
+        store = TransactionStore(RetryAsyncClient(base_url=BASE_URL), max_pages=2)
+
+        table = await store.table(WALLET)
+
+        assert table.complete is False
+
+    @respx.mock
+    async def test_served_from_memory_within_ttl(self):
+        """Test that a fresh table makes no request."""
+        route = respx.get(TRANSACTIONS_URL).mock(return_value=httpx.Response(200, json={"data": TRANSACTIONS, "links": {}}))
+        store = TransactionStore(RetryAsyncClient(base_url=BASE_URL), ttl=300)
+
+        await store.table(WALLET)
+        await store.table(WALLET.upper())
+
+        assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+class TestAnalyticsTool:
+    """Tests for the analyzeWalletTransactions tool."""
+
+    @respx.mock
+    async def test_tool_returns_summary(self):
+        """Test a tool call end to end."""
+        respx.get(TRANSACTIONS_URL).mock(return_value=httpx.Response(200, json={"data": TRANSACTIONS, "links": {}}))
+        mcp = FastMCP("test")
+        mcp.add_tool(analytics_tool(TransactionStore(RetryAsyncClient(base_url=BASE_URL))))
+
+        async with Client(mcp) as client:
+            result = await client.call_tool(
+                "analyzeWalletTransactions", {"address": WALLET, "group_by": "asset", "operation_type": "trade"}
+            )
+
+        summary = result.structured_content
+        assert summary["complete"] is True
+        assert groups(summary)["USDC"]["out"] == 160.0
+
+    async def test_invalid_since(self):
+        """Test that an unparseable date is rejected."""
+        mcp = FastMCP("test")
+        mcp.add_tool(analytics_tool(TransactionStore(RetryAsyncClient(base_url=BASE_URL))))
+
+        async with Client(mcp) as client:
+            with pytest.raises(ToolError, match="Invalid since"):
+                await client.call_tool("analyzeWalletTransactions", {"address": WALLET, "since": "last month"})
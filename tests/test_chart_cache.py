@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Tests for the in-memory chart series cache."""
+
+import httpx
+import pytest
+import respx
+
+from zerion_mcp_server import chart_cache
+from zerion_mcp_server.chart_cache import ChartCacheToolClient, ChartSeries
+from zerion_mcp_server.operations import OperationIndex
+from zerion_mcp_server.retry_client import RetryAsyncClient
+
+BASE_URL = "https://api.test.com"
+CHART_URL = f"{BASE_URL}/v1/fungibles/eth/charts"
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Test", "version": "1"},
+    "paths": {
+        "/v1/fungibles/{fungible_id}/charts/{chart_period}": {
+            "get": {"operationId": "getFungibleChart", "responses": {"200": {"description": "OK"}}}
+        },
+        "/v1/chains/": {"get": {"operationId": "listChains", "responses": {"200": {"description": "OK"}}}}
+    }
+}
+
+HOUR = 3600
+START = 1700000000
+
+
+def points(first: int, count: int, step: int = HOUR):
+    return [[first + step * i, float(i)] for i in range(count)]
+
+
+def chart(points_):
+    return {"data": {"type": "fungible_charts", "id": "eth", "attributes": {"points": points_}}}
+
+
+@pytest.fixture
+def client():
+    """Chart cache over a RetryAsyncClient with an operation index."""
+    retry_client = RetryAsyncClient(base_url=BASE_URL, operations=OperationIndex(SPEC))
+    return ChartCacheToolClient(retry_client, retry_client, ttl=60, max_series=2)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the cache."""
+    now = [START + 100 * HOUR]
+    monkeypatch.setattr(chart_cache.time, "time", lambda: now[0])
+    return now
+
+
+class TestChartSeries:
+    """Tests for merging tail points into a series."""
+
+    def test_merge_tail_keeps_resolution_and_window(self):
+        """Test that only points at the series' spacing are added and old ones dropped."""
+        series = ChartSeries("day", chart(points(START, 25)), fetched_at=0)
+        window = series.window
+        # A finer tail (every 15 minutes) reaching 2 hours past the series
+        tail = points(START + 23 * HOUR, 13, step=900)
+
+        added = series.merge_tail(chart(tail), fetched_at=1)
+
+        assert added == 2
+        assert list(series.timestamps[-3:]) == [START + 24 * HOUR, START + 25 * HOUR, START + 26 * HOUR]
+        assert series.timestamps[-1] - series.timestamps[0] == window
+        assert series.fetched_at == 1
+
+    def test_merge_tail_replaces_off_grid_point(self):
+        """Test that a previous 'now' point between grid steps is replaced."""
+        document = chart(points(START, 10) + [[START + 9 * HOUR + 600, 99.0]])
+        series = ChartSeries("max", document, fetched_at=0)
+
+        series.merge_tail(chart(points(START + 9 * HOUR, 3)), fetched_at=1)
+
+        assert list(series.timestamps[-3:]) == [START + 9 * HOUR, START + 10 * HOUR, START + 11 * HOUR]
+        assert 99.0 not in series.values
+
+
+@pytest.mark.asyncio
+class TestChartCacheToolClient:
+    """Tests for serving chart requests from memory."""
+
+    @respx.mock
+    async def test_served_from_memory_within_ttl(self, client, clock):
+        """Test that a repeated call inside the ttl makes no request."""
+        route = respx.get(f"{CHART_URL}/year").mock(return_value=httpx.Response(200, json=chart(points(START, 100))))
+
+        first = await client.request("GET", "/v1/fungibles/eth/charts/year")
+        clock[0] += 30
+        second = await client.request("GET", "/v1/fungibles/eth/charts/year")
+
+        assert route.call_count == 1
+        assert second.json() == first.json()
+        assert client.stats()["hits"] == 1
+
+    @respx.mock
+    async def test_stale_series_refreshed_from_shorter_period(self, client, clock):
+        """Test that a stale year series is extended with a day chart's tail."""
+        year = respx.get(f"{CHART_URL}/year").mock(return_value=httpx.Response(200, json=chart(points(START, 100))))
+        day = respx.get(f"{CHART_URL}/day").mock(
+            return_value=httpx.Response(200, json=chart(points(START + 96 * HOUR, 7)))
+        )
+
+        await client.request("GET", "/v1/fungibles/eth/charts/year")
+        clock[0] += 2 * HOUR
+        response = await client.request("GET", "/v1/fungibles/eth/charts/year")
+
+        timestamps = [p[0] for p in response.json()["data"]["attributes"]["points"]]
+        assert year.call_count == 1
+        assert day.call_count == 1
+        assert timestamps[-1] == START + 102 * HOUR
+        assert len(timestamps) == 100
+        assert client.stats()["refreshes"] == 1
+
+    @respx.mock
+    async def test_full_download_when_gap_too_long(self, client, clock):
+        """Test that no tail request is made when no shorter period covers the gap."""
+        route = respx.get(f"{CHART_URL}/day").mock(return_value=httpx.Response(200, json=chart(points(START, 24))))
+
+        await client.request("GET", "/v1/fungibles/eth/charts/day")
+        clock[0] += 2 * 86400
+        await client.request("GET", "/v1/fungibles/eth/charts/day")
+
+        assert route.call_count == 2
+        assert client.stats()["downloads"] == 2
+
+    @respx.mock
+    async def test_stale_empty_series_downloaded(self, client, clock):
+        """Test that an expired series without points is downloaded again."""
+        route = respx.get(f"{CHART_URL}/year").mock(return_value=httpx.Response(200, json=chart([])))
+
+        await client.request("GET", "/v1/fungibles/eth/charts/year")
+        clock[0] += 2 * HOUR
+        response = await client.request("GET", "/v1/fungibles/eth/charts/year")
+
+        assert response.json()["data"]["attributes"]["points"] == []
+        assert route.call_count == 2
+        assert client.stats()["downloads"] == 2
+
+    @respx.mock
+    async def test_params_are_part_of_key(self, client, clock):
+        """Test that charts in different currencies are cached separately."""
+        route = respx.get(f"{CHART_URL}/week").mock(return_value=httpx.Response(200, json=chart(points(START, 10))))
+
+        await client.request("GET", "/v1/fungibles/eth/charts/week", params={"currency": "usd"})
+        await client.request("GET", "/v1/fungibles/eth/charts/week", params={"currency": "eur"})
+
+        assert route.call_count == 2
+
+    @respx.mock
+    async def test_least_recently_used_evicted(self, client, clock):
+        """Test that series beyond max_series are dropped oldest first."""
+        for period in ("week", "month", "year"):
+            respx.get(f"{CHART_URL}/{period}").mock(return_value=httpx.Response(200, json=chart(points(START, 10))))
+            await client.request("GET", f"/v1/fungibles/eth/charts/{period}")
+
+        assert client.stats()["series"] == 2
+        await client.request("GET", "/v1/fungibles/eth/charts/week")
+        assert client.stats()["downloads"] == 4
+
+    @respx.mock
+    async def test_other_requests_delegated(self, client, clock):
+        """Test that non-chart requests go straight to the wrapped client."""
+        route = respx.get(f"{BASE_URL}/v1/chains/").mock(return_value=httpx.Response(200, json={"data": []}))
+
+        await client.request("GET", "/v1/chains/")
+        await client.request("GET", "/v1/chains/")
+
+        assert route.call_count == 2
+        assert client.stats()["series"] == 0
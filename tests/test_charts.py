@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""Tests for chart downsampling and compact encoding."""
+
+import math
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+from fastmcp.server.openapi import RouteMap, MCPType
+
+from zerion_mcp_server import charts
+from zerion_mcp_server.charts import ChartOptionsMiddleware, delta_decode, delta_encode, lttb
+from zerion_mcp_server.retry_client import RetryAsyncClient
+from zerion_mcp_server.tool_schemas import drop_output_schema
+
+BASE_URL = "https://api.test.com"
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Test", "version": "1"},
+    "paths": {
+        "/v1/fungibles/{fungible_id}/charts/{chart_period}": {
+            "get": {
+                "operationId": "getFungibleChart",
+                "parameters": [
+                    {"name": "fungible_id", "in": "path", "required": True, "schema": {"type": "string"}},
+                    {"name": "chart_period", "in": "path", "required": True, "schema": {"type": "string"}}
+                ],
+                "responses": {"200": {"description": "OK"}}
+            }
+        },
+        "/v1/chains/": {"get": {"operationId": "listChains", "responses": {"200": {"description": "OK"}}}}
+    }
+}
+
+
+def series(size: int):
+    """Hourly points of a noisy sine wave with one spike."""
+    points = [[1700000000 + 3600 * i, round(1000 + 100 * math.sin(i / 20) + (i % 7), 4)] for i in range(size)]
+    points[size // 3][1] = 5000.0
+    return points
+
+
+@pytest.fixture
+def mcp():
+    """MCP server with the chart middleware."""
+    server = FastMCP.from_openapi(
+        openapi_spec=SPEC,
+        client=RetryAsyncClient(base_url=BASE_URL),
+        route_maps=[RouteMap(mcp_type=MCPType.TOOL)],
+        mcp_component_fn=drop_output_schema
+    )
+    server.add_middleware(ChartOptionsMiddleware())
+    return server
+
+
+def chart_response(points):
+    return httpx.Response(200, json={
+        "data": {"type": "fungible_charts", "id": "eth-year", "attributes": {"points": points}}
+    })
+
+
+class TestLttb:
+    """Tests for the LTTB downsampler."""
+
+    def test_keeps_endpoints_and_count(self):
+        """Test that the first and last points survive and the size is bounded."""
+        points = series(1000)
+
+        result = lttb(points, 100)
+
+        assert len(result) == 100
+        assert result[0] == points[0]
+        assert result[-1] == points[-1]
+        assert result == sorted(result)
+
+    def test_keeps_spike(self):
+        """Test that an outlier defining the chart's shape is selected."""
+        points = series(1000)
+
+        assert [points[333][0], 5000.0] in lttb(points, 50)
+
+    def test_short_series_unchanged(self):
+        """Test that series already within max_points are returned as-is."""
+        points = series(10)
+
+        assert lttb(points, 10) is points
+
+    @pytest.mark.skipif(charts._numpy() is None, reason="numpy not installed")
+    def test_numpy_matches_python(self, monkeypatch):
+        """Test that the vectorized and pure-Python paths pick the same points."""
+        points = series(2000)
+        vectorized = lttb(points, 150)
+
+        monkeypatch.setattr(charts, "_numpy", lambda: None)
+
+        assert lttb(points, 150) == vectorized
+
+
+class TestDeltaEncoding:
+    """Tests for the compact point format."""
+
+    def test_round_trip(self):
+        """Test that decoding restores the points to six significant digits."""
+        points = series(200)
+
+        decoded = delta_decode(delta_encode(points))
+
+        assert [p[0] for p in decoded] == [p[0] for p in points]
+        for (_, original), (_, value) in zip(points, decoded):
+            assert value == pytest.approx(original, abs=0.01)
+
+    def test_small_prices_keep_precision(self):
+        """Test that sub-cent values are scaled, not rounded to zero."""
+        points = [[0, 0.00001234], [60, 0.00001301]]
+
+        decoded = delta_decode(delta_encode(points))
+
+        assert decoded[1][1] == pytest.approx(0.00001301, rel=1e-5)
+
+    def test_shorter_than_pairs(self):
+        """Test that the encoding is smaller than the original pairs."""
+        points = series(500)
+
+        assert len(str(delta_encode(points))) < len(str(points)) / 2
+
+
+@pytest.mark.asyncio
+class TestChartOptionsMiddleware:
+    """Tests for the chart tool arguments."""
+
+    async def test_arguments_listed(self, mcp):
+        """Test that only chart tools advertise max_points and points_format."""
+        async with Client(mcp) as client:
+            tools = {tool.name: tool for tool in await client.list_tools()}
+
+        assert "max_points" in tools["getFungibleChart"].inputSchema["properties"]
+        assert "points_format" in tools["getFungibleChart"].inputSchema["properties"]
+        assert "max_points" not in tools["listChains"].inputSchema.get("properties", {})
+
+    @respx.mock
+    async def test_downsampled(self, mcp):
+        """Test that max_points is applied and not sent upstream."""
+        route = respx.get(f"{BASE_URL}/v1/fungibles/eth/charts/year").mock(return_value=chart_response(series(1000)))
+
+        async with Client(mcp) as client:
+            result = await client.call_tool(
+                "getFungibleChart", {"fungible_id": "eth", "chart_period": "year", "max_points": 60}
+            )
+
+        attributes = result.structured_content["data"]["attributes"]
+        assert len(attributes["points"]) == 60
+        assert attributes["original_points"] == 1000
+        assert "max_points" not in str(route.calls[0].request.url)
+
+    @respx.mock
+    async def test_delta_format(self, mcp):
+        """Test that points_format=delta returns the compact encoding."""
+        respx.get(f"{BASE_URL}/v1/fungibles/eth/charts/day").mock(return_value=chart_response(series(100)))
+
+        async with Client(mcp) as client:
+            result = await client.call_tool(
+                "getFungibleChart", {"fungible_id": "eth", "chart_period": "day", "points_format": "delta"}
+            )
+
+        encoded = result.structured_content["data"]["attributes"]["points"]
+        assert encoded["encoding"] == "delta"
+        assert len(delta_decode(encoded)) == 100
+
+    @respx.mock
+    async def test_without_options_unchanged(self, mcp):
+        """Test that calls without the options return the response untouched."""
+        points = series(20)
+        respx.get(f"{BASE_URL}/v1/fungibles/eth/charts/day").mock(return_value=chart_response(points))
+
+        async with Client(mcp) as client:
+            result = await client.call_tool("getFungibleChart", {"fungible_id": "eth", "chart_period": "day"})
+
+        assert result.structured_content["data"]["attributes"] == {"points": points}
+
+    async def test_invalid_max_points(self, mcp):
+        """Test that max_points below 3 is rejected."""
+        async with Client(mcp) as client:
+            with pytest.raises(ToolError, match="minimum of 3"):
+                await client.call_tool(
+                    "getFungibleChart", {"fungible_id": "eth", "chart_period": "day", "max_points": 2}
+                )
@@ -161,3 +161,330 @@ class TestConfigManager:
         config_dict = config.to_dict(redact_secrets=False)
         
         assert config_dict["api_key"] == "Bearer test-api-key-123"
+    
+    def test_api_keys_pool(self, tmp_path: Path, clear_env_vars):
+        """Test API key pool definitions with strings and mappings."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({
+                "api_keys": [
+                    "Bearer key-one",
+                    {"key": "Bearer key-two", "name": "builder", "rate_limit": 50}
+                ]
+            }, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.api_key == "Bearer key-one"
+        assert config.api_keys == [
+            {"name": "key-1", "key": "Bearer key-one", "rate_limit": None, "burst": None},
+            {"name": "builder", "key": "Bearer key-two", "rate_limit": 50, "burst": None}
+        ]
+        assert config.to_dict()["api_keys"] == ["***REDACTED***", "***REDACTED***"]
+    
+    def test_api_keys_default_to_single_key(self, config_file: Path):
+        """Test that a single api_key forms a one-key pool."""
+        config = ConfigManager(str(config_file))
+        
+        assert [k["key"] for k in config.api_keys] == ["Bearer test-api-key-123"]
+    
+    def test_env_override_api_keys(self, config_file: Path, monkeypatch):
+        """Test ZERION_API_KEYS comma-separated override."""
+        monkeypatch.setenv("ZERION_API_KEYS", "Bearer a, Bearer b")
+        
+        config = ConfigManager(str(config_file))
+        
+        assert [k["key"] for k in config.api_keys] == ["Bearer a", "Bearer b"]
+    
+    def test_invalid_api_keys_rate_limit(self, tmp_path: Path, clear_env_vars):
+        """Test error when a pooled key has an invalid rate limit."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_keys": [{"key": "Bearer a", "rate_limit": 0}]}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "rate_limit" in str(exc_info.value)
+    
+    def test_tool_filter_config(self, tmp_path: Path, clear_env_vars):
+        """Test tool include/exclude rules with defaults for missing lists."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({
+                "api_key": "Bearer a",
+                "tools": {"include_tags": ["wallets"], "exclude_operations": ["getWalletPNL"]}
+            }, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.tool_filter_config == {
+            "include_operations": [],
+            "include_tags": ["wallets"],
+            "exclude_operations": ["getWalletPNL"],
+            "exclude_tags": []
+        }
+    
+    def test_invalid_tool_filter(self, tmp_path: Path, clear_env_vars):
+        """Test error when a tool filter rule is not a list of strings."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "tools": {"include_tags": "wallets"}}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "tools.include_tags" in str(exc_info.value)
+    
+    def test_http_config(self, tmp_path: Path, clear_env_vars):
+        """Test HTTP transport settings with defaults for missing keys."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "http": {"host": "0.0.0.0", "workers": 4}}, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.http_config["host"] == "0.0.0.0"
+        assert config.http_config["port"] == 8000
+        assert config.http_config["workers"] == 4
+        assert config.http_config["shared_state_path"].endswith("limiter.sqlite3")
+        assert config.http_config["max_concurrent_streams"] == 100
+    
+    def test_invalid_http_workers(self, tmp_path: Path, clear_env_vars):
+        """Test error when the worker count is not a positive integer."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "http": {"workers": 0}}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "http.workers" in str(exc_info.value)
+    
+    def test_analytics_config(self, tmp_path: Path, clear_env_vars):
+        """Test analytics settings with defaults for missing keys."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "analytics": {"enabled": True, "max_pages": 5}}, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.analytics_config == {"enabled": True, "ttl": 300, "max_pages": 5, "max_wallets": 32}
+    
+    def test_invalid_analytics_max_pages(self, tmp_path: Path, clear_env_vars):
+        """Test error when max_pages is not a positive integer."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "analytics": {"max_pages": 0}}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "analytics.max_pages" in str(exc_info.value)
+    
+    def test_portfolio_config(self, tmp_path: Path, clear_env_vars):
+        """Test portfolio settings with defaults for missing keys."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "portfolio": {"enabled": True, "max_wallets": 10}}, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.portfolio_config == {"enabled": True, "max_wallets": 10, "max_concurrency": 8, "max_pages": 10}
+    
+    def test_invalid_portfolio_concurrency(self, tmp_path: Path, clear_env_vars):
+        """Test error when max_concurrency is not a positive integer."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "portfolio": {"max_concurrency": -1}}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "portfolio.max_concurrency" in str(exc_info.value)
+    
+    def test_position_diff_config(self, tmp_path: Path, clear_env_vars):
+        """Test position diff settings with defaults for missing keys."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "position_diff": {"enabled": True}}, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.position_diff_config == {"enabled": True, "max_snapshots": 256, "max_pages": 10}
+    
+    def test_validation_config(self, tmp_path: Path, clear_env_vars):
+        """Test request validation settings with defaults for missing keys."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "validation": {"max_url_length": 4000}}, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.validation_config == {"enabled": True, "max_url_length": 4000}
+    
+    def test_invalid_validation_max_url_length(self, tmp_path: Path, clear_env_vars):
+        """Test error when max_url_length is negative."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "validation": {"max_url_length": -1}}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "validation.max_url_length" in str(exc_info.value)
+    
+    def test_filter_splitting_config(self, tmp_path: Path, clear_env_vars):
+        """Test filter splitting settings with defaults for missing keys."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "filter_splitting": {"enabled": False}}, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.filter_splitting_config == {"enabled": False, "max_requests": 8}
+    
+    def test_invalid_filter_splitting_max_requests(self, tmp_path: Path, clear_env_vars):
+        """Test error when max_requests is not a positive integer."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "filter_splitting": {"max_requests": 0}}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "filter_splitting.max_requests" in str(exc_info.value)
+    
+    def test_swap_quotes_config(self, tmp_path: Path, clear_env_vars):
+        """Test swap quote settings with defaults for missing keys."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "swap_quotes": {"enabled": True, "ttl": 3}}, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.swap_quotes_config == {
+            "enabled": True, "ttl": 3, "amount_tolerance": 0.001, "max_entries": 512, "max_amounts": 10
+        }
+    
+    def test_invalid_swap_quotes_amount_tolerance(self, tmp_path: Path, clear_env_vars):
+        """Test error when amount_tolerance is negative."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "swap_quotes": {"amount_tolerance": -0.1}}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "swap_quotes.amount_tolerance" in str(exc_info.value)
+    
+    def test_gas_prices_config(self, tmp_path: Path, clear_env_vars):
+        """Test gas price polling settings with defaults for missing keys."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "gas_prices": {"enabled": True, "chain_ids": ["ethereum", "base"]}}, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.gas_prices_config == {
+            "enabled": True, "chain_ids": ["ethereum", "base"], "interval": 10, "max_age": 30, "idle_after": 300
+        }
+    
+    def test_invalid_gas_prices_interval(self, tmp_path: Path, clear_env_vars):
+        """Test error when interval is not a positive number."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "gas_prices": {"interval": 0}}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "gas_prices.interval" in str(exc_info.value)
+    
+    def test_prices_config(self, tmp_path: Path, clear_env_vars):
+        """Test batch price settings with defaults for missing keys."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "prices": {"enabled": True, "ttl": 10}}, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.prices_config == {"enabled": True, "ttl": 10, "max_ids": 200, "max_entries": 4096}
+    
+    def test_invalid_prices_max_ids(self, tmp_path: Path, clear_env_vars):
+        """Test error when max_ids is not a positive integer."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "prices": {"max_ids": 0}}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "prices.max_ids" in str(exc_info.value)
+    
+    def test_chart_cache_config(self, tmp_path: Path, clear_env_vars):
+        """Test chart cache settings with defaults for missing keys."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "chart_cache": {"enabled": True}}, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.chart_cache_config == {"enabled": True, "ttl": 60, "max_series": 256}
+    
+    def test_invalid_chart_cache_max_series(self, tmp_path: Path, clear_env_vars):
+        """Test error when max_series is not a positive integer."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "chart_cache": {"max_series": 0}}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "chart_cache.max_series" in str(exc_info.value)
+    
+    def test_http_cache_config(self, tmp_path: Path, clear_env_vars):
+        """Test HTTP cache settings with defaults for missing keys."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "http_cache": {"enabled": True, "max_size_mb": 64}}, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.http_cache_config["enabled"] is True
+        assert config.http_cache_config["max_size_mb"] == 64
+        assert config.http_cache_config["max_stale"] == 604800
+    
+    def test_invalid_http_cache_size(self, tmp_path: Path, clear_env_vars):
+        """Test error when the cache size is not positive."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "http_cache": {"max_size_mb": 0}}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "http_cache.max_size_mb" in str(exc_info.value)
+    
+    def test_sidecar_config(self, tmp_path: Path, clear_env_vars):
+        """Test sidecar settings with defaults for missing keys."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "sidecar": {"enabled": True}}, f)
+        
+        config = ConfigManager(str(config_path))
+        
+        assert config.sidecar_config["enabled"] is True
+        assert config.sidecar_config["autostart"] is True
+        assert config.sidecar_config["socket_path"].endswith("sidecar.sock")
+    
+    def test_invalid_passthrough_operations(self, tmp_path: Path, clear_env_vars):
+        """Test error when passthrough operations are not a list of strings."""
+        config_path = tmp_path / "config.yaml"
+        with open(config_path, "w") as f:
+            yaml.dump({"api_key": "Bearer a", "passthrough": {"operations": "getRaw"}}, f)
+        
+        with pytest.raises(ConfigError) as exc_info:
+            ConfigManager(str(config_path))
+        
+        assert "passthrough.operations" in str(exc_info.value)
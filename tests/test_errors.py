@@ -8,7 +8,8 @@ from zerion_mcp_server.errors import (
     ConfigError,
     NetworkError,
     APIError,
-    ValidationError
+    ValidationError,
+    QuotaExceededError
 )
 
 
@@ -190,3 +191,15 @@ class TestValidationError:
         error = ValidationError("Invalid format", context=context)
         
         assert error.context["suggestion"] == "Check data format"
+
+
+class TestQuotaExceededError:
+    """Test quota exceeded error."""
+    
+    def test_quota_exceeded_error(self):
+        """Test QuotaExceededError context."""
+        error = QuotaExceededError("Budget reached", used=4000, limit=4000, priority="background")
+        
+        assert isinstance(error, ZerionMCPError)
+        assert error.used == 4000
+        assert error.context == {"used": 4000, "limit": 4000, "priority": "background"}
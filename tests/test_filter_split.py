@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""Tests for splitting over-long filter lists."""
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+from fastmcp.server.openapi import RouteMap, MCPType
+
+from zerion_mcp_server.errors import ValidationError
+from zerion_mcp_server.filter_split import (
+    FilterSplittingMiddleware, SplittingToolClient, decode_cursor, encode_cursor, merge_documents
+)
+from zerion_mcp_server.operations import OperationIndex
+from zerion_mcp_server.param_validation import RequestValidator, ValidatingToolClient, parameter_rules
+from zerion_mcp_server.retry_client import RetryAsyncClient
+from zerion_mcp_server.tool_schemas import drop_output_schema
+
+BASE_URL = "https://api.test.com"
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Test", "version": "1"},
+    "paths": {
+        "/v1/wallets/{address}/positions/": {
+            "get": {
+                "operationId": "listWalletPositions",
+                "parameters": [
+                    {"name": "address", "in": "path", "required": True, "schema": {"type": "string"}},
+                    {
+                        "name": "filter[fungible_ids]", "in": "query", "style": "form", "explode": False,
+                        "schema": {"type": "array", "maxItems": 3, "items": {"type": "string"}}
+                    },
+                    {
+                        "name": "filter[position_types]", "in": "query", "style": "form", "explode": False,
+                        "schema": {"type": "array", "items": {"type": "string", "enum": ["wallet", "loan"]}}
+                    },
+                    {"name": "sort", "in": "query", "schema": {"type": "string", "enum": ["value", "-value"]}},
+                    {
+                        "name": "page", "in": "query", "style": "deepObject", "explode": True,
+                        "schema": {"type": "object", "properties": {"after": {"type": "string", "maxLength": 64}}}
+                    }
+                ],
+                "responses": {"200": {"description": "OK"}}
+            }
+        }
+    }
+}
+
+URL = "/v1/wallets/0xabc/positions/"
+
+
+def position(fungible_id, value):
+    return {"type": "positions", "id": f"{fungible_id}-pos", "attributes": {"value": value}}
+
+
+def serve(values, page_size=None):
+    """respx side effect returning one position per requested fungible.
+
+    With page_size, each chunk is served in pages linked by 'p<offset>' cursors.
+    """
+    def handler(request):
+        ids = request.url.params["filter[fungible_ids]"].split(",")
+        offset = int(request.url.params.get("page[after]", "p0")[1:].split("-")[0])
+        end = len(ids) if page_size is None else offset + page_size
+        document = {"data": [position(i, values[i]) for i in ids[offset:end]], "links": {}}
+        if end < len(ids):
+            # Padded to the length of real cursors
+            document["links"]["next"] = str(request.url.copy_set_param("page[after]", f"p{end}-{'c' * 40}"))
+        return httpx.Response(200, json=document)
+    return handler
+
+
+def splitting_client(max_url_length=2000, max_requests=8):
+    validator = RequestValidator(parameter_rules(SPEC), OperationIndex(SPEC), BASE_URL, max_url_length)
+    return SplittingToolClient(
+        ValidatingToolClient(RetryAsyncClient(base_url=BASE_URL), validator), validator, max_requests
+    )
+
+
+class TestMergeDocuments:
+    """Tests for merging split responses."""
+
+    def test_dedupe_and_sort(self):
+        """Test that items are deduped by id and ordered by the sort attribute."""
+        merged = merge_documents([
+            {"data": [position("a", 5), position("b", 1)], "links": {"self": "first"}},
+            {"data": [position("c", 3), position("a", 5), {"id": "d", "attributes": {}}]}
+        ], "-value")
+
+        assert [item["id"] for item in merged["data"]] == ["a-pos", "c-pos", "b-pos", "d"]
+        assert merged["links"] == {"self": "first"}
+
+    def test_no_sort_keeps_chunk_order(self):
+        """Test that without an ordering items stay in chunk order."""
+        merged = merge_documents([{"data": [position("b", 1)]}, {"data": [position("a", 5)]}], None)
+
+        assert [item["id"] for item in merged["data"]] == ["b-pos", "a-pos"]
+
+    def test_cursor_round_trip(self):
+        """Test that split cursors survive encoding and are checked against the split."""
+        token = encode_cursor(["abc", None])
+
+        assert decode_cursor(token, 2) == ["abc", None]
+        with pytest.raises(ValidationError):
+            decode_cursor(token, 3)
+        with pytest.raises(ValidationError):
+            decode_cursor("split:!!", 2)
+
+
+class TestSplittingToolClient:
+    """Tests for SplittingToolClient."""
+
+    @respx.mock
+    async def test_short_request_not_split(self):
+        """Test that a request within the limits is sent once, unchanged."""
+        route = respx.get(f"{BASE_URL}{URL}").mock(side_effect=serve({"a": 1, "b": 2}))
+
+        response = await splitting_client().request("GET", URL, params={"filter[fungible_ids]": "a,b"})
+
+        assert route.call_count == 1
+        assert [item["id"] for item in response.json()["data"]] == ["a-pos", "b-pos"]
+
+    @respx.mock
+    async def test_split_over_max_items(self):
+        """Test that a list over maxItems is split and merged in sort order."""
+        values = {name: i for i, name in enumerate("abcdefg")}
+        route = respx.get(f"{BASE_URL}{URL}").mock(side_effect=serve(values))
+
+        response = await splitting_client().request("GET", URL, params={
+            "filter[fungible_ids]": "a,b,c,d,e,f,g,a", "filter[position_types]": "wallet", "sort": "-value"
+        })
+
+        assert response.status_code == 200
+        assert route.call_count == 3
+        sent = [call.request.url.params["filter[fungible_ids]"] for call in route.calls]
+        assert sorted(sent) == ["a,b,c", "d,e,f", "g,a"]
+        assert all(call.request.url.params["filter[position_types]"] == "wallet" for call in route.calls)
+        assert [item["id"] for item in response.json()["data"]] == [f"{name}-pos" for name in "gfedcba"]
+        assert "next" not in response.json()["links"]
+
+    @respx.mock
+    async def test_split_over_url_length(self):
+        """Test that a list too long for the URL is split into requests within the limit."""
+        max_url_length = 300
+        ids = [f"0x{i:078x}" for i in range(3)]
+        route = respx.get(f"{BASE_URL}{URL}").mock(side_effect=serve({i: 1 for i in ids}))
+
+        response = await splitting_client(max_url_length).request(
+            "GET", URL, params={"filter[fungible_ids]": ",".join(ids)}
+        )
+
+        assert response.status_code == 200
+        assert route.call_count > 1
+        assert all(len(str(call.request.url)) <= max_url_length for call in route.calls)
+        assert len(response.json()["data"]) == 3
+
+    @respx.mock
+    async def test_pagination_follows_each_chunk(self):
+        """Test that links.next continues every unfinished chunk from its cursor."""
+        values = {name: i for i, name in enumerate("abcde")}
+        route = respx.get(f"{BASE_URL}{URL}").mock(side_effect=serve(values, page_size=2))
+        client = splitting_client()
+        params = {"filter[fungible_ids]": "a,b,c,d,e"}
+
+        first = (await client.request("GET", URL, params=params)).json()
+        token = httpx.URL(first["links"]["next"]).params["page[after]"]
+        second = (await client.request("GET", URL, params={**params, "page[after]": token})).json()
+
+        assert [item["id"] for item in first["data"]] == ["a-pos", "b-pos", "d-pos", "e-pos"]
+        assert [item["id"] for item in second["data"]] == ["c-pos"]
+        assert "next" not in second["links"]
+        # The finished second chunk is not requested again
+        assert route.call_count == 3
+        assert route.calls[-1].request.url.params["filter[fungible_ids]"] == "a,b,c"
+        assert route.calls[-1].request.url.params["page[after]"] == f"p2-{'c' * 40}"
+
+    @respx.mock
+    async def test_failed_chunk_returned(self):
+        """Test that a failing chunk's response is returned instead of a partial merge."""
+        def handler(request):
+            if request.url.params["filter[fungible_ids]"].startswith("d"):
+                return httpx.Response(400, json={"errors": [{"title": "Bad filter"}]})
+            return serve({"a": 1, "b": 1, "c": 1})(request)
+        respx.get(f"{BASE_URL}{URL}").mock(side_effect=handler)
+
+        response = await splitting_client().request("GET", URL, params={"filter[fungible_ids]": "a,b,c,d"})
+
+        assert response.status_code == 400
+
+    @respx.mock
+    async def test_too_many_requests_not_split(self):
+        """Test that a split over max_requests is left to validation to reject."""
+        route = respx.get(f"{BASE_URL}{URL}").mock(side_effect=serve({}))
+
+        with pytest.raises(ValidationError, match="at most 3 items"):
+            await splitting_client(max_requests=2).request("GET", URL, params={"filter[fungible_ids]": "a,b,c,d,e,f,g"})
+
+        assert route.call_count == 0
+
+
+class TestFilterSplittingMiddleware:
+    """Tests for lifting item limits from the tool schemas."""
+
+    @respx.mock
+    async def test_tool_call_over_max_items(self):
+        """Test that a tool call with more ids than maxItems reaches the splitting client."""
+        route = respx.get(f"{BASE_URL}{URL}").mock(side_effect=serve({name: 1 for name in "abcde"}))
+        client = splitting_client()
+        mcp = FastMCP.from_openapi(
+            openapi_spec=SPEC,
+            client=client,
+            route_maps=[RouteMap(mcp_type=MCPType.TOOL)],
+            mcp_component_fn=drop_output_schema
+        )
+        mcp.add_middleware(FilterSplittingMiddleware(client.validator))
+
+        async with Client(mcp) as mcp_client:
+            tools = {tool.name: tool for tool in await mcp_client.list_tools()}
+            result = await mcp_client.call_tool(
+                "listWalletPositions", {"address": "0xabc", "filter[fungible_ids]": list("abcde")}
+            )
+
+        properties = tools["listWalletPositions"].inputSchema["properties"]
+        assert "maxItems" not in properties["filter[fungible_ids]"]
+        assert route.call_count == 2
+        assert len(result.structured_content["data"]) == 5
+
+    @respx.mock
+    async def test_tool_call_on_continued_page(self):
+        """Test that the split page[after] token is accepted by the tool."""
+        route = respx.get(f"{BASE_URL}{URL}").mock(side_effect=serve({name: 1 for name in "abcde"}, page_size=2))
+        client = splitting_client()
+        mcp = FastMCP.from_openapi(
+            openapi_spec=SPEC,
+            client=client,
+            route_maps=[RouteMap(mcp_type=MCPType.TOOL)],
+            mcp_component_fn=drop_output_schema
+        )
+        mcp.add_middleware(FilterSplittingMiddleware(client.validator))
+        arguments = {"address": "0xabc", "filter[fungible_ids]": list("abcde")}
+
+        async with Client(mcp) as mcp_client:
+            first = await mcp_client.call_tool("listWalletPositions", arguments)
+            token = httpx.URL(first.structured_content["links"]["next"]).params["page[after]"]
+            second = await mcp_client.call_tool("listWalletPositions", {**arguments, "page": {"after": token}})
+
+        assert len(token) > 64
+        assert route.call_count == 3
+        assert [item["id"] for item in second.structured_content["data"]] == ["c-pos"]
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Tests for gas price polling and the latest-value store."""
+
+import asyncio
+
+import httpx
+import respx
+
+from zerion_mcp_server.gas_prices import GAS_PRICES_URL, GasPriceStore, GasPriceToolClient
+from zerion_mcp_server.operations import OperationIndex
+from zerion_mcp_server.retry_client import RetryAsyncClient
+
+BASE_URL = "https://api.test.com"
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Test", "version": "1"},
+    "paths": {
+        "/v1/gas-prices/": {"get": {"operationId": "listGasPrices", "responses": {"200": {"description": "OK"}}}},
+        "/v1/chains/": {"get": {"operationId": "listChains", "responses": {"200": {"description": "OK"}}}}
+    }
+}
+
+
+def gas_price(chain_id, gas_type, fast):
+    return {
+        "type": "gas-prices",
+        "id": f"gas-{chain_id}-{gas_type}",
+        "attributes": {"gas_type": gas_type, "info": {"fast": fast}, "updated_at": "2024-01-01T00:00:00Z"},
+        "relationships": {"chain": {"data": {"type": "chains", "id": chain_id}}}
+    }
+
+
+def serve_gas_prices():
+    """respx side effect with prices that rise with every upstream call."""
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json={"data": [
+            gas_price("ethereum", "classic", calls),
+            gas_price("ethereum", "eip1559", calls),
+            gas_price("polygon", "classic", calls)
+        ], "links": {"self": str(request.url)}})
+    return handler
+
+
+def gas_client(**store_options):
+    retry_client = RetryAsyncClient(base_url=BASE_URL)
+    store = GasPriceStore(retry_client, **store_options)
+    return GasPriceToolClient(retry_client, store, OperationIndex(SPEC)), store
+
+
+class TestGasPriceStore:
+    """Tests for GasPriceStore and GasPriceToolClient."""
+
+    @respx.mock
+    async def test_served_from_memory(self):
+        """Test that reads after the first are answered without upstream calls."""
+        route = respx.get(f"{BASE_URL}{GAS_PRICES_URL}").mock(side_effect=serve_gas_prices())
+        client, store = gas_client(interval=60)
+
+        try:
+            first = await client.request("GET", GAS_PRICES_URL, params={"filter[chain_ids]": "ethereum"})
+            second = await client.request("GET", GAS_PRICES_URL, params={
+                "filter[chain_ids]": "ethereum,polygon", "filter[gas_types]": "classic"
+            })
+            await asyncio.sleep(0.01)
+        finally:
+            await store.stop()
+
+        assert route.call_count == 1
+        assert [item["id"] for item in first.json()["data"]] == ["gas-ethereum-classic", "gas-ethereum-eip1559"]
+        assert [item["id"] for item in second.json()["data"]] == ["gas-ethereum-classic", "gas-polygon-classic"]
+        assert second.json()["meta"]["age_seconds"] >= 0
+        assert "fetched_at" in second.json()["meta"]
+
+    @respx.mock
+    async def test_poller_refreshes(self):
+        """Test that the poller keeps the store fresh in the background."""
+        route = respx.get(f"{BASE_URL}{GAS_PRICES_URL}").mock(side_effect=serve_gas_prices())
+        client, store = gas_client(interval=0.05)
+
+        try:
+            await client.request("GET", GAS_PRICES_URL)
+            await asyncio.sleep(0.18)
+            response = await client.request("GET", GAS_PRICES_URL)
+        finally:
+            await store.stop()
+
+        assert route.call_count >= 3
+        assert response.json()["data"][0]["attributes"]["info"]["fast"] == route.call_count
+        assert store.live_refreshes == 1
+
+    @respx.mock
+    async def test_stale_data_refreshed_live(self):
+        """Test that data older than max_age is refreshed once for concurrent readers."""
+        route = respx.get(f"{BASE_URL}{GAS_PRICES_URL}").mock(side_effect=serve_gas_prices())
+        client, store = gas_client(interval=60, max_age=0.05)
+
+        try:
+            await client.request("GET", GAS_PRICES_URL)
+            await asyncio.sleep(0.1)
+            responses = await asyncio.gather(*(client.request("GET", GAS_PRICES_URL) for _ in range(3)))
+        finally:
+            await store.stop()
+
+        assert route.call_count == 2
+        assert all(r.json()["data"][0]["attributes"]["info"]["fast"] == 2 for r in responses)
+
+    @respx.mock
+    async def test_poller_pauses_when_idle(self):
+        """Test that polling stops once nothing has read the store for idle_after."""
+        route = respx.get(f"{BASE_URL}{GAS_PRICES_URL}").mock(side_effect=serve_gas_prices())
+        client, store = gas_client(interval=0.02, idle_after=0.05)
+
+        await client.request("GET", GAS_PRICES_URL)
+        await asyncio.sleep(0.15)
+        calls = route.call_count
+        await asyncio.sleep(0.1)
+
+        assert route.call_count == calls
+        assert store._poller is None
+
+    @respx.mock
+    async def test_uncovered_requests_go_upstream(self):
+        """Test that testnet requests and chains outside the configured set are not served from memory."""
+        route = respx.get(f"{BASE_URL}{GAS_PRICES_URL}").mock(side_effect=serve_gas_prices())
+        client, store = gas_client(chain_ids=["ethereum"], interval=60)
+
+        try:
+            await client.request("GET", GAS_PRICES_URL, params={"filter[chain_ids]": "polygon"})
+            await client.request(
+                "GET", GAS_PRICES_URL, params={"filter[chain_ids]": "ethereum"}, headers={"x-env": "testnet"}
+            )
+            await client.request("GET", GAS_PRICES_URL)
+        finally:
+            await store.stop()
+
+        assert route.call_count == 3
+        assert store.age is None
+
+    @respx.mock
+    async def test_failed_refresh_falls_back(self):
+        """Test that a request is sent upstream as usual when the store cannot be filled."""
+        route = respx.get(f"{BASE_URL}{GAS_PRICES_URL}").mock(return_value=httpx.Response(503))
+        client, store = gas_client(interval=60)
+
+        try:
+            response = await client.request("GET", GAS_PRICES_URL)
+        finally:
+            await store.stop()
+
+        assert response.status_code == 503
+        assert route.call_count >= 2
+        assert store.polls == 0
+
+    @respx.mock
+    async def test_stopped_when_client_closed(self):
+        """Test that closing the upstream client stops the poller."""
+        respx.get(f"{BASE_URL}{GAS_PRICES_URL}").mock(side_effect=serve_gas_prices())
+        client, store = gas_client(interval=60)
+        client.client.close_callbacks.append(store.stop)
+
+        await client.request("GET", GAS_PRICES_URL)
+        poller = store._poller
+        await client.aclose()
+
+        assert poller.cancelled()
+        assert store._poller is None
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Tests for the persistent HTTP cache."""
+
+import time
+
+import httpx
+import pytest
+import respx
+
+from zerion_mcp_server.http_cache import DiskCache, parse_cache_control
+from zerion_mcp_server.retry_client import RetryAsyncClient
+from zerion_mcp_server.streaming import JsonArrayParser
+
+BASE_URL = "https://api.test.com"
+URL = f"{BASE_URL}/v1/fungibles/"
+BODY = b'{"data": [{"id": "eth"}, {"id": "usdc"}]}'
+
+
+def json_response(headers: dict, status: int = 200, content: bytes = BODY) -> httpx.Response:
+    return httpx.Response(status, content=content, headers={"content-type": "application/json", **headers})
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "http_cache.sqlite3"
+
+
+def test_parse_cache_control():
+    """Test directive parsing."""
+    assert parse_cache_control('max-age=60, No-Cache, private="x"') == {
+        "max-age": "60", "no-cache": None, "private": "x"
+    }
+    assert parse_cache_control(None) == {}
+
+
+@pytest.mark.asyncio
+class TestRetryClientCache:
+    """Tests for RetryAsyncClient with a DiskCache."""
+
+    @respx.mock
+    async def test_fresh_entry_served_without_request(self, cache_path):
+        """Test that a max-age response is served from disk while fresh."""
+        route = respx.get(URL).mock(return_value=json_response({"cache-control": "max-age=60"}))
+
+        async with RetryAsyncClient(base_url=BASE_URL, cache=DiskCache(str(cache_path))) as client:
+            first = await client.get("/v1/fungibles/")
+            second = await client.get("/v1/fungibles/")
+            assert client.cache.hits == 1
+
+        assert route.call_count == 1
+        assert first.json() == second.json()
+
+    @respx.mock
+    async def test_query_params_are_part_of_key(self, cache_path):
+        """Test that different query strings are cached separately."""
+        route = respx.get(URL).mock(return_value=json_response({"cache-control": "max-age=60"}))
+
+        async with RetryAsyncClient(base_url=BASE_URL, cache=DiskCache(str(cache_path))) as client:
+            await client.get("/v1/fungibles/", params={"currency": "usd"})
+            await client.get("/v1/fungibles/", params={"currency": "eur"})
+
+        assert route.call_count == 2
+
+    @respx.mock
+    async def test_etag_revalidation(self, cache_path):
+        """Test that a stale entry is revalidated and a 304 serves the stored body."""
+        route = respx.get(URL).mock(side_effect=[
+            json_response({"cache-control": "no-cache", "etag": '"v1"'}),
+            httpx.Response(304, headers={"etag": '"v1"'})
+        ])
+
+        async with RetryAsyncClient(base_url=BASE_URL, cache=DiskCache(str(cache_path))) as client:
+            await client.get("/v1/fungibles/")
+            response = await client.get("/v1/fungibles/")
+            assert client.cache.revalidated == 1
+
+        assert route.calls[1].request.headers["if-none-match"] == '"v1"'
+        assert response.status_code == 200
+        assert response.content == BODY
+
+    @respx.mock
+    async def test_changed_resource_replaces_entry(self, cache_path):
+        """Test that a 200 to a conditional request replaces the stored body."""
+        respx.get(URL).mock(side_effect=[
+            json_response({"cache-control": "no-cache", "etag": '"v1"'}),
+            json_response({"cache-control": "max-age=60", "etag": '"v2"'}, content=b'{"data": []}')
+        ])
+
+        async with RetryAsyncClient(base_url=BASE_URL, cache=DiskCache(str(cache_path))) as client:
+            await client.get("/v1/fungibles/")
+            await client.get("/v1/fungibles/")
+            response = await client.get("/v1/fungibles/")
+
+        assert response.json() == {"data": []}
+
+    @respx.mock
+    async def test_no_store_not_cached(self, cache_path):
+        """Test that no-store responses are never written."""
+        route = respx.get(URL).mock(return_value=json_response({"cache-control": "no-store"}))
+
+        async with RetryAsyncClient(base_url=BASE_URL, cache=DiskCache(str(cache_path))) as client:
+            await client.get("/v1/fungibles/")
+            await client.get("/v1/fungibles/")
+            assert client.cache.stats()["entries"] == 0
+
+        assert route.call_count == 2
+
+    @respx.mock
+    async def test_errors_not_cached(self, cache_path):
+        """Test that error responses are not stored."""
+        route = respx.get(URL).mock(return_value=json_response({"cache-control": "max-age=60"}, status=404))
+
+        async with RetryAsyncClient(base_url=BASE_URL, cache=DiskCache(str(cache_path))) as client:
+            await client.get("/v1/fungibles/")
+            await client.get("/v1/fungibles/")
+
+        assert route.call_count == 2
+
+    @respx.mock
+    async def test_api_key_not_part_of_key(self, cache_path):
+        """Test that the Authorization header neither varies nor is stored with entries."""
+        route = respx.get(URL).mock(return_value=json_response({"cache-control": "max-age=60"}))
+
+        async with RetryAsyncClient(base_url=BASE_URL, cache=DiskCache(str(cache_path))) as client:
+            await client.get("/v1/fungibles/", headers={"Authorization": "Basic a"})
+            await client.get("/v1/fungibles/", headers={"Authorization": "Basic b"})
+
+        assert route.call_count == 1
+        assert b"Basic" not in cache_path.read_bytes()
+
+    @respx.mock
+    async def test_shared_between_processes(self, cache_path):
+        """Test that a second cache on the same file sees stored entries."""
+        route = respx.get(URL).mock(return_value=json_response({"cache-control": "max-age=60"}))
+
+        async with RetryAsyncClient(base_url=BASE_URL, cache=DiskCache(str(cache_path))) as client:
+            await client.get("/v1/fungibles/")
+        async with RetryAsyncClient(base_url=BASE_URL, cache=DiskCache(str(cache_path))) as client:
+            await client.get("/v1/fungibles/")
+
+        assert route.call_count == 1
+
+    @respx.mock
+    async def test_stream_json_served_from_cache(self, cache_path):
+        """Test that streamed responses are stored and parsed from a cache hit."""
+        route = respx.get(URL).mock(return_value=json_response({"cache-control": "max-age=60"}))
+        items = []
+
+        async def on_item(item):
+            items.append(item)
+
+        async with RetryAsyncClient(base_url=BASE_URL, cache=DiskCache(str(cache_path))) as client:
+            await client.stream_json("GET", "/v1/fungibles/", JsonArrayParser(), on_item=on_item)
+            parser = JsonArrayParser()
+            await client.stream_json("GET", "/v1/fungibles/", parser, on_item=on_item)
+
+        assert route.call_count == 1
+        assert parser.document == {"data": [{"id": "eth"}, {"id": "usdc"}]}
+        assert len(items) == 4
+
+
+class TestDiskCacheMaintenance:
+    """Tests for eviction and compaction."""
+
+    def store(self, cache: DiskCache, path: str, body: bytes) -> None:
+        request = httpx.Request("GET", f"{BASE_URL}{path}")
+        cache.store(httpx.Response(200, content=body, headers={"cache-control": "max-age=60"}, request=request), body)
+
+    def test_lru_eviction(self, cache_path):
+        """Test that the least recently used entry is evicted first."""
+        cache = DiskCache(str(cache_path), max_bytes=2500)
+        self.store(cache, "/a", b"a" * 1000)
+        self.store(cache, "/b", b"b" * 1000)
+        assert cache.lookup(httpx.Request("GET", f"{BASE_URL}/a")) is not None
+
+        self.store(cache, "/c", b"c" * 1000)
+
+        assert cache.lookup(httpx.Request("GET", f"{BASE_URL}/b")) is None
+        assert cache.lookup(httpx.Request("GET", f"{BASE_URL}/a")) is not None
+        assert cache.stats()["bytes"] <= 2500
+        cache.close()
+
+    def test_compaction_drops_long_stale_entries(self, cache_path):
+        """Test that entries stale for longer than max_stale are removed."""
+        cache = DiskCache(str(cache_path), max_stale=60)
+        self.store(cache, "/old", b"{}")
+        self.store(cache, "/new", b"{}")
+        cache._db.execute("UPDATE entries SET fresh_until = ? WHERE url LIKE '%/old'", (time.time() - 120,))
+
+        cache.compact()
+
+        assert cache.stats()["entries"] == 1
+        cache.close()
+
+    def test_compaction_runs_on_open_when_due(self, cache_path):
+        """Test that opening the cache compacts it once per interval."""
+        cache = DiskCache(str(cache_path), max_stale=0)
+        self.store(cache, "/old", b"{}")
+        cache._db.execute("UPDATE entries SET fresh_until = 0")
+        cache.close()
+
+        assert DiskCache(str(cache_path), compact_interval=3600).stats()["entries"] == 1
+        assert DiskCache(str(cache_path), compact_interval=0).stats()["entries"] == 0
+
+    def test_total_size_tracked(self, cache_path):
+        """Test that the stored total follows inserts, replacements and evictions."""
+        cache = DiskCache(str(cache_path), max_bytes=2500)
+        self.store(cache, "/a", b"a" * 1000)
+        self.store(cache, "/a", b"a" * 400)
+        self.store(cache, "/b", b"b" * 1000)
+        assert cache.stats()["bytes"] == 1400
+
+        self.store(cache, "/c", b"c" * 1200)
+
+        total = cache._db.execute("SELECT SUM(size) FROM entries").fetchone()[0]
+        assert cache.stats()["bytes"] == total <= 2500
+        cache.close()
+
+    def test_reads_written_in_batches(self, cache_path):
+        """Test that lookups do not write last_access until the batch is flushed."""
+        cache = DiskCache(str(cache_path))
+        self.store(cache, "/a", b"{}")
+        cache._db.execute("UPDATE entries SET last_access = 0")
+
+        for _ in range(3):
+            cache.lookup(httpx.Request("GET", f"{BASE_URL}/a"))
+        assert cache._db.execute("SELECT last_access FROM entries").fetchone()[0] == 0
+
+        cache.flush()
+        assert cache._db.execute("SELECT last_access FROM entries").fetchone()[0] > 0
+        cache.close()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""Tests for HTTP transport settings."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from starlette.applications import Starlette
+
+from zerion_mcp_server.http_transport import (
+    BackpressureMiddleware, close_client_on_shutdown, uvicorn_options
+)
+
+HTTP_CONFIG = {
+    "host": "0.0.0.0",
+    "port": 9000,
+    "workers": 1,
+    "keep_alive": 15,
+    "max_concurrent_streams": 1,
+    "send_timeout": 0.05,
+    "graceful_shutdown_timeout": 10
+}
+
+
+def make_app(release: asyncio.Event):
+    """ASGI app that responds once release is set."""
+    async def app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+    return app
+
+
+def session_app():
+    """ASGI app issuing a session id for each initialize POST, like streamable HTTP."""
+    issued = iter(range(1, 1000))
+
+    async def app(scope, receive, send):
+        headers = dict(scope["headers"])
+        response_headers = []
+        if scope["method"] == "POST" and b"mcp-session-id" not in headers:
+            response_headers.append((b"mcp-session-id", f"s{next(issued)}".encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": response_headers})
+        await send({"type": "http.response.body", "body": b"{}"})
+    return app
+
+
+def http_scope(method, session_id=None, path="/mcp"):
+    headers = [(b"mcp-session-id", session_id.encode())] if session_id else []
+    return {"type": "http", "method": method, "path": path, "headers": headers}
+
+
+class Recorder:
+    """ASGI send callable recording messages."""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.messages = []
+
+    async def __call__(self, message):
+        await asyncio.sleep(self.delay)
+        self.messages.append(message)
+
+
+@pytest.mark.asyncio
+class TestBackpressureMiddleware:
+    """Tests for BackpressureMiddleware."""
+
+    async def test_rejects_streams_over_limit(self):
+        """Test that requests beyond max_streams get 503 with Retry-After."""
+        release = asyncio.Event()
+        middleware = BackpressureMiddleware(make_app(release), max_streams=1)
+        first, second = Recorder(), Recorder()
+
+        running = asyncio.create_task(middleware({"type": "http"}, None, first))
+        await asyncio.sleep(0)
+        await middleware({"type": "http"}, None, second)
+        release.set()
+        await running
+
+        assert second.messages[0]["status"] == 503
+        assert (b"retry-after", b"1") in second.messages[0]["headers"]
+        assert first.messages[0]["status"] == 200
+        assert middleware.active == 0
+
+    async def test_drops_slow_client(self):
+        """Test that a write blocked past send_timeout ends the request."""
+        release = asyncio.Event()
+        release.set()
+        middleware = BackpressureMiddleware(make_app(release), send_timeout=0.05)
+
+        with pytest.raises(OSError):
+            await middleware({"type": "http"}, None, Recorder(delay=1))
+
+        assert middleware.active == 0
+
+    async def test_lifespan_passes_through(self):
+        """Test that non-HTTP scopes are not counted or limited."""
+        app = AsyncMock()
+        middleware = BackpressureMiddleware(app, max_streams=0)
+
+        await middleware({"type": "lifespan"}, None, None)
+
+        app.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+class TestSessionLimit:
+    """Tests for the MCP session cap."""
+
+    async def initialize(self, middleware):
+        recorder = Recorder()
+        await middleware(http_scope("POST"), None, recorder)
+        return recorder.messages[0]
+
+    async def test_rejects_initialize_over_limit(self):
+        """Test that new sessions beyond max_sessions get 503 while existing ones keep working."""
+        middleware = BackpressureMiddleware(session_app(), max_sessions=2)
+        await self.initialize(middleware)
+        await self.initialize(middleware)
+
+        rejected = await self.initialize(middleware)
+        in_session = Recorder()
+        await middleware(http_scope("POST", "s1"), None, in_session)
+
+        assert rejected["status"] == 503
+        assert in_session.messages[0]["status"] == 200
+        assert set(middleware.sessions) == {"s1", "s2"}
+
+    async def test_deleted_and_idle_sessions_free_slots(self):
+        """Test that DELETE and the idle timeout stop a session from counting."""
+        middleware = BackpressureMiddleware(session_app(), max_sessions=1, session_idle_timeout=0.05)
+        await self.initialize(middleware)
+        await middleware(http_scope("DELETE", "s1"), None, Recorder())
+        assert (await self.initialize(middleware))["status"] == 200
+
+        await asyncio.sleep(0.1)
+
+        assert (await self.initialize(middleware))["status"] == 200
+        assert set(middleware.sessions) == {"s3"}
+
+    async def test_sse_stream_is_a_session(self):
+        """Test that with SSE each open stream counts as one session."""
+        release = asyncio.Event()
+        middleware = BackpressureMiddleware(make_app(release), max_sessions=1, transport="sse")
+        first, second, message = Recorder(), Recorder(), Recorder()
+
+        stream = asyncio.create_task(middleware(http_scope("GET", path="/sse"), None, first))
+        await asyncio.sleep(0)
+        await middleware(http_scope("GET", path="/sse"), None, second)
+        release.set()
+        await middleware(http_scope("POST", path="/messages/"), None, message)
+        await stream
+
+        assert second.messages[0]["status"] == 503
+        assert message.messages[0]["status"] == 200
+        assert middleware.sessions == {}
+
+
+@pytest.mark.asyncio
+async def test_client_closed_on_shutdown():
+    """Test that the upstream client is closed when the app shuts down."""
+    app = Starlette()
+    client = AsyncMock()
+    close_client_on_shutdown(app, client)
+
+    async with app.router.lifespan_context(app):
+        client.aclose.assert_not_awaited()
+
+    client.aclose.assert_awaited_once()
+
+
+def test_uvicorn_options():
+    """Test mapping of HTTP config to uvicorn settings."""
+    options = uvicorn_options(HTTP_CONFIG, "INFO")
+
+    assert options == {
+        "host": "0.0.0.0",
+        "port": 9000,
+        "timeout_keep_alive": 15,
+        "timeout_graceful_shutdown": 10,
+        "log_level": "info"
+    }
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Tests for shared wallet indexing state."""
+
+import asyncio
+import pytest
+
+from zerion_mcp_server.indexing import IndexingTracker
+
+
+class TestIndexingTracker:
+    """Tests for IndexingTracker."""
+
+    def test_address_from_url(self):
+        """Test wallet address extraction from request URLs."""
+        assert IndexingTracker.address_from_url("/v1/wallets/0xABC/portfolio") == "0xabc"
+        assert IndexingTracker.address_from_url(
+            "https://api.zerion.io/v1/wallets/0xabc/positions/?currency=usd"
+        ) == "0xabc"
+        assert IndexingTracker.address_from_url("/v1/chains/") is None
+
+    def test_poll_interval_increases_to_cap(self):
+        """Test linearly increasing poll interval capped at max_delay."""
+        tracker = IndexingTracker(retry_delay=1, max_delay=3, max_retries=5)
+
+        assert [tracker.poll_interval(i) for i in range(1, 6)] == [1, 2, 3, 3, 3]
+        assert tracker.total_wait == 12
+
+    def test_recently_indexed_expires(self):
+        """Test that indexed addresses are forgotten after indexed_ttl."""
+        tracker = IndexingTracker(indexed_ttl=0)
+        tracker.start_polling("0xabc")
+        tracker.finish_polling("0xabc", indexed=True)
+
+        assert not tracker.recently_indexed("0xabc")
+
+        tracker.indexed_ttl = 60
+        tracker.start_polling("0xdef")
+        tracker.finish_polling("0xdef", indexed=True)
+        assert tracker.recently_indexed("0xdef")
+
+    def test_timeout_not_remembered(self):
+        """Test that a timed-out poll does not mark the address indexed."""
+        tracker = IndexingTracker()
+        tracker.start_polling("0xabc")
+        tracker.finish_polling("0xabc", indexed=False)
+
+        assert not tracker.recently_indexed("0xabc")
+        assert not tracker.is_polling("0xabc")
+
+
+@pytest.mark.asyncio
+class TestIndexingTrackerWait:
+    """Tests for waiting on a shared poller."""
+
+    async def test_waiters_receive_outcome(self):
+        """Test that waiters are woken with the poller's outcome."""
+        tracker = IndexingTracker(retry_delay=0.1, max_retries=2)
+        tracker.start_polling("0xabc")
+
+        waiters = [asyncio.create_task(tracker.wait_for("0xabc")) for _ in range(3)]
+        await asyncio.sleep(0)
+        tracker.finish_polling("0xabc", indexed=True)
+
+        assert await asyncio.gather(*waiters) == [True, True, True]
+
+    async def test_wait_without_poller(self):
+        """Test that waiting without an active poller returns immediately."""
+        tracker = IndexingTracker()
+
+        assert await tracker.wait_for("0xabc") is None
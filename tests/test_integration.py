@@ -4,7 +4,7 @@
 import pytest
 import httpx
 import respx
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from zerion_mcp_server.config import ConfigManager
 from zerion_mcp_server.errors import NetworkError, APIError, ValidationError
 import asyncio
@@ -55,14 +55,17 @@ class TestServerInitialization:
             # Import and run main (will be mocked)
             from zerion_mcp_server import main
             
-            # Mock the run() method to prevent blocking
-            mock_server.run = Mock()
+            # Mock the stdio run to prevent blocking
+            mock_server.run_async = AsyncMock()
             
             # Run main function
-            main()
+            with patch('zerion_mcp_server.retry_client.RetryAsyncClient.aclose', new_callable=AsyncMock) as aclose:
+                main()
             
-            # Verify FastMCP was called
+            # Verify FastMCP was called and the client closed after the session
             assert mock_fastmcp.called
+            mock_server.run_async.assert_awaited_once()
+            aclose.assert_awaited_once()
     
     @respx.mock
     def test_openapi_spec_timeout(self, monkeypatch, clear_env_vars, capsys):
@@ -112,6 +115,63 @@ class TestServerInitialization:
         captured = capsys.readouterr()
         assert "yaml" in captured.out.lower() or "error" in captured.out.lower()
     
+    def test_profile_startup_reports_and_exits(
+        self, tmp_path, monkeypatch, clear_env_vars, capsys, mock_openapi_spec_yaml
+    ):
+        """Test --profile-startup reports phase timings without serving."""
+        spec_file = tmp_path / "spec.yaml"
+        spec_file.write_text(mock_openapi_spec_yaml)
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(yaml.dump({
+            "api_key": "Bearer test-key",
+            "oas_url": str(spec_file),
+            "quota": {"enabled": False}
+        }))
+        monkeypatch.setenv("CONFIG_PATH", str(config_file))
+
+        with patch('zerion_mcp_server.FastMCP.from_openapi') as mock_fastmcp:
+            mock_server = Mock()
+            mock_fastmcp.return_value = mock_server
+
+            from zerion_mcp_server import main
+            main(profile_startup=True)
+
+            assert mock_fastmcp.called
+            mock_server.run.assert_not_called()
+
+        captured = capsys.readouterr()
+        assert "Startup profile" in captured.err
+        for phase in ("import", "config", "spec_load", "spec_parse", "tool_generation", "first_ready"):
+            assert phase in captured.err
+
+    def test_tool_snapshot_skips_from_openapi(
+        self, tmp_path, monkeypatch, clear_env_vars, capsys, mock_openapi_spec_yaml
+    ):
+        """Test that a second launch registers tools from the snapshot."""
+        spec_file = tmp_path / "spec.yaml"
+        spec_file.write_text(mock_openapi_spec_yaml)
+        snapshot_file = tmp_path / "tools.json"
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(yaml.dump({
+            "api_key": "Bearer test-key",
+            "oas_url": str(spec_file),
+            "quota": {"enabled": False},
+            "tool_snapshot": {"path": str(snapshot_file)}
+        }))
+        monkeypatch.setenv("CONFIG_PATH", str(config_file))
+
+        from zerion_mcp_server import main
+        main(build_snapshot=True)
+        assert snapshot_file.exists()
+
+        with patch('zerion_mcp_server.FastMCP.from_openapi') as mock_fastmcp:
+            main(profile_startup=True)
+            assert not mock_fastmcp.called
+
+        captured = capsys.readouterr()
+        assert "snapshot_load" in captured.err
+        assert "spec_parse" not in captured.err
+
     def test_missing_api_key(self, clear_env_vars, capsys):
         """Test error when API key is missing."""
         from zerion_mcp_server import main
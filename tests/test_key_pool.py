@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Tests for the API key pool."""
+
+import pytest
+
+from zerion_mcp_server.errors import ConfigError
+from zerion_mcp_server.key_pool import ApiKey, ApiKeyPool
+
+
+class TestApiKeyPool:
+    """Tests for ApiKeyPool."""
+
+    def test_requires_keys(self):
+        """Test that an empty pool is rejected."""
+        with pytest.raises(ConfigError):
+            ApiKeyPool([])
+
+    def test_default_names(self):
+        """Test that unnamed keys get positional labels."""
+        pool = ApiKeyPool([{"key": "Bearer a"}, {"key": "Bearer b", "name": "spare"}])
+
+        assert [k.name for k in pool.keys] == ["key-1", "spare"]
+
+    def test_rate_limited_key_leaves_rotation(self):
+        """Test that a 429 takes a key out of rotation."""
+        pool = ApiKeyPool([{"key": "Bearer a"}, {"key": "Bearer b"}])
+        first = pool.keys[0]
+
+        pool.record(first, 429, retry_after=60)
+
+        assert not first.in_rotation()
+        assert pool.available()
+        usage = {u["name"]: u for u in pool.usage()}
+        assert usage["key-1"]["rate_limited"] == 1
+        assert usage["key-1"]["in_rotation"] is False
+        assert usage["key-2"]["in_rotation"] is True
+
+    def test_time_zero_is_a_time(self):
+        """Test that now=0 is used as given rather than replaced by the clock."""
+        api_key = ApiKey("key-1", "Bearer a")
+        api_key.consume(now=0.0)
+
+        assert api_key.last_used == 0.0
+
+
+@pytest.mark.asyncio
+class TestApiKeyPoolAcquire:
+    """Tests for key selection."""
+
+    async def test_picks_key_with_most_headroom(self):
+        """Test that requests are spread by remaining budget."""
+        pool = ApiKeyPool([
+            {"key": "Bearer a", "rate_limit": 2},
+            {"key": "Bearer b", "rate_limit": 5}
+        ])
+
+        picked = [(await pool.acquire()).name for _ in range(5)]
+
+        # key-2 starts with 5 tokens vs 2, so it is picked until budgets even out
+        assert picked[:3] == ["key-2", "key-2", "key-2"]
+        assert picked.count("key-1") >= 1
+        assert sum(u["requests"] for u in pool.usage()) == 5
+
+    async def test_unlimited_keys_take_turns(self):
+        """Test that keys with equal headroom are used round-robin."""
+        pool = ApiKeyPool([{"key": "Bearer a"}, {"key": "Bearer b"}, {"key": "Bearer c"}])
+
+        picked = [(await pool.acquire()).name for _ in range(6)]
+
+        assert picked == ["key-1", "key-2", "key-3", "key-1", "key-2", "key-3"]
+
+    async def test_skips_cooling_key(self):
+        """Test that a rate-limited key is not picked while cooling down."""
+        pool = ApiKeyPool([{"key": "Bearer a"}, {"key": "Bearer b"}])
+        pool.record(pool.keys[0], 429, retry_after=60)
+
+        picked = {(await pool.acquire()).name for _ in range(3)}
+
+        assert picked == {"key-2"}
+
+    async def test_waits_when_budget_exhausted(self):
+        """Test that acquire waits for a token when all keys are exhausted."""
+        pool = ApiKeyPool([{"key": "Bearer a", "rate_limit": 20, "burst": 1}])
+
+        await pool.acquire()
+        key = await pool.acquire()
+
+        assert key.requests == 2
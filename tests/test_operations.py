@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Tests for operationId resolution."""
+
+from zerion_mcp_server.operations import OperationIndex
+
+
+SPEC = {
+    "paths": {
+        "/v1/wallets/{address}/positions/": {
+            "get": {"operationId": "listWalletPositions"}
+        },
+        "/v1/fungibles/{fungible_id}": {
+            "get": {"operationId": "getFungibleById"}
+        },
+        "/v1/fungibles/": {
+            "get": {"operationId": "listFungibles"}
+        },
+        "/v1/tx-subscriptions/{id}": {
+            "get": {"operationId": "getTxSubscription"},
+            "delete": {"operationId": "deleteTxSubscription"},
+            "parameters": []
+        }
+    }
+}
+
+
+class TestOperationIndex:
+    """Tests for OperationIndex."""
+
+    def test_resolves_templated_paths(self):
+        """Test matching path templates with and without trailing slash."""
+        index = OperationIndex(SPEC)
+
+        assert index.resolve("GET", "/v1/wallets/0xabc/positions/") == "listWalletPositions"
+        assert index.resolve("get", "https://api.zerion.io/v1/wallets/0xabc/positions?currency=usd") == "listWalletPositions"
+        assert index.resolve("GET", "/v1/fungibles/eth") == "getFungibleById"
+        assert index.resolve("GET", "/v1/fungibles/") == "listFungibles"
+
+    def test_resolves_by_method(self):
+        """Test that the HTTP method selects the operation."""
+        index = OperationIndex(SPEC)
+
+        assert index.resolve("DELETE", "/v1/tx-subscriptions/abc") == "deleteTxSubscription"
+        assert index.resolve("POST", "/v1/tx-subscriptions/abc") is None
+        assert len(index) == 5
+
+    def test_unknown_path(self):
+        """Test that unknown paths resolve to None."""
+        assert OperationIndex(SPEC).resolve("GET", "/v2/unknown") is None
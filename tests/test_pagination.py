@@ -9,6 +9,7 @@ from zerion_mcp_server.pagination import (
     fetch_page
 )
 from zerion_mcp_server.errors import ValidationError
+from zerion_mcp_server.priority import Priority, current_priority
 
 
 @pytest.mark.asyncio
@@ -193,6 +194,20 @@ class TestFetchAllPages:
         assert call_kwargs["page[size]"] == 100
 
 
+    async def test_pages_fetched_at_background_priority(self):
+        """Test that auto-pagination tags its requests as background work."""
+        seen = []
+
+        async def api_call(**kwargs):
+            seen.append(current_priority())
+            return {"data": [], "links": {}}
+
+        await fetch_all_pages(api_call=api_call, max_pages=5)
+
+        assert seen == [Priority.BACKGROUND]
+        assert current_priority() == Priority.INTERACTIVE
+
+
 class TestExtractCursorFromUrl:
     """Tests for extract_cursor_from_url function."""
 
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Tests for local request parameter validation."""
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+from fastmcp.server.openapi import RouteMap, MCPType
+
+from zerion_mcp_server.errors import ValidationError
+from zerion_mcp_server.operations import OperationIndex
+from zerion_mcp_server.param_validation import RequestValidator, ValidatingToolClient, parameter_rules
+from zerion_mcp_server.retry_client import RetryAsyncClient
+from zerion_mcp_server.tool_schemas import drop_output_schema
+
+BASE_URL = "https://api.test.com"
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Test", "version": "1"},
+    "components": {
+        "parameters": {
+            "Currency": {
+                "name": "currency", "in": "query", "required": False,
+                "schema": {"type": "string", "enum": ["usd", "eur"]}
+            }
+        },
+        "schemas": {"TransactionType": {"type": "string", "enum": ["trade", "send", "receive"]}}
+    },
+    "paths": {
+        "/v1/wallets/{address}/transactions/": {
+            "get": {
+                "operationId": "listWalletTransactions",
+                "parameters": [
+                    {"name": "address", "in": "path", "required": True, "schema": {"type": "string"}},
+                    {"$ref": "#/components/parameters/Currency"},
+                    {
+                        "name": "page", "in": "query", "style": "deepObject", "explode": True,
+                        "schema": {"type": "object", "properties": {
+                            "size": {"type": "integer", "minimum": 1, "maximum": 100}
+                        }}
+                    },
+                    {
+                        "name": "filter[operation_types]", "in": "query", "style": "form", "explode": False,
+                        "schema": {"type": "array", "maxItems": 2, "items": {"$ref": "#/components/schemas/TransactionType"}}
+                    },
+                    {
+                        "name": "filter[search_query]", "in": "query",
+                        "schema": {"type": "string", "minLength": 2, "maxLength": 8}
+                    },
+                    {"name": "X-Env", "in": "header", "schema": {"type": "string", "enum": ["testnet"]}}
+                ],
+                "responses": {"200": {"description": "OK"}}
+            }
+        }
+    }
+}
+
+URL = "/v1/wallets/0xabc/transactions/"
+
+
+@pytest.fixture
+def validator():
+    return RequestValidator(parameter_rules(SPEC), OperationIndex(SPEC), BASE_URL, max_url_length=200)
+
+
+class TestParameterRules:
+    """Tests for compiling rules from the spec."""
+
+    def test_refs_and_deep_objects_resolved(self):
+        """Test that $ref parameters and item schemas are resolved and deepObjects expanded."""
+        rules = {rule["name"]: rule for rule in parameter_rules(SPEC)["listWalletTransactions"]}
+
+        assert rules["currency"]["enum"] == ["usd", "eur"]
+        assert rules["page[size]"] == {
+            "name": "page[size]", "in": "query", "required": False, "type": "integer", "minimum": 1, "maximum": 100
+        }
+        assert rules["filter[operation_types]"]["items"]["enum"] == ["trade", "send", "receive"]
+        assert "address" not in rules
+
+
+class TestRequestValidator:
+    """Tests for validating requests."""
+
+    def test_valid_request(self, validator):
+        """Test that valid values, as FastMCP serializes them, pass."""
+        operation_id = validator.validate(
+            "GET", URL,
+            {"currency": "usd", "page[size]": "50", "filter[operation_types]": "trade,send"},
+            {"x-env": "testnet"}
+        )
+
+        assert operation_id == "listWalletTransactions"
+
+    @pytest.mark.parametrize("params, field", [
+        ({"currency": "usdt"}, "currency"),
+        ({"page[size]": "500"}, "page[size]"),
+        ({"page[size]": "ten"}, "page[size]"),
+        ({"filter[operation_types]": "trade,swap"}, "filter[operation_types]"),
+        ({"filter[operation_types]": "trade,send,receive"}, "filter[operation_types]"),
+        ({"filter[search_query]": "a"}, "filter[search_query]")
+    ])
+    def test_invalid_parameters(self, validator, params, field):
+        """Test that enum, bounds, type, item count and length violations are rejected."""
+        with pytest.raises(ValidationError) as exc_info:
+            validator.validate("GET", URL, params)
+
+        assert exc_info.value.field == field
+
+    def test_invalid_header(self, validator):
+        """Test that header values are checked case-insensitively by name."""
+        with pytest.raises(ValidationError, match="X-Env"):
+            validator.validate("GET", URL, {}, {"X-Env": "mainnet"})
+
+    def test_url_too_long(self, validator):
+        """Test that URLs over the limit are rejected."""
+        with pytest.raises(ValidationError, match="character limit"):
+            validator.validate("GET", "/v1/unknown/", {"filter[chain_ids]": ",".join(["ethereum"] * 30)})
+
+    def test_unknown_operation_passes(self, validator):
+        """Test that requests outside the spec are not checked."""
+        assert validator.validate("GET", "/v1/other/", {"anything": "goes"}) is None
+
+
+@pytest.mark.asyncio
+class TestValidatingToolClient:
+    """Tests for rejecting tool calls before the upstream request."""
+
+    @respx.mock
+    async def test_invalid_call_not_sent(self):
+        """Test that a call over the URL limit fails without an upstream request.
+
+        MCP already checks arguments against the tool's input schema; the URL
+        length can only be checked on the final request.
+        """
+        route = respx.get(f"{BASE_URL}{URL}").mock(return_value=httpx.Response(200, json={"data": []}))
+        validator = RequestValidator(parameter_rules(SPEC), OperationIndex(SPEC), BASE_URL, max_url_length=80)
+        mcp = FastMCP.from_openapi(
+            openapi_spec=SPEC,
+            client=ValidatingToolClient(RetryAsyncClient(base_url=BASE_URL), validator),
+            route_maps=[RouteMap(mcp_type=MCPType.TOOL)],
+            mcp_component_fn=drop_output_schema
+        )
+
+        async with Client(mcp) as client:
+            await client.call_tool("listWalletTransactions", {"address": "0xabc", "currency": "eur"})
+            with pytest.raises(ToolError, match="character limit"):
+                await client.call_tool(
+                    "listWalletTransactions",
+                    {"address": "0xabc", "currency": "eur", "filter[operation_types]": ["trade", "receive"]}
+                )
+
+        assert route.call_count == 1
+
+    @respx.mock
+    async def test_direct_requests_validated(self, validator):
+        """Test that requests built by the server's own tools are checked too."""
+        route = respx.get(f"{BASE_URL}{URL}").mock(return_value=httpx.Response(200, json={"data": []}))
+        client = ValidatingToolClient(RetryAsyncClient(base_url=BASE_URL), validator)
+
+        with pytest.raises(ValidationError, match="page\\[size\\]"):
+            await client.request("GET", URL, params={"page[size]": 500})
+
+        assert route.call_count == 0
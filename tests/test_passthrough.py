@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Tests for raw JSON passthrough."""
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+from fastmcp.server.openapi import RouteMap, MCPType
+
+from zerion_mcp_server.operations import OperationIndex
+from zerion_mcp_server.passthrough import PassthroughResponse, PassthroughToolClient
+from zerion_mcp_server.retry_client import RetryAsyncClient
+from zerion_mcp_server.tool_schemas import drop_output_schema
+
+BASE_URL = "https://api.test.com"
+BODY = b'{"links": {}, "data": [{"id": "1", "attributes": {"value": 1.50}}]}'
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Test", "version": "1"},
+    "paths": {
+        "/v1/raw/": {"get": {"operationId": "getRaw", "responses": {"200": {"description": "OK"}}}},
+        "/v1/decoded/": {"get": {"operationId": "getDecoded", "responses": {"200": {"description": "OK"}}}}
+    }
+}
+
+
+@pytest.fixture
+def mcp():
+    """MCP server with getRaw passed through."""
+    client = RetryAsyncClient(base_url=BASE_URL, operations=OperationIndex(SPEC))
+    return FastMCP.from_openapi(
+        openapi_spec=SPEC,
+        client=PassthroughToolClient(client, client, ["getRaw"]),
+        route_maps=[RouteMap(mcp_type=MCPType.TOOL)],
+        mcp_component_fn=drop_output_schema
+    )
+
+
+def json_response(status: int = 200) -> httpx.Response:
+    return httpx.Response(status, content=BODY, headers={"content-type": "application/json"})
+
+
+@pytest.mark.asyncio
+class TestPassthrough:
+    """Tests for PassthroughToolClient."""
+
+    @respx.mock
+    async def test_body_returned_verbatim(self, mcp):
+        """Test that the upstream text is the tool result, byte for byte."""
+        respx.get(f"{BASE_URL}/v1/raw/").mock(return_value=json_response())
+
+        async with Client(mcp) as client:
+            result = await client.call_tool("getRaw", {})
+
+        assert result.content[0].text == BODY.decode()
+        assert result.structured_content is None
+
+    @respx.mock
+    async def test_other_operations_decoded(self, mcp):
+        """Test that operations not opted in keep structured output."""
+        respx.get(f"{BASE_URL}/v1/decoded/").mock(return_value=json_response())
+
+        async with Client(mcp) as client:
+            result = await client.call_tool("getDecoded", {})
+
+        assert result.structured_content["data"][0]["attributes"]["value"] == 1.5
+
+    @respx.mock
+    async def test_errors_not_passed_through(self, mcp):
+        """Test that error responses still raise tool errors."""
+        respx.get(f"{BASE_URL}/v1/raw/").mock(return_value=json_response(404))
+
+        async with Client(mcp) as client:
+            with pytest.raises(ToolError, match="404"):
+                await client.call_tool("getRaw", {})
+
+    @respx.mock
+    async def test_non_json_not_passed_through(self):
+        """Test that only JSON content types are wrapped."""
+        respx.get(f"{BASE_URL}/v1/raw/").mock(return_value=httpx.Response(200, text="ok"))
+        client = RetryAsyncClient(base_url=BASE_URL, operations=OperationIndex(SPEC))
+
+        response = await PassthroughToolClient(client, client, ["getRaw"]).request("GET", "/v1/raw/")
+
+        assert not isinstance(response, PassthroughResponse)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Tests for multi-wallet portfolio aggregation."""
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+
+from zerion_mcp_server.portfolio import aggregate_positions, portfolio_tool
+from zerion_mcp_server.retry_client import RetryAsyncClient
+
+BASE_URL = "https://api.test.com"
+
+
+def position(fungible, symbol, chain, value, quantity=1.0, dapp=None, position_type="wallet", displayable=True):
+    relationships = {
+        "chain": {"data": {"type": "chains", "id": chain}},
+        "fungible": {"data": {"type": "fungibles", "id": fungible}}
+    }
+    attributes = {
+        "position_type": position_type,
+        "value": value,
+        "quantity": {"float": quantity},
+        "fungible_info": {"symbol": symbol},
+        "flags": {"displayable": displayable}
+    }
+    if dapp:
+        relationships["dapp"] = {"data": {"type": "dapps", "id": dapp}}
+        attributes["application_metadata"] = {"name": dapp.title()}
+    return {"type": "positions", "id": f"{fungible}-{chain}-{dapp}-{position_type}", "attributes": attributes,
+            "relationships": relationships}
+
+
+WALLETS = {
+    "0xa": [
+        position("eth", "ETH", "ethereum", 600.0, 0.2),
+        position("usdc", "USDC", "base", 100.0, 100.0),
+        position("eth", "ETH", "ethereum", 300.0, 0.1, dapp="aave-v3", position_type="deposit"),
+        position("usdc", "USDC", "ethereum", 50.0, 50.0, dapp="aave-v3", position_type="loan")
+    ],
+    "0xb": [
+        position("eth", "ETH", "ethereum", 1000.0, 0.33),
+        position("spam", "SPAM", "base", 999.0, displayable=False)
+    ]
+}
+
+
+class TestAggregatePositions:
+    """Tests for the single-pass merge."""
+
+    def test_totals_and_debt(self):
+        """Test that loans are debt and hidden positions are skipped."""
+        summary = aggregate_positions(WALLETS)
+
+        assert summary["totals"] == {"value": 1950.0, "assets": 2000.0, "debt": 50.0}
+        assert summary["positions"] == 5
+        assert summary["by_wallet"]["0xb"] == {"value": 1000.0, "share_pct": 50.0}
+
+    def test_merged_by_fungible_across_wallets(self):
+        """Test that the same fungible in several wallets becomes one entry."""
+        eth = aggregate_positions(WALLETS)["by_fungible"][0]
+
+        assert eth["fungible_id"] == "eth"
+        assert eth["value"] == 1900.0
+        assert eth["share_pct"] == 95.0
+        assert eth["wallets"] == 2
+        assert eth["quantity"] == pytest.approx(0.63)
+
+    def test_protocol_exposure(self):
+        """Test protocol breakdown with debt, chains and position types."""
+        protocols = {p["protocol"]: p for p in aggregate_positions(WALLETS)["by_protocol"]}
+
+        aave = protocols["aave-v3"]
+        assert (aave["name"], aave["value"], aave["debt"], aave["share_pct"]) == ("Aave-V3", 250.0, 50.0, 15.0)
+        assert aave["position_types"] == {"deposit": 300.0, "loan": 50.0}
+        assert protocols["wallet"]["chains"] == ["base", "ethereum"]
+
+    def test_top_limits_entries(self):
+        """Test that breakdowns are cut to top and concentration reported."""
+        summary = aggregate_positions(WALLETS, top=1)
+
+        assert len(summary["top_holdings"]) == 1
+        assert summary["top_holdings"][0]["protocol"] == "wallet"
+        assert summary["concentration"]["top_fungible_pct"] == 95.0
+
+
+@pytest.mark.asyncio
+class TestPortfolioTool:
+    """Tests for the aggregateWalletPortfolios tool."""
+
+    @respx.mock
+    async def test_wallets_fetched_and_merged(self):
+        """Test that each wallet is fetched once with the filters and merged."""
+        routes = {
+            address: respx.get(f"{BASE_URL}/v1/wallets/{address}/positions/").mock(
+                return_value=httpx.Response(200, json={"data": positions, "links": {}})
+            )
+            for address, positions in WALLETS.items()
+        }
+        mcp = FastMCP("test")
+        mcp.add_tool(portfolio_tool(RetryAsyncClient(base_url=BASE_URL)))
+
+        async with Client(mcp) as client:
+            result = await client.call_tool(
+                "aggregateWalletPortfolios", {"addresses": ["0xa", "0xb", "0xa"], "chain_ids": ["ethereum", "base"]}
+            )
+
+        assert result.structured_content["totals"]["value"] == 1950.0
+        assert routes["0xa"].call_count == 1
+        params = routes["0xb"].calls[0].request.url.params
+        assert params["filter[chain_ids]"] == "ethereum,base"
+        assert params["filter[positions]"] == "no_filter"
+
+    @respx.mock
+    async def test_failed_wallet_reported(self):
+        """Test that one failing wallet does not fail the whole call."""
+        respx.get(f"{BASE_URL}/v1/wallets/0xa/positions/").mock(
+            return_value=httpx.Response(200, json={"data": WALLETS["0xa"]})
+        )
+        respx.get(f"{BASE_URL}/v1/wallets/0xbad/positions/").mock(return_value=httpx.Response(400, json={}))
+        mcp = FastMCP("test")
+        mcp.add_tool(portfolio_tool(RetryAsyncClient(base_url=BASE_URL)))
+
+        async with Client(mcp) as client:
+            result = await client.call_tool("aggregateWalletPortfolios", {"addresses": ["0xa", "0xbad"]})
+
+        assert result.structured_content["wallets"] == 1
+        assert "0xbad" in result.structured_content["failed_wallets"]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Tests for position snapshot diffing."""
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+
+from zerion_mcp_server.position_diff import SnapshotStore, diff_snapshots, diff_tool, snapshot_positions
+from zerion_mcp_server.retry_client import RetryAsyncClient
+
+BASE_URL = "https://api.test.com"
+
+
+def position(id_, quantity, value, symbol="ETH", chain="ethereum"):
+    return {
+        "type": "positions",
+        "id": id_,
+        "attributes": {
+            "position_type": "wallet",
+            "quantity": {"float": quantity},
+            "value": value,
+            "fungible_info": {"symbol": symbol}
+        },
+        "relationships": {"chain": {"data": {"type": "chains", "id": chain}}}
+    }
+
+
+BEFORE = [position("eth", 1.0, 3000.0), position("usdc", 500.0, 500.0, "USDC"), position("arb", 10.0, 8.0, "ARB")]
+AFTER = [position("eth", 1.0, 3100.0), position("usdc", 400.0, 400.0, "USDC"), position("op", 5.0, 9.0, "OP")]
+
+
+class TestDiffSnapshots:
+    """Tests for comparing snapshots by position id."""
+
+    def test_added_removed_changed(self):
+        """Test that only quantity changes count as changed by default."""
+        diff = diff_snapshots(snapshot_positions(BEFORE, 0), snapshot_positions(AFTER, 60))
+
+        assert diff["counts"] == {"added": 1, "removed": 1, "changed": 1, "unchanged": 1}
+        assert diff["added"][0]["id"] == "op"
+        assert diff["removed"][0]["id"] == "arb"
+        assert diff["changed"][0]["quantity_change"] == -100.0
+        assert diff["changed"][0]["value_change"] == -100.0
+        assert diff["total_value_change"] == 1.0
+
+    def test_value_changes_with_threshold(self):
+        """Test that price-only moves are reported above min_value_change."""
+        diff = diff_snapshots(snapshot_positions(BEFORE, 0), snapshot_positions(AFTER, 60), min_value_change=50)
+
+        assert [c["id"] for c in diff["changed"]] == ["eth", "usdc"]
+
+    def test_store_keeps_last_per_key(self):
+        """Test that swap returns the replaced snapshot and evicts beyond the limit."""
+        store = SnapshotStore(max_snapshots=1)
+        first = snapshot_positions(BEFORE)
+
+        assert store.swap("a", first) is None
+        assert store.swap("a", snapshot_positions(AFTER)) is first
+        store.swap("b", first)
+        assert store.swap("a", first) is None
+
+
+@pytest.mark.asyncio
+class TestDiffTool:
+    """Tests for the diffWalletPositions tool."""
+
+    @respx.mock
+    async def test_baseline_then_diff(self):
+        """Test that the first call records a baseline and the second returns changes."""
+        route = respx.get(url__regex=r"/v1/wallets/0x(abc|ABC)/positions/").mock(side_effect=[
+            httpx.Response(200, json={"data": BEFORE}),
+            httpx.Response(200, json={"data": AFTER}),
+            httpx.Response(200, json={"data": AFTER})
+        ])
+        mcp = FastMCP("test")
+        mcp.add_tool(diff_tool(RetryAsyncClient(base_url=BASE_URL), SnapshotStore()))
+
+        async with Client(mcp) as client:
+            baseline = await client.call_tool("diffWalletPositions", {"address": "0xabc"})
+            diff = await client.call_tool("diffWalletPositions", {"address": "0xABC"})
+            other = await client.call_tool("diffWalletPositions", {"address": "0xabc", "chain_ids": ["base"]})
+
+        assert baseline.structured_content["baseline"] is True
+        assert baseline.structured_content["positions"] == 3
+        assert diff.structured_content["counts"]["added"] == 1
+        assert other.structured_content["baseline"] is True
+        assert route.calls[2].request.url.params["filter[chain_ids]"] == "base"
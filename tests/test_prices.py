@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Tests for the batch fungible price tool and its cache."""
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+from fastmcp.exceptions import ToolError
+
+from zerion_mcp_server.filter_split import SplittingToolClient
+from zerion_mcp_server.operations import OperationIndex
+from zerion_mcp_server.param_validation import RequestValidator, parameter_rules
+from zerion_mcp_server.prices import FUNGIBLES_URL, PRICES_TOOL, PriceCache, fungible_prices, prices_tool
+from zerion_mcp_server.retry_client import RetryAsyncClient
+
+BASE_URL = "https://api.test.com"
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Test", "version": "1"},
+    "paths": {
+        "/v1/fungibles/": {
+            "get": {
+                "operationId": "listFungibles",
+                "parameters": [
+                    {"name": "currency", "in": "query", "schema": {"type": "string"}},
+                    {
+                        "name": "filter[fungible_ids]", "in": "query", "style": "form", "explode": False,
+                        "schema": {"type": "array", "maxItems": 50, "items": {"type": "string"}}
+                    },
+                    {"name": "page[size]", "in": "query", "schema": {"type": "integer", "maximum": 100}}
+                ],
+                "responses": {"200": {"description": "OK"}}
+            }
+        }
+    }
+}
+
+
+def fungible(fungible_id, price):
+    return {"type": "fungibles", "id": fungible_id, "attributes": {"market_data": {"price": price}}}
+
+
+def serve_prices(request):
+    """Price each requested fungible by its number; ids starting with 'unknown' are not returned."""
+    ids = request.url.params["filter[fungible_ids]"].split(",")
+    return httpx.Response(200, json={"data": [
+        fungible(i, float(i.rsplit("-", 1)[-1])) for i in ids if not i.startswith("unknown")
+    ], "links": {}})
+
+
+def price_server(max_url_length=2000, ttl=60):
+    validator = RequestValidator(parameter_rules(SPEC), OperationIndex(SPEC), BASE_URL, max_url_length)
+    client = SplittingToolClient(RetryAsyncClient(base_url=BASE_URL), validator, max_requests=200)
+    mcp = FastMCP("test")
+    mcp.add_tool(prices_tool(client, PriceCache(ttl=ttl)))
+    return mcp
+
+
+class TestPriceCache:
+    """Tests for PriceCache."""
+
+    def test_lookup_splits_hits_and_misses(self):
+        """Test that fresh prices are served per currency and the rest reported as misses."""
+        cache = PriceCache(ttl=60)
+        cache.store("usd", {"eth": 2000.0, "dai": None})
+
+        assert cache.lookup("usd", ["eth", "dai", "btc"]) == ({"eth": 2000.0, "dai": None}, ["btc"])
+        assert cache.lookup("eur", ["eth"]) == ({}, ["eth"])
+
+    def test_expiry_and_eviction(self):
+        """Test that expired prices are misses and the least recently used are dropped."""
+        assert PriceCache(ttl=0).lookup("usd", ["eth"]) == ({}, ["eth"])
+
+        cache = PriceCache(ttl=60, max_entries=2)
+        cache.store("usd", {"a": 1.0, "b": 2.0})
+        cache.lookup("usd", ["a"])
+        cache.store("usd", {"c": 3.0})
+
+        assert cache.lookup("usd", ["a", "b", "c"]) == ({"a": 1.0, "c": 3.0}, ["b"])
+
+    def test_fungible_prices(self):
+        """Test that prices are read from market_data."""
+        document = {"data": [fungible("eth", "2000.5"), {"id": "new", "attributes": {}}]}
+
+        assert fungible_prices(document) == {"eth": 2000.5, "new": None}
+
+
+class TestPricesTool:
+    """Tests for the getFungiblePrices tool."""
+
+    @respx.mock
+    async def test_misses_split_and_cached(self):
+        """Test that misses are fetched in concurrent chunks and served from the cache afterwards."""
+        route = respx.get(f"{BASE_URL}{FUNGIBLES_URL}").mock(side_effect=serve_prices)
+        ids = [f"token-{n}" for n in range(120)]
+
+        async with Client(price_server()) as client:
+            first = await client.call_tool(PRICES_TOOL, {"fungible_ids": ids})
+            second = await client.call_tool(PRICES_TOOL, {"fungible_ids": ids[:10] + ["token-500"]})
+
+        assert route.call_count == 4
+        assert all(len(call.request.url.params["filter[fungible_ids]"].split(",")) <= 50 for call in route.calls[:3])
+        assert route.calls[3].request.url.params["filter[fungible_ids]"] == "token-500"
+        assert first.structured_content["prices"] == {i: float(n) for n, i in enumerate(ids)}
+        assert second.structured_content["prices"]["token-500"] == 500.0
+
+    @respx.mock
+    async def test_split_by_url_length(self):
+        """Test that long ids are split to stay within the URL limit."""
+        route = respx.get(f"{BASE_URL}{FUNGIBLES_URL}").mock(side_effect=serve_prices)
+        ids = [f"{'x' * 80}-{n}" for n in range(10)]
+
+        async with Client(price_server(max_url_length=500)) as client:
+            result = await client.call_tool(PRICES_TOOL, {"fungible_ids": ids})
+
+        assert route.call_count > 1
+        assert all(len(str(call.request.url)) <= 500 for call in route.calls)
+        assert len(result.structured_content["prices"]) == 10
+
+    @respx.mock
+    async def test_missing_ids_reported(self):
+        """Test that ids Zerion does not return are listed and asked for again next time."""
+        route = respx.get(f"{BASE_URL}{FUNGIBLES_URL}").mock(side_effect=serve_prices)
+
+        async with Client(price_server()) as client:
+            await client.call_tool(PRICES_TOOL, {"fungible_ids": ["token-1", "unknown-2"]})
+            result = await client.call_tool(PRICES_TOOL, {"fungible_ids": ["token-1", "unknown-2"]})
+
+        assert route.call_count == 2
+        assert route.calls[1].request.url.params["filter[fungible_ids]"] == "unknown-2"
+        assert result.structured_content == {"currency": "usd", "prices": {"token-1": 1.0}, "missing": ["unknown-2"]}
+
+    @respx.mock
+    async def test_upstream_error(self):
+        """Test that a failed lookup is reported as a tool error."""
+        respx.get(f"{BASE_URL}{FUNGIBLES_URL}").mock(return_value=httpx.Response(400, json={"errors": []}))
+
+        async with Client(price_server()) as client:
+            with pytest.raises(ToolError):
+                await client.call_tool(PRICES_TOOL, {"fungible_ids": ["token-1"]})
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Tests for daily quota accounting."""
+
+import asyncio
+
+import pytest
+import httpx
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from zerion_mcp_server.errors import QuotaExceededError
+from zerion_mcp_server.operations import OperationIndex
+from zerion_mcp_server.priority import Priority, request_priority
+from zerion_mcp_server.quota import QuotaLedger
+from zerion_mcp_server.retry_client import RetryAsyncClient
+
+
+@pytest.fixture
+def ledger_path(tmp_path):
+    """Path for a temporary quota ledger."""
+    return str(tmp_path / "quota.sqlite3")
+
+
+class TestQuotaLedger:
+    """Tests for QuotaLedger."""
+
+    def test_counts_per_key_and_operation(self, ledger_path):
+        """Test counting calls per key and operationId."""
+        ledger = QuotaLedger(ledger_path)
+        ledger.record("key-1", "listChains")
+        ledger.record("key-1", "listChains")
+        ledger.record("key-2", "getWalletPortfolio")
+        ledger.record("key-2", None)
+
+        assert ledger.used("key-1") == 2
+        assert ledger.usage() == {
+            "key-1": {"listChains": 2},
+            "key-2": {"getWalletPortfolio": 1, "unknown": 1}
+        }
+        ledger.close()
+
+    def test_survives_restart(self, ledger_path):
+        """Test that counts persist across ledger instances."""
+        ledger = QuotaLedger(ledger_path)
+        for _ in range(3):
+            ledger.record("key-1", "listChains")
+        ledger.close()
+
+        reopened = QuotaLedger(ledger_path)
+        assert reopened.used("key-1") == 3
+        reopened.close()
+
+    async def test_flushed_by_timer(self, ledger_path):
+        """Test that buffered calls are written after flush_interval without another call."""
+        ledger = QuotaLedger(ledger_path, flush_interval=0.05)
+        ledger.record("key-1", "listChains")
+        before = QuotaLedger(ledger_path)
+        await asyncio.sleep(0.1)
+        after = QuotaLedger(ledger_path)
+
+        assert before.used("key-1") == 0
+        assert after.used("key-1") == 1
+        for opened in (before, after, ledger):
+            opened.close()
+
+    def test_soft_budget_refuses_background_first(self, ledger_path):
+        """Test that background requests are refused at the soft budget."""
+        ledger = QuotaLedger(ledger_path, soft_limit=2, hard_limit=3)
+        ledger.record("key-1", "listChains")
+        ledger.record("key-1", "listChains")
+
+        assert not ledger.allows("key-1", Priority.BACKGROUND)
+        assert ledger.allows("key-1", Priority.INTERACTIVE)
+
+        ledger.record("key-1", "listChains")
+        assert not ledger.allows("key-1", Priority.INTERACTIVE)
+
+        error = ledger.exceeded_error("key-1", Priority.INTERACTIVE)
+        assert error.used == 3
+        assert error.limit == 3
+        assert "hard" in str(error)
+        ledger.close()
+
+    def test_unlimited_by_default(self, ledger_path):
+        """Test that budgets are disabled unless configured."""
+        ledger = QuotaLedger(ledger_path)
+        for _ in range(100):
+            ledger.record("key-1", None)
+
+        assert ledger.allows("key-1", Priority.BACKGROUND)
+        ledger.close()
+
+
+@pytest.mark.asyncio
+class TestQuotaEnforcement:
+    """Tests for quota enforcement in RetryAsyncClient."""
+
+    async def test_refused_before_upstream_call(self, ledger_path):
+        """Test that over-budget requests never reach the API."""
+        ledger = QuotaLedger(ledger_path, soft_limit=1, hard_limit=2)
+        spec = {"paths": {"/v1/chains/": {"get": {"operationId": "listChains"}}}}
+        client = RetryAsyncClient(
+            base_url="https://api.test.com",
+            quota=ledger,
+            operations=OperationIndex(spec)
+        )
+
+        with patch.object(httpx.AsyncClient, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = MagicMock(status_code=200)
+
+            await client.request("GET", "/v1/chains/")
+
+            with request_priority(Priority.BACKGROUND):
+                with pytest.raises(QuotaExceededError):
+                    await client.request("GET", "/v1/chains/")
+
+            await client.request("GET", "/v1/chains/")
+
+            with pytest.raises(QuotaExceededError):
+                await client.request("GET", "/v1/chains/")
+
+            assert mock_request.call_count == 2
+
+        assert ledger.usage() == {"default": {"listChains": 2}}
+        await client.aclose()
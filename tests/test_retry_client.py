@@ -6,6 +6,7 @@ import httpx
 from unittest.mock import AsyncMock, MagicMock, patch
 import asyncio
 
+from zerion_mcp_server.key_pool import ApiKeyPool
 from zerion_mcp_server.retry_client import RetryAsyncClient
 from zerion_mcp_server.errors import RateLimitError, WalletIndexingError
 
@@ -94,6 +95,49 @@ class TestRetryClient:
             # Initial request + 2 retries = 3 total
             assert mock_request.call_count == 3
 
+    async def test_202_concurrent_requests_share_poller(self, retry_client):
+        """Test that concurrent requests for one address share a single poller."""
+        calls = {"count": 0}
+
+        async def upstream(*args, **kwargs):
+            calls["count"] += 1
+            # 5 initial requests + first poll are still indexing
+            if calls["count"] <= 6:
+                return MagicMock(status_code=202)
+            return MagicMock(status_code=200, text='{"data": []}')
+
+        with patch.object(httpx.AsyncClient, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = upstream
+
+            results = await asyncio.gather(*[
+                retry_client.request("GET", f"/v1/wallets/0xabc/{endpoint}")
+                for endpoint in ("portfolio", "positions/", "transactions/", "pnl/", "nft-portfolio")
+            ])
+
+            assert all(r.status_code == 200 for r in results)
+            # 5 initial + 2 polls by the single poller + 4 waiter re-issues
+            assert mock_request.call_count == 11
+            assert retry_client.indexing_tracker.recently_indexed("0xabc")
+
+    async def test_202_recently_indexed_retries_immediately(self, retry_client):
+        """Test that a stale 202 for a recently indexed address skips polling."""
+        retry_client.indexing_tracker.start_polling("0xabc")
+        retry_client.indexing_tracker.finish_polling("0xabc", indexed=True)
+
+        mock_responses = [
+            MagicMock(status_code=202),
+            MagicMock(status_code=200, text='{"data": []}')
+        ]
+
+        with patch.object(httpx.AsyncClient, 'request', new_callable=AsyncMock) as mock_request, \
+                patch("zerion_mcp_server.retry_client.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            mock_request.side_effect = mock_responses
+
+            response = await retry_client.request("GET", "/v1/wallets/0xabc/portfolio")
+
+            assert response.status_code == 200
+            mock_sleep.assert_not_awaited()
+
     async def test_202_auto_retry_disabled(self):
         """Test 202 with auto_retry disabled."""
         client = RetryAsyncClient(
@@ -154,6 +198,77 @@ class TestRetryClient:
             with pytest.raises(RateLimitError):
                 await retry_client.request("GET", "/test")
 
+    async def test_429_no_extra_upstream_call(self, retry_client):
+        """Test that a single 429 costs exactly one retry, not an extra probe."""
+        mock_responses = [
+            MagicMock(status_code=429, headers={"retry-after": "0"}),
+            MagicMock(status_code=200, text='{"data": []}')
+        ]
+
+        with patch.object(httpx.AsyncClient, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = mock_responses
+
+            response = await retry_client.request("GET", "/test")
+
+            assert response.status_code == 200
+            assert mock_request.call_count == 2  # Initial + 1 retry
+
+    async def test_429_exhausted_call_count(self, retry_client):
+        """Test that exhausting retries costs initial request + max_attempts."""
+        mock_response = MagicMock(status_code=429, headers={"retry-after": "0"})
+
+        with patch.object(httpx.AsyncClient, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.return_value = mock_response
+
+            with pytest.raises(RateLimitError) as exc_info:
+                await retry_client.request("GET", "/test")
+
+            assert exc_info.value.attempts == 3  # max_attempts
+            assert mock_request.call_count == 4
+
+    async def test_429_first_wait_uses_original_retry_after(self, retry_client):
+        """Test that the original response's Retry-After drives the first wait."""
+        mock_responses = [
+            MagicMock(status_code=429, headers={"retry-after": "1"}),
+            MagicMock(status_code=200, text='{"data": []}')
+        ]
+
+        with patch.object(httpx.AsyncClient, 'request', new_callable=AsyncMock) as mock_request, \
+                patch("zerion_mcp_server.retry_client.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            mock_request.side_effect = mock_responses
+
+            await retry_client.request("GET", "/test")
+
+            mock_sleep.assert_awaited_once_with(1)
+
+    async def test_429_rotates_to_next_pooled_key(self, retry_config, indexing_config):
+        """Test that a 429 moves to another pooled key without waiting."""
+        pool = ApiKeyPool([{"key": "Bearer a"}, {"key": "Bearer b"}])
+        client = RetryAsyncClient(
+            base_url="https://api.test.com",
+            retry_config=retry_config,
+            indexing_config=indexing_config,
+            key_pool=pool
+        )
+
+        mock_responses = [
+            MagicMock(status_code=429, headers={"retry-after": "60"}),
+            MagicMock(status_code=200, text='{"data": []}', headers={})
+        ]
+
+        with patch.object(httpx.AsyncClient, 'request', new_callable=AsyncMock) as mock_request, \
+                patch("zerion_mcp_server.retry_client.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+            mock_request.side_effect = mock_responses
+
+            response = await client.request("GET", "/test")
+
+            assert response.status_code == 200
+            used = [c.kwargs["headers"]["Authorization"] for c in mock_request.call_args_list]
+            assert used[0] != used[1]
+            mock_sleep.assert_awaited_once_with(0.0)
+
+        await client.aclose()
+
     async def test_other_errors_not_retried(self, retry_client):
         """Test that other HTTP errors (404, 500) are not retried."""
         mock_response = MagicMock(status_code=404)
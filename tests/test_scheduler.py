@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Tests for the priority scheduler."""
+
+import asyncio
+import pytest
+import httpx
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from zerion_mcp_server.key_pool import ApiKeyPool
+from zerion_mcp_server.priority import Priority, request_priority
+from zerion_mcp_server.retry_client import RetryAsyncClient
+from zerion_mcp_server.scheduler import PriorityScheduler
+
+
+async def _record(scheduler, priority, order, name):
+    """Acquire a slot, record admission order and hold briefly."""
+    async with scheduler.slot(priority):
+        order.append(name)
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+class TestPriorityScheduler:
+    """Tests for PriorityScheduler."""
+
+    async def test_higher_priority_admitted_first(self):
+        """Test that queued interactive requests overtake background ones."""
+        scheduler = PriorityScheduler(max_concurrency=1, aging_interval=60)
+        order = []
+
+        await scheduler.acquire(Priority.BACKGROUND)
+        tasks = [
+            asyncio.create_task(_record(scheduler, Priority.BACKGROUND, order, "bg-1")),
+            asyncio.create_task(_record(scheduler, Priority.BACKGROUND, order, "bg-2")),
+            asyncio.create_task(_record(scheduler, Priority.INTERACTIVE, order, "interactive")),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.waiting == 3
+
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["interactive", "bg-1", "bg-2"]
+
+    async def test_aging_promotes_waiters(self):
+        """Test that long-waiting background requests are not starved."""
+        scheduler = PriorityScheduler(max_concurrency=1, aging_interval=0.01)
+        order = []
+
+        await scheduler.acquire(Priority.INTERACTIVE)
+        background = asyncio.create_task(_record(scheduler, Priority.BACKGROUND, order, "bg"))
+        await asyncio.sleep(0.05)  # bg ages past interactive level
+        interactive = asyncio.create_task(_record(scheduler, Priority.INTERACTIVE, order, "interactive"))
+        await asyncio.sleep(0)
+
+        scheduler.release()
+        await asyncio.gather(background, interactive)
+
+        assert order == ["bg", "interactive"]
+
+    async def test_cancelled_waiter_is_skipped(self):
+        """Test that cancelling a queued request frees its place."""
+        scheduler = PriorityScheduler(max_concurrency=1)
+        await scheduler.acquire(Priority.NORMAL)
+
+        waiter = asyncio.create_task(scheduler.acquire(Priority.NORMAL))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert scheduler.waiting == 0
+        scheduler.release()
+        await asyncio.wait_for(scheduler.acquire(Priority.NORMAL), timeout=1)
+
+
+@pytest.mark.asyncio
+class TestSchedulerWithClient:
+    """Tests for scheduling upstream requests in RetryAsyncClient."""
+
+    async def test_interactive_request_skips_backfill_queue(self):
+        """Test that an interactive call gets the next token during a backfill."""
+        client = RetryAsyncClient(
+            base_url="https://api.test.com",
+            key_pool=ApiKeyPool([{"key": "Bearer a", "rate_limit": 50, "burst": 1}]),
+            scheduler=PriorityScheduler(max_concurrency=1, aging_interval=60)
+        )
+        order = []
+
+        async def upstream(method, url, **kwargs):
+            order.append(str(url))
+            return MagicMock(status_code=200, headers={})
+
+        async def backfill(page):
+            with request_priority(Priority.BACKGROUND):
+                await client.request("GET", f"/v1/wallets/0xabc/transactions/?page={page}")
+
+        with patch.object(httpx.AsyncClient, 'request', new_callable=AsyncMock) as mock_request:
+            mock_request.side_effect = upstream
+
+            pages = [asyncio.create_task(backfill(i)) for i in range(5)]
+            await asyncio.sleep(0.01)
+            await client.request("GET", "/v1/wallets/0xabc/portfolio")
+            await asyncio.gather(*pages)
+
+        # Only requests admitted before the interactive call may precede it
+        assert order.index("/v1/wallets/0xabc/portfolio") <= 2
+        await client.aclose()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Tests for the cross-process rate limiter."""
+
+import asyncio
+import math
+import sqlite3
+import time
+
+import pytest
+
+from zerion_mcp_server.key_pool import ApiKeyPool
+from zerion_mcp_server.retry_client import RetryAsyncClient
+from zerion_mcp_server.shared_limiter import SharedRateLimiter
+
+
+class TestSharedRateLimiter:
+    """Tests for SharedRateLimiter."""
+
+    def test_instances_share_tokens(self, tmp_path):
+        """Test that two limiters on one file spend the same bucket."""
+        path = str(tmp_path / "limiter.sqlite3")
+        first, second = SharedRateLimiter(path), SharedRateLimiter(path)
+
+        assert first.take("key-1", 1, 2) == 0
+        assert second.take("key-1", 1, 2) == 0
+        # Bucket of 2 is empty for both processes now
+        assert first.take("key-1", 1, 2) > 0
+        assert second.headroom("key-1", 1, 2) < 1
+
+    def test_unlimited_key(self, tmp_path):
+        """Test that keys without a rate limit always have headroom."""
+        limiter = SharedRateLimiter(str(tmp_path / "limiter.sqlite3"))
+
+        assert all(limiter.take("key-1", None, 1) == 0 for _ in range(5))
+        assert limiter.headroom("key-1", None, 1) == math.inf
+
+    def test_cooldown_is_shared(self, tmp_path):
+        """Test that a 429 cooldown recorded by one process blocks the others."""
+        path = str(tmp_path / "limiter.sqlite3")
+        first, second = SharedRateLimiter(path), SharedRateLimiter(path)
+
+        first.cool_down("key-1", None, 1, 60)
+
+        assert second.headroom("key-1", None, 1) == 0
+        assert 59 < second.take("key-1", None, 1) <= 60
+
+
+@pytest.mark.asyncio
+class TestApiKeyPoolSharedLimiter:
+    """Tests for ApiKeyPool backed by a shared limiter."""
+
+    async def test_pools_share_budget(self, tmp_path):
+        """Test that two pools (workers) do not double a key's budget."""
+        path = str(tmp_path / "limiter.sqlite3")
+        keys = [{"key": "Bearer a", "name": "main", "rate_limit": 0.01, "burst": 2}]
+        first = ApiKeyPool(keys, limiter=SharedRateLimiter(path))
+        second = ApiKeyPool(keys, limiter=SharedRateLimiter(path))
+
+        await first.acquire()
+        await second.acquire()
+
+        assert not first.available()
+        assert not second.available()
+
+    async def test_rate_limit_cools_key_in_other_pools(self, tmp_path):
+        """Test that a 429 seen by one pool moves the other pool to a spare key."""
+        path = str(tmp_path / "limiter.sqlite3")
+        keys = [{"key": "Bearer a", "name": "main"}, {"key": "Bearer b", "name": "spare"}]
+        first = ApiKeyPool(keys, limiter=SharedRateLimiter(path))
+        second = ApiKeyPool(keys, limiter=SharedRateLimiter(path))
+
+        first.record(first.keys[0], 429, retry_after=60)
+
+        picked = {(await second.acquire()).name for _ in range(3)}
+        assert picked == {"spare"}
+
+    async def test_locked_limiter_retried_without_blocking(self, tmp_path):
+        """Test that a limiter locked by another worker is retried after an async sleep."""
+        path = str(tmp_path / "limiter.sqlite3")
+        pool = ApiKeyPool([{"key": "Bearer a", "name": "main"}], limiter=SharedRateLimiter(path, busy_timeout=0.01))
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        acquire = asyncio.create_task(pool.acquire())
+        await asyncio.sleep(0.1)
+        assert not acquire.done()
+        other.execute("COMMIT")
+
+        assert (await acquire).name == "main"
+        ticker.cancel()
+        # The event loop kept running while the database was locked
+        assert len(ticks) >= 5
+
+    async def test_client_close_closes_limiter(self, tmp_path):
+        """Test that closing the upstream client closes the shared limiter."""
+        limiter = SharedRateLimiter(str(tmp_path / "limiter.sqlite3"))
+        client = RetryAsyncClient(base_url="https://api.test.com", key_pool=ApiKeyPool(
+            [{"key": "Bearer a"}], limiter=limiter
+        ))
+
+        await client.aclose()
+
+        with pytest.raises(sqlite3.ProgrammingError):
+            limiter.headroom("key-1", None, 1)
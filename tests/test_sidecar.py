@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Tests for the per-host sidecar daemon and its client."""
+
+import asyncio
+import fcntl
+
+import httpx
+import pytest
+import uvicorn
+
+from zerion_mcp_server.errors import NetworkError, QuotaExceededError, RateLimitError, WalletIndexingError
+from zerion_mcp_server.priority import Priority, current_priority, request_priority
+from zerion_mcp_server.retry_client import RetryAsyncClient
+from zerion_mcp_server.sidecar import (
+    SidecarApp, SidecarClient, config_fingerprint, connect, daemon_fingerprint, error_from_payload,
+    error_payload, serve
+)
+from zerion_mcp_server.streaming import JsonArrayParser
+
+BASE_URL = "https://api.test.com"
+BODY = b'{"data": [{"id": "1"}, {"id": "2"}]}'
+
+
+class FailingClient:
+    """Upstream client stand-in that always raises."""
+
+    base_url = httpx.URL(BASE_URL)
+
+    def __init__(self, error):
+        self.error = error
+
+    async def request(self, *args, **kwargs):
+        raise self.error
+
+
+@pytest.fixture
+async def sidecar(tmp_path):
+    """Run a SidecarApp on a Unix socket; yields a function starting it with a client."""
+    servers = []
+
+    async def start(client, fingerprint=None):
+        path = tmp_path / "sidecar.sock"
+        server = uvicorn.Server(uvicorn.Config(
+            SidecarApp(client, fingerprint), uds=str(path), lifespan="off", log_level="warning"
+        ))
+        task = asyncio.create_task(server.serve())
+        servers.append((server, task))
+        while not server.started:
+            await asyncio.sleep(0.01)
+        return SidecarClient(str(path), base_url="http://sidecar")
+
+    yield start
+    for server, task in servers:
+        server.should_exit = True
+        await task
+
+
+def test_error_round_trip():
+    """Test that errors keep their type and attributes across the socket."""
+    rate_limit = error_from_payload(error_payload(RateLimitError("Rate limited", retry_after=7, attempts=3)))
+    assert isinstance(rate_limit, RateLimitError)
+    assert rate_limit.retry_after == 7
+    assert rate_limit.attempts == 3
+
+    quota = error_from_payload(error_payload(QuotaExceededError("Over budget", used=10, limit=10, priority="background")))
+    assert isinstance(quota, QuotaExceededError)
+    assert (quota.used, quota.limit, quota.priority) == (10, 10, "background")
+
+    assert isinstance(error_from_payload(error_payload(httpx.ConnectError("refused"))), NetworkError)
+
+
+@pytest.mark.asyncio
+class TestSidecar:
+    """Tests for requests through a running sidecar."""
+
+    async def test_request_forwarded_upstream(self, sidecar):
+        """Test that path, query and X-Env reach Zerion and the response comes back."""
+        seen = []
+
+        def upstream(request):
+            seen.append(request)
+            return httpx.Response(200, content=BODY, headers={"content-type": "application/json"})
+
+        client = await sidecar(RetryAsyncClient(base_url=BASE_URL, transport=httpx.MockTransport(upstream)))
+        async with client:
+            response = await client.get(
+                "/v1/wallets/0xabc/positions/",
+                params={"filter[chain_ids]": "base"},
+                headers={"X-Env": "testnet"}
+            )
+
+        assert response.json() == {"data": [{"id": "1"}, {"id": "2"}]}
+        assert str(seen[0].url) == f"{BASE_URL}/v1/wallets/0xabc/positions/?filter%5Bchain_ids%5D=base"
+        assert seen[0].headers["x-env"] == "testnet"
+
+    async def test_priority_forwarded(self, sidecar):
+        """Test that the caller's request priority applies in the daemon."""
+        priorities = []
+
+        def upstream(request):
+            priorities.append(current_priority())
+            return httpx.Response(200, json={})
+
+        client = await sidecar(RetryAsyncClient(base_url=BASE_URL, transport=httpx.MockTransport(upstream)))
+        async with client:
+            with request_priority(Priority.BACKGROUND):
+                await client.get("/v1/chains/")
+
+        assert priorities == [Priority.BACKGROUND]
+
+    async def test_errors_raised_in_caller(self, sidecar):
+        """Test that the daemon's client errors are raised by SidecarClient."""
+        client = await sidecar(FailingClient(WalletIndexingError("Still indexing", attempts=5)))
+        async with client:
+            with pytest.raises(WalletIndexingError) as exc_info:
+                await client.get("/v1/wallets/0xabc/portfolio/")
+
+        assert exc_info.value.attempts == 5
+
+    async def test_stream_json(self, sidecar):
+        """Test that stream_json parses the body coming through the sidecar."""
+        upstream = httpx.MockTransport(
+            lambda request: httpx.Response(200, content=BODY, headers={"content-type": "application/json"})
+        )
+        client = await sidecar(RetryAsyncClient(base_url=BASE_URL, transport=upstream))
+        items = []
+
+        async def on_item(item):
+            items.append(item)
+
+        async with client:
+            parser = JsonArrayParser()
+            await client.stream_json("GET", "/v1/wallets/0xabc/transactions/", parser, on_item=on_item)
+
+        assert parser.document == {"data": [{"id": "1"}, {"id": "2"}]}
+        assert items == [{"id": "1"}, {"id": "2"}]
+
+    async def test_stream_json_error(self, sidecar):
+        """Test that stream_json raises the daemon's error as well."""
+        client = await sidecar(FailingClient(RateLimitError("Rate limited", retry_after=2)))
+        async with client:
+            with pytest.raises(RateLimitError):
+                await client.stream_json("GET", "/v1/chains/", JsonArrayParser())
+
+    async def test_connect_checks_fingerprint(self, sidecar, tmp_path):
+        """Test that connect() only uses a daemon serving the same configuration."""
+        await sidecar(FailingClient(NetworkError("unused")), fingerprint="abc")
+        config = {"socket_path": str(tmp_path / "sidecar.sock"), "autostart": False, "startup_timeout": 1}
+
+        assert await asyncio.to_thread(daemon_fingerprint, config["socket_path"]) == "abc"
+        client = await asyncio.to_thread(connect, config, BASE_URL, "abc")
+        assert isinstance(client, SidecarClient)
+        await client.aclose()
+        assert await asyncio.to_thread(connect, config, BASE_URL, "other") is None
+
+
+def test_config_fingerprint():
+    """Test that the fingerprint changes with the API keys and base URL."""
+    class Config:
+        base_url = BASE_URL
+        oas_url = "spec.yaml"
+        api_keys = [{"key": "a", "rate_limit": 10}]
+        key_cooldown = 1.0
+        retry_config = indexing_config = quota_config = scheduler_config = http_cache_config = {}
+
+    other_keys, other_url = Config(), Config()
+    other_keys.api_keys = [{"key": "b", "rate_limit": 10}]
+    other_url.base_url = "https://other.test.com"
+
+    assert config_fingerprint(Config()) == config_fingerprint(Config())
+    assert config_fingerprint(other_keys) != config_fingerprint(Config())
+    assert config_fingerprint(other_url) != config_fingerprint(Config())
+
+
+def test_connect_without_sidecar(tmp_path):
+    """Test that no client is returned when nothing listens and autostart is off."""
+    config = {"socket_path": str(tmp_path / "sidecar.sock"), "autostart": False, "startup_timeout": 1}
+
+    assert connect(config, BASE_URL, "abc") is None
+
+
+def test_serve_is_singleton(tmp_path):
+    """Test that a second daemon exits on the lock without creating a client."""
+    path = tmp_path / "sidecar.sock"
+    created = []
+
+    with open(tmp_path / "sidecar.sock.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        assert serve(lambda: created.append(True), str(path)) is False
+
+    assert created == []
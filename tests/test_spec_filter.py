@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Tests for operation filtering and component pruning."""
+
+import copy
+
+import pytest
+
+from zerion_mcp_server.errors import ConfigError
+from zerion_mcp_server.spec_filter import filter_spec
+
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Test", "version": "1"},
+    "paths": {
+        "/v1/wallets/{address}/positions/": {
+            "parameters": [{"$ref": "#/components/parameters/Address"}],
+            "get": {
+                "operationId": "listWalletPositions",
+                "tags": ["wallets"],
+                "responses": {"200": {"$ref": "#/components/responses/Positions"}}
+            }
+        },
+        "/v1/wallets/{address}/pnl/": {
+            "get": {"operationId": "getWalletPNL", "tags": ["wallets"], "responses": {}}
+        },
+        "/v1/swap/offers/": {
+            "get": {
+                "operationId": "swapOffers",
+                "tags": ["swap"],
+                "responses": {"200": {"content": {"application/json": {
+                    "schema": {"$ref": "#/components/schemas/SwapOffer"}
+                }}}}
+            }
+        },
+        "/v1/tx-subscriptions/{id}": {
+            "get": {"operationId": "getTxSubscription", "tags": ["webhooks"], "responses": {}},
+            "delete": {"operationId": "deleteTxSubscription", "tags": ["webhooks"], "responses": {}}
+        }
+    },
+    "components": {
+        "securitySchemes": {"APIKeyBasic": {"type": "http", "scheme": "basic"}},
+        "parameters": {"Address": {"name": "address", "in": "path", "schema": {"type": "string"}}},
+        "responses": {"Positions": {"content": {"application/json": {
+            "schema": {"$ref": "#/components/schemas/Position"}
+        }}}},
+        "schemas": {
+            "Position": {"properties": {"fungible": {"$ref": "#/components/schemas/Fungible"}}},
+            "Fungible": {"properties": {"symbol": {"type": "string"}}},
+            "SwapOffer": {"properties": {"fee": {"type": "number"}}}
+        }
+    }
+}
+
+
+def operation_ids(spec):
+    """List operationIds in a spec."""
+    return sorted(
+        op["operationId"]
+        for path_item in spec["paths"].values()
+        for method, op in path_item.items()
+        if method != "parameters"
+    )
+
+
+class TestFilterSpec:
+    """Tests for filter_spec."""
+
+    def test_include_tag_prunes_components(self):
+        """Test that only components reachable from kept operations remain."""
+        pruned = filter_spec(SPEC, include_tags=["wallets"])
+
+        assert operation_ids(pruned) == ["getWalletPNL", "listWalletPositions"]
+        assert set(pruned["components"]["schemas"]) == {"Position", "Fungible"}
+        assert set(pruned["components"]["parameters"]) == {"Address"}
+        assert set(pruned["components"]["responses"]) == {"Positions"}
+        assert pruned["components"]["securitySchemes"] == SPEC["components"]["securitySchemes"]
+        assert pruned["info"] == SPEC["info"]
+
+    def test_path_level_fields_kept(self):
+        """Test that path-level parameters stay with the kept methods."""
+        pruned = filter_spec(SPEC, include_operations=["listWalletPositions"])
+
+        path_item = pruned["paths"]["/v1/wallets/{address}/positions/"]
+        assert path_item["parameters"] == [{"$ref": "#/components/parameters/Address"}]
+
+    def test_include_operations_and_tags_combine(self):
+        """Test that an operation matching any include rule is kept."""
+        pruned = filter_spec(SPEC, include_operations=["swapOffers"], include_tags=["webhooks"])
+
+        assert operation_ids(pruned) == ["deleteTxSubscription", "getTxSubscription", "swapOffers"]
+        assert set(pruned["components"]["schemas"]) == {"SwapOffer"}
+
+    def test_exclude_rules(self):
+        """Test that exclude rules drop operations from the full set."""
+        pruned = filter_spec(SPEC, exclude_tags=["webhooks"], exclude_operations=["getWalletPNL"])
+
+        assert operation_ids(pruned) == ["listWalletPositions", "swapOffers"]
+        assert "/v1/tx-subscriptions/{id}" not in pruned["paths"]
+
+    def test_exclude_one_method_of_path(self):
+        """Test excluding one method keeps the others on the same path."""
+        pruned = filter_spec(SPEC, exclude_operations=["deleteTxSubscription"])
+
+        assert list(pruned["paths"]["/v1/tx-subscriptions/{id}"]) == ["get"]
+
+    def test_original_spec_unchanged(self):
+        """Test that filtering does not modify its input."""
+        original = copy.deepcopy(SPEC)
+
+        filter_spec(SPEC, include_tags=["swap"])
+
+        assert SPEC == original
+
+    def test_empty_result_raises(self):
+        """Test that a filter matching nothing is a configuration error."""
+        with pytest.raises(ConfigError) as exc_info:
+            filter_spec(SPEC, include_tags=["nonexistent"])
+
+        assert "no operations" in str(exc_info.value)
@@ -0,0 +1,53 @@
+"""Tests for startup phase profiling."""
+
+import io
+import time
+
+from zerion_mcp_server.startup import StartupProfiler
+
+
+class TestStartupProfiler:
+    """Test StartupProfiler."""
+
+    def test_phase_records_duration(self):
+        """Timed phases are reported in milliseconds."""
+        profiler = StartupProfiler(enabled=True)
+
+        with profiler.phase("spec_parse"):
+            time.sleep(0.01)
+
+        phases = profiler.report()["phases_ms"]
+        assert list(phases) == ["spec_parse"]
+        assert phases["spec_parse"] >= 10
+
+    def test_disabled_profiler_records_nothing(self):
+        """Phases are not recorded unless profiling is enabled."""
+        profiler = StartupProfiler()
+
+        with profiler.phase("import"):
+            pass
+        profiler.record("config", 0.5)
+
+        assert profiler.report() == {"phases_ms": {}}
+
+    def test_first_ready_measured_from_origin(self):
+        """first_ready spans from origin to mark_ready."""
+        profiler = StartupProfiler(enabled=True, origin=time.perf_counter() - 1.0)
+
+        profiler.mark_ready()
+
+        assert profiler.report()["first_ready_ms"] >= 1000
+
+    def test_print_report(self):
+        """Report lists each phase and first_ready."""
+        profiler = StartupProfiler(enabled=True)
+        profiler.record("import", 0.25)
+        profiler.mark_ready()
+        stream = io.StringIO()
+
+        profiler.print_report(stream)
+
+        output = stream.getvalue()
+        assert "import" in output
+        assert "250.0 ms" in output
+        assert "first_ready" in output
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Tests for incremental response streaming."""
+
+import json
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+from fastmcp.server.openapi import RouteMap, MCPType
+
+from zerion_mcp_server.retry_client import RetryAsyncClient
+from zerion_mcp_server.streaming import JsonArrayParser, StreamedResponse, StreamingToolClient
+from zerion_mcp_server.tool_schemas import drop_output_schema
+
+BASE_URL = "https://api.test.com"
+
+DOCUMENT = {
+    "links": {"self": f"{BASE_URL}/v1/items/", "next": f"{BASE_URL}/v1/items/?page[after]=x"},
+    "data": [
+        {"type": "transactions", "id": str(i), "attributes": {"transfers": [{"value": i * 1.5, "note": "a\"]},"}]}}
+        for i in range(20)
+    ],
+    "meta": {"total": 20}
+}
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Test", "version": "1"},
+    "paths": {
+        "/v1/items/": {
+            "get": {
+                "operationId": "listItems",
+                "responses": {"200": {"description": "OK"}}
+            }
+        }
+    }
+}
+
+
+def parse_in_chunks(text: str, size: int):
+    """Feed text to a parser in fixed-size chunks."""
+    parser = JsonArrayParser()
+    items = []
+    for i in range(0, len(text), size):
+        items += parser.feed(text[i:i + size])
+    items += parser.close()
+    return parser, items
+
+
+@pytest.fixture
+def retry_client():
+    """Retry client with fast retries."""
+    return RetryAsyncClient(
+        base_url=BASE_URL,
+        retry_config={"max_attempts": 2, "base_delay": 0.01, "max_delay": 0.01, "exponential_base": 2}
+    )
+
+
+class TestJsonArrayParser:
+    """Tests for JsonArrayParser."""
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 64, 100000])
+    def test_items_match_document(self, size):
+        """Test that any chunking yields every item and the full document."""
+        parser, items = parse_in_chunks(json.dumps(DOCUMENT, indent=1), size)
+
+        assert parser.finished
+        assert items == DOCUMENT["data"]
+        assert parser.document == DOCUMENT
+        assert parser.items == 20
+
+    def test_large_item_decoded_once(self):
+        """Test that an item split over many chunks is decoded once, not once per chunk."""
+        item = {"id": "big", "attributes": {"transfers": [{"note": 'x\\"]}', "value": i} for i in range(500)]}}
+        text = json.dumps({"data": [item, {"id": "next"}]}, indent=1)
+        parser = JsonArrayParser()
+        decoder = parser._decoder
+        calls = []
+
+        class CountingDecoder:
+            def raw_decode(self, s, idx=0):
+                calls.append(idx)
+                return decoder.raw_decode(s, idx)
+
+        parser._decoder = CountingDecoder()
+        items = []
+        for i in range(0, len(text), 16):
+            items += parser.feed(text[i:i + 16])
+        items += parser.close()
+
+        assert items == [item, {"id": "next"}]
+        # The "data" key and the two items
+        assert len(calls) == 3
+
+    def test_items_available_before_end(self):
+        """Test that items are returned as soon as they are complete."""
+        text = json.dumps(DOCUMENT)
+        parser = JsonArrayParser()
+
+        items = parser.feed(text[:len(text) // 2])
+
+        assert 0 < len(items) < 20
+        assert items == DOCUMENT["data"][:len(items)]
+
+    @pytest.mark.parametrize("text", ['{"data": {"id": "1"}}', '[1, 2]', '{}', '{"data": [1, 22]}'])
+    def test_other_documents(self, text):
+        """Test that non-list documents are decoded whole."""
+        parser, _ = parse_in_chunks(text, 1)
+
+        assert parser.document == json.loads(text)
+
+    @pytest.mark.parametrize("text", ['{"data": [1,]}', '{"data": [1}', '{"links": {}', '{"a": 1} x'])
+    def test_invalid_documents(self, text):
+        """Test that malformed or truncated JSON is rejected."""
+        with pytest.raises(ValueError):
+            parse_in_chunks(text, 2)
+
+
+@pytest.mark.asyncio
+class TestStreamJson:
+    """Tests for RetryAsyncClient.stream_json."""
+
+    @respx.mock
+    async def test_streams_items(self, retry_client):
+        """Test that each item is handed to on_item and the body is parsed."""
+        respx.get(f"{BASE_URL}/v1/items/").mock(return_value=httpx.Response(200, json=DOCUMENT))
+        parser = JsonArrayParser()
+        seen = []
+
+        async def on_item(item):
+            seen.append(item["id"])
+
+        response = await retry_client.stream_json("GET", "/v1/items/", parser, on_item=on_item)
+
+        assert response.status_code == 200
+        assert parser.finished
+        assert seen == [str(i) for i in range(20)]
+
+    @respx.mock
+    async def test_retries_rate_limit(self, retry_client):
+        """Test that a 429 is retried before the body is parsed."""
+        route = respx.get(f"{BASE_URL}/v1/items/").mock(side_effect=[
+            httpx.Response(429, headers={"Retry-After": "0"}),
+            httpx.Response(200, json=DOCUMENT)
+        ])
+        parser = JsonArrayParser()
+
+        response = await retry_client.stream_json("GET", "/v1/items/", parser)
+
+        assert response.status_code == 200
+        assert route.call_count == 2
+        assert parser.document == DOCUMENT
+
+    @respx.mock
+    async def test_error_not_parsed(self, retry_client):
+        """Test that error responses are returned with their body."""
+        respx.get(f"{BASE_URL}/v1/items/").mock(return_value=httpx.Response(404, json={"errors": []}))
+        parser = JsonArrayParser()
+
+        response = await retry_client.stream_json("GET", "/v1/items/", parser)
+
+        assert response.status_code == 404
+        assert response.json() == {"errors": []}
+        assert not parser.finished
+
+
+@pytest.mark.asyncio
+class TestStreamingToolClient:
+    """Tests for StreamingToolClient."""
+
+    @respx.mock
+    async def test_returns_streamed_response(self, retry_client):
+        """Test that GET responses come back decoded."""
+        respx.get(f"{BASE_URL}/v1/items/").mock(return_value=httpx.Response(200, json=DOCUMENT))
+
+        response = await StreamingToolClient(retry_client).request("GET", "/v1/items/")
+
+        assert isinstance(response, StreamedResponse)
+        assert response.json() == DOCUMENT
+        response.raise_for_status()
+
+    @respx.mock
+    async def test_tool_forwards_items_as_progress(self, retry_client):
+        """Test that a tool call reports each item through progress notifications."""
+        respx.get(f"{BASE_URL}/v1/items/").mock(return_value=httpx.Response(200, json=DOCUMENT))
+        mcp = FastMCP.from_openapi(
+            openapi_spec=SPEC,
+            client=StreamingToolClient(retry_client),
+            route_maps=[RouteMap(mcp_type=MCPType.TOOL)],
+            mcp_component_fn=drop_output_schema
+        )
+        progress = []
+
+        async def on_progress(value, total, message):
+            progress.append((value, json.loads(message)["id"]))
+
+        async with Client(mcp) as client:
+            result = await client.call_tool("listItems", {}, progress_handler=on_progress)
+
+        assert progress == [(i + 1, str(i)) for i in range(20)]
+        assert result.structured_content == DOCUMENT
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Tests for the swap quote cache and comparison tool."""
+
+import asyncio
+
+import httpx
+import pytest
+import respx
+from fastmcp import Client, FastMCP
+
+from zerion_mcp_server.operations import OperationIndex
+from zerion_mcp_server.retry_client import RetryAsyncClient
+from zerion_mcp_server.swap_quotes import (
+    SWAP_OFFERS_URL, SWAP_QUOTES_TOOL, SwapQuoteCache, SwapQuoteToolClient, amount_bucket, best_offer,
+    price_impact_table, swap_quotes_tool
+)
+
+BASE_URL = "https://api.test.com"
+
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Test", "version": "1"},
+    "paths": {
+        "/v1/swap/offers/": {"get": {"operationId": "swapOffers", "responses": {"200": {"description": "OK"}}}},
+        "/v1/chains/": {"get": {"operationId": "listChains", "responses": {"200": {"description": "OK"}}}}
+    }
+}
+
+
+def offer(source, input_amount, output_amount):
+    return {
+        "type": "swaps",
+        "id": source,
+        "attributes": {
+            "estimation": {
+                "input_quantity": {"float": input_amount},
+                "output_quantity": {"float": output_amount},
+                "gas": 100000,
+                "seconds": 30
+            },
+            "liquidity_source": {"id": source}
+        }
+    }
+
+
+def quote_for(request):
+    """Offers at a rate that drops 1% per 10 units of input (in whole units)."""
+    amount = float(request.url.params["input[amount]"]) / 1e18
+    rate = 2000 * (1 - amount / 1000)
+    return httpx.Response(200, json={"data": [
+        offer("slow", amount, amount * rate * 0.99),
+        offer("best", amount, amount * rate)
+    ]})
+
+
+def empty_quote():
+    return httpx.Response(200, json={"data": []}, request=httpx.Request("GET", f"{BASE_URL}{SWAP_OFFERS_URL}"))
+
+
+class TestAmountBucket:
+    """Tests for amount bucketing."""
+
+    def test_close_amounts_share_bucket(self):
+        """Test that amounts within the tolerance share a bucket and others do not."""
+        assert amount_bucket(10 ** 18, 0.001) == amount_bucket(10 ** 18 + 10 ** 14, 0.001)
+        assert amount_bucket(10 ** 18, 0.001) != amount_bucket(2 * 10 ** 18, 0.001)
+
+    def test_exact_without_tolerance(self):
+        """Test that a zero tolerance or a non-numeric amount keeps the amount itself."""
+        assert amount_bucket("123", 0) == "123"
+        assert amount_bucket("abc", 0.001) == "abc"
+
+
+class TestSwapQuoteCache:
+    """Tests for SwapQuoteCache."""
+
+    @respx.mock
+    async def test_cached_within_ttl(self):
+        """Test that a nearby amount is served from the cache while fresh."""
+        route = respx.get(f"{BASE_URL}{SWAP_OFFERS_URL}").mock(side_effect=quote_for)
+        retry_client = RetryAsyncClient(base_url=BASE_URL)
+        client = SwapQuoteToolClient(retry_client, SwapQuoteCache(ttl=60), OperationIndex(SPEC))
+
+        first = await client.request("GET", SWAP_OFFERS_URL, params={"input[amount]": 10 ** 18})
+        second = await client.request("GET", SWAP_OFFERS_URL, params={"input[amount]": 10 ** 18 + 10 ** 14})
+        third = await client.request("GET", SWAP_OFFERS_URL, params={"input[amount]": 2 * 10 ** 18})
+
+        assert route.call_count == 2
+        assert second.json() == first.json()
+        assert third.json() != first.json()
+        assert client.cache.stats()["hits"] == 1
+
+    @respx.mock
+    async def test_exact_amount_with_from(self):
+        """Test that quotes with a sender are not shared between nearby amounts."""
+        route = respx.get(f"{BASE_URL}{SWAP_OFFERS_URL}").mock(side_effect=quote_for)
+        retry_client = RetryAsyncClient(base_url=BASE_URL)
+        client = SwapQuoteToolClient(retry_client, SwapQuoteCache(ttl=60), OperationIndex(SPEC))
+        params = {"input[from]": "0xabc", "input[amount]": 10 ** 18}
+
+        await client.request("GET", SWAP_OFFERS_URL, params=params)
+        await client.request("GET", SWAP_OFFERS_URL, params={**params, "input[amount]": 10 ** 18 + 10 ** 14})
+        await client.request("GET", SWAP_OFFERS_URL, params=params)
+
+        assert route.call_count == 2
+        assert client.cache.stats()["hits"] == 1
+
+    @respx.mock
+    async def test_expired_quote_refetched(self):
+        """Test that a quote is fetched again once the ttl has passed."""
+        route = respx.get(f"{BASE_URL}{SWAP_OFFERS_URL}").mock(side_effect=quote_for)
+        cache = SwapQuoteCache(ttl=0)
+        retry_client = RetryAsyncClient(base_url=BASE_URL)
+        params = {"input[amount]": 10 ** 18}
+
+        for _ in range(2):
+            await cache.get(cache.key(params), lambda: retry_client.request("GET", SWAP_OFFERS_URL, params=params))
+
+        assert route.call_count == 2
+
+    async def test_concurrent_requests_coalesced(self):
+        """Test that identical requests in flight share one upstream call."""
+        cache = SwapQuoteCache(ttl=0)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return empty_quote()
+
+        responses = await asyncio.gather(*(cache.get("key", fetch) for _ in range(5)))
+
+        assert calls == 1
+        assert all(response is responses[0] for response in responses)
+        assert cache.stats()["coalesced"] == 4
+
+    async def test_errors_shared_not_cached(self):
+        """Test that a failed fetch fails its waiters and is not cached."""
+        cache = SwapQuoteCache(ttl=60)
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise httpx.ConnectError("down")
+
+        results = await asyncio.gather(*(cache.get("key", fail) for _ in range(2)), return_exceptions=True)
+
+        assert all(isinstance(result, httpx.ConnectError) for result in results)
+        assert cache.stats()["quotes"] == 0
+
+    async def test_cancelled_owner_does_not_cancel_waiters(self):
+        """Test that a waiter fetches itself if the request it joined is cancelled."""
+        cache = SwapQuoteCache(ttl=0)
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def fast():
+            return empty_quote()
+
+        owner = asyncio.create_task(cache.get("key", slow))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get("key", fast))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        response = await waiter
+        assert response.status_code == 200
+
+
+class TestPriceImpactTable:
+    """Tests for best offer selection and the impact table."""
+
+    def test_best_offer(self):
+        """Test that the offer with the largest output is chosen."""
+        best = best_offer({"data": [offer("a", 1.0, 1900.0), offer("b", 1.0, 1950.0)]})
+
+        assert best["source"] == "b"
+        assert best["output"] == 1950.0
+        assert best["offers"] == 2
+        assert best_offer({"data": []}) is None
+
+    def test_impact_relative_to_smallest_amount(self):
+        """Test that price impact compares each rate with the smallest amount's."""
+        rows = price_impact_table([
+            (10, {"input": 10.0, "output": 19000.0}, None),
+            (1, {"input": 1.0, "output": 2000.0}, None),
+            (5, None, "Swap provider error"),
+            (7, None, None)
+        ])
+
+        assert [row["amount"] for row in rows] == [1, 5, 7, 10]
+        assert rows[0]["price_impact_pct"] == 0.0
+        assert rows[1] == {"amount": 5, "error": "Swap provider error"}
+        assert rows[2] == {"amount": 7, "offers": 0}
+        assert rows[3]["price_impact_pct"] == 5.0
+
+
+class TestSwapQuotesTool:
+    """Tests for the compareSwapQuotes tool."""
+
+    @respx.mock
+    async def test_amounts_quoted_concurrently(self):
+        """Test that each amount is quoted once and returned as one row."""
+        route = respx.get(f"{BASE_URL}{SWAP_OFFERS_URL}").mock(side_effect=quote_for)
+        mcp = FastMCP("test")
+        mcp.add_tool(swap_quotes_tool(RetryAsyncClient(base_url=BASE_URL), SwapQuoteCache()))
+
+        async with Client(mcp) as client:
+            result = await client.call_tool(SWAP_QUOTES_TOOL, {
+                "input_chain_id": "ethereum",
+                "input_fungible_id": "eth",
+                "output_fungible_id": "usdc",
+                "amounts": [10 * 10 ** 18, 10 ** 18, 10 ** 18]
+            })
+
+        rows = result.structured_content["quotes"]
+        assert route.call_count == 2
+        assert route.calls[0].request.url.params["output[chain_id]"] == "ethereum"
+        assert [row["source"] for row in rows] == ["best", "best"]
+        assert rows[0]["price_impact_pct"] == 0.0
+        assert rows[1]["price_impact_pct"] == pytest.approx(0.9009, abs=1e-3)
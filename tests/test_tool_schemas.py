@@ -0,0 +1,58 @@
+"""Tests for tool schema fixups."""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+from fastmcp import FastMCP
+
+from zerion_mcp_server.tool_schemas import drop_output_schema
+
+
+class TestDropOutputSchema:
+    """Test drop_output_schema component hook."""
+
+    def test_drops_output_schema(self):
+        """Generated output schema is removed."""
+        component = SimpleNamespace(name="getWalletPortfolio", output_schema={
+            "type": "object",
+            "properties": {"data": {"$ref": "#/$defs/WalletPortfolioContainer"}},
+            "$defs": {}
+        })
+
+        drop_output_schema(SimpleNamespace(), component)
+
+        assert component.output_schema is None
+
+    def test_component_without_output_schema_unchanged(self):
+        """Components without an output schema are left alone."""
+        component = SimpleNamespace(name="listChains", output_schema=None)
+
+        drop_output_schema(SimpleNamespace(), component)
+
+        assert component.output_schema is None
+
+    def test_from_openapi_tools_have_no_output_schema(self):
+        """Tools built with the hook validate no structured output."""
+        spec = {
+            "openapi": "3.0.3",
+            "info": {"title": "t", "version": "1"},
+            "paths": {"/v1/chains/": {"get": {
+                "operationId": "listChains",
+                "responses": {"200": {"description": "ok", "content": {"application/json": {
+                    "schema": {"type": "object", "properties": {"data": {"$ref": "#/components/schemas/Chain"}}}
+                }}}}
+            }}},
+            "components": {"schemas": {
+                "Chain": {"type": "object", "properties": {"attributes": {"$ref": "#/components/schemas/Attrs"}}},
+                "Attrs": {"type": "object", "properties": {"name": {"type": "string"}}}
+            }}
+        }
+        mcp = FastMCP.from_openapi(
+            openapi_spec=spec,
+            client=httpx.AsyncClient(),
+            mcp_component_fn=drop_output_schema
+        )
+
+        tools = asyncio.run(mcp.get_tools())
+        assert tools["listChains"].output_schema is None
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Tests for the precompiled tool snapshot."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+import yaml
+from fastmcp import FastMCP
+from fastmcp.server.openapi import RouteMap, MCPType
+
+from zerion_mcp_server.operations import OperationIndex
+from zerion_mcp_server.tool_schemas import drop_output_schema
+from zerion_mcp_server.tool_snapshot import (
+    SnapshotRecorder, load_snapshot, save_snapshot, server_from_snapshot,
+    snapshot_operations, spec_hash
+)
+
+SPEC_PATH = Path(__file__).resolve().parent.parent / "zerion_mcp_server" / "openapi_zerion.yaml"
+BASE_URL = "https://api.zerion.io"
+
+
+@pytest.fixture(scope="module")
+def spec_content() -> str:
+    """Bundled Zerion OpenAPI spec text."""
+    return SPEC_PATH.read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def compiled(spec_content):
+    """Tools compiled with from_openapi and the recorded snapshot."""
+    spec = yaml.load(spec_content, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    recorder = SnapshotRecorder(drop_output_schema)
+    mcp = FastMCP.from_openapi(
+        openapi_spec=spec,
+        client=httpx.AsyncClient(base_url=BASE_URL),
+        route_maps=[RouteMap(mcp_type=MCPType.TOOL)],
+        mcp_component_fn=recorder
+    )
+    # Round-trip through JSON like a real snapshot file
+    snapshot = json.loads(json.dumps(recorder.snapshot(spec_hash(spec_content))))
+    return spec, mcp, snapshot
+
+
+class TestSpecHash:
+    """Tests for spec_hash."""
+
+    def test_hash_changes_with_spec(self):
+        """Test that any spec change produces a new key."""
+        assert spec_hash("openapi: 3.0.3") == spec_hash("openapi: 3.0.3")
+        assert spec_hash("openapi: 3.0.3") != spec_hash("openapi: 3.0.4")
+
+    def test_hash_changes_with_tool_filter(self):
+        """Test that a different tool filter does not reuse the snapshot."""
+        assert spec_hash("spec", {"include_tags": ["wallets"]}) != spec_hash("spec")
+        assert spec_hash("spec", {"include_tags": ["wallets"]}) == spec_hash("spec", {"include_tags": ["wallets"]})
+
+
+class TestSnapshotRoundTrip:
+    """Tests for rebuilding tools from a snapshot."""
+
+    def test_tool_definitions_match_from_openapi(self, compiled):
+        """Test that snapshot tools expose the same MCP definitions."""
+        _, mcp, snapshot = compiled
+        restored = server_from_snapshot(snapshot, httpx.AsyncClient(base_url=BASE_URL), "Zerion API")
+
+        original = asyncio.run(mcp.get_tools())
+        rebuilt = asyncio.run(restored.get_tools())
+
+        assert set(rebuilt) == set(original)
+        for name, tool in original.items():
+            assert rebuilt[name].to_mcp_tool().model_dump() == tool.to_mcp_tool().model_dump()
+
+    def test_operations_index_from_snapshot(self, compiled):
+        """Test that the snapshot resolves operationIds like the full spec."""
+        spec, _, snapshot = compiled
+        full = OperationIndex(spec)
+        minimal = OperationIndex(snapshot_operations(snapshot))
+
+        assert len(minimal) == len(full)
+        assert minimal.resolve("GET", "/v1/wallets/0xabc/positions/") == "listWalletPositions"
+        assert minimal.resolve("DELETE", "/v1/tx-subscriptions/sub-1") == "deleteTxSubscription"
+
+    @respx.mock
+    def test_snapshot_tool_sends_request(self, compiled):
+        """Test that a rebuilt tool renders path and query parameters."""
+        _, _, snapshot = compiled
+        route = respx.get(f"{BASE_URL}/v1/wallets/0xabc/positions/").mock(
+            return_value=httpx.Response(200, json={"data": []})
+        )
+        restored = server_from_snapshot(snapshot, httpx.AsyncClient(base_url=BASE_URL), "Zerion API")
+        tool = asyncio.run(restored.get_tools())["listWalletPositions"]
+
+        result = asyncio.run(tool.run({"address": "0xabc", "currency": "usd"}))
+
+        assert route.called
+        assert route.calls.last.request.url.params["currency"] == "usd"
+        assert result.structured_content == {"data": []}
+
+
+class TestSnapshotFile:
+    """Tests for loading and saving snapshot files."""
+
+    def test_save_and_load(self, tmp_path, compiled):
+        """Test that a saved snapshot loads for the same spec hash."""
+        _, _, snapshot = compiled
+        path = tmp_path / "cache" / "tools.json"
+
+        save_snapshot(str(path), snapshot)
+
+        assert load_snapshot(str(path), snapshot["spec_hash"]) == snapshot
+        assert not list(path.parent.glob("*.tmp"))
+
+    def test_stale_snapshot_ignored(self, tmp_path, compiled):
+        """Test that a snapshot for another spec is not used."""
+        _, _, snapshot = compiled
+        path = tmp_path / "tools.json"
+        save_snapshot(str(path), snapshot)
+
+        assert load_snapshot(str(path), spec_hash("other spec")) is None
+
+    def test_missing_or_corrupt_snapshot(self, tmp_path):
+        """Test that missing and unreadable files fall back to a full compile."""
+        path = tmp_path / "tools.json"
+        assert load_snapshot(str(path), "abc") is None
+
+        path.write_text("{not json")
+        assert load_snapshot(str(path), "abc") is None
@@ -2,63 +2,230 @@
 """Universal MCP Server for OpenAPI specifications."""
 
 import time
-import yaml
-import httpx
-from fastmcp import FastMCP
-from fastmcp.server.openapi import RouteMap, MCPType
 
-from .config import ConfigManager
-from .errors import ConfigError, NetworkError, APIError, ValidationError
-from .logger import setup_logging, get_logger
-from .retry_client import RetryAsyncClient
+_IMPORT_START = time.perf_counter()
 
+from typing import Optional
+
+from .logger import get_logger
+from .startup import StartupProfiler
+
+# fastmcp, httpx, yaml and the OpenAPI route machinery are imported inside
+# main() so that importing the package (or its config/pagination helpers)
+# stays cheap, and --profile-startup can time them as their own phase.
+_LAZY_ATTRS = {
+    "FastMCP": ("fastmcp", "FastMCP"),
+    "RouteMap": ("fastmcp.server.openapi", "RouteMap"),
+    "MCPType": ("fastmcp.server.openapi", "MCPType"),
+}
+
+
+def __getattr__(name):
+    """Resolve third-party names re-exported by this module on first use."""
+    if name in _LAZY_ATTRS:
+        import importlib
+        module_name, attr = _LAZY_ATTRS[name]
+        return getattr(importlib.import_module(module_name), attr)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_IMPORT_DONE = time.perf_counter()
+
+
+def _upstream_client(config, openapi_spec, shared_limiter: bool = False):
+    """Create the RetryAsyncClient that calls Zerion directly.
+
+    The client gets the key pool, limiter, quota ledger, scheduler and cache
+    from the configuration; optional stores that cannot be opened are
+    logged and left out.
 
-def main(transport: str = "stdio"):
-    """Main entry point.
-    
     Args:
-        transport: Transport mode - 'stdio' (default) or 'http'
+        config: Loaded ConfigManager.
+        openapi_spec: Parsed (possibly filtered) OpenAPI specification.
+        shared_limiter: Keep API key rate budgets in the SQLite file at
+            http.shared_state_path.
+
+    Returns:
+        RetryAsyncClient.
     """
-    # Load configuration
-    try:
-        config = ConfigManager()
-    except ConfigError as e:
-        print(f"Configuration error: {e}")
-        return
-    
-    # Setup logging
-    setup_logging(level=config.log_level, format_type=config.log_format)
+    import sqlite3
+
+    from .http_cache import DiskCache
+    from .key_pool import ApiKeyPool
+    from .operations import OperationIndex
+    from .quota import QuotaLedger
+    from .retry_client import RetryAsyncClient
+    from .scheduler import PriorityScheduler
+    from .shared_limiter import SharedRateLimiter
+
     logger = get_logger(__name__)
-    
-    logger.info("Starting Zerion MCP Server")
-    logger.info(f"Configuration loaded", extra={
-        "config_source": "config.yaml" if config.get("_config_loaded_from_file") else "defaults",
+
+    # Worker processes share key rate budgets and 429 cooldowns through SQLite
+    limiter = None
+    if shared_limiter:
+        limiter_path = config.http_config["shared_state_path"]
+        try:
+            limiter = SharedRateLimiter(limiter_path)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Shared rate limiter unavailable, using per-process limits", extra={
+                "path": limiter_path,
+                "error": str(e)
+            })
+
+    # API keys from config; each request uses the key with the most headroom
+    key_pool = ApiKeyPool(config.api_keys, cooldown=config.key_cooldown, limiter=limiter)
+
+    # Daily quota ledger, shared across restarts
+    quota = None
+    quota_config = config.quota_config
+    if quota_config["enabled"]:
+        try:
+            quota = QuotaLedger(
+                quota_config["path"],
+                soft_limit=quota_config["daily_soft_limit"],
+                hard_limit=quota_config["daily_hard_limit"]
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Quota ledger unavailable, quota tracking disabled", extra={
+                "path": quota_config["path"],
+                "error": str(e)
+            })
+    logger.debug("HTTP client configured", extra={
         "base_url": config.base_url,
-        "log_level": config.log_level,
-        "log_format": config.log_format
+        "retry_enabled": True,
+        "auto_retry_202": config.indexing_config.get("auto_retry", True),
+        "api_keys": len(key_pool.keys)
     })
-    
+
+    # Priority scheduler in front of the key pool's rate limiter
+    scheduler = None
+    scheduler_config = config.scheduler_config
+    if scheduler_config["enabled"]:
+        scheduler = PriorityScheduler(
+            max_concurrency=scheduler_config["max_concurrency"],
+            aging_interval=scheduler_config["aging_interval"]
+        )
+
+    # Persistent response cache, shared by every process using the same file
+    cache = None
+    cache_config = config.http_cache_config
+    if cache_config["enabled"]:
+        try:
+            cache = DiskCache(
+                cache_config["path"],
+                max_bytes=int(cache_config["max_size_mb"] * 1024 * 1024),
+                default_ttl=cache_config["default_ttl"],
+                max_stale=cache_config["max_stale"],
+                compact_interval=cache_config["compact_interval"]
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("HTTP cache unavailable, caching disabled", extra={
+                "path": cache_config["path"],
+                "error": str(e)
+            })
+
+    # Create HTTP client with retry logic
+    client = RetryAsyncClient(
+        base_url=config.base_url,
+        timeout=30.0,
+        retry_config=config.retry_config,
+        indexing_config=config.indexing_config,
+        key_pool=key_pool,
+        quota=quota,
+        operations=OperationIndex(openapi_spec),
+        scheduler=scheduler,
+        cache=cache
+    )
+    return client
+
+
+def _sidecar_client(config):
+    """Create the upstream client a sidecar daemon shares, without the MCP server.
+
+    Args:
+        config: Loaded ConfigManager.
+
+    Returns:
+        RetryAsyncClient, or None if the spec could not be loaded.
+    """
+    spec = _load_spec(config, StartupProfiler())
+    if spec is None:
+        return None
+    return _upstream_client(config, spec[0])
+
+
+def _load_spec(config, profiler: StartupProfiler, build_snapshot: bool = False):
+    """Load the OpenAPI spec, or the tool snapshot built from it.
+
+    Errors are logged and printed (as main() reports them) rather than raised.
+
+    Args:
+        config: Loaded ConfigManager.
+        profiler: Startup profiler to record phases with.
+        build_snapshot: Ignore an existing tool snapshot.
+
+    Returns:
+        Tuple of (spec, parameter rules, snapshot or None, spec hash), or
+        None if loading failed. With a snapshot, the spec holds only the
+        operations.
+    """
+    import yaml
+    import httpx
+
+    from .errors import ConfigError, NetworkError, APIError, ValidationError
+    from .param_validation import parameter_rules
+    from .spec_filter import filter_spec
+    from .tool_snapshot import load_snapshot, snapshot_operations, spec_hash
+
+    logger = get_logger(__name__)
+
     # Download OpenAPI spec (YAML format)
     logger.info(f"Loading OpenAPI specification from {config.oas_url}")
     start_time = time.time()
     
     try:
-        if config.oas_url.startswith(("http://", "https://")):
-            response = httpx.get(config.oas_url, timeout=30.0)
-            response.raise_for_status()
-            spec_content = response.text
-        else:
-            with open(config.oas_url, "r", encoding="utf-8") as f:
-                spec_content = f.read()
+        with profiler.phase("spec_load"):
+            if config.oas_url.startswith(("http://", "https://")):
+                response = httpx.get(config.oas_url, timeout=30.0)
+                response.raise_for_status()
+                spec_content = response.text
+            else:
+                with open(config.oas_url, "r", encoding="utf-8") as f:
+                    spec_content = f.read()
 
         spec_size = len(spec_content)
-        openapi_spec = yaml.safe_load(spec_content)
+
+        # A snapshot built from this exact spec replaces parsing and tool generation
+        snapshot = None
+        snapshot_config = config.tool_snapshot_config
+        tool_filter = config.tool_filter_config
+        digest = spec_hash(spec_content, variant=tool_filter)
+        if snapshot_config["enabled"] and not build_snapshot:
+            with profiler.phase("snapshot_load"):
+                snapshot = load_snapshot(snapshot_config["path"], digest)
+
+        if snapshot is not None:
+            openapi_spec = snapshot_operations(snapshot)
+            rules = snapshot.get("parameter_rules") or {}
+        else:
+            # The libyaml-backed loader parses the spec roughly 8x faster
+            with profiler.phase("spec_parse"):
+                openapi_spec = yaml.load(spec_content, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+            # Drop unused operations and the components only they reference
+            if any(tool_filter.values()):
+                with profiler.phase("spec_filter"):
+                    openapi_spec = filter_spec(openapi_spec, **tool_filter)
+
+            # Query/header parameter schemas for local request validation
+            rules = parameter_rules(openapi_spec)
         
         load_duration = time.time() - start_time
         logger.info("OpenAPI specification loaded successfully", extra={
             "duration_sec": round(load_duration, 2),
             "spec_size_bytes": spec_size,
-            "endpoints": len(openapi_spec.get("paths", {}))
+            "endpoints": len(openapi_spec.get("paths", {})),
+            "from_snapshot": snapshot is not None
         })
         
     except httpx.TimeoutException as e:
@@ -70,7 +237,7 @@ def main(transport: str = "stdio"):
         )
         logger.error(str(error), extra=error.context)
         print(f"Error: {error}")
-        return
+        return None
     except httpx.HTTPStatusError as e:
         error = APIError.from_response(
             e.response,
@@ -78,7 +245,7 @@ def main(transport: str = "stdio"):
         )
         logger.error(str(error), extra=error.context)
         print(f"Error: {error}")
-        return
+        return None
     except yaml.YAMLError as e:
         error = ValidationError(
             f"Invalid YAML in OpenAPI specification: {e}",
@@ -86,38 +253,234 @@ def main(transport: str = "stdio"):
         )
         logger.error(str(error), extra=error.context)
         print(f"Error: {error}")
-        return
+        return None
+    except ConfigError as e:
+        logger.error(str(e), extra=e.context)
+        print(f"Configuration error: {e}")
+        return None
     except Exception as e:
         logger.error(f"Unexpected error loading OpenAPI spec", extra={"error": str(e)}, exc_info=True)
         print(f"Error loading OpenAPI spec from {config.oas_url}: {e}")
-        return
-    
-    # Setup headers (API key from config)
-    headers = {"Authorization": config.api_key}
-    logger.debug("HTTP client configured", extra={
+        return None
+
+    return openapi_spec, rules, snapshot, digest
+
+
+def build_server(
+    config,
+    profiler: Optional[StartupProfiler] = None,
+    build_snapshot: bool = False,
+    shared_limiter: bool = False,
+    sidecar: bool = False
+):
+    """Load the OpenAPI spec and create the MCP server and its HTTP client.
+
+    Errors are logged and printed (as main() reports them) rather than raised.
+
+    Args:
+        config: Loaded ConfigManager.
+        profiler: Startup profiler to record phases with.
+        build_snapshot: Always compile from the spec and write the tool snapshot.
+        shared_limiter: Keep API key rate budgets in the SQLite file at
+            http.shared_state_path so several worker processes share them.
+        sidecar: Send upstream requests through the host's sidecar daemon
+            when the sidecar config enables it.
+
+    Returns:
+        Tuple of (FastMCP server, upstream client), or None if startup failed.
+        The client is a RetryAsyncClient, or a SidecarClient in sidecar mode.
+    """
+    profiler = profiler or StartupProfiler()
+    logger = get_logger(__name__)
+
+    with profiler.phase("import"):
+        # yaml, httpx and filter_spec are used by _load_spec; importing them
+        # here keeps their cost in this phase
+        import yaml
+        import httpx
+        from fastmcp import FastMCP
+        from fastmcp.server.openapi import RouteMap, MCPType
+
+        from .analytics import TransactionStore, analytics_tool
+        from .chart_cache import ChartCacheToolClient
+        from .charts import ChartOptionsMiddleware
+        from .filter_split import FilterSplittingMiddleware, SplittingToolClient
+        from .gas_prices import GasPriceStore, GasPriceToolClient
+        from .operations import OperationIndex
+        from .param_validation import RequestValidator, ValidatingToolClient
+        from .passthrough import PassthroughToolClient
+        from .portfolio import portfolio_tool
+        from .position_diff import SnapshotStore, diff_tool
+        from .prices import PriceCache, prices_tool
+        from .sidecar import config_fingerprint, connect as connect_sidecar
+        from .spec_filter import filter_spec
+        from .streaming import StreamingToolClient
+        from .swap_quotes import SwapQuoteCache, SwapQuoteToolClient, swap_quotes_tool
+        from .tool_schemas import drop_output_schema
+        from .tool_snapshot import (
+            SnapshotRecorder, load_snapshot, save_snapshot, server_from_snapshot,
+            snapshot_operations, spec_hash
+        )
+
+    logger.info("Starting Zerion MCP Server")
+    logger.info(f"Configuration loaded", extra={
+        "config_source": "config.yaml" if config.get("_config_loaded_from_file") else "defaults",
         "base_url": config.base_url,
-        "retry_enabled": True,
-        "auto_retry_202": config.indexing_config.get("auto_retry", True)
+        "log_level": config.log_level,
+        "log_format": config.log_format
     })
 
-    # Create HTTP client with retry logic
-    client = RetryAsyncClient(
-        base_url=config.base_url,
-        headers=headers,
-        timeout=30.0,
-        retry_config=config.retry_config,
-        indexing_config=config.indexing_config
-    )
+    spec = _load_spec(config, profiler, build_snapshot)
+    if spec is None:
+        return None
+    openapi_spec, rules, snapshot, digest = spec
+    snapshot_config = config.tool_snapshot_config
+
+    client_setup_start = time.perf_counter()
+
+    # stdio servers can hand upstream calls to the host's sidecar daemon,
+    # which owns the key pool, limiter, quota ledger and cache for all of them
+    client = None
+    sidecar_config = config.sidecar_config
+    if sidecar and sidecar_config["enabled"]:
+        client = connect_sidecar(
+            sidecar_config, config.base_url, config_fingerprint(config), OperationIndex(openapi_spec)
+        )
+        if client is None:
+            logger.warning("Sidecar unavailable, calling Zerion directly", extra={
+                "socket_path": sidecar_config["socket_path"]
+            })
+        else:
+            logger.info("Using sidecar", extra={"socket_path": client.socket_path})
+    if client is None:
+        client = _upstream_client(config, openapi_spec, shared_limiter)
+
+    # GET tools parse list responses as they download and forward each item
+    # as a progress notification
+    tool_client = client
+    streaming_config = config.streaming_config
+    if streaming_config["enabled"]:
+        tool_client = StreamingToolClient(client, forward_items=streaming_config["forward_items"])
+
+    # Chart series are kept in memory and refreshed from a shorter period
+    chart_cache_config = config.chart_cache_config
+    if chart_cache_config["enabled"]:
+        tool_client = ChartCacheToolClient(
+            tool_client, client,
+            ttl=chart_cache_config["ttl"],
+            max_series=chart_cache_config["max_series"]
+        )
+
+    # swapOffers quotes are kept for a few seconds per amount bucket and
+    # identical requests in flight share one upstream call
+    swap_quotes_config = config.swap_quotes_config
+    swap_quote_cache = None
+    if swap_quotes_config["enabled"]:
+        swap_quote_cache = SwapQuoteCache(
+            ttl=swap_quotes_config["ttl"],
+            amount_tolerance=swap_quotes_config["amount_tolerance"],
+            max_entries=swap_quotes_config["max_entries"]
+        )
+        tool_client = SwapQuoteToolClient(tool_client, swap_quote_cache, client.operations)
+
+    # listGasPrices is answered from a store the background poller refreshes
+    gas_prices_config = config.gas_prices_config
+    if gas_prices_config["enabled"]:
+        gas_price_store = GasPriceStore(
+            client,
+            chain_ids=gas_prices_config["chain_ids"],
+            interval=gas_prices_config["interval"],
+            max_age=gas_prices_config["max_age"],
+            idle_after=gas_prices_config["idle_after"]
+        )
+        # The poller is stopped wherever the server closes its client
+        client.close_callbacks.append(gas_price_store.stop)
+        tool_client = GasPriceToolClient(tool_client, gas_price_store, client.operations)
+
+    # Opted-in operations skip JSON decoding and re-encoding entirely
+    if config.passthrough_operations:
+        tool_client = PassthroughToolClient(tool_client, client, config.passthrough_operations)
+
+    # Invalid parameters and over-long URLs are rejected before any upstream
+    # call, for the OpenAPI tools and the server's own aggregate tools alike;
+    # over-long id filter lists are first split into several requests
+    tool_upstream = client
+    validation_config = config.validation_config
+    filter_splitting_config = config.filter_splitting_config
+    validator = RequestValidator(rules, client.operations, config.base_url, validation_config["max_url_length"])
+    if validation_config["enabled"]:
+        tool_client = ValidatingToolClient(tool_client, validator)
+        tool_upstream = ValidatingToolClient(client, validator)
+    if filter_splitting_config["enabled"]:
+        max_requests = filter_splitting_config["max_requests"]
+        tool_client = SplittingToolClient(tool_client, validator, max_requests)
+        tool_upstream = SplittingToolClient(tool_upstream, validator, max_requests)
+    profiler.record("client_setup", time.perf_counter() - client_setup_start)
     
     # Create MCP server
+    recorder = SnapshotRecorder(drop_output_schema)
     try:
-        logger.info("Creating MCP server from OpenAPI spec")
-        mcp = FastMCP.from_openapi(
-            openapi_spec=openapi_spec,
-            client=client,
-            name=config.name,
-            route_maps=[RouteMap(mcp_type=MCPType.TOOL)]
-        )
+        with profiler.phase("tool_generation"):
+            if snapshot is not None:
+                logger.info("Creating MCP server from tool snapshot")
+                mcp = server_from_snapshot(snapshot, tool_client, config.name)
+            else:
+                logger.info("Creating MCP server from OpenAPI spec")
+                mcp = FastMCP.from_openapi(
+                    openapi_spec=openapi_spec,
+                    client=tool_client,
+                    name=config.name,
+                    route_maps=[RouteMap(mcp_type=MCPType.TOOL)],
+                    mcp_component_fn=recorder
+                )
+            # max_points / points_format on the chart tools
+            mcp.add_middleware(ChartOptionsMiddleware())
+            if filter_splitting_config["enabled"]:
+                mcp.add_middleware(FilterSplittingMiddleware(validator))
+
+            # Local group-by analytics over cached wallet transactions
+            analytics_config = config.analytics_config
+            if analytics_config["enabled"]:
+                mcp.add_tool(analytics_tool(TransactionStore(
+                    tool_upstream,
+                    ttl=analytics_config["ttl"],
+                    max_pages=analytics_config["max_pages"],
+                    max_wallets=analytics_config["max_wallets"]
+                )))
+
+            # Multi-wallet exposure merged server-side
+            portfolio_config = config.portfolio_config
+            if portfolio_config["enabled"]:
+                mcp.add_tool(portfolio_tool(
+                    tool_upstream,
+                    max_wallets=portfolio_config["max_wallets"],
+                    max_concurrency=portfolio_config["max_concurrency"],
+                    max_pages=portfolio_config["max_pages"]
+                ))
+
+            # Position change detection against the previous snapshot
+            position_diff_config = config.position_diff_config
+            if position_diff_config["enabled"]:
+                mcp.add_tool(diff_tool(
+                    tool_upstream,
+                    SnapshotStore(position_diff_config["max_snapshots"]),
+                    max_pages=position_diff_config["max_pages"]
+                ))
+
+            # Several swap amounts quoted concurrently into one table
+            if swap_quote_cache is not None:
+                mcp.add_tool(swap_quotes_tool(
+                    tool_upstream, swap_quote_cache, max_amounts=swap_quotes_config["max_amounts"]
+                ))
+
+            # Batch prices from a short-TTL map, misses in split listFungibles calls
+            prices_config = config.prices_config
+            if prices_config["enabled"]:
+                mcp.add_tool(prices_tool(
+                    SplittingToolClient(tool_upstream, validator, max_requests=prices_config["max_ids"]),
+                    PriceCache(ttl=prices_config["ttl"], max_entries=prices_config["max_entries"]),
+                    max_ids=prices_config["max_ids"]
+                ))
         
         # Count tools
         tool_count = len([r for r in (openapi_spec.get("paths", {}) or [])])
@@ -129,19 +492,184 @@ def main(transport: str = "stdio"):
     except Exception as e:
         logger.error("Failed to create MCP server", extra={"error": str(e)}, exc_info=True)
         print(f"Error creating MCP server: {e}")
-        return
+        return None
     
+    # Save the compiled tools so the next launch can skip from_openapi
+    if recorder.components and (snapshot_config["enabled"] or build_snapshot):
+        try:
+            save_snapshot(snapshot_config["path"], recorder.snapshot(digest, rules))
+            if build_snapshot:
+                print(f"Tool snapshot written to {snapshot_config['path']} ({len(recorder.components)} tools)")
+        except OSError as e:
+            logger.warning("Could not write tool snapshot", extra={
+                "path": snapshot_config["path"],
+                "error": str(e)
+            })
+
+    return mcp, client
+
+
+def _asgi_app(mcp, client, config, transport: str = "http"):
+    """Create the ASGI app for the streamable HTTP or SSE transport.
+
+    The app closes the upstream client on shutdown and bounds concurrent
+    streams, MCP sessions and slow clients (see http_transport).
+    """
+    from .http_transport import wrap_app
+
+    http_config = config.http_config
+    if transport == "sse":
+        app = mcp.http_app(transport="sse")
+    else:
+        # MCP sessions live in one process's memory and uvicorn does not route
+        # a client back to the same worker, so multi-worker mode is stateless
+        app = mcp.http_app(stateless_http=http_config["workers"] > 1)
+    return wrap_app(app, client, http_config, transport)
+
+
+async def _run_stdio(mcp, client) -> None:
+    """Serve MCP over stdio, closing the upstream client when the session ends.
+
+    The client is closed on the server's own event loop, which also logs
+    per-key usage and flushes the quota ledger.
+    """
+    try:
+        await mcp.run_async()
+    finally:
+        await client.aclose()
+        get_logger(__name__).info("Upstream HTTP client closed")
+
+
+def create_http_app(transport: str = "http"):
+    """Build the ASGI app for one uvicorn worker.
+
+    Used as a uvicorn application factory when http.workers > 1: every
+    worker process loads the configuration (CONFIG_PATH is inherited),
+    builds its own server and shares API key rate budgets with the other
+    workers through the SQLite limiter. The quota ledger and tool snapshot
+    are already file-backed and shared.
+
+    Args:
+        transport: 'http' (streamable HTTP) or 'sse'.
+
+    Returns:
+        ASGI application.
+
+    Raises:
+        RuntimeError: If the server cannot be created.
+    """
+    from .config import ConfigManager
+    from .logger import setup_logging
+
+    config = ConfigManager()
+    setup_logging(level=config.log_level, format_type=config.log_format)
+    server = build_server(config, shared_limiter=config.http_config["workers"] > 1)
+    if server is None:
+        raise RuntimeError("Failed to create Zerion MCP server")
+    mcp, client = server
+    return _asgi_app(mcp, client, config, transport)
+
+
+def main(
+    transport: str = "stdio",
+    profile_startup: bool = False,
+    build_snapshot: bool = False,
+    sidecar: bool = False
+):
+    """Main entry point.
+    
+    Args:
+        transport: Transport mode - 'stdio' (default), 'http' (streamable
+            HTTP) or 'sse'
+        profile_startup: Report startup phase timings to stderr and exit
+            instead of serving
+        build_snapshot: Compile tools from the spec, write the tool
+            snapshot and exit instead of serving
+        sidecar: Run the per-host sidecar daemon on sidecar.socket_path
+            instead of an MCP server
+    """
+    profiler = StartupProfiler(enabled=profile_startup, origin=_IMPORT_START)
+    profiler.record("package_import", _IMPORT_DONE - _IMPORT_START)
+
+    # Load configuration
+    with profiler.phase("config"):
+        from .config import ConfigManager
+        from .errors import ConfigError
+        from .logger import setup_logging
+        try:
+            config = ConfigManager()
+        except ConfigError as e:
+            print(f"Configuration error: {e}")
+            return
+    
+        # Setup logging
+        setup_logging(level=config.log_level, format_type=config.log_format)
+
+    if transport == "sse" and config.http_config["workers"] > 1:
+        # SSE posts messages to the worker holding the stream; uvicorn cannot route them
+        print("Configuration error: the SSE transport requires http.workers: 1")
+        return
+
+    if sidecar:
+        # The daemon only needs the upstream client, built once it holds the lock
+        from .sidecar import config_fingerprint, serve
+        serve(
+            lambda: _sidecar_client(config),
+            config.sidecar_config["socket_path"],
+            config_fingerprint(config),
+            log_level=config.log_level,
+            graceful_shutdown_timeout=config.http_config["graceful_shutdown_timeout"]
+        )
+        return
+
+    server = build_server(
+        config, profiler,
+        build_snapshot=build_snapshot,
+        sidecar=transport == "stdio" and not build_snapshot
+    )
+    if server is None:
+        return
+    mcp, client = server
+    logger = get_logger(__name__)
+
+    if build_snapshot:
+        import asyncio
+        asyncio.run(client.aclose())
+        return
+
     # Start server with requested transport
+    profiler.mark_ready()
     logger.info("Server started and ready to accept requests")
+
+    if profile_startup:
+        logger.info("Startup profile", extra=profiler.report())
+        profiler.print_report()
+        import asyncio
+        asyncio.run(client.aclose())
+        return
     
-    if transport == "http":
-        # Run HTTP server for testing
+    if transport in ("http", "sse"):
         import uvicorn
-        logger.info("Starting HTTP server on http://127.0.0.1:8000")
-        uvicorn.run(mcp, host="127.0.0.1", port=8000, log_level="info")
+        from .http_transport import uvicorn_options
+
+        http_config = config.http_config
+        options = uvicorn_options(http_config, config.log_level)
+        workers = http_config["workers"]
+        logger.info(f"Starting {transport.upper()} server on http://{options['host']}:{options['port']}", extra={
+            "workers": workers
+        })
+        if workers > 1:
+            # The parent only validated the setup and warmed the tool snapshot;
+            # each worker builds its own server through the app factory
+            import asyncio
+            asyncio.run(client.aclose())
+            uvicorn.run("zerion_mcp_server:create_http_app", factory=True, workers=workers, **options)
+        else:
+            uvicorn.run(_asgi_app(mcp, client, config, transport), **options)
     else:
         # Run stdio transport (default MCP mode)
-        mcp.run()
+        import anyio
+        anyio.run(_run_stdio, mcp, client)
 
 
 if __name__ == "__main__":
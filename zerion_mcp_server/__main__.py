@@ -1,7 +1,49 @@
 #!/usr/bin/env python3
 """Entry point for running the package as a module."""
 
+import argparse
+from typing import List, Optional
+
 from zerion_mcp_server import main
 
+
+def cli(argv: Optional[List[str]] = None) -> None:
+    """Parse command-line options and run the server.
+
+    Args:
+        argv: Arguments (default: sys.argv[1:]).
+    """
+    parser = argparse.ArgumentParser(prog="zerion-mcp-server", description="Zerion API MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "http", "sse"],
+        default="stdio",
+        help="MCP transport (default: stdio)"
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import, config, spec-load, spec-parse, tool-generation and "
+             "first-ready timings to stderr, then exit"
+    )
+    parser.add_argument(
+        "--build-snapshot",
+        action="store_true",
+        help="Compile tools from the OpenAPI spec, write the tool snapshot, then exit"
+    )
+    parser.add_argument(
+        "--sidecar",
+        action="store_true",
+        help="Run the per-host sidecar daemon that stdio servers send upstream requests through"
+    )
+    args = parser.parse_args(argv)
+    main(
+        transport=args.transport,
+        profile_startup=args.profile_startup,
+        build_snapshot=args.build_snapshot,
+        sidecar=args.sidecar
+    )
+
+
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""Local analytics over a wallet's cached transaction history.
+
+Questions like "how much did this wallet swap on Arbitrum last month" would
+otherwise mean paging listWalletTransactions into the agent's context and
+summing by hand. The analyzeWalletTransactions tool answers them from a
+columnar copy of the wallet's transactions kept in memory:
+
+- transactions: timestamp, chain, operation type and fee, one row each
+- transfers: owning transaction, direction, value, counterparty and asset
+
+Strings are stored as integer codes and every column is a typed array, so
+filters and group-by sums are single vectorized passes (np.bincount) when
+NumPy is installed (``pip install zerion-mcp-server[analytics]``), with a
+pure-Python fallback. Only a small summary is returned.
+
+A wallet is downloaded once (up to max_pages pages) and later refreshed by
+fetching newer pages until a cached transaction is reached.
+"""
+
+import asyncio
+import time
+from array import array
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Annotated, Any, Dict, Iterable, List, Literal, Optional, Tuple
+
+from .errors import APIError, ValidationError
+from .logger import get_logger
+from .pagination import extract_cursor_from_url
+from .priority import Priority, request_priority
+
+logger = get_logger(__name__)
+
+ANALYTICS_TOOL = "analyzeWalletTransactions"
+
+GROUP_BY = ("day", "chain", "operation_type", "counterparty", "asset")
+
+# Transfer direction codes
+IN, OUT, SELF = 0, 1, 2
+_DIRECTIONS = {"in": IN, "out": OUT, "self": SELF}
+
+_DAY = 86400
+
+
+@lru_cache(maxsize=None)
+def _numpy() -> Optional[Any]:
+    """numpy, imported on first use so that server startup does not pay for it.
+
+    Returns:
+        The numpy module, or None without the analytics extra.
+    """
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - exercised without the analytics extra
+        return None
+    return numpy
+
+
+class _Codes:
+    """Maps labels (chain ids, addresses, ...) to dense integer codes."""
+
+    def __init__(self):
+        self.labels: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def code(self, label: str) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+    def find(self, label: str) -> int:
+        """Code of a label, or -1 if it never occurred."""
+        return self._codes.get(label, -1)
+
+
+def _epoch(text: str) -> int:
+    return int(datetime.fromisoformat(text).timestamp())
+
+
+def _parse_bound(value: Optional[str], field: str) -> Optional[int]:
+    """Parse a since/until argument (ISO date or datetime) to epoch seconds."""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValidationError(
+            f"Invalid {field}: {value}",
+            field=field,
+            expected="ISO 8601 date or datetime (e.g. 2024-05-01)",
+            actual=value
+        ) from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _day_label(day: int) -> str:
+    return datetime.fromtimestamp(day * _DAY, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+class TransactionTable:
+    """Columnar transactions and transfers of one wallet.
+
+    Attributes:
+        ids: Transaction ids already stored
+        complete: Whether the whole history is stored (no page limit hit)
+        fetched_at: Monotonic time of the last download or refresh
+    """
+
+    def __init__(self):
+        self.ids = set()
+        self.complete = False
+        self.fetched_at = 0.0
+        self.chains = _Codes()
+        self.operations = _Codes()
+        self.counterparties = _Codes()
+        self.assets = _Codes()
+        # One row per transaction
+        self.tx_time = array("q")
+        self.tx_chain = array("i")
+        self.tx_operation = array("i")
+        self.tx_fee = array("d")
+        # One row per transfer
+        self.transfer_tx = array("i")
+        self.transfer_direction = array("b")
+        self.transfer_value = array("d")
+        self.transfer_counterparty = array("i")
+        self.transfer_asset = array("i")
+
+    def __len__(self) -> int:
+        return len(self.tx_time)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the columns."""
+        columns = (
+            self.tx_time, self.tx_chain, self.tx_operation, self.tx_fee, self.transfer_tx,
+            self.transfer_direction, self.transfer_value, self.transfer_counterparty, self.transfer_asset
+        )
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def extend(self, items: Iterable[Dict[str, Any]]) -> int:
+        """Append listWalletTransactions items, skipping known or malformed ones.
+
+        Returns:
+            Number of transactions added.
+        """
+        added = 0
+        for item in items:
+            item_id = item.get("id")
+            if item_id in self.ids:
+                continue
+            try:
+                self._append(item)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug("Transaction skipped", extra={"id": item_id, "error": str(e)})
+                continue
+            self.ids.add(item_id)
+            added += 1
+        return added
+
+    def _append(self, item: Dict[str, Any]) -> None:
+        attributes = item["attributes"]
+        timestamp = _epoch(attributes["mined_at"])
+        chain = ((item.get("relationships") or {}).get("chain") or {}).get("data") or {}
+        fee = attributes.get("fee") or {}
+        transfers = []
+        for transfer in attributes.get("transfers") or []:
+            direction = _DIRECTIONS[transfer["direction"]]
+            counterparty = transfer.get("sender") if direction == IN else transfer.get("recipient")
+            asset = (transfer.get("fungible_info") or {}).get("symbol") or (transfer.get("nft_info") or {}).get("name")
+            transfers.append((
+                direction,
+                float(transfer.get("value") or 0.0),
+                (counterparty or "unknown").lower(),
+                asset or "unknown"
+            ))
+
+        # Validated before anything is appended so the columns stay aligned
+        row = len(self.tx_time)
+        self.tx_time.append(timestamp)
+        self.tx_chain.append(self.chains.code(chain.get("id") or "unknown"))
+        self.tx_operation.append(self.operations.code(attributes.get("operation_type") or "unknown"))
+        self.tx_fee.append(float(fee.get("value") or 0.0))
+        for direction, value, counterparty, asset in transfers:
+            self.transfer_tx.append(row)
+            self.transfer_direction.append(direction)
+            self.transfer_value.append(value)
+            self.transfer_counterparty.append(self.counterparties.code(counterparty))
+            self.transfer_asset.append(self.assets.code(asset))
+
+    def summarize(
+        self,
+        group_by: str = "operation_type",
+        chain_id: Optional[str] = None,
+        operation_type: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        top: int = 10
+    ) -> Dict[str, Any]:
+        """Aggregate the stored transactions.
+
+        Args:
+            group_by: One of GROUP_BY.
+            chain_id: Only transactions on this chain.
+            operation_type: Only transactions of this type (e.g. 'trade').
+            since: Only transactions mined at or after this epoch second.
+            until: Only transactions mined before this epoch second.
+            top: Groups returned: the largest by volume, or the most recent
+                days for group_by='day'.
+
+        Returns:
+            Dict with totals over the selection and the groups, each with
+            transaction and transfer counts, in/out value, net flow and fees
+            (fees only for transaction-level groupings).
+        """
+        chain = self.chains.find(chain_id) if chain_id is not None else None
+        operation = self.operations.find(operation_type) if operation_type is not None else None
+        aggregate = _aggregate_numpy if _numpy() is not None else _aggregate_python
+        groups = aggregate(self, group_by, chain, operation, since, until)
+
+        totals = [0, 0, 0.0, 0.0, 0.0]
+        first = last = None
+        for key, (transactions, transfers, value_in, value_out, fees, begin, end) in groups.items():
+            for i, value in enumerate((transactions, transfers, value_in, value_out, fees)):
+                totals[i] += value
+            first = begin if first is None else min(first, begin)
+            last = end if last is None else max(last, end)
+        if group_by in ("counterparty", "asset"):
+            # A transaction can appear in several groups; count it once
+            totals[0] = aggregate(self, "chain", chain, operation, since, until, count_only=True)
+            totals[4] = None
+
+        if group_by == "day":
+            keys = sorted(groups)[-top:]
+        else:
+            keys = sorted(groups, key=lambda k: (-(groups[k][2] + groups[k][3]), -groups[k][0]))[:top]
+        labels = {
+            "day": _day_label,
+            "chain": lambda k: self.chains.labels[k],
+            "operation_type": lambda k: self.operations.labels[k],
+            "counterparty": lambda k: self.counterparties.labels[k],
+            "asset": lambda k: self.assets.labels[k]
+        }[group_by]
+
+        return {
+            "transactions": totals[0],
+            "transfers": totals[1],
+            "first_mined_at": _timestamp_text(first),
+            "last_mined_at": _timestamp_text(last),
+            "totals": _metrics(totals[2], totals[3], totals[4]),
+            "group_by": group_by,
+            "groups_total": len(groups),
+            "groups": [
+                {
+                    group_by: labels(key),
+                    "transactions": groups[key][0],
+                    "transfers": groups[key][1],
+                    **_metrics(groups[key][2], groups[key][3], None if group_by in ("counterparty", "asset") else groups[key][4])
+                }
+                for key in keys
+            ]
+        }
+
+
+def _timestamp_text(timestamp: Optional[int]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _metrics(value_in: float, value_out: float, fees: Optional[float]) -> Dict[str, float]:
+    metrics = {
+        "in": round(value_in, 2),
+        "out": round(value_out, 2),
+        "net": round(value_in - value_out, 2),
+        "volume": round(value_in + value_out, 2)
+    }
+    if fees is not None:
+        metrics["fees"] = round(fees, 2)
+    return metrics
+
+
+# Group row: [transactions, transfers, in, out, fees, first time, last time]
+Groups = Dict[int, List[Any]]
+
+
+def _aggregate_numpy(
+    table: TransactionTable,
+    group_by: str,
+    chain: Optional[int],
+    operation: Optional[int],
+    since: Optional[int],
+    until: Optional[int],
+    count_only: bool = False
+) -> Any:
+    np = _numpy()
+    # Copies, so the array columns can keep growing while results are in use
+    column = lambda a: np.frombuffer(a, dtype=a.typecode).copy() if len(a) else np.zeros(0, dtype=a.typecode)
+    tx_time = column(table.tx_time)
+    mask = np.ones(len(tx_time), dtype=bool)
+    if chain is not None:
+        mask &= column(table.tx_chain) == chain
+    if operation is not None:
+        mask &= column(table.tx_operation) == operation
+    if since is not None:
+        mask &= tx_time >= since
+    if until is not None:
+        mask &= tx_time < until
+    if count_only:
+        return int(mask.sum())
+
+    transfer_tx = column(table.transfer_tx)
+    transfer_mask = mask[transfer_tx]
+    transfer_tx = transfer_tx[transfer_mask]
+    direction = column(table.transfer_direction)[transfer_mask]
+    value = column(table.transfer_value)[transfer_mask]
+    selected = np.flatnonzero(mask)
+
+    if group_by in ("counterparty", "asset"):
+        source = table.transfer_counterparty if group_by == "counterparty" else table.transfer_asset
+        transfer_key = column(source)[transfer_mask].astype(np.int64)
+        # Transactions per group: distinct (transaction, group) pairs
+        base = int(transfer_key.max(initial=0)) + 1
+        pair_tx, pair_key = np.divmod(np.unique(transfer_tx.astype(np.int64) * base + transfer_key), base)
+        keys, inverse = np.unique(transfer_key, return_inverse=True)
+        pair_inverse = np.searchsorted(keys, pair_key)
+        transactions = np.bincount(pair_inverse, minlength=len(keys))
+        fees = np.zeros(len(keys))
+        first = np.full(len(keys), np.iinfo(np.int64).max)
+        last = np.full(len(keys), np.iinfo(np.int64).min)
+        np.minimum.at(first, pair_inverse, tx_time[pair_tx])
+        np.maximum.at(last, pair_inverse, tx_time[pair_tx])
+    else:
+        if group_by == "day":
+            tx_key = tx_time // _DAY
+        elif group_by == "chain":
+            tx_key = column(table.tx_chain).astype(np.int64)
+        else:
+            tx_key = column(table.tx_operation).astype(np.int64)
+        keys, selected_inverse = np.unique(tx_key[selected], return_inverse=True)
+        transactions = np.bincount(selected_inverse, minlength=len(keys))
+        fees = np.bincount(selected_inverse, weights=column(table.tx_fee)[selected], minlength=len(keys))
+        first = np.full(len(keys), np.iinfo(np.int64).max)
+        last = np.full(len(keys), np.iinfo(np.int64).min)
+        np.minimum.at(first, selected_inverse, tx_time[selected])
+        np.maximum.at(last, selected_inverse, tx_time[selected])
+        inverse = np.searchsorted(keys, tx_key[transfer_tx])
+
+    transfers = np.bincount(inverse, minlength=len(keys))
+    value_in = np.bincount(inverse, weights=np.where(direction == IN, value, 0.0), minlength=len(keys))
+    value_out = np.bincount(inverse, weights=np.where(direction == OUT, value, 0.0), minlength=len(keys))
+    return {
+        int(key): [
+            int(transactions[i]), int(transfers[i]), float(value_in[i]), float(value_out[i]),
+            float(fees[i]), int(first[i]), int(last[i])
+        ]
+        for i, key in enumerate(keys)
+    }
+
+
+def _aggregate_python(
+    table: TransactionTable,
+    group_by: str,
+    chain: Optional[int],
+    operation: Optional[int],
+    since: Optional[int],
+    until: Optional[int],
+    count_only: bool = False
+) -> Any:
+    mask = [
+        (chain is None or c == chain)
+        and (operation is None or o == operation)
+        and (since is None or t >= since)
+        and (until is None or t < until)
+        for t, c, o in zip(table.tx_time, table.tx_chain, table.tx_operation)
+    ]
+    if count_only:
+        return sum(mask)
+
+    groups: Groups = defaultdict(lambda: [0, 0, 0.0, 0.0, 0.0, None, None])
+
+    def touch(group: List[Any], timestamp: int) -> None:
+        group[5] = timestamp if group[5] is None else min(group[5], timestamp)
+        group[6] = timestamp if group[6] is None else max(group[6], timestamp)
+
+    if group_by in ("counterparty", "asset"):
+        source = table.transfer_counterparty if group_by == "counterparty" else table.transfer_asset
+        seen = set()
+        for tx, direction, value, key in zip(table.transfer_tx, table.transfer_direction, table.transfer_value, source):
+            if not mask[tx]:
+                continue
+            group = groups[key]
+            group[1] += 1
+            if direction == IN:
+                group[2] += value
+            elif direction == OUT:
+                group[3] += value
+            if (tx, key) not in seen:
+                seen.add((tx, key))
+                group[0] += 1
+                touch(group, table.tx_time[tx])
+        return dict(groups)
+
+    if group_by == "day":
+        tx_key = [t // _DAY for t in table.tx_time]
+    else:
+        tx_key = table.tx_chain if group_by == "chain" else table.tx_operation
+    for tx, selected in enumerate(mask):
+        if selected:
+            group = groups[tx_key[tx]]
+            group[0] += 1
+            group[4] += table.tx_fee[tx]
+            touch(group, table.tx_time[tx])
+    for tx, direction, value in zip(table.transfer_tx, table.transfer_direction, table.transfer_value):
+        if not mask[tx]:
+            continue
+        group = groups[tx_key[tx]]
+        group[1] += 1
+        if direction == IN:
+            group[2] += value
+        elif direction == OUT:
+            group[3] += value
+    return dict(groups)
+
+
+class TransactionStore:
+    """In-memory TransactionTables per wallet, refreshed incrementally.
+
+    Attributes:
+        client: Upstream client (RetryAsyncClient or SidecarClient)
+        ttl: Seconds a table is used without checking for new transactions
+        max_pages: Pages fetched per download or refresh
+        max_wallets: Tables kept (least recently used are dropped)
+        page_size: Transactions per page
+    """
+
+    def __init__(self, client: Any, ttl: float = 300, max_pages: int = 20, max_wallets: int = 32, page_size: int = 100):
+        """Initialize store.
+
+        Args:
+            client: Upstream client for listWalletTransactions requests.
+            ttl: Seconds before a table is refreshed.
+            max_pages: Page limit per download or refresh.
+            max_wallets: Maximum cached wallets.
+            page_size: Transactions per page (Zerion allows up to 100).
+        """
+        self.client = client
+        self.ttl = ttl
+        self.max_pages = max_pages
+        self.max_wallets = max_wallets
+        self.page_size = page_size
+        self._tables: "OrderedDict[Tuple[str, str], TransactionTable]" = OrderedDict()
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    async def table(self, address: str, currency: str = "usd") -> TransactionTable:
+        """Get a wallet's table, downloading or refreshing it as needed.
+
+        Args:
+            address: Wallet address.
+            currency: Currency of values and fees.
+
+        Returns:
+            The wallet's TransactionTable.
+
+        Raises:
+            APIError: If Zerion returns an error status.
+        """
+        key = (address.lower(), currency)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                if time.monotonic() - table.fetched_at < self.ttl:
+                    return table
+            table = await self._refresh(address, currency, table)
+            self._tables[key] = table
+            self._tables.move_to_end(key)
+            while len(self._tables) > self.max_wallets:
+                evicted, _ = self._tables.popitem(last=False)
+                self._locks.pop(evicted, None)
+            return table
+
+    async def _refresh(self, address: str, currency: str, table: Optional[TransactionTable]) -> TransactionTable:
+        """Fetch pages newest first until a stored transaction, the end or the page limit."""
+        items: List[Dict[str, Any]] = []
+        reached_known = reached_end = False
+        page_after = None
+        pages = 0
+        while pages < self.max_pages and not (reached_known or reached_end):
+            params = {"currency": currency, "page[size]": self.page_size, "filter[trash]": "only_non_trash"}
+            if page_after:
+                params["page[after]"] = page_after
+            # Fan-out on behalf of the interactive call
+            with request_priority(Priority.NORMAL):
+                response = await self.client.request("GET", f"/v1/wallets/{address}/transactions/", params=params)
+            if not response.is_success:
+                raise APIError.from_response(response)
+            document = response.json()
+            pages += 1
+            for item in document.get("data") or []:
+                if table is not None and item.get("id") in table.ids:
+                    reached_known = True
+                    break
+                items.append(item)
+            next_url = (document.get("links") or {}).get("next")
+            page_after = extract_cursor_from_url(next_url) if next_url else None
+            reached_end = page_after is None
+
+        if table is None or not reached_known:
+            # First download, or more new transactions than the page limit:
+            # start over from the newest ones
+            complete = reached_end and not reached_known
+            table = TransactionTable()
+            table.complete = complete
+        added = table.extend(items)
+        table.fetched_at = time.monotonic()
+        logger.debug("Wallet transactions cached", extra={
+            "pages": pages,
+            "transactions_added": added,
+            "transactions": len(table),
+            "complete": table.complete,
+            "bytes": table.nbytes
+        })
+        return table
+
+
+def analytics_tool(store: TransactionStore) -> Any:
+    """Create the analyzeWalletTransactions tool.
+
+    Args:
+        store: TransactionStore backing the tool.
+
+    Returns:
+        fastmcp FunctionTool to add with mcp.add_tool().
+    """
+    from fastmcp.tools import Tool
+    from pydantic import Field
+
+    async def analyze_wallet_transactions(
+        address: Annotated[str, Field(description="Wallet address")],
+        group_by: Annotated[
+            Literal["day", "chain", "operation_type", "counterparty", "asset"],
+            Field(description="Group totals by UTC day, chain, operation type, counterparty address or asset symbol")
+        ] = "operation_type",
+        chain_id: Annotated[Optional[str], Field(description="Only transactions on this chain (e.g. 'arbitrum')")] = None,
+        operation_type: Annotated[Optional[str], Field(description="Only transactions of this type (e.g. 'trade')")] = None,
+        since: Annotated[Optional[str], Field(description="Only transactions mined at or after this ISO date/datetime (UTC)")] = None,
+        until: Annotated[Optional[str], Field(description="Only transactions mined before this ISO date/datetime (UTC)")] = None,
+        top: Annotated[int, Field(ge=1, le=100, description="Groups returned (largest by volume; most recent for 'day')")] = 10,
+        currency: Annotated[str, Field(description="Currency of values and fees")] = "usd"
+    ) -> Dict[str, Any]:
+        since_at = _parse_bound(since, "since")
+        until_at = _parse_bound(until, "until")
+        table = await store.table(address, currency)
+        summary = table.summarize(group_by, chain_id, operation_type, since_at, until_at, top)
+        return {"address": address, "currency": currency, "complete": table.complete, **summary}
+
+    return Tool.from_function(
+        analyze_wallet_transactions,
+        name=ANALYTICS_TOOL,
+        description=(
+            "Summarize a wallet's transaction history without listing it: counts, "
+            "in/out value, net flow, volume and fees, filtered by chain, operation "
+            "type and time range and grouped by day, chain, operation type, "
+            "counterparty or asset. Computed locally over a cached copy of the "
+            "wallet's transactions (spam excluded); 'complete' is false when only "
+            "the most recent pages were downloaded."
+        ),
+        output_schema=None
+    )
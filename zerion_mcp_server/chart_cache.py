@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""In-memory chart series cache with incremental tail refresh.
+
+Chart responses for a wallet or fungible cover a whole period (up to
+several years) and are downloaded whole on every call, although only the
+most recent points change. Series are kept here as typed arrays (8-byte
+timestamps and doubles instead of lists of Python objects), keyed by the
+chart path, period, currency and filters, and served from memory while
+fresh. Zerion has no "points since" parameter, so a stale series is
+refreshed from the shortest chart period that still covers the time since
+it was fetched (e.g. a 'day' chart for a 'year' series): only the new tail
+points are merged, at the series' own resolution, and the window is moved
+forward. A series is downloaded in full again only when no shorter period
+covers the gap.
+"""
+
+import json
+import re
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from .charts import CHART_OPERATIONS
+from .logger import get_logger
+from .streaming import StreamedResponse
+
+logger = get_logger(__name__)
+
+# Nominal length of each chart period, shortest first ('max' has no window)
+PERIOD_SECONDS = {
+    "hour": 3600,
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 30 * 86400,
+    "year": 365 * 86400
+}
+
+_PERIOD_PATH = re.compile(r"^(?P<prefix>.*/charts/)(?P<period>[a-z]+)/?$")
+
+
+def _timestamp_text(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _split_document(document: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Any]]:
+    """Separate the points from a chart document.
+
+    Returns:
+        Tuple of (document without points, points).
+    """
+    data = dict(document["data"])
+    attributes = dict(data["attributes"])
+    points = attributes.pop("points")
+    data["attributes"] = attributes
+    return {**document, "data": data}, points
+
+
+class ChartSeries:
+    """One cached chart: typed point arrays plus the rest of the document.
+
+    Attributes:
+        period: Chart period of the series
+        timestamps: Point timestamps (array('q'))
+        values: Point values (array('d'))
+        fetched_at: Wall-clock time of the last download or refresh
+        window: Seconds of history the series covers (None for 'max')
+    """
+
+    def __init__(self, period: str, document: Dict[str, Any], fetched_at: float):
+        """Build a series from a full chart response.
+
+        Raises:
+            KeyError, TypeError, ValueError: If the document is not a chart
+                with numeric [timestamp, value] points.
+        """
+        self.period = period
+        self._skeleton, points = _split_document(document)
+        self.timestamps = array("q", (int(p[0]) for p in points))
+        self.values = array("d", (float(p[1]) for p in points))
+        self.fetched_at = fetched_at
+        self.window = (
+            self.timestamps[-1] - self.timestamps[0]
+            if period != "max" and len(self.timestamps) > 1 else None
+        )
+
+    @property
+    def step(self) -> float:
+        """Typical spacing between points (seconds)."""
+        gaps = sorted(b - a for a, b in zip(self.timestamps, self.timestamps[1:]))
+        return gaps[len(gaps) // 2] if gaps else 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the point arrays."""
+        return self.timestamps.itemsize * len(self.timestamps) + self.values.itemsize * len(self.values)
+
+    def document(self) -> Dict[str, Any]:
+        """Rebuild the chart response document."""
+        data = dict(self._skeleton["data"])
+        attributes = dict(data["attributes"])
+        attributes["points"] = [[t, v] for t, v in zip(self.timestamps, self.values)]
+        data["attributes"] = attributes
+        return {**self._skeleton, "data": data}
+
+    def merge_tail(self, document: Dict[str, Any], fetched_at: float) -> int:
+        """Merge a shorter-period chart's newer points into the series.
+
+        Tail points are taken at the series' own spacing; the newest point
+        is always kept as the current value, replacing a previous current
+        value that was not on the grid. Points older than the window are
+        dropped.
+
+        Args:
+            document: Chart response for a shorter period.
+            fetched_at: Wall-clock time of the tail request.
+
+        Returns:
+            Number of points added.
+        """
+        _, points = _split_document(document)
+        step = self.step
+        # The last cached point may be an off-grid "now" value; the grid
+        # continues from the last regular point and the new tail replaces it
+        off_grid = len(self.timestamps) > 1 and self.timestamps[-1] - self.timestamps[-2] < step
+        last_regular = self.timestamps[-2] if off_grid else self.timestamps[-1]
+        tail = [(int(p[0]), float(p[1])) for p in points if int(p[0]) > last_regular]
+        if not tail or tail[-1][0] <= self.timestamps[-1]:
+            self.fetched_at = fetched_at
+            return 0
+        if off_grid:
+            self.timestamps.pop()
+            self.values.pop()
+
+        added = 0
+        for i, (timestamp, value) in enumerate(tail):
+            if timestamp - self.timestamps[-1] >= step or i == len(tail) - 1:
+                self.timestamps.append(timestamp)
+                self.values.append(value)
+                added += 1
+
+        if self.window is not None:
+            start = self.timestamps[-1] - self.window
+            drop = 0
+            while drop < len(self.timestamps) - 1 and self.timestamps[drop] < start:
+                drop += 1
+            del self.timestamps[:drop]
+            del self.values[:drop]
+
+        attributes = self._skeleton["data"]["attributes"]
+        _, tail_end = self._bounds(document)
+        if tail_end is not None:
+            attributes["end_at"] = tail_end
+        if "begin_at" in attributes and self.window is not None:
+            attributes["begin_at"] = _timestamp_text(self.timestamps[0])
+        self.fetched_at = fetched_at
+        return added
+
+    @staticmethod
+    def _bounds(document: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        attributes = (document.get("data") or {}).get("attributes") or {}
+        return attributes.get("begin_at"), attributes.get("end_at")
+
+
+class ChartCacheToolClient:
+    """Client for OpenAPI tools that serves chart responses from memory.
+
+    Requests for the chart operations are answered from a cached series
+    while it is younger than ttl. Older series are refreshed with a
+    shorter-period tail request when one covers the gap, and downloaded in
+    full otherwise. Everything else is delegated to the wrapped tool client.
+
+    Attributes:
+        client: Wrapped tool client
+        retry_client: Upstream client with an OperationIndex
+        ttl: Seconds a series is served without contacting Zerion
+        max_series: Series kept (least recently used are dropped)
+        hits: Calls answered from memory
+        refreshes: Tail refreshes
+        downloads: Full downloads
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        retry_client: Any,
+        ttl: float = 60,
+        max_series: int = 256,
+        operations: Iterable[str] = CHART_OPERATIONS
+    ):
+        """Initialize chart cache client.
+
+        Args:
+            client: Tool client for upstream requests (e.g. StreamingToolClient).
+            retry_client: RetryAsyncClient (or SidecarClient) with an OperationIndex.
+            ttl: Seconds to serve a series from memory.
+            max_series: Maximum cached series.
+            operations: Chart operationIds to cache.
+        """
+        self.client = client
+        self.retry_client = retry_client
+        self.ttl = ttl
+        self.max_series = max_series
+        self.operations = set(operations)
+        self.hits = 0
+        self.refreshes = 0
+        self.downloads = 0
+        self._series: "OrderedDict[str, ChartSeries]" = OrderedDict()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def _chart_request(self, method: str, url: Any, kwargs: Dict[str, Any]) -> Optional[Tuple[str, str, str]]:
+        """Get (cache key, URL prefix, period) for a cacheable chart request."""
+        operations = self.retry_client.operations
+        if method.upper() != "GET" or operations is None or operations.resolve(method, url) not in self.operations:
+            return None
+        match = _PERIOD_PATH.match(httpx.URL(str(url)).path)
+        if match is None:
+            return None
+        headers = {k.lower(): v for k, v in (kwargs.get("headers") or {}).items()}
+        key = json.dumps(
+            [match.group("prefix"), match.group("period"), kwargs.get("params") or {}, headers.get("x-env")],
+            sort_keys=True,
+            default=str
+        )
+        return key, match.group("prefix"), match.group("period")
+
+    @staticmethod
+    def _tail_period(period: str, gap: float, step: float) -> Optional[str]:
+        """Shortest period shorter than period that covers gap plus one point."""
+        if period not in PERIOD_SECONDS and period != "max":
+            return None
+        limit = PERIOD_SECONDS.get(period, float("inf"))
+        for candidate, seconds in PERIOD_SECONDS.items():
+            if seconds >= limit:
+                return None
+            if seconds >= gap + step:
+                return candidate
+        return None
+
+    def _response(self, url: Any, document: Dict[str, Any]) -> httpx.Response:
+        response = httpx.Response(
+            200, headers={"content-type": "application/json"}, request=httpx.Request("GET", str(url))
+        )
+        return StreamedResponse(response, document)
+
+    def _store(self, key: str, series: ChartSeries) -> None:
+        self._series[key] = series
+        self._series.move_to_end(key)
+        while len(self._series) > self.max_series:
+            self._series.popitem(last=False)
+
+    async def request(self, method: str, url: Any, **kwargs: Any) -> httpx.Response:
+        """Make a request, serving chart operations from the series cache.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            **kwargs: Request arguments.
+
+        Returns:
+            Chart response (possibly built from memory), or the wrapped
+            client's response for other requests.
+        """
+        chart = self._chart_request(method, url, kwargs)
+        if chart is None:
+            return await self.client.request(method, url, **kwargs)
+        key, prefix, period = chart
+
+        now = time.time()
+        series = self._series.get(key)
+        if series is not None:
+            self._series.move_to_end(key)
+            if now - series.fetched_at < self.ttl:
+                self.hits += 1
+                return self._response(url, series.document())
+
+            # An empty series has no tail to extend: download it in full
+            tail_period = None
+            if series.timestamps:
+                tail_period = self._tail_period(period, now - series.timestamps[-1], series.step)
+            if tail_period is not None:
+                response = await self.client.request(method, f"{prefix}{tail_period}", **kwargs)
+                if response.is_success:
+                    try:
+                        added = series.merge_tail(response.json(), now)
+                    except (KeyError, TypeError, ValueError) as e:
+                        logger.debug("Chart tail not merged", extra={"error": str(e)})
+                    else:
+                        self.refreshes += 1
+                        logger.debug("Chart series refreshed", extra={
+                            "period": period,
+                            "tail_period": tail_period,
+                            "points_added": added,
+                            "points": len(series.timestamps)
+                        })
+                        return self._response(url, series.document())
+
+        response = await self.client.request(method, url, **kwargs)
+        self.downloads += 1
+        if response.is_success:
+            try:
+                self._store(key, ChartSeries(period, response.json(), now))
+            except (KeyError, TypeError, ValueError, IndexError) as e:
+                # Unexpected layout or a passthrough body: serve it uncached
+                logger.debug("Chart not cached", extra={"error": str(e)})
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        """Report cached series, point memory and hit counters."""
+        return {
+            "series": len(self._series),
+            "bytes": sum(s.nbytes for s in self._series.values()),
+            "hits": self.hits,
+            "refreshes": self.refreshes,
+            "downloads": self.downloads
+        }
@@ -4,7 +4,7 @@
 import os
 import re
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 import yaml
 
 from .errors import ConfigError
@@ -28,9 +28,115 @@ class ConfigManager:
             "exponential_base": 2
         },
         "wallet_indexing": {
-            "retry_delay": 3,
-            "max_retries": 3,
+            "retry_delay": 1,
+            "max_delay": 5,
+            "max_retries": 5,
+            "indexed_ttl": 300,
             "auto_retry": True
+        },
+        "quota": {
+            "enabled": True,
+            "path": "~/.cache/zerion-mcp-server/quota.sqlite3",
+            "daily_soft_limit": None,
+            "daily_hard_limit": None
+        },
+        "scheduler": {
+            "enabled": True,
+            "max_concurrency": 1,
+            "aging_interval": 5
+        },
+        "tool_snapshot": {
+            "enabled": True,
+            "path": "~/.cache/zerion-mcp-server/tool_snapshot.json"
+        },
+        "streaming": {
+            "enabled": False,
+            "forward_items": False
+        },
+        "passthrough": {
+            "operations": []
+        },
+        "validation": {
+            "enabled": True,
+            "max_url_length": 2000
+        },
+        "filter_splitting": {
+            "enabled": True,
+            "max_requests": 8
+        },
+        "analytics": {
+            "enabled": False,
+            "ttl": 300,
+            "max_pages": 20,
+            "max_wallets": 32
+        },
+        "portfolio": {
+            "enabled": False,
+            "max_wallets": 50,
+            "max_concurrency": 8,
+            "max_pages": 10
+        },
+        "position_diff": {
+            "enabled": False,
+            "max_snapshots": 256,
+            "max_pages": 10
+        },
+        "swap_quotes": {
+            "enabled": False,
+            "ttl": 5,
+            "amount_tolerance": 0.001,
+            "max_entries": 512,
+            "max_amounts": 10
+        },
+        "gas_prices": {
+            "enabled": False,
+            "chain_ids": [],
+            "interval": 10,
+            "max_age": 30,
+            "idle_after": 300
+        },
+        "prices": {
+            "enabled": False,
+            "ttl": 30,
+            "max_ids": 200,
+            "max_entries": 4096
+        },
+        "chart_cache": {
+            "enabled": False,
+            "ttl": 60,
+            "max_series": 256
+        },
+        "http_cache": {
+            "enabled": False,
+            "path": "~/.cache/zerion-mcp-server/http_cache.sqlite3",
+            "max_size_mb": 256,
+            "default_ttl": 0,
+            "max_stale": 604800,
+            "compact_interval": 86400
+        },
+        "sidecar": {
+            "enabled": False,
+            "socket_path": "~/.cache/zerion-mcp-server/sidecar.sock",
+            "autostart": True,
+            "startup_timeout": 30
+        },
+        "tools": {
+            "include_operations": [],
+            "include_tags": [],
+            "exclude_operations": [],
+            "exclude_tags": []
+        },
+        "http": {
+            "host": "127.0.0.1",
+            "port": 8000,
+            "workers": 1,
+            "shared_state_path": "~/.cache/zerion-mcp-server/limiter.sqlite3",
+            "keep_alive": 5,
+            "max_concurrent_streams": 100,
+            "max_sessions": 100,
+            "session_idle_timeout": 3600,
+            "send_timeout": 30,
+            "graceful_shutdown_timeout": 10
         }
     }
     
@@ -88,6 +194,11 @@ class ConfigManager:
         if api_key:
             self._config["api_key"] = api_key
         
+        # Override API key pool (comma-separated)
+        api_keys = os.getenv("ZERION_API_KEYS")
+        if api_keys:
+            self._config["api_keys"] = [k.strip() for k in api_keys.split(",") if k.strip()]
+        
         # Override base URL
         base_url = os.getenv("ZERION_BASE_URL")
         if base_url:
@@ -151,13 +262,28 @@ class ConfigManager:
     def _validate(self) -> None:
         """Validate required configuration fields."""
         # Check for API key
-        if "api_key" not in self._config:
+        if "api_key" not in self._config and not self._config.get("api_keys"):
             raise ConfigError(
                 "Missing required configuration: api_key\n"
                 "Set ZERION_API_KEY environment variable or add 'api_key' to config.yaml\n"
                 "Example: export ZERION_API_KEY='Bearer your-api-key-here'"
             )
         
+        # Validate API key pool entries
+        api_keys = self._config.get("api_keys")
+        if api_keys is not None:
+            if not isinstance(api_keys, list):
+                raise ConfigError("Invalid api_keys: must be a list of keys")
+            for i, entry in enumerate(api_keys):
+                if isinstance(entry, dict):
+                    if not entry.get("key"):
+                        raise ConfigError(f"Invalid api_keys[{i}]: missing 'key'")
+                    rate_limit = entry.get("rate_limit")
+                    if rate_limit is not None and (not isinstance(rate_limit, (int, float)) or rate_limit <= 0):
+                        raise ConfigError(f"Invalid api_keys[{i}].rate_limit: {rate_limit} (must be a positive number)")
+                elif not isinstance(entry, str) or not entry:
+                    raise ConfigError(f"Invalid api_keys[{i}]: must be a string or a mapping with 'key'")
+        
         # Check for base URL
         if not self._config.get("base_url"):
             raise ConfigError("Missing required configuration: base_url")
@@ -170,6 +296,146 @@ class ConfigManager:
         # Check for OAS URL
         if not self._config.get("oas_url"):
             raise ConfigError("Missing required configuration: oas_url")
+        
+        # Validate quota budgets
+        quota = self._config.get("quota") or {}
+        for budget in ("daily_soft_limit", "daily_hard_limit"):
+            value = quota.get(budget)
+            if value is not None and (not isinstance(value, int) or value <= 0):
+                raise ConfigError(f"Invalid quota.{budget}: {value} (must be a positive integer)")
+        soft, hard = quota.get("daily_soft_limit"), quota.get("daily_hard_limit")
+        if soft is not None and hard is not None and soft > hard:
+            raise ConfigError("Invalid quota: daily_soft_limit must not exceed daily_hard_limit")
+
+        # Validate tool filter lists
+        tools = self._config.get("tools") or {}
+        for rule in ("include_operations", "include_tags", "exclude_operations", "exclude_tags"):
+            value = tools.get(rule)
+            if value is not None and (
+                not isinstance(value, list) or not all(isinstance(v, str) for v in value)
+            ):
+                raise ConfigError(f"Invalid tools.{rule}: must be a list of strings")
+
+        # Validate passthrough operations
+        passthrough = (self._config.get("passthrough") or {}).get("operations")
+        if passthrough is not None and (
+            not isinstance(passthrough, list) or not all(isinstance(v, str) for v in passthrough)
+        ):
+            raise ConfigError("Invalid passthrough.operations: must be a list of operationIds")
+
+        # Validate request validation settings
+        validation = self._config.get("validation") or {}
+        max_url_length = validation.get("max_url_length")
+        if max_url_length is not None and (not isinstance(max_url_length, int) or max_url_length < 0):
+            raise ConfigError(
+                f"Invalid validation.max_url_length: {max_url_length} (must be a non-negative integer, 0 disables)"
+            )
+
+        # Validate filter splitting settings
+        filter_splitting = self._config.get("filter_splitting") or {}
+        max_requests = filter_splitting.get("max_requests")
+        if max_requests is not None and (not isinstance(max_requests, int) or max_requests < 1):
+            raise ConfigError(f"Invalid filter_splitting.max_requests: {max_requests} (must be a positive integer)")
+
+        # Validate analytics settings
+        analytics = self._config.get("analytics") or {}
+        ttl = analytics.get("ttl")
+        if ttl is not None and (not isinstance(ttl, (int, float)) or ttl < 0):
+            raise ConfigError(f"Invalid analytics.ttl: {ttl} (must be a non-negative number)")
+        for field in ("max_pages", "max_wallets"):
+            value = analytics.get(field)
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise ConfigError(f"Invalid analytics.{field}: {value} (must be a positive integer)")
+
+        # Validate portfolio aggregation settings
+        portfolio = self._config.get("portfolio") or {}
+        for field in ("max_wallets", "max_concurrency", "max_pages"):
+            value = portfolio.get(field)
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise ConfigError(f"Invalid portfolio.{field}: {value} (must be a positive integer)")
+
+        # Validate position diff settings
+        position_diff = self._config.get("position_diff") or {}
+        for field in ("max_snapshots", "max_pages"):
+            value = position_diff.get(field)
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise ConfigError(f"Invalid position_diff.{field}: {value} (must be a positive integer)")
+
+        # Validate swap quote settings
+        swap_quotes = self._config.get("swap_quotes") or {}
+        for field in ("ttl", "amount_tolerance"):
+            value = swap_quotes.get(field)
+            if value is not None and (not isinstance(value, (int, float)) or value < 0):
+                raise ConfigError(f"Invalid swap_quotes.{field}: {value} (must be a non-negative number)")
+        for field in ("max_entries", "max_amounts"):
+            value = swap_quotes.get(field)
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise ConfigError(f"Invalid swap_quotes.{field}: {value} (must be a positive integer)")
+
+        # Validate gas price polling settings
+        gas_prices = self._config.get("gas_prices") or {}
+        chain_ids = gas_prices.get("chain_ids")
+        if chain_ids is not None and (
+            not isinstance(chain_ids, list) or not all(isinstance(c, str) for c in chain_ids)
+        ):
+            raise ConfigError("Invalid gas_prices.chain_ids: must be a list of chain ids")
+        for field in ("interval", "idle_after"):
+            value = gas_prices.get(field)
+            if value is not None and (not isinstance(value, (int, float)) or value <= 0):
+                raise ConfigError(f"Invalid gas_prices.{field}: {value} (must be a positive number)")
+        max_age = gas_prices.get("max_age")
+        if max_age is not None and (not isinstance(max_age, (int, float)) or max_age < 0):
+            raise ConfigError(f"Invalid gas_prices.max_age: {max_age} (must be a non-negative number)")
+
+        # Validate price lookup settings
+        prices = self._config.get("prices") or {}
+        ttl = prices.get("ttl")
+        if ttl is not None and (not isinstance(ttl, (int, float)) or ttl < 0):
+            raise ConfigError(f"Invalid prices.ttl: {ttl} (must be a non-negative number)")
+        for field in ("max_ids", "max_entries"):
+            value = prices.get(field)
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise ConfigError(f"Invalid prices.{field}: {value} (must be a positive integer)")
+
+        # Validate chart cache settings
+        chart_cache = self._config.get("chart_cache") or {}
+        ttl = chart_cache.get("ttl")
+        if ttl is not None and (not isinstance(ttl, (int, float)) or ttl < 0):
+            raise ConfigError(f"Invalid chart_cache.ttl: {ttl} (must be a non-negative number)")
+        max_series = chart_cache.get("max_series")
+        if max_series is not None and (not isinstance(max_series, int) or max_series < 1):
+            raise ConfigError(f"Invalid chart_cache.max_series: {max_series} (must be a positive integer)")
+
+        # Validate HTTP cache settings
+        http_cache = self._config.get("http_cache") or {}
+        max_size = http_cache.get("max_size_mb")
+        if max_size is not None and (not isinstance(max_size, (int, float)) or max_size <= 0):
+            raise ConfigError(f"Invalid http_cache.max_size_mb: {max_size} (must be a positive number)")
+        for option in ("default_ttl", "max_stale", "compact_interval"):
+            value = http_cache.get(option)
+            if value is not None and (not isinstance(value, (int, float)) or value < 0):
+                raise ConfigError(f"Invalid http_cache.{option}: {value} (must be a non-negative number)")
+
+        # Validate sidecar settings
+        startup_timeout = (self._config.get("sidecar") or {}).get("startup_timeout")
+        if startup_timeout is not None and (not isinstance(startup_timeout, (int, float)) or startup_timeout <= 0):
+            raise ConfigError(f"Invalid sidecar.startup_timeout: {startup_timeout} (must be a positive number)")
+
+        # Validate HTTP transport settings
+        http = self._config.get("http") or {}
+        port = http.get("port")
+        if port is not None and (not isinstance(port, int) or not 0 < port < 65536):
+            raise ConfigError(f"Invalid http.port: {port} (must be an integer between 1 and 65535)")
+        workers = http.get("workers")
+        if workers is not None and (not isinstance(workers, int) or workers < 1):
+            raise ConfigError(f"Invalid http.workers: {workers} (must be a positive integer)")
+        for option in (
+            "keep_alive", "max_concurrent_streams", "max_sessions", "session_idle_timeout",
+            "send_timeout", "graceful_shutdown_timeout"
+        ):
+            value = http.get(option)
+            if value is not None and (not isinstance(value, (int, float)) or value <= 0):
+                raise ConfigError(f"Invalid http.{option}: {value} (must be a positive number)")
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by key.
@@ -211,8 +477,36 @@ class ConfigManager:
     
     @property
     def api_key(self) -> str:
-        """Get API key."""
-        return self._config["api_key"]
+        """Get API key (the first pooled key if only api_keys is set)."""
+        if "api_key" in self._config:
+            return self._config["api_key"]
+        return self.api_keys[0]["key"]
+
+    @property
+    def api_keys(self) -> List[Dict[str, Any]]:
+        """Get API key pool definitions.
+
+        Entries of ``api_keys`` may be plain strings or mappings with ``key``,
+        ``name``, ``rate_limit`` (requests per second) and ``burst``. Without
+        ``api_keys``, the single ``api_key`` forms a one-key pool.
+        """
+        entries = self._config.get("api_keys") or [self._config["api_key"]]
+        keys = []
+        for i, entry in enumerate(entries):
+            if isinstance(entry, str):
+                entry = {"key": entry}
+            keys.append({
+                "name": entry.get("name") or f"key-{i + 1}",
+                "key": entry["key"],
+                "rate_limit": entry.get("rate_limit"),
+                "burst": entry.get("burst")
+            })
+        return keys
+
+    @property
+    def key_cooldown(self) -> float:
+        """Get seconds a pooled key stays out of rotation after a 429 without Retry-After."""
+        return self._config.get("key_cooldown", 1.0)
     
     @property
     def log_level(self) -> str:
@@ -238,8 +532,10 @@ class ConfigManager:
     def indexing_config(self) -> Dict[str, Any]:
         """Get wallet indexing configuration."""
         return self._config.get("wallet_indexing", {
-            "retry_delay": 3,
-            "max_retries": 3,
+            "retry_delay": 1,
+            "max_delay": 5,
+            "max_retries": 5,
+            "indexed_ttl": 300,
             "auto_retry": True
         })
 
@@ -251,6 +547,211 @@ class ConfigManager:
             "max_auto_pages": 50
         })
 
+    @property
+    def quota_config(self) -> Dict[str, Any]:
+        """Get daily quota ledger configuration."""
+        quota = {
+            "enabled": True,
+            "path": "~/.cache/zerion-mcp-server/quota.sqlite3",
+            "daily_soft_limit": None,
+            "daily_hard_limit": None
+        }
+        quota.update(self._config.get("quota") or {})
+        return quota
+
+    @property
+    def scheduler_config(self) -> Dict[str, Any]:
+        """Get priority scheduler configuration."""
+        scheduler = {
+            "enabled": True,
+            "max_concurrency": 1,
+            "aging_interval": 5
+        }
+        scheduler.update(self._config.get("scheduler") or {})
+        return scheduler
+
+    @property
+    def tool_snapshot_config(self) -> Dict[str, Any]:
+        """Get precompiled tool snapshot configuration."""
+        snapshot = {
+            "enabled": True,
+            "path": "~/.cache/zerion-mcp-server/tool_snapshot.json"
+        }
+        snapshot.update(self._config.get("tool_snapshot") or {})
+        return snapshot
+
+    @property
+    def streaming_config(self) -> Dict[str, Any]:
+        """Get incremental response streaming configuration."""
+        streaming = {
+            "enabled": False,
+            "forward_items": False
+        }
+        streaming.update(self._config.get("streaming") or {})
+        return streaming
+
+    @property
+    def passthrough_operations(self) -> List[str]:
+        """Get operationIds whose responses are passed through undecoded."""
+        return list((self._config.get("passthrough") or {}).get("operations") or [])
+
+    @property
+    def validation_config(self) -> Dict[str, Any]:
+        """Get local request parameter validation configuration."""
+        validation = {
+            "enabled": True,
+            "max_url_length": 2000
+        }
+        validation.update(self._config.get("validation") or {})
+        return validation
+
+    @property
+    def filter_splitting_config(self) -> Dict[str, Any]:
+        """Get filter list splitting configuration."""
+        filter_splitting = {
+            "enabled": True,
+            "max_requests": 8
+        }
+        filter_splitting.update(self._config.get("filter_splitting") or {})
+        return filter_splitting
+
+    @property
+    def analytics_config(self) -> Dict[str, Any]:
+        """Get transaction analytics tool configuration."""
+        analytics = {
+            "enabled": False,
+            "ttl": 300,
+            "max_pages": 20,
+            "max_wallets": 32
+        }
+        analytics.update(self._config.get("analytics") or {})
+        return analytics
+
+    @property
+    def portfolio_config(self) -> Dict[str, Any]:
+        """Get multi-wallet portfolio aggregation tool configuration."""
+        portfolio = {
+            "enabled": False,
+            "max_wallets": 50,
+            "max_concurrency": 8,
+            "max_pages": 10
+        }
+        portfolio.update(self._config.get("portfolio") or {})
+        return portfolio
+
+    @property
+    def position_diff_config(self) -> Dict[str, Any]:
+        """Get position snapshot diff tool configuration."""
+        position_diff = {
+            "enabled": False,
+            "max_snapshots": 256,
+            "max_pages": 10
+        }
+        position_diff.update(self._config.get("position_diff") or {})
+        return position_diff
+
+    @property
+    def swap_quotes_config(self) -> Dict[str, Any]:
+        """Get swap quote cache and comparison tool configuration."""
+        swap_quotes = {
+            "enabled": False,
+            "ttl": 5,
+            "amount_tolerance": 0.001,
+            "max_entries": 512,
+            "max_amounts": 10
+        }
+        swap_quotes.update(self._config.get("swap_quotes") or {})
+        return swap_quotes
+
+    @property
+    def gas_prices_config(self) -> Dict[str, Any]:
+        """Get gas price polling configuration."""
+        gas_prices = {
+            "enabled": False,
+            "chain_ids": [],
+            "interval": 10,
+            "max_age": 30,
+            "idle_after": 300
+        }
+        gas_prices.update(self._config.get("gas_prices") or {})
+        return gas_prices
+
+    @property
+    def prices_config(self) -> Dict[str, Any]:
+        """Get batch fungible price tool configuration."""
+        prices = {
+            "enabled": False,
+            "ttl": 30,
+            "max_ids": 200,
+            "max_entries": 4096
+        }
+        prices.update(self._config.get("prices") or {})
+        return prices
+
+    @property
+    def chart_cache_config(self) -> Dict[str, Any]:
+        """Get in-memory chart series cache configuration."""
+        chart_cache = {
+            "enabled": False,
+            "ttl": 60,
+            "max_series": 256
+        }
+        chart_cache.update(self._config.get("chart_cache") or {})
+        return chart_cache
+
+    @property
+    def http_cache_config(self) -> Dict[str, Any]:
+        """Get persistent HTTP response cache configuration."""
+        http_cache = {
+            "enabled": False,
+            "path": "~/.cache/zerion-mcp-server/http_cache.sqlite3",
+            "max_size_mb": 256,
+            "default_ttl": 0,
+            "max_stale": 604800,
+            "compact_interval": 86400
+        }
+        http_cache.update(self._config.get("http_cache") or {})
+        return http_cache
+
+    @property
+    def sidecar_config(self) -> Dict[str, Any]:
+        """Get per-host sidecar daemon configuration."""
+        sidecar = {
+            "enabled": False,
+            "socket_path": "~/.cache/zerion-mcp-server/sidecar.sock",
+            "autostart": True,
+            "startup_timeout": 30
+        }
+        sidecar.update(self._config.get("sidecar") or {})
+        return sidecar
+
+    @property
+    def tool_filter_config(self) -> Dict[str, List[str]]:
+        """Get operation include/exclude rules (operationIds and tags)."""
+        tools = self._config.get("tools") or {}
+        return {
+            rule: list(tools.get(rule) or [])
+            for rule in ("include_operations", "include_tags", "exclude_operations", "exclude_tags")
+        }
+
+    @property
+    def http_config(self) -> Dict[str, Any]:
+        """Get HTTP transport configuration (binding, workers and connection limits)."""
+        http = {
+            "host": "127.0.0.1",
+            "port": 8000,
+            "workers": 1,
+            "shared_state_path": "~/.cache/zerion-mcp-server/limiter.sqlite3",
+            "keep_alive": 5,
+            "max_concurrent_streams": 100,
+            "max_sessions": 100,
+            "session_idle_timeout": 3600,
+            "send_timeout": 30,
+            "graceful_shutdown_timeout": 10
+        }
+        http.update(self._config.get("http") or {})
+        return http
+
     def to_dict(self, redact_secrets: bool = True) -> Dict[str, Any]:
         """Export configuration as dictionary.
         
@@ -265,4 +766,7 @@ class ConfigManager:
         if redact_secrets and "api_key" in config:
             config["api_key"] = "***REDACTED***"
         
+        if redact_secrets and "api_keys" in config:
+            config["api_keys"] = ["***REDACTED***" for _ in config["api_keys"]]
+        
         return config
@@ -282,3 +282,49 @@ class WalletIndexingError(APIError):
         self.retry_delay = retry_delay
         self.max_retries = max_retries
         self.attempts = attempts
+
+
+class QuotaExceededError(ZerionMCPError):
+    """Raised when a request is refused locally by the daily quota budget.
+
+    No upstream call is made. Low-priority work (auto-pagination, prefetch)
+    is refused at the soft budget; interactive calls only at the hard budget.
+
+    Examples:
+        - Auto-pagination after the daily soft budget is spent
+        - Any request after the daily hard budget is spent
+
+    Attributes:
+        used: Requests already made today
+        limit: Budget that refused the request
+        priority: Name of the refused request's priority
+    """
+
+    def __init__(
+        self,
+        message: str,
+        used: int = 0,
+        limit: Optional[int] = None,
+        priority: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None
+    ):
+        """Initialize quota exceeded error.
+
+        Args:
+            message: Error message.
+            used: Requests already made today.
+            limit: Budget that refused the request.
+            priority: Name of the refused request's priority.
+            context: Additional context.
+        """
+        context = context or {}
+        context["used"] = used
+        if limit is not None:
+            context["limit"] = limit
+        if priority:
+            context["priority"] = priority
+
+        super().__init__(message, context)
+        self.used = used
+        self.limit = limit
+        self.priority = priority
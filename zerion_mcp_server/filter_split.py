@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""Splitting of over-long filter lists into concurrent requests.
+
+Zerion's list endpoints take id filters as comma-separated lists (e.g.
+filter[fungible_ids]) and the spec warns to keep URLs under about 2000
+characters; some filters also cap the number of ids. A request whose
+longest id filter breaks either limit is split into requests over chunks
+of that filter, sent concurrently. Their data arrays are merged, deduped
+by id and, where the operation has an ordering, merge-sorted, so the
+tool caller sees one response.
+
+Each chunk has its own pagination cursor. links.next of a merged page
+carries all of them in one page[after] token, so following it continues
+every chunk where it stopped.
+"""
+
+import asyncio
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from fastmcp.server.middleware import Middleware
+
+from .errors import ValidationError
+from .logger import get_logger
+from .param_validation import RequestValidator
+from .streaming import StreamedResponse
+
+logger = get_logger(__name__)
+
+# List operations whose id filters can be split, with their default order
+# (a sort parameter value; None when the order is not defined)
+SPLIT_OPERATIONS: Dict[str, Optional[str]] = {
+    "listWalletTransactions": "-mined_at",
+    "listWalletPositions": "value",
+    "listFungibles": "-market_data.market_cap",
+    "listWalletNFTPositions": None,
+    "listWalletNFTCollections": None,
+    "listNFTs": None,
+    "listGasPrices": None
+}
+
+PAGE_AFTER = "page[after]"
+
+# page[after] values carrying the cursors of split requests
+SPLIT_CURSOR_PREFIX = "split:"
+
+# URL characters kept free in each split request for its page[after] cursor
+CURSOR_RESERVE = 128
+
+
+def encode_cursor(cursors: List[Optional[str]]) -> str:
+    """page[after] token for the chunks' cursors (None for finished chunks)."""
+    payload = json.dumps(cursors, separators=(",", ":")).encode()
+    return SPLIT_CURSOR_PREFIX + base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(token: str, chunks: int) -> List[Optional[str]]:
+    """Chunk cursors of a page[after] token from encode_cursor().
+
+    Raises:
+        ValidationError: If the token is malformed or made for another split.
+    """
+    payload = token[len(SPLIT_CURSOR_PREFIX):]
+    try:
+        cursors = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    except ValueError:
+        cursors = None
+    if not isinstance(cursors, list) or len(cursors) != chunks or not any(cursors):
+        raise ValidationError(
+            "Invalid page[after] cursor for this request; pass the filters of the previous page unchanged",
+            field=PAGE_AFTER
+        )
+    return cursors
+
+
+def _values(value: Any) -> List[str]:
+    return [v for v in value.split(",") if v] if isinstance(value, str) else [str(v) for v in value]
+
+
+def _encoded_length(value: str) -> int:
+    """Length of a value once percent-encoded into the query string."""
+    return len(str(httpx.QueryParams({"": value}))) - 1
+
+
+def _sort_value(item: Any, path: List[str]) -> Any:
+    node = item.get("attributes") if isinstance(item, dict) else None
+    for part in path:
+        if not isinstance(node, dict):
+            return None
+        node = node.get(part)
+    return node
+
+
+def merge_documents(documents: List[Dict[str, Any]], sort: Optional[str]) -> Dict[str, Any]:
+    """Merge the documents of split requests into one.
+
+    Items are deduped by id (first occurrence kept) and, if sort is given
+    (a sort parameter value such as '-mined_at'), ordered by that
+    attribute, with items lacking it last.
+
+    Args:
+        documents: Response documents, in chunk order.
+        sort: Attribute path to order by, '-' prefixed for descending.
+
+    Returns:
+        The first document with the merged data array.
+    """
+    seen = set()
+    items: List[Any] = []
+    for document in documents:
+        for item in document.get("data") or []:
+            item_id = item.get("id") if isinstance(item, dict) else None
+            if item_id is not None:
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+            items.append(item)
+
+    if sort:
+        path = sort.lstrip("-").split(".")
+        keyed = [(_sort_value(item, path), item) for item in items]
+        present = [pair for pair in keyed if pair[0] is not None]
+        try:
+            present.sort(key=lambda pair: pair[0], reverse=sort.startswith("-"))
+        except TypeError:
+            # Mixed value types: keep chunk order
+            pass
+        else:
+            items = [item for _, item in present] + [item for value, item in keyed if value is None]
+
+    return {**documents[0], "data": items}
+
+
+def splittable_filters(validator: RequestValidator, operation_id: Optional[str]) -> Dict[str, Any]:
+    """Id filters of a split operation (query arrays without an enum) by name."""
+    operation = validator.validators.get(operation_id) if operation_id in SPLIT_OPERATIONS else None
+    if operation is None:
+        return {}
+    return {
+        name: parameter for name, parameter in operation.query.items()
+        if parameter.is_array and parameter.enum is None
+    }
+
+
+def _document(response: httpx.Response) -> Dict[str, Any]:
+    try:
+        return response.json()
+    except json.JSONDecodeError:
+        # PassthroughResponse does not decode itself
+        return json.loads(response.content)
+
+
+class SplittingToolClient:
+    """Client for OpenAPI tools that splits over-long filter lists.
+
+    Requests of SPLIT_OPERATIONS are split over their longest id filter
+    when it has more values than the spec allows or the URL would exceed
+    the validator's max_url_length. Other requests are delegated as-is.
+
+    Attributes:
+        client: Wrapped tool client sending each request
+        validator: RequestValidator providing the rules and URL lengths
+        max_requests: Most requests one call is split into
+    """
+
+    def __init__(self, client: Any, validator: RequestValidator, max_requests: int = 8):
+        """Initialize splitting client.
+
+        Args:
+            client: Tool client to send the (split) requests with.
+            validator: RequestValidator for the spec's operations.
+            max_requests: Requests one call may be split into; larger
+                splits are sent unsplit (and rejected by validation).
+        """
+        self.client = client
+        self.validator = validator
+        self.max_requests = max_requests
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def _split_filter(self, operation_id: Optional[str], params: Dict[str, Any]) -> Optional[Tuple[str, int, List[str]]]:
+        """The id filter to split on: (name, max items, values), longest first."""
+        best = None
+        for name, parameter in splittable_filters(self.validator, operation_id).items():
+            if params.get(name) is None:
+                continue
+            values = _values(params[name])
+            length = sum(map(_encoded_length, values))
+            if best is None or length > best[0]:
+                best = (length, name, parameter.max_items, values)
+        return best[1:] if best else None
+
+    def chunks(self, url: Any, params: Dict[str, Any], name: str, max_items: Optional[int], values: List[str]) -> List[str]:
+        """Pack a filter's values into comma-joined chunks within the limits.
+
+        Chunk boundaries depend only on the request without its cursor, so
+        every page of a split call is split the same way.
+        """
+        budget = float("inf")
+        if self.validator.max_url_length:
+            rest = {k: v for k, v in params.items() if k not in (name, PAGE_AFTER)}
+            empty = self.validator.url_length(url, {**rest, name: ""})
+            budget = self.validator.max_url_length - empty - CURSOR_RESERVE
+        separator = _encoded_length(",")
+
+        chunks: List[List[str]] = [[]]
+        used = 0
+        for value in values:
+            cost = _encoded_length(value)
+            chunk = chunks[-1]
+            full = max_items is not None and len(chunk) >= max_items
+            if chunk and (full or used + separator + cost > budget):
+                chunks.append([])
+                chunk, used = chunks[-1], 0
+            used += cost + (separator if chunk else 0)
+            chunk.append(value)
+        return [",".join(chunk) for chunk in chunks]
+
+    async def request(self, method: str, url: Any, **kwargs: Any) -> httpx.Response:
+        """Make a request, splitting it over an over-long filter list if needed.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            **kwargs: Request arguments.
+
+        Returns:
+            The wrapped client's response, or a merged response for split
+            requests (the first failing chunk's response if any fails).
+        """
+        params = kwargs.get("params")
+        operations = self.validator.operations
+        operation_id = operations.resolve(method, url) if operations is not None and params else None
+        if operation_id not in SPLIT_OPERATIONS:
+            return await self.client.request(method, url, **kwargs)
+
+        split = self._split_filter(operation_id, params)
+        if split is None:
+            return await self.client.request(method, url, **kwargs)
+        name, max_items, values = split
+        token = params.get(PAGE_AFTER)
+        continued = isinstance(token, str) and token.startswith(SPLIT_CURSOR_PREFIX)
+        if not continued and (max_items is None or len(values) <= max_items) \
+                and self.validator.exceeds_url_limit(url, params) is None:
+            return await self.client.request(method, url, **kwargs)
+
+        chunks = self.chunks(url, params, name, max_items, values)
+        if len(chunks) > self.max_requests or (len(chunks) == 1 and not continued):
+            logger.debug("Filter list not split", extra={"operation_id": operation_id, "chunks": len(chunks)})
+            return await self.client.request(method, url, **kwargs)
+        cursors = decode_cursor(token, len(chunks)) if continued else [None] * len(chunks)
+
+        async def fetch(chunk: str, cursor: Optional[str]) -> httpx.Response:
+            chunk_params = {k: v for k, v in params.items() if k != PAGE_AFTER}
+            chunk_params[name] = chunk
+            if cursor:
+                chunk_params[PAGE_AFTER] = cursor
+            return await self.client.request(method, url, **{**kwargs, "params": chunk_params})
+
+        # A finished chunk (no cursor on a continued call) is not requested again
+        active = [i for i in range(len(chunks)) if not continued or cursors[i]]
+        responses = await asyncio.gather(*(fetch(chunks[i], cursors[i]) for i in active))
+        for response in responses:
+            if not response.is_success:
+                return response
+
+        documents = [_document(response) for response in responses]
+        next_cursors: List[Optional[str]] = [None] * len(chunks)
+        next_url = None
+        for i, document in zip(active, documents):
+            link = (document.get("links") or {}).get("next")
+            if link:
+                next_cursors[i] = httpx.URL(link).params.get(PAGE_AFTER)
+                next_url = next_url or link
+
+        merged = merge_documents(documents, params.get("sort") or SPLIT_OPERATIONS[operation_id])
+        links = dict(merged.get("links") or {})
+        links.pop("next", None)
+        if next_url and any(next_cursors):
+            links["next"] = str(httpx.URL(next_url).copy_set_param(PAGE_AFTER, encode_cursor(next_cursors)))
+        merged["links"] = links
+        logger.debug("Filter list split", extra={
+            "operation_id": operation_id,
+            "filter": name,
+            "requests": len(active),
+            "items": len(merged["data"])
+        })
+        return StreamedResponse(responses[0], merged)
+
+
+class FilterSplittingMiddleware(Middleware):
+    """Lifts the limits split requests break from the tool schemas.
+
+    MCP validates tool arguments against the listed input schema, so a
+    list over the spec's maxItems would be refused before
+    SplittingToolClient could split it. The same goes for the split
+    page[after] token, which is longer than the spec's cursor maxLength.
+
+    Attributes:
+        validator: RequestValidator the splitting client uses
+    """
+
+    def __init__(self, validator: RequestValidator):
+        """Initialize middleware.
+
+        Args:
+            validator: RequestValidator for the spec's operations.
+        """
+        self.validator = validator
+
+    async def on_list_tools(self, context: Any, call_next: Any) -> List[Any]:
+        tools = await call_next(context)
+        result = []
+        for tool in tools:
+            names = splittable_filters(self.validator, tool.name)
+            properties = tool.parameters.get("properties", {})
+            lifted = {
+                name: {
+                    **{k: v for k, v in properties[name].items() if k != "maxItems"},
+                    "description": (properties[name].get("description", "") +
+                                    " Longer lists are split into several requests.").strip()
+                }
+                for name, parameter in names.items()
+                if parameter.max_items is not None and "maxItems" in properties.get(name, {})
+            }
+            page = properties.get("page") or {}
+            after = (page.get("properties") or {}).get("after") or {}
+            if names and "maxLength" in after:
+                after = {k: v for k, v in after.items() if k != "maxLength"}
+                lifted["page"] = {**page, "properties": {**page["properties"], "after": after}}
+            if lifted:
+                tool = tool.model_copy(update={"parameters": {**tool.parameters, "properties": {**properties, **lifted}}})
+            result.append(tool)
+        return result
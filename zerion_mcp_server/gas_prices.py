@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Background gas price polling with an in-memory latest-value store.
+
+Transaction-building agents call listGasPrices before nearly every
+transaction, and each call is an upstream round trip for data that
+changes every few seconds at most. GasPriceStore polls listGasPrices for
+the configured chains at a fixed interval (as BACKGROUND requests, so the
+quota soft budget can refuse them) and keeps the latest document. Tool
+calls are answered from memory, filtered by chain and gas type, with the
+fetch time and age in meta. Data older than max_age is refreshed with one
+live call, shared by concurrent readers.
+
+The poller starts with the first read and pauses when nothing has read
+the store for idle_after seconds, so an idle server does not spend quota.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+import httpx
+
+from .errors import ZerionMCPError
+from .logger import get_logger
+from .priority import Priority, request_priority
+from .streaming import StreamedResponse
+
+logger = get_logger(__name__)
+
+GAS_OPERATION = "listGasPrices"
+GAS_PRICES_URL = "/v1/gas-prices/"
+
+
+def _filter_values(value: Any) -> Optional[List[str]]:
+    if value is None:
+        return None
+    return [v for v in value.split(",") if v] if isinstance(value, str) else [str(v) for v in value]
+
+
+def _chain_id(item: Dict[str, Any]) -> Optional[str]:
+    return (((item.get("relationships") or {}).get("chain") or {}).get("data") or {}).get("id")
+
+
+class GasPriceStore:
+    """Latest gas prices of the configured chains, refreshed in the background.
+
+    Attributes:
+        client: Upstream client (RetryAsyncClient or SidecarClient)
+        chain_ids: Chains polled (empty for all chains)
+        interval: Seconds between polls
+        max_age: Oldest data served without a live call, in seconds
+        idle_after: Seconds without reads after which polling pauses
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        chain_ids: Iterable[str] = (),
+        interval: float = 10,
+        max_age: float = 30,
+        idle_after: float = 300
+    ):
+        """Initialize store.
+
+        Args:
+            client: Upstream client for listGasPrices requests.
+            chain_ids: Chains to poll (empty polls all chains in one request).
+            interval: Seconds between polls.
+            max_age: Oldest data served without a live call, in seconds.
+            idle_after: Seconds without reads after which polling pauses.
+        """
+        self.client = client
+        self.chain_ids = list(chain_ids)
+        self.interval = interval
+        self.max_age = max_age
+        self.idle_after = idle_after
+        self._response: Optional[httpx.Response] = None
+        self._items: List[Dict[str, Any]] = []
+        self._fetched_at = 0.0
+        self._fetched_wall = 0.0
+        self._last_read = 0.0
+        self._refresh_lock = asyncio.Lock()
+        self._poller: Optional[asyncio.Task] = None
+        # Successful background refreshes
+        self.polls = 0
+        self.live_refreshes = 0
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the stored data was fetched (None before the first fetch)."""
+        return time.monotonic() - self._fetched_at if self._response is not None else None
+
+    async def refresh(self) -> bool:
+        """Fetch gas prices for the configured chains into the store.
+
+        Returns:
+            True if the store was updated.
+        """
+        params = {"filter[chain_ids]": ",".join(self.chain_ids)} if self.chain_ids else {}
+        try:
+            response = await self.client.request("GET", GAS_PRICES_URL, params=params)
+            if not response.is_success:
+                logger.warning("Gas price refresh failed", extra={"status_code": response.status_code})
+                return False
+            document = response.json()
+        except (ZerionMCPError, httpx.HTTPError, ValueError) as e:
+            logger.warning("Gas price refresh failed", extra={"error": str(e)})
+            return False
+        self._response = StreamedResponse(response, document)
+        self._items = list(document.get("data") or [])
+        self._fetched_at = time.monotonic()
+        self._fetched_wall = time.time()
+        return True
+
+    async def _poll(self) -> None:
+        try:
+            while time.monotonic() - self._last_read < self.idle_after:
+                async with self._refresh_lock:
+                    # A live refresh by a reader counts as this poll
+                    age = self.age
+                    if age is None or age >= self.interval:
+                        with request_priority(Priority.BACKGROUND):
+                            if await self.refresh():
+                                self.polls += 1
+                        age = 0.0
+                await asyncio.sleep(self.interval - age)
+            logger.debug("Gas price polling paused", extra={"idle_after": self.idle_after})
+        finally:
+            if self._poller is asyncio.current_task():
+                self._poller = None
+
+    def _ensure_polling(self) -> None:
+        if self._poller is None:
+            self._poller = asyncio.get_running_loop().create_task(self._poll())
+
+    async def stop(self) -> None:
+        """Stop the background poller."""
+        poller, self._poller = self._poller, None
+        if poller is not None:
+            poller.cancel()
+            try:
+                await poller
+            except asyncio.CancelledError:
+                pass
+
+    def covers(self, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, Any]]) -> bool:
+        """Whether a listGasPrices request can be answered from the store.
+
+        Testnet requests (X-Env) and chains outside the configured set are not.
+        """
+        if any(k.lower() == "x-env" for k in (headers or {})):
+            return False
+        if not self.chain_ids:
+            return True
+        requested = _filter_values((params or {}).get("filter[chain_ids]"))
+        return requested is not None and set(requested) <= set(self.chain_ids)
+
+    async def serve(self, params: Optional[Dict[str, Any]] = None) -> Optional[httpx.Response]:
+        """Answer a listGasPrices request from memory.
+
+        Starts the poller if needed, refreshes live if the data is older
+        than max_age, then filters the stored items.
+
+        Args:
+            params: Request parameters (filter[chain_ids], filter[gas_types]).
+
+        Returns:
+            Response with the matching items and meta.fetched_at /
+            meta.age_seconds, or None if no fresh data could be fetched.
+        """
+        self._last_read = time.monotonic()
+        self._ensure_polling()
+        age = self.age
+        if age is None or age > self.max_age:
+            async with self._refresh_lock:
+                # Another reader may have refreshed while this one waited
+                age = self.age
+                if age is None or age > self.max_age:
+                    self.live_refreshes += 1
+                    if not await self.refresh():
+                        return None
+                    age = self.age
+
+        params = params or {}
+        chains = _filter_values(params.get("filter[chain_ids]"))
+        gas_types = _filter_values(params.get("filter[gas_types]"))
+        items = [
+            item for item in self._items
+            if (chains is None or _chain_id(item) in chains)
+            and (gas_types is None or (item.get("attributes") or {}).get("gas_type") in gas_types)
+        ]
+        fetched_at = datetime.fromtimestamp(self._fetched_wall, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        document = {
+            **self._response.json(),
+            "data": items,
+            "meta": {"fetched_at": fetched_at, "age_seconds": round(age, 3)}
+        }
+        return StreamedResponse(self._response, document)
+
+
+class GasPriceToolClient:
+    """Client for OpenAPI tools that answers listGasPrices from a GasPriceStore.
+
+    Attributes:
+        client: Wrapped tool client
+        store: GasPriceStore
+        operations: OperationIndex mapping requests to operationIds
+    """
+
+    def __init__(self, client: Any, store: GasPriceStore, operations: Any):
+        """Initialize gas price client.
+
+        Args:
+            client: Tool client for all other requests (and store misses).
+            store: GasPriceStore.
+            operations: OperationIndex.
+        """
+        self.client = client
+        self.store = store
+        self.operations = operations
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    async def request(self, method: str, url: Any, **kwargs: Any) -> httpx.Response:
+        """Make a request, serving listGasPrices from memory when possible.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            **kwargs: Request arguments.
+
+        Returns:
+            Stored gas prices, or the wrapped client's response.
+        """
+        operation_id = self.operations.resolve(method, url) if self.operations is not None else None
+        if operation_id == GAS_OPERATION and self.store.covers(kwargs.get("params"), kwargs.get("headers")):
+            response = await self.store.serve(kwargs.get("params"))
+            if response is not None:
+                return response
+        return await self.client.request(method, url, **kwargs)
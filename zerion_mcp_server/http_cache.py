@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""Persistent HTTP response cache with conditional revalidation."""
+
+import hashlib
+import json
+import sqlite3
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    fresh_until REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+INSERT OR IGNORE INTO meta (name, value) SELECT 'total_size', COALESCE(SUM(size), 0) FROM entries;
+CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN
+    UPDATE meta SET value = value + NEW.size WHERE name = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries BEGIN
+    UPDATE meta SET value = value + NEW.size - OLD.size WHERE name = 'total_size';
+END;
+CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN
+    UPDATE meta SET value = value - OLD.size WHERE name = 'total_size';
+END;
+"""
+
+# Entry reads are written back (for LRU order) in one transaction once this
+# many entries were read, or once the oldest unwritten read is this old
+_ACCESS_BATCH = 64
+_ACCESS_FLUSH_INTERVAL = 30
+
+# Response headers kept with an entry; hop-by-hop and body framing headers
+# do not describe the stored (decoded) body
+_STORED_HEADERS = {"content-type", "cache-control", "etag", "last-modified", "date", "expires"}
+
+# Request headers that select a different representation (X-Env: testnet)
+_KEY_HEADERS = ("x-env",)
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Parse a Cache-Control header into lowercase directives.
+
+    Args:
+        value: Header value, or None.
+
+    Returns:
+        Mapping of directive to its argument (None for flags).
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+class CacheEntry:
+    """A stored response.
+
+    Attributes:
+        key: Cache key
+        headers: Stored response headers
+        body: Response body
+        fresh_until: Wall-clock time the entry may be served without revalidation
+    """
+
+    def __init__(self, key: str, headers: Dict[str, str], body: bytes, fresh_until: float):
+        self.key = key
+        self.headers = headers
+        self.body = body
+        self.fresh_until = fresh_until
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry can be served without contacting Zerion."""
+        return time.time() < self.fresh_until
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Get If-None-Match / If-Modified-Since headers for revalidation."""
+        headers = {}
+        if "etag" in self.headers:
+            headers["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+    def response(self, request: httpx.Request) -> httpx.Response:
+        """Build a 200 response from the entry."""
+        return httpx.Response(200, headers=self.headers, content=self.body, request=request)
+
+
+class DiskCache:
+    """SQLite-backed HTTP cache shared by every process using the same file.
+
+    Successful GET responses are stored with their validators. Freshness
+    follows Cache-Control (no-store, no-cache, max-age, Age) and Expires;
+    responses without explicit freshness use default_ttl. A stale entry
+    with an ETag or Last-Modified is revalidated with a conditional request,
+    and a 304 serves the stored body.
+
+    The file is bounded by max_bytes: least recently used entries are
+    evicted after a store takes the total over it. The total is kept in the
+    meta table by triggers, so a store does not sum the entries. Reads
+    update last_access in batches (see flush()). compact() drops entries
+    stale for longer than max_stale and returns free pages to the
+    filesystem; it runs on open when the last compaction is older than
+    compact_interval.
+
+    Attributes:
+        path: SQLite cache file
+        max_bytes: Maximum total body size
+        default_ttl: Freshness for responses without Cache-Control/Expires
+        max_stale: Seconds a stale entry is kept for revalidation
+        hits: Fresh entries served
+        revalidated: Entries served after a 304
+        misses: Lookups without a usable entry
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        default_ttl: float = 0,
+        max_stale: float = 7 * 86400,
+        compact_interval: float = 86400
+    ):
+        """Open or create the cache.
+
+        Args:
+            path: SQLite cache file path ('~' is expanded).
+            max_bytes: Maximum total body size before LRU eviction.
+            default_ttl: Freshness in seconds when Zerion sends none.
+            max_stale: Seconds to keep stale entries for revalidation.
+            compact_interval: Seconds between automatic compactions.
+        """
+        self.path = Path(path).expanduser()
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.max_stale = max_stale
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+        # Unwritten last_access times by key, and when the oldest was recorded
+        self._accessed: Dict[str, float] = {}
+        self._accessed_since = 0.0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        # Must be set before the first table is created to take effect
+        self._db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'last_compaction'").fetchone()
+        if row is None or time.time() - row[0] >= compact_interval:
+            self.compact()
+
+        logger.debug("HTTP cache opened", extra={
+            "path": str(self.path),
+            "max_bytes": max_bytes
+        })
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        """Get the cache key for a request (method, URL and X-Env; never the API key)."""
+        parts = [request.method, str(request.url)]
+        parts.extend(request.headers.get(name, "") for name in _KEY_HEADERS)
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def lookup(self, request: httpx.Request) -> Optional[CacheEntry]:
+        """Find the stored response for a request.
+
+        Args:
+            request: Outgoing GET request.
+
+        Returns:
+            The entry (fresh or stale), or None.
+        """
+        key = self.key(request)
+        row = self._db.execute(
+            "SELECT headers, body, fresh_until FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self._touch(key)
+        entry = CacheEntry(key, json.loads(row[0]), row[1], row[2])
+        if entry.fresh:
+            self.hits += 1
+        return entry
+
+    def _touch(self, key: str) -> None:
+        """Record a read of an entry, writing the batch when it is due."""
+        now = time.time()
+        if not self._accessed:
+            self._accessed_since = now
+        self._accessed[key] = now
+        if len(self._accessed) >= _ACCESS_BATCH or now - self._accessed_since >= _ACCESS_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the batched last_access times in one transaction."""
+        if not self._accessed:
+            return
+        accessed, self._accessed = self._accessed, {}
+        try:
+            self._db.execute("BEGIN")
+            self._db.executemany(
+                "UPDATE entries SET last_access = MAX(last_access, ?) WHERE key = ?",
+                [(at, key) for key, at in accessed.items()]
+            )
+            self._db.execute("COMMIT")
+        except sqlite3.Error as e:
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            logger.warning("Failed to write HTTP cache", extra={"error": str(e)})
+
+    def _fresh_until(self, headers: httpx.Headers, now: float) -> Optional[float]:
+        """Compute the freshness deadline, or None if the response must not be stored."""
+        directives = parse_cache_control(headers.get("cache-control"))
+        if "no-store" in directives:
+            return None
+        if "no-cache" in directives:
+            return now
+        if (directives.get("max-age") or "").isdigit():
+            age = headers.get("age", "0")
+            return now + int(directives["max-age"]) - (int(age) if age.isdigit() else 0)
+        if "expires" in headers:
+            try:
+                expires = parsedate_to_datetime(headers["expires"]).timestamp()
+                date = parsedate_to_datetime(headers["date"]).timestamp() if "date" in headers else now
+                return now + expires - date
+            except (TypeError, ValueError):
+                return now
+        return now + self.default_ttl
+
+    def storable(self, response: httpx.Response) -> bool:
+        """Check whether a response may be stored, from its status and headers alone."""
+        if response.status_code != 200 or response.request.method != "GET":
+            return False
+        fresh_until = self._fresh_until(response.headers, time.time())
+        if fresh_until is None:
+            return False
+        return fresh_until > time.time() or "etag" in response.headers or "last-modified" in response.headers
+
+    def store(self, response: httpx.Response, body: bytes) -> None:
+        """Store a response if it is cacheable, then enforce the size bound.
+
+        Args:
+            response: Upstream response.
+            body: Decoded response body.
+        """
+        if not self.storable(response):
+            return
+        # Eviction below should see this process's recent reads
+        self.flush()
+        now = time.time()
+        headers = {k: v for k, v in response.headers.items() if k.lower() in _STORED_HEADERS}
+        try:
+            # An upsert, not INSERT OR REPLACE, so the size triggers see a replaced entry
+            self._db.execute(
+                "INSERT INTO entries (key, url, headers, body, size, fresh_until, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                "url = excluded.url, headers = excluded.headers, body = excluded.body, size = excluded.size, "
+                "fresh_until = excluded.fresh_until, last_access = excluded.last_access",
+                (
+                    self.key(response.request), str(response.request.url), json.dumps(headers),
+                    body, len(body), self._fresh_until(response.headers, now), now
+                )
+            )
+            self._evict()
+        except sqlite3.Error as e:
+            logger.warning("Failed to write HTTP cache", extra={"error": str(e)})
+
+    def revalidate(self, entry: CacheEntry, response: httpx.Response) -> httpx.Response:
+        """Refresh an entry from a 304 and serve its stored body.
+
+        Args:
+            entry: Entry the conditional request was made for.
+            response: The 304 Not Modified response.
+
+        Returns:
+            A 200 response with the stored body.
+        """
+        self.revalidated += 1
+        headers = dict(entry.headers)
+        headers.update({k: v for k, v in response.headers.items() if k.lower() in _STORED_HEADERS})
+        now = time.time()
+        fresh_until = self._fresh_until(httpx.Headers(headers), now) or now
+        try:
+            self._db.execute(
+                "UPDATE entries SET headers = ?, fresh_until = ?, last_access = ? WHERE key = ?",
+                (json.dumps(headers), fresh_until, now, entry.key)
+            )
+        except sqlite3.Error as e:
+            logger.warning("Failed to write HTTP cache", extra={"error": str(e)})
+        return CacheEntry(entry.key, headers, entry.body, fresh_until).response(response.request)
+
+    def _total_size(self) -> int:
+        """Get the total body size, as kept by the triggers."""
+        return int(self._db.execute("SELECT value FROM meta WHERE name = 'total_size'").fetchone()[0])
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits max_bytes."""
+        total = self._total_size()
+        if total <= self.max_bytes:
+            return
+        # Evict down to 90% so a full cache does not evict on every store
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        keys = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            keys.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        self._db.executemany("DELETE FROM entries WHERE key = ?", keys)
+        logger.debug("HTTP cache evicted entries", extra={"entries": len(keys), "bytes": freed})
+
+    def compact(self) -> None:
+        """Drop long-stale entries and return free pages to the filesystem."""
+        now = time.time()
+        try:
+            removed = self._db.execute(
+                "DELETE FROM entries WHERE fresh_until < ?", (now - self.max_stale,)
+            ).rowcount
+            self._db.execute("PRAGMA incremental_vacuum")
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('last_compaction', ?)", (now,)
+            )
+        except sqlite3.Error as e:
+            logger.warning("HTTP cache compaction failed", extra={"error": str(e)})
+            return
+        logger.debug("HTTP cache compacted", extra={"removed": removed})
+
+    def stats(self) -> Dict[str, int]:
+        """Report entry count, stored bytes and this process's hit counters."""
+        entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            "entries": entries,
+            "bytes": self._total_size(),
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses
+        }
+
+    def close(self) -> None:
+        """Write batched reads and close the cache file."""
+        self.flush()
+        self._db.close()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""Production settings for the streamable HTTP and SSE transports."""
+
+import json
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+import anyio
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BackpressureMiddleware:
+    """ASGI middleware bounding concurrent streams, MCP sessions and slow readers.
+
+    Every in-flight HTTP request counts as one stream: a streamable HTTP POST
+    or GET stream, or an SSE connection. Requests beyond max_streams are
+    rejected with 503 and Retry-After instead of queueing without bound.
+    uvicorn already stops writing to a client whose socket buffer is full; a
+    write that stays blocked for send_timeout seconds ends the request, so a
+    client that stops reading cannot hold a stream (and its buffered tool
+    results) forever.
+
+    Sessions are counted separately, since each holds server state between
+    requests. With streamable HTTP every distinct Mcp-Session-Id the server
+    hands out is one session until the client deletes it, the server answers
+    404 for it, or it has been idle for session_idle_timeout; with SSE every
+    open stream is one. A request opening a session (an initialize POST
+    without Mcp-Session-Id, or the SSE GET) beyond max_sessions gets 503 and
+    Retry-After; requests in existing sessions are not affected.
+
+    Attributes:
+        max_streams: Maximum concurrent requests, or None for unlimited
+        send_timeout: Seconds a single write may block, or None to wait forever
+        max_sessions: Maximum MCP sessions, or None for unlimited
+        session_idle_timeout: Seconds after which an unused session stops
+            counting, or None to keep it until it is deleted
+        transport: 'http' (streamable HTTP) or 'sse'
+        active: Requests currently in flight
+        sessions: Monotonic time each counted session was last used
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        max_streams: Optional[int] = None,
+        send_timeout: Optional[float] = None,
+        max_sessions: Optional[int] = None,
+        session_idle_timeout: Optional[float] = None,
+        transport: str = "http"
+    ):
+        """Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application.
+            max_streams: Maximum concurrent requests (None for unlimited).
+            send_timeout: Per-write timeout in seconds (None to disable).
+            max_sessions: Maximum MCP sessions (None for unlimited).
+            session_idle_timeout: Seconds before an unused session stops
+                counting (None to disable).
+            transport: 'http' (streamable HTTP) or 'sse'.
+        """
+        self.app = app
+        self.max_streams = max_streams
+        self.send_timeout = send_timeout
+        self.max_sessions = max_sessions
+        self.session_idle_timeout = session_idle_timeout
+        self.transport = transport
+        self.active = 0
+        self.sessions: Dict[str, float] = {}
+        # Initialize requests in flight, counted before their session id is known
+        self._opening = 0
+
+    def session_count(self) -> int:
+        """Get the number of sessions, dropping idle ones first."""
+        if self.session_idle_timeout is not None:
+            cutoff = time.monotonic() - self.session_idle_timeout
+            for session_id in [s for s, used in self.sessions.items() if used < cutoff]:
+                del self.sessions[session_id]
+        return len(self.sessions) + self._opening
+
+    def _opens_session(self, scope: Dict[str, Any], session_id: Optional[str]) -> bool:
+        method = scope.get("method")
+        if self.transport == "sse":
+            return method == "GET" and scope.get("path", "").rstrip("/").endswith("/sse")
+        return method == "POST" and session_id is None
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self.max_streams is not None and self.active >= self.max_streams:
+            logger.warning("Rejecting request, too many concurrent streams", extra={
+                "active": self.active,
+                "max_streams": self.max_streams
+            })
+            await self._reject(send)
+            return
+
+        async def send_with_timeout(message: Dict[str, Any]) -> None:
+            try:
+                with anyio.fail_after(self.send_timeout):
+                    await send(message)
+            except TimeoutError:
+                logger.warning("Dropping slow client", extra={
+                    "path": scope.get("path"),
+                    "send_timeout_sec": self.send_timeout
+                })
+                raise OSError("Client did not read the response in time")
+
+        downstream = send_with_timeout if self.send_timeout else send
+        if self.max_sessions is None:
+            self.active += 1
+            try:
+                await self.app(scope, receive, downstream)
+            finally:
+                self.active -= 1
+            return
+
+        headers = dict(scope.get("headers") or [])
+        session_id = headers[b"mcp-session-id"].decode("latin-1") if b"mcp-session-id" in headers else None
+        opens = self._opens_session(scope, session_id)
+        if opens and self.session_count() >= self.max_sessions:
+            logger.warning("Rejecting new session, too many MCP sessions", extra={
+                "sessions": self.session_count(),
+                "max_sessions": self.max_sessions
+            })
+            await self._reject(send)
+            return
+
+        async def send_tracking_sessions(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if opens and self.transport == "http" and status == 200:
+                    issued = dict(message.get("headers") or []).get(b"mcp-session-id")
+                    if issued is not None:
+                        self.sessions[issued.decode("latin-1")] = time.monotonic()
+                elif session_id is not None and (status == 404 or (scope.get("method") == "DELETE" and status < 300)):
+                    # Deleted by the client, or unknown to the server (expired)
+                    self.sessions.pop(session_id, None)
+            await downstream(message)
+
+        # An SSE session lives exactly as long as its stream
+        stream_session = f"sse-{id(scope)}" if opens and self.transport == "sse" else None
+        if stream_session is not None:
+            self.sessions[stream_session] = math.inf
+        elif opens:
+            self._opening += 1
+        elif session_id in self.sessions:
+            self.sessions[session_id] = time.monotonic()
+
+        self.active += 1
+        try:
+            await self.app(scope, receive, send_tracking_sessions)
+        finally:
+            self.active -= 1
+            if stream_session is not None:
+                self.sessions.pop(stream_session, None)
+            elif opens:
+                self._opening -= 1
+            elif session_id in self.sessions:
+                # A long GET stream counts as use until it ends
+                self.sessions[session_id] = time.monotonic()
+
+    async def _reject(self, send: Any) -> None:
+        body = json.dumps({"error": "Server busy, retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", b"1")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def close_client_on_shutdown(app: Any, client: Any) -> Any:
+    """Close the upstream HTTP client when the app's lifespan ends.
+
+    The client is closed after the MCP session manager has stopped, so no
+    tool call is still using it; RetryAsyncClient.aclose() also logs per-key
+    usage and flushes the quota ledger.
+
+    Args:
+        app: Starlette app returned by FastMCP.http_app().
+        client: HTTP client used by the tools.
+
+    Returns:
+        The same app, with its lifespan extended.
+    """
+    lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan_with_client(app_):
+        try:
+            async with lifespan(app_) as state:
+                yield state
+        finally:
+            await client.aclose()
+            logger.info("Upstream HTTP client closed")
+
+    app.router.lifespan_context = lifespan_with_client
+    return app
+
+
+def wrap_app(app: Any, client: Any, http_config: Dict[str, Any], transport: str = "http") -> Any:
+    """Apply shutdown and backpressure handling to an MCP HTTP app.
+
+    Args:
+        app: Starlette app returned by FastMCP.http_app().
+        client: HTTP client used by the tools.
+        http_config: ConfigManager.http_config.
+        transport: 'http' (streamable HTTP) or 'sse'.
+
+    Returns:
+        ASGI application to serve.
+    """
+    close_client_on_shutdown(app, client)
+    # Multi-worker streamable HTTP is stateless: there are no sessions to count
+    stateless = transport == "http" and http_config["workers"] > 1
+    return BackpressureMiddleware(
+        app,
+        max_streams=http_config["max_concurrent_streams"],
+        send_timeout=http_config["send_timeout"],
+        max_sessions=None if stateless else http_config["max_sessions"],
+        session_idle_timeout=http_config["session_idle_timeout"],
+        transport=transport
+    )
+
+
+def uvicorn_options(http_config: Dict[str, Any], log_level: str) -> Dict[str, Any]:
+    """Get uvicorn.run() keyword arguments from the HTTP configuration.
+
+    On SIGTERM uvicorn stops accepting connections, lets in-flight requests
+    finish for up to graceful_shutdown_timeout seconds, cancels what is left
+    (long-lived SSE streams) and then runs the lifespan shutdown.
+
+    Args:
+        http_config: ConfigManager.http_config.
+        log_level: Server log level name.
+
+    Returns:
+        Keyword arguments for uvicorn.run().
+    """
+    options = {
+        "host": http_config["host"],
+        "port": http_config["port"],
+        "timeout_graceful_shutdown": http_config["graceful_shutdown_timeout"],
+        "log_level": log_level.lower()
+    }
+    if http_config["keep_alive"] is not None:
+        options["timeout_keep_alive"] = http_config["keep_alive"]
+    return options
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Shared per-address state for wallet indexing (202 Accepted) polling."""
+
+import asyncio
+import re
+import time
+from typing import Dict, Optional
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Matches the address segment of /v1/wallets/{address}/... paths
+_WALLET_PATH = re.compile(r"/wallets/([^/?#]+)")
+
+
+class _IndexingState:
+    """Polling state for a single address.
+
+    Attributes:
+        event: Set when the owning poller finishes
+        indexed: True if indexing completed, False if it timed out,
+            None if the poller was abandoned (e.g. cancelled)
+    """
+
+    def __init__(self):
+        self.event = asyncio.Event()
+        self.indexed: Optional[bool] = None
+
+
+class IndexingTracker:
+    """Coordinates 202 polling so each wallet address has a single poller.
+
+    The first request that sees a 202 for an address becomes its poller and
+    retries with a linearly increasing interval (retry_delay, 2 × retry_delay,
+    ... capped at max_delay). Concurrent requests for the same address wait on
+    the poller's shared event instead of running their own loops. Addresses
+    that finished indexing are remembered for indexed_ttl seconds so a late
+    202 for them is retried immediately instead of waiting again.
+
+    Attributes:
+        retry_delay: Initial polling interval in seconds
+        max_delay: Maximum polling interval in seconds
+        max_retries: Maximum number of polls per address
+        indexed_ttl: Seconds to remember an address as indexed
+    """
+
+    def __init__(
+        self,
+        retry_delay: float = 1,
+        max_delay: float = 5,
+        max_retries: int = 5,
+        indexed_ttl: float = 300
+    ):
+        """Initialize indexing tracker.
+
+        Args:
+            retry_delay: Initial polling interval in seconds.
+            max_delay: Maximum polling interval in seconds.
+            max_retries: Maximum number of polls per address.
+            indexed_ttl: Seconds to remember an address as indexed.
+        """
+        self.retry_delay = retry_delay
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+        self.indexed_ttl = indexed_ttl
+
+        self._polling: Dict[str, _IndexingState] = {}
+        self._indexed: Dict[str, float] = {}
+
+    @staticmethod
+    def address_from_url(url: str) -> Optional[str]:
+        """Extract the wallet address from a request URL.
+
+        Args:
+            url: Request URL or path.
+
+        Returns:
+            Lowercased wallet address, or None if the URL is not wallet-scoped.
+        """
+        match = _WALLET_PATH.search(str(url))
+        return match.group(1).lower() if match else None
+
+    def poll_interval(self, attempt: int) -> float:
+        """Get the wait before the given poll.
+
+        Args:
+            attempt: 1-based poll number.
+
+        Returns:
+            Delay in seconds.
+        """
+        return min(self.retry_delay * attempt, self.max_delay)
+
+    @property
+    def total_wait(self) -> float:
+        """Total time a poller waits before giving up (seconds)."""
+        return sum(self.poll_interval(i) for i in range(1, self.max_retries + 1))
+
+    def recently_indexed(self, address: str) -> bool:
+        """Check whether an address finished indexing within indexed_ttl.
+
+        Args:
+            address: Wallet address.
+
+        Returns:
+            True if the address is known to be indexed.
+        """
+        indexed_at = self._indexed.get(address)
+        if indexed_at is None:
+            return False
+        if time.monotonic() - indexed_at > self.indexed_ttl:
+            del self._indexed[address]
+            return False
+        return True
+
+    def is_polling(self, address: str) -> bool:
+        """Check whether another request is already polling an address."""
+        return address in self._polling
+
+    def start_polling(self, address: str) -> None:
+        """Register the caller as the poller for an address."""
+        self._polling[address] = _IndexingState()
+
+    def finish_polling(self, address: str, indexed: Optional[bool]) -> None:
+        """Publish the poll outcome and wake up waiting requests.
+
+        Args:
+            address: Wallet address.
+            indexed: True if indexed, False on timeout, None if abandoned.
+        """
+        state = self._polling.pop(address, None)
+        if indexed:
+            self._indexed[address] = time.monotonic()
+        if state is not None:
+            state.indexed = indexed
+            state.event.set()
+
+    async def wait_for(self, address: str) -> Optional[bool]:
+        """Wait for the active poller of an address to finish.
+
+        Args:
+            address: Wallet address.
+
+        Returns:
+            The poller's outcome (see finish_polling), or None if no poller
+            is active or it did not finish within total_wait.
+        """
+        state = self._polling.get(address)
+        if state is None:
+            return None
+
+        logger.debug(
+            "Waiting on shared wallet indexing poller",
+            extra={"address": address}
+        )
+        try:
+            await asyncio.wait_for(state.event.wait(), timeout=self.total_wait + self.max_delay)
+        except asyncio.TimeoutError:
+            return None
+        return state.indexed
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""API key pool with per-key rate budgets for load balancing."""
+
+import asyncio
+import math
+import sqlite3
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .errors import ConfigError
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds to wait before retrying a shared limiter another worker has locked
+_LIMITER_RETRY = 0.01
+
+
+class ApiKey:
+    """A single API key with a token-bucket rate budget.
+
+    Attributes:
+        name: Label used in logs and usage reports (never the key itself)
+        key: Authorization header value
+        rate_limit: Sustained requests per second, or None for unlimited
+        burst: Maximum tokens the bucket can hold
+        requests: Upstream requests made with this key
+        rate_limited: Number of 429 responses received with this key
+        last_used: Monotonic time the key was last handed out
+    """
+
+    def __init__(self, name: str, key: str, rate_limit: Optional[float] = None, burst: Optional[float] = None):
+        """Initialize API key state.
+
+        Args:
+            name: Key label.
+            key: Authorization header value.
+            rate_limit: Requests per second budget, or None for unlimited.
+            burst: Bucket capacity (default: rate_limit, at least 1).
+        """
+        self.name = name
+        self.key = key
+        self.rate_limit = rate_limit
+        self.burst = burst if burst is not None else max(rate_limit or 1, 1)
+        self.requests = 0
+        self.rate_limited = 0
+        self.last_used = 0.0
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._cooldown_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        """Refill the token bucket up to the current time."""
+        if self.rate_limit is not None:
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate_limit)
+        self._updated = now
+
+    def in_rotation(self, now: Optional[float] = None) -> bool:
+        """Check whether the key is not cooling down after a 429."""
+        return (now if now is not None else time.monotonic()) >= self._cooldown_until
+
+    def headroom(self, now: Optional[float] = None) -> float:
+        """Get the number of requests the key can make right now.
+
+        Returns:
+            Available tokens, math.inf for unlimited keys, or 0 while cooling down.
+        """
+        now = now if now is not None else time.monotonic()
+        if not self.in_rotation(now):
+            return 0.0
+        if self.rate_limit is None:
+            return math.inf
+        self._refill(now)
+        return self._tokens
+
+    def ready_in(self, now: Optional[float] = None) -> float:
+        """Get seconds until the key can make its next request."""
+        now = now if now is not None else time.monotonic()
+        wait = max(0.0, self._cooldown_until - now)
+        if self.rate_limit is not None:
+            self._refill(now)
+            if self._tokens < 1:
+                wait = max(wait, (1 - self._tokens) / self.rate_limit)
+        return wait
+
+    def consume(self, now: Optional[float] = None) -> None:
+        """Spend one token for an upstream request."""
+        now = now if now is not None else time.monotonic()
+        self._refill(now)
+        if self.rate_limit is not None:
+            self._tokens -= 1
+        self.requests += 1
+        self.last_used = now
+
+    def cool_down(self, seconds: float) -> None:
+        """Take the key out of rotation for the given number of seconds."""
+        self.rate_limited += 1
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + seconds)
+
+
+class ApiKeyPool:
+    """Load-balances requests across several API keys.
+
+    Each request uses the key with the most remaining headroom, and among
+    keys with equal headroom (e.g. keys without a rate_limit) the least
+    recently used one. A key that receives a 429 is taken out of rotation
+    for the Retry-After period (or cooldown seconds when the header is
+    absent).
+
+    With a shared limiter, token buckets and cooldowns live in a database
+    shared by every worker process instead of in this process's memory.
+
+    Attributes:
+        keys: Keys in the pool
+        cooldown: Default seconds a key stays out of rotation after a 429
+        limiter: Optional SharedRateLimiter used across processes
+    """
+
+    def __init__(self, keys: List[Dict[str, Any]], cooldown: float = 1.0, limiter: Optional[Any] = None):
+        """Initialize API key pool.
+
+        Args:
+            keys: Key definitions with keys 'key', 'name' and optional
+                'rate_limit' (requests per second) and 'burst'.
+            cooldown: Default cooldown after a 429 without Retry-After.
+            limiter: Optional SharedRateLimiter for multi-process servers.
+
+        Raises:
+            ConfigError: If no keys are provided.
+        """
+        if not keys:
+            raise ConfigError("API key pool requires at least one key")
+
+        self.keys = [
+            ApiKey(
+                name=k.get("name") or f"key-{i + 1}",
+                key=k["key"],
+                rate_limit=k.get("rate_limit"),
+                burst=k.get("burst")
+            )
+            for i, k in enumerate(keys)
+        ]
+        self.cooldown = cooldown
+        self.limiter = limiter
+
+        logger.debug("API key pool initialized", extra={
+            "keys": [k.name for k in self.keys]
+        })
+
+    def _headroom(self, api_key: ApiKey, now: float) -> float:
+        """Get a key's headroom from the shared limiter or its local bucket."""
+        if self.limiter is None:
+            return api_key.headroom(now)
+        if not api_key.in_rotation(now):
+            return 0.0
+        try:
+            return self.limiter.headroom(api_key.name, api_key.rate_limit, api_key.burst)
+        except sqlite3.OperationalError:
+            # Locked by another worker: rank the key last rather than block
+            return 0.0
+
+    def available(self) -> bool:
+        """Check whether any key can make a request right now."""
+        now = time.monotonic()
+        return any(self._headroom(k, now) >= 1 for k in self.keys)
+
+    async def acquire(self, eligible: Optional[Callable[[ApiKey], bool]] = None) -> ApiKey:
+        """Pick the key with the most headroom, waiting if all are exhausted.
+
+        Args:
+            eligible: Optional filter restricting which keys may be used
+                (e.g. keys still within their daily budget). Callers must
+                ensure at least one key is eligible.
+
+        Returns:
+            The key to use; one token has already been consumed.
+        """
+        candidates = [k for k in self.keys if eligible(k)] if eligible else self.keys
+        while True:
+            now = time.monotonic()
+            if self.limiter is not None:
+                best = max(candidates, key=lambda k: (self._headroom(k, now), -k.last_used))
+                try:
+                    wait = self.limiter.take(best.name, best.rate_limit, best.burst)
+                except sqlite3.OperationalError as e:
+                    logger.debug("Shared rate limiter busy, retrying", extra={"error": str(e)})
+                    await asyncio.sleep(_LIMITER_RETRY)
+                    continue
+                if wait <= 0:
+                    best.requests += 1
+                    best.last_used = now
+                    return best
+                logger.debug("All API keys exhausted, waiting", extra={"wait_sec": round(wait, 3)})
+                await asyncio.sleep(wait)
+                continue
+
+            best = max(candidates, key=lambda k: (k.headroom(now), -k.last_used))
+            if best.headroom(now) >= 1:
+                best.consume(now)
+                return best
+
+            wait = min(k.ready_in(now) for k in candidates)
+            logger.debug("All API keys exhausted, waiting", extra={"wait_sec": round(wait, 3)})
+            await asyncio.sleep(wait)
+
+    def record(self, api_key: ApiKey, status_code: int, retry_after: Optional[int] = None) -> None:
+        """Record the outcome of a request made with a key.
+
+        Args:
+            api_key: Key used for the request.
+            status_code: Response status code.
+            retry_after: Retry-After header value, if any.
+        """
+        if status_code == 429:
+            cooldown = retry_after if retry_after is not None else self.cooldown
+            api_key.cool_down(cooldown)
+            if self.limiter is not None:
+                try:
+                    self.limiter.cool_down(api_key.name, api_key.rate_limit, api_key.burst, cooldown)
+                except sqlite3.OperationalError as e:
+                    # This process still skips the key; the other workers find out on their own 429
+                    logger.warning("Shared cooldown not recorded", extra={
+                        "key_name": api_key.name,
+                        "error": str(e)
+                    })
+            logger.warning(
+                "API key rate limited, removed from rotation",
+                extra={"key_name": api_key.name, "cooldown_sec": cooldown}
+            )
+
+    def close(self) -> None:
+        """Close the shared limiter, if any."""
+        if self.limiter is not None:
+            self.limiter.close()
+
+    def usage(self) -> List[Dict[str, Any]]:
+        """Report per-key usage.
+
+        Returns:
+            One entry per key with request counts and rotation status.
+        """
+        now = time.monotonic()
+        return [
+            {
+                "name": k.name,
+                "requests": k.requests,
+                "rate_limited": k.rate_limited,
+                "in_rotation": k.in_rotation(now),
+                "rate_limit": k.rate_limit
+            }
+            for k in self.keys
+        ]
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Resolve request paths to OpenAPI operationIds."""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+HTTP_METHODS = {"get", "put", "post", "delete", "options", "head", "patch", "trace"}
+
+
+class OperationIndex:
+    """Maps (method, URL) pairs to the operationId of the matching spec path.
+
+    Path templates such as ``/v1/wallets/{address}/positions/`` are compiled
+    once into regular expressions. Literal templates are preferred over
+    templated ones when both match.
+    """
+
+    def __init__(self, openapi_spec: Dict[str, Any]):
+        """Build the index from an OpenAPI specification.
+
+        Args:
+            openapi_spec: Parsed OpenAPI specification.
+        """
+        self._routes: Dict[str, List[Tuple[re.Pattern, str, str]]] = {}
+
+        for path, path_item in (openapi_spec.get("paths") or {}).items():
+            if not isinstance(path_item, dict):
+                continue
+            pattern = self._compile(path)
+            for method, operation in path_item.items():
+                if method.lower() not in HTTP_METHODS or not isinstance(operation, dict):
+                    continue
+                operation_id = operation.get("operationId")
+                if operation_id:
+                    self._routes.setdefault(method.upper(), []).append((pattern, path, operation_id))
+
+        # Fewer path parameters first, so literal segments win
+        for routes in self._routes.values():
+            routes.sort(key=lambda r: r[1].count("{"))
+
+    @staticmethod
+    def _compile(path: str) -> re.Pattern:
+        """Compile a path template into a regex tolerant of trailing slashes."""
+        parts = re.split(r"(\{[^}]+\})", path.rstrip("/"))
+        regex = "".join(
+            "[^/]+" if part.startswith("{") else re.escape(part)
+            for part in parts
+        )
+        return re.compile(f"^{regex}/?$")
+
+    def resolve(self, method: str, url: Any) -> Optional[str]:
+        """Find the operationId for a request.
+
+        Args:
+            method: HTTP method.
+            url: Request URL or path.
+
+        Returns:
+            operationId, or None if no spec path matches.
+        """
+        path = urlsplit(str(url)).path
+        for pattern, _, operation_id in self._routes.get(method.upper(), []):
+            if pattern.match(path):
+                return operation_id
+        return None
+
+    def __len__(self) -> int:
+        return sum(len(routes) for routes in self._routes.values())
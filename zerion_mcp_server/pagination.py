@@ -6,6 +6,7 @@ import asyncio
 
 from .logger import get_logger
 from .errors import ValidationError
+from .priority import Priority, request_priority
 
 logger = get_logger(__name__)
 
@@ -14,6 +15,7 @@ async def fetch_all_pages(
     api_call: Callable[..., Awaitable[Dict[str, Any]]],
     max_pages: Optional[int] = None,
     page_size: int = 100,
+    priority: Priority = Priority.BACKGROUND,
     **params: Any
 ) -> List[Dict[str, Any]]:
     """Fetch all pages from a paginated endpoint automatically.
@@ -28,6 +30,9 @@ async def fetch_all_pages(
         max_pages: Maximum number of pages to fetch (safety limit). If None, uses
             default from configuration or 50.
         page_size: Number of items per page (default: 100).
+        priority: Priority of the page requests (default: BACKGROUND, so
+            auto-pagination is refused by the quota soft budget before
+            interactive tools are).
         **params: Additional parameters to pass to api_call.
 
     Returns:
@@ -87,7 +92,8 @@ async def fetch_all_pages(
 
         # Make API call
         try:
-            response = await api_call(**request_params)
+            with request_priority(priority):
+                response = await api_call(**request_params)
         except Exception as e:
             logger.error(
                 f"Error fetching page {current_page}",
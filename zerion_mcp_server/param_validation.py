@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Local validation of query and header parameters against the spec.
+
+An invalid filter or currency otherwise costs a quota-counted round trip
+that ends in a 400. The parameter schemas of every operation are compiled
+once into validators (enums as frozensets, length, count and numeric
+bounds) and each tool request is checked before it reaches the upstream
+client, together with the URL length limit the spec warns about.
+
+Rules are plain JSON (see parameter_rules()) so the tool snapshot can carry
+them when the spec itself is not parsed.
+"""
+
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional
+
+import httpx
+
+from .errors import ValidationError
+from .logger import get_logger
+from .operations import HTTP_METHODS
+
+logger = get_logger(__name__)
+
+# "Usually, 2000 characters are the safe limit" (listWalletTransactions and
+# listWalletPositions descriptions)
+MAX_URL_LENGTH = 2000
+
+_CONSTRAINTS = {
+    "enum": "enum",
+    "minLength": "min_length",
+    "maxLength": "max_length",
+    "minimum": "minimum",
+    "maximum": "maximum",
+    "pattern": "pattern"
+}
+
+
+def _resolve(spec: Dict[str, Any], node: Any) -> Any:
+    """Follow local $refs ('#/components/...') until a concrete node."""
+    seen = set()
+    while isinstance(node, dict) and "$ref" in node:
+        ref = node["$ref"]
+        if not ref.startswith("#/") or ref in seen:
+            return {}
+        seen.add(ref)
+        node = spec
+        for part in ref[2:].split("/"):
+            node = node.get(part, {}) if isinstance(node, dict) else {}
+    return node if isinstance(node, dict) else {}
+
+
+def _constraints(schema: Dict[str, Any]) -> Dict[str, Any]:
+    rule = {"type": schema.get("type", "string")}
+    for key, name in _CONSTRAINTS.items():
+        if schema.get(key) is not None:
+            rule[name] = schema[key]
+    return rule
+
+
+def _rule(spec: Dict[str, Any], name: str, location: str, required: bool, schema: Dict[str, Any]) -> Dict[str, Any]:
+    rule: Dict[str, Any] = {"name": name, "in": location, "required": required}
+    if schema.get("type") == "array" or "items" in schema:
+        # Arrays are sent comma-separated (style form, explode false)
+        rule["type"] = "array"
+        rule["items"] = _constraints(_resolve(spec, schema.get("items", {})))
+        for key, target in (("minItems", "min_items"), ("maxItems", "max_items")):
+            if schema.get(key) is not None:
+                rule[target] = schema[key]
+    else:
+        rule.update(_constraints(schema))
+    return rule
+
+
+def parameter_rules(openapi_spec: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """Extract query and header parameter rules per operationId.
+
+    Path parameters are part of the URL the tool builds and are not
+    checked. deepObject parameters are expanded into one rule per property
+    ('input[chain_id]').
+
+    Args:
+        openapi_spec: Parsed OpenAPI specification.
+
+    Returns:
+        JSON-serializable rules keyed by operationId.
+    """
+    rules: Dict[str, List[Dict[str, Any]]] = {}
+    for path_item in (openapi_spec.get("paths") or {}).values():
+        if not isinstance(path_item, dict):
+            continue
+        shared = path_item.get("parameters") or []
+        for method, operation in path_item.items():
+            if method.lower() not in HTTP_METHODS or not isinstance(operation, dict) or not operation.get("operationId"):
+                continue
+            operation_rules = []
+            for parameter in shared + (operation.get("parameters") or []):
+                parameter = _resolve(openapi_spec, parameter)
+                location = parameter.get("in")
+                if location not in ("query", "header") or not parameter.get("name"):
+                    continue
+                schema = _resolve(openapi_spec, parameter.get("schema") or {})
+                if schema.get("type") == "object" and parameter.get("style") == "deepObject":
+                    for prop, prop_schema in (schema.get("properties") or {}).items():
+                        operation_rules.append(_rule(
+                            openapi_spec, f"{parameter['name']}[{prop}]", location, False, _resolve(openapi_spec, prop_schema)
+                        ))
+                else:
+                    operation_rules.append(_rule(
+                        openapi_spec, parameter["name"], location, bool(parameter.get("required")), schema
+                    ))
+            rules[operation["operationId"]] = operation_rules
+    return rules
+
+
+class ParameterValidator:
+    """Checks one parameter's value against its compiled rule."""
+
+    __slots__ = ("name", "required", "is_array", "type", "enum", "min_length", "max_length",
+                 "minimum", "maximum", "pattern", "min_items", "max_items")
+
+    def __init__(self, rule: Dict[str, Any]):
+        """Compile a rule from parameter_rules().
+
+        Args:
+            rule: Parameter rule.
+        """
+        self.name = rule["name"]
+        self.required = rule.get("required", False)
+        self.is_array = rule.get("type") == "array"
+        self.min_items = rule.get("min_items")
+        self.max_items = rule.get("max_items")
+        scalar = rule["items"] if self.is_array else rule
+        self.type = scalar.get("type", "string")
+        self.enum: Optional[FrozenSet[str]] = (
+            frozenset(str(v) for v in scalar["enum"] if v is not None) if scalar.get("enum") else None
+        )
+        self.min_length = scalar.get("min_length")
+        self.max_length = scalar.get("max_length")
+        self.minimum = scalar.get("minimum")
+        self.maximum = scalar.get("maximum")
+        self.pattern = re.compile(scalar["pattern"]) if scalar.get("pattern") else None
+
+    def _fail(self, value: Any, expected: str) -> ValidationError:
+        return ValidationError(
+            f"Invalid value for {self.name}: {value!r} (expected {expected})",
+            field=self.name,
+            expected=expected,
+            actual=repr(value)
+        )
+
+    def check(self, value: Any) -> None:
+        """Validate a value as sent in the request.
+
+        Raises:
+            ValidationError: If the value breaks the rule.
+        """
+        if value is None:
+            return
+        if not self.is_array:
+            self._check_scalar(value)
+            return
+        items = value.split(",") if isinstance(value, str) else list(value)
+        if self.max_items is not None and len(items) > self.max_items:
+            raise self._fail(value, f"at most {self.max_items} items")
+        if self.min_items is not None and len(items) < self.min_items:
+            raise self._fail(value, f"at least {self.min_items} items")
+        for item in items:
+            self._check_scalar(item)
+
+    def _check_scalar(self, value: Any) -> None:
+        if self.enum is not None:
+            text = str(value).lower() if isinstance(value, bool) else str(value)
+            if text not in self.enum:
+                raise self._fail(value, f"one of {', '.join(sorted(self.enum))}")
+        if self.type in ("integer", "number"):
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                raise self._fail(value, self.type) from None
+            if self.type == "integer" and not number.is_integer():
+                raise self._fail(value, "integer")
+            if self.minimum is not None and number < self.minimum:
+                raise self._fail(value, f">= {self.minimum}")
+            if self.maximum is not None and number > self.maximum:
+                raise self._fail(value, f"<= {self.maximum}")
+        elif self.type == "string":
+            text = str(value)
+            if self.min_length is not None and len(text) < self.min_length:
+                raise self._fail(value, f"at least {self.min_length} characters")
+            if self.max_length is not None and len(text) > self.max_length:
+                raise self._fail(value, f"at most {self.max_length} characters")
+            if self.pattern is not None and not self.pattern.search(text):
+                raise self._fail(value, f"match for {self.pattern.pattern}")
+
+
+class OperationValidator:
+    """Validators for one operation's query and header parameters."""
+
+    def __init__(self, rules: Iterable[Dict[str, Any]]):
+        """Compile an operation's rules.
+
+        Args:
+            rules: Rules of one operation from parameter_rules().
+        """
+        self.query: Dict[str, ParameterValidator] = {}
+        self.headers: Dict[str, ParameterValidator] = {}
+        for rule in rules:
+            if rule["in"] == "header":
+                self.headers[rule["name"].lower()] = ParameterValidator(rule)
+            else:
+                self.query[rule["name"]] = ParameterValidator(rule)
+
+    def validate(self, params: Optional[Mapping[str, Any]], headers: Optional[Mapping[str, Any]]) -> None:
+        """Validate the request's parameters; unknown names are left to Zerion.
+
+        Raises:
+            ValidationError: If a parameter is missing or invalid.
+        """
+        params = params or {}
+        header_values = {k.lower(): v for k, v in (headers or {}).items()}
+        for values, validators in ((params, self.query), (header_values, self.headers)):
+            for name, validator in validators.items():
+                value = values.get(name)
+                if value is None:
+                    if validator.required:
+                        raise ValidationError(f"Missing required parameter {validator.name}", field=validator.name)
+                    continue
+                validator.check(value)
+
+
+class RequestValidator:
+    """Validates requests by operation and checks the URL length.
+
+    Attributes:
+        operations: OperationIndex mapping requests to operationIds
+        base_url: Zerion base URL used to measure the full URL
+        max_url_length: Longest URL sent upstream
+    """
+
+    def __init__(
+        self,
+        rules: Dict[str, List[Dict[str, Any]]],
+        operations: Any,
+        base_url: str,
+        max_url_length: int = MAX_URL_LENGTH
+    ):
+        """Compile validators.
+
+        Args:
+            rules: parameter_rules() output.
+            operations: OperationIndex.
+            base_url: Zerion base URL.
+            max_url_length: URL length limit (0 disables the check).
+        """
+        self.validators = {operation_id: OperationValidator(r) for operation_id, r in rules.items()}
+        self.operations = operations
+        self.base_url = httpx.URL(base_url)
+        self.max_url_length = max_url_length
+
+    def url_length(self, url: Any, params: Optional[Mapping[str, Any]]) -> int:
+        """Length of the URL the request would be sent to."""
+        full = self.base_url.join(str(url))
+        if params:
+            full = full.copy_merge_params(params)
+        return len(str(full))
+
+    def exceeds_url_limit(self, url: Any, params: Optional[Mapping[str, Any]]) -> Optional[int]:
+        """URL length if the request would exceed max_url_length, else None."""
+        if not self.max_url_length:
+            return None
+        # Cheap pre-check: percent-encoding at most triples the raw length
+        raw = len(str(self.base_url)) + len(str(url))
+        for name, value in (params or {}).items():
+            raw += len(name) + len(str(value)) + 2
+        if 3 * raw <= self.max_url_length:
+            return None
+        length = self.url_length(url, params)
+        return length if length > self.max_url_length else None
+
+    def validate(self, method: str, url: Any, params: Optional[Mapping[str, Any]] = None,
+                 headers: Optional[Mapping[str, Any]] = None) -> Optional[str]:
+        """Validate a request.
+
+        Returns:
+            The request's operationId, or None if it matches no operation.
+
+        Raises:
+            ValidationError: If a parameter is invalid or the URL too long.
+        """
+        operation_id = self.operations.resolve(method, url) if self.operations is not None else None
+        validator = self.validators.get(operation_id)
+        if validator is not None:
+            validator.validate(params, headers)
+        length = self.exceeds_url_limit(url, params)
+        if length is not None:
+            raise ValidationError(
+                f"Request URL is {length} characters, over the {self.max_url_length} character limit; "
+                "use fewer filter values",
+                field="url",
+                expected=f"<= {self.max_url_length} characters",
+                actual=str(length),
+                context={"operation_id": operation_id}
+            )
+        return operation_id
+
+
+class ValidatingToolClient:
+    """Client for OpenAPI tools that rejects invalid requests locally.
+
+    Attributes:
+        client: Wrapped tool client
+        validator: RequestValidator
+    """
+
+    def __init__(self, client: Any, validator: RequestValidator):
+        """Initialize validating client.
+
+        Args:
+            client: Tool client to send valid requests with.
+            validator: RequestValidator for the spec's operations.
+        """
+        self.client = client
+        self.validator = validator
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    async def request(self, method: str, url: Any, **kwargs: Any) -> httpx.Response:
+        """Validate the request, then send it with the wrapped client.
+
+        Raises:
+            ValidationError: If the request is invalid (nothing is sent).
+        """
+        try:
+            self.validator.validate(method, url, kwargs.get("params"), kwargs.get("headers"))
+        except ValidationError as e:
+            logger.info("Request rejected locally", extra={"url": str(url), **e.context})
+            raise
+        return await self.client.request(method, url, **kwargs)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Raw JSON passthrough for tools whose responses are not transformed."""
+
+import json
+from typing import Any, Iterable
+
+import httpx
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# The body is handed over already decoded, so these no longer describe it
+_BODY_HEADERS = {"content-length", "content-encoding", "transfer-encoding"}
+
+
+class PassthroughResponse(httpx.Response):
+    """Upstream response handed to OpenAPITool without being decoded.
+
+    OpenAPITool returns the body text as the tool's text content when
+    json() fails, so json() always raises here: the upstream bytes are
+    decoded to text once and sent on as-is, with no json.loads of the body,
+    no structured content and no json.dumps on the way out.
+    """
+
+    def __init__(self, response: httpx.Response):
+        """Wrap a fully read upstream response.
+
+        Args:
+            response: Successful JSON response (body already read).
+        """
+        super().__init__(
+            response.status_code,
+            headers=[(k, v) for k, v in response.headers.items() if k.lower() not in _BODY_HEADERS],
+            content=response.content,
+            request=response.request
+        )
+
+    def json(self, **kwargs: Any) -> Any:
+        raise json.JSONDecodeError("Passthrough response is not decoded", "", 0)
+
+
+class PassthroughToolClient:
+    """Client for OpenAPI tools that passes selected responses through raw.
+
+    Requests for the configured operationIds go straight to the retry
+    client and, if the response is a 2xx with a JSON content type, come
+    back as PassthroughResponse. All other requests are delegated to the
+    wrapped tool client (e.g. StreamingToolClient), so passthrough
+    operations are not streamed.
+
+    Attributes:
+        client: Wrapped tool client
+        retry_client: RetryAsyncClient making the upstream requests
+        operations: operationIds served raw
+    """
+
+    def __init__(self, client: Any, retry_client: Any, operations: Iterable[str]):
+        """Initialize passthrough client.
+
+        Args:
+            client: Tool client for operations that are not passed through.
+            retry_client: RetryAsyncClient with an OperationIndex.
+            operations: operationIds whose responses are passed through.
+        """
+        self.client = client
+        self.retry_client = retry_client
+        self.operations = set(operations)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    async def request(self, method: str, url: Any, **kwargs: Any) -> httpx.Response:
+        """Make a request, skipping JSON decoding for passthrough operations.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            **kwargs: Request arguments.
+
+        Returns:
+            PassthroughResponse for successful JSON responses of passthrough
+            operations, otherwise the wrapped client's response.
+        """
+        operations = self.retry_client.operations
+        operation_id = operations.resolve(method, url) if operations is not None else None
+        if operation_id not in self.operations:
+            return await self.client.request(method, url, **kwargs)
+
+        response = await self.retry_client.request(method, url, **kwargs)
+        # Cheap checks only: the body itself is not validated
+        if response.is_success and "json" in response.headers.get("content-type", ""):
+            return PassthroughResponse(response)
+        logger.debug("Response not passed through", extra={
+            "operation_id": operation_id,
+            "status_code": response.status_code
+        })
+        return response
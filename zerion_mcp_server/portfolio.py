@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""Aggregated positions and exposure across several wallets.
+
+Risk and whale-tracking flows call listWalletPositions once per wallet and
+then sum exposures by protocol or fungible by hand, with hundreds of
+positions in the agent's context. The aggregateWalletPortfolios tool
+fetches the wallets' positions concurrently and merges them in one
+hash-join pass (dicts keyed by fungible id, chain and protocol), returning
+totals, concentration percentages and the top holdings only.
+
+Loans count as debt: a group's value is its assets minus its debt, and
+concentration shares are taken of gross assets.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Annotated, Any, Dict, List, Literal, Optional, Tuple
+
+import httpx
+
+from .errors import APIError, ZerionMCPError
+from .logger import get_logger
+from .pagination import extract_cursor_from_url
+from .priority import Priority, request_priority
+
+logger = get_logger(__name__)
+
+PORTFOLIO_TOOL = "aggregateWalletPortfolios"
+
+# Protocol key of plain wallet balances (no dapp)
+WALLET_PROTOCOL = "wallet"
+
+
+class _Group:
+    """Running totals of one group (a fungible, chain, protocol or holding)."""
+
+    __slots__ = ("label", "assets", "debt", "quantity", "positions", "wallets", "chains", "position_types")
+
+    def __init__(self, label: str):
+        self.label = label
+        self.assets = 0.0
+        self.debt = 0.0
+        self.quantity = 0.0
+        self.positions = 0
+        self.wallets = set()
+        self.chains = set()
+        self.position_types: Dict[str, float] = defaultdict(float)
+
+    def add(self, wallet: str, chain: str, position_type: str, value: float, quantity: float) -> None:
+        if position_type == "loan":
+            self.debt += value
+        else:
+            self.assets += value
+        self.quantity += quantity
+        self.positions += 1
+        self.wallets.add(wallet)
+        self.chains.add(chain)
+        self.position_types[position_type] += value
+
+
+def relationship_id(position: Dict[str, Any], name: str) -> Optional[str]:
+    """Id of a JSON:API relationship of an item (e.g. 'chain'), if present."""
+    return (((position.get("relationships") or {}).get(name) or {}).get("data") or {}).get("id")
+
+
+def aggregate_positions(positions_by_wallet: Dict[str, List[Dict[str, Any]]], top: int = 10) -> Dict[str, Any]:
+    """Merge wallets' listWalletPositions items into exposure summaries.
+
+    Positions flagged as not displayable are skipped, as Zerion excludes
+    them from wallet totals.
+
+    Args:
+        positions_by_wallet: Position items per wallet address.
+        top: Entries returned per breakdown.
+
+    Returns:
+        Dict with totals, per-wallet values, and the top entries by
+        fungible, chain and protocol and the top holdings (fungible on a
+        chain in a protocol), each with value, share of gross assets and
+        wallet count.
+    """
+    by_fungible: Dict[str, _Group] = {}
+    by_chain: Dict[str, _Group] = {}
+    by_protocol: Dict[str, _Group] = {}
+    holdings: Dict[Tuple[str, str, str], _Group] = {}
+    wallets: Dict[str, _Group] = {}
+
+    for wallet, positions in positions_by_wallet.items():
+        wallet_group = wallets[wallet] = _Group(wallet)
+        for position in positions:
+            attributes = position.get("attributes") or {}
+            if (attributes.get("flags") or {}).get("displayable") is False:
+                continue
+            value = float(attributes.get("value") or 0.0)
+            quantity = float((attributes.get("quantity") or {}).get("float") or 0.0)
+            position_type = attributes.get("position_type") or "wallet"
+            fungible_info = attributes.get("fungible_info") or {}
+            fungible = relationship_id(position, "fungible") or fungible_info.get("symbol") or "unknown"
+            chain = relationship_id(position, "chain") or "unknown"
+            protocol = relationship_id(position, "dapp") or attributes.get("protocol") or WALLET_PROTOCOL
+            protocol_label = (attributes.get("application_metadata") or {}).get("name") or protocol
+            symbol = fungible_info.get("symbol") or fungible
+
+            for groups, key, label in (
+                (by_fungible, fungible, symbol),
+                (by_chain, chain, chain),
+                (by_protocol, protocol, protocol_label),
+                (holdings, (fungible, chain, protocol), symbol)
+            ):
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = _Group(label)
+                group.add(wallet, chain, position_type, value, quantity)
+            wallet_group.add(wallet, chain, position_type, value, quantity)
+
+    gross = sum(group.assets for group in wallets.values())
+    debt = sum(group.debt for group in wallets.values())
+
+    def share(group: _Group) -> float:
+        return round(100 * group.assets / gross, 2) if gross else 0.0
+
+    def summary(group: _Group) -> Dict[str, Any]:
+        entry = {
+            "value": round(group.assets - group.debt, 2),
+            "share_pct": share(group),
+            "wallets": len(group.wallets)
+        }
+        if group.debt:
+            entry["debt"] = round(group.debt, 2)
+        return entry
+
+    def ranked(groups: Dict[Any, _Group]) -> List[Tuple[Any, _Group]]:
+        return sorted(groups.items(), key=lambda item: -(item[1].assets + item[1].debt))[:top]
+
+    return {
+        "wallets": len(positions_by_wallet),
+        "positions": sum(group.positions for group in wallets.values()),
+        "totals": {
+            "value": round(gross - debt, 2),
+            "assets": round(gross, 2),
+            "debt": round(debt, 2)
+        },
+        "by_wallet": {
+            address: {"value": round(group.assets - group.debt, 2), "share_pct": share(group)}
+            for address, group in wallets.items()
+        },
+        "by_fungible": [
+            {"fungible_id": key, "symbol": group.label, "quantity": group.quantity, **summary(group)}
+            for key, group in ranked(by_fungible)
+        ],
+        "by_chain": [{"chain_id": key, **summary(group)} for key, group in ranked(by_chain)],
+        "by_protocol": [
+            {
+                "protocol": key,
+                "name": group.label,
+                **summary(group),
+                "chains": sorted(group.chains),
+                "position_types": {k: round(v, 2) for k, v in group.position_types.items()}
+            }
+            for key, group in ranked(by_protocol)
+        ],
+        "top_holdings": [
+            {
+                "fungible_id": fungible,
+                "symbol": group.label,
+                "chain_id": chain,
+                "protocol": protocol,
+                "quantity": group.quantity,
+                **summary(group)
+            }
+            for (fungible, chain, protocol), group in ranked(holdings)
+        ],
+        "concentration": {
+            "top_fungible_pct": max(map(share, by_fungible.values()), default=0.0),
+            "top_protocol_pct": max(map(share, by_protocol.values()), default=0.0),
+            "top_wallet_pct": max(map(share, wallets.values()), default=0.0)
+        }
+    }
+
+
+async def fetch_wallet_positions(
+    client: Any,
+    address: str,
+    params: Dict[str, Any],
+    max_pages: int = 10
+) -> List[Dict[str, Any]]:
+    """Fetch a wallet's positions, following links.next up to max_pages.
+
+    Args:
+        client: Upstream client (RetryAsyncClient or SidecarClient).
+        address: Wallet address.
+        params: Query parameters (currency and filters).
+        max_pages: Page limit.
+
+    Returns:
+        Position items.
+
+    Raises:
+        APIError: If Zerion returns an error status.
+    """
+    positions: List[Dict[str, Any]] = []
+    page_after = None
+    for _ in range(max_pages):
+        request_params = dict(params)
+        if page_after:
+            request_params["page[after]"] = page_after
+        response = await client.request("GET", f"/v1/wallets/{address}/positions/", params=request_params)
+        if not response.is_success:
+            raise APIError.from_response(response)
+        document = response.json()
+        positions.extend(document.get("data") or [])
+        next_url = (document.get("links") or {}).get("next")
+        page_after = extract_cursor_from_url(next_url) if next_url else None
+        if page_after is None:
+            break
+    return positions
+
+
+def portfolio_tool(client: Any, max_wallets: int = 50, max_concurrency: int = 8, max_pages: int = 10) -> Any:
+    """Create the aggregateWalletPortfolios tool.
+
+    Args:
+        client: Upstream client for listWalletPositions requests.
+        max_wallets: Maximum addresses per call.
+        max_concurrency: Wallets fetched at the same time.
+        max_pages: Page limit per wallet.
+
+    Returns:
+        fastmcp FunctionTool to add with mcp.add_tool().
+    """
+    from fastmcp.tools import Tool
+    from pydantic import Field
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(address: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        async with semaphore:
+            # Fan-out on behalf of the interactive call
+            with request_priority(Priority.NORMAL):
+                return await fetch_wallet_positions(client, address, params, max_pages)
+
+    async def aggregate_wallet_portfolios(
+        addresses: Annotated[
+            List[str], Field(min_length=1, max_length=max_wallets, description="Wallet addresses")
+        ],
+        positions: Annotated[
+            Literal["only_simple", "only_complex", "no_filter"],
+            Field(description="Wallet balances only, DeFi protocol positions only, or both")
+        ] = "no_filter",
+        chain_ids: Annotated[Optional[List[str]], Field(description="Only positions on these chains")] = None,
+        dapp_ids: Annotated[Optional[List[str]], Field(description="Only positions in these protocols (e.g. 'aave-v3')")] = None,
+        top: Annotated[int, Field(ge=1, le=100, description="Entries returned per breakdown")] = 10,
+        currency: Annotated[str, Field(description="Currency of values")] = "usd"
+    ) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"currency": currency, "filter[positions]": positions, "filter[trash]": "only_non_trash"}
+        if chain_ids:
+            params["filter[chain_ids]"] = ",".join(chain_ids)
+        if dapp_ids:
+            params["filter[dapp_ids]"] = ",".join(dapp_ids)
+
+        unique = list(dict.fromkeys(addresses))
+        results = await asyncio.gather(*(fetch(address, params) for address in unique), return_exceptions=True)
+        fetched: Dict[str, List[Dict[str, Any]]] = {}
+        errors: Dict[str, str] = {}
+        for address, result in zip(unique, results):
+            if isinstance(result, (ZerionMCPError, httpx.HTTPError)):
+                errors[address] = str(result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                fetched[address] = result
+        if not fetched:
+            # Nothing to aggregate: surface the first failure as the tool error
+            raise next(r for r in results if isinstance(r, BaseException))
+
+        summary = aggregate_positions(fetched, top)
+        logger.debug("Portfolios aggregated", extra={
+            "wallets": len(fetched),
+            "failed_wallets": len(errors),
+            "positions": summary["positions"]
+        })
+        if errors:
+            summary["failed_wallets"] = errors
+        return {"currency": currency, **summary}
+
+    return Tool.from_function(
+        aggregate_wallet_portfolios,
+        name=PORTFOLIO_TOOL,
+        description=(
+            "Aggregate the positions of several wallets without listing them: total "
+            "value, assets and debt (loans), each wallet's share, and the top "
+            "fungibles, chains, protocols and holdings with their share of assets. "
+            "Use for exposure and concentration questions across a set of wallets."
+        ),
+        output_schema=None
+    )
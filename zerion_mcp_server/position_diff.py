@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Position snapshots and change detection for wallet monitoring.
+
+Monitoring flows poll listWalletPositions and ask the model what changed
+since the last poll, which puts both full position lists in its context.
+The diffWalletPositions tool keeps the last snapshot per (wallet, filter
+set) in memory, as one tuple per position id, and returns only the
+positions that were added, removed or changed, with quantity and value
+deltas. The comparison is a single pass over the two id-keyed dicts.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Annotated, Any, Dict, List, Literal, NamedTuple, Optional
+
+from .logger import get_logger
+from .portfolio import WALLET_PROTOCOL, fetch_wallet_positions, relationship_id
+
+logger = get_logger(__name__)
+
+DIFF_TOOL = "diffWalletPositions"
+
+# Relative quantity change below which a quantity counts as unchanged
+QUANTITY_TOLERANCE = 1e-9
+
+
+class PositionState(NamedTuple):
+    """Compact per-position state kept in a snapshot."""
+
+    quantity: float
+    value: float
+    symbol: str
+    chain_id: str
+    protocol: str
+    position_type: str
+
+
+class PositionSnapshot(NamedTuple):
+    """Positions of one wallet and filter set at a point in time."""
+
+    positions: Dict[str, PositionState]
+    taken_at: float
+
+
+def _timestamp_text(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def snapshot_positions(positions: List[Dict[str, Any]], taken_at: Optional[float] = None) -> PositionSnapshot:
+    """Build a snapshot from listWalletPositions items.
+
+    Args:
+        positions: Position items (items without an id are skipped).
+        taken_at: Snapshot time (default: now).
+
+    Returns:
+        PositionSnapshot keyed by position id.
+    """
+    states: Dict[str, PositionState] = {}
+    for position in positions:
+        position_id = position.get("id")
+        if not position_id:
+            continue
+        attributes = position.get("attributes") or {}
+        states[position_id] = PositionState(
+            quantity=float((attributes.get("quantity") or {}).get("float") or 0.0),
+            value=float(attributes.get("value") or 0.0),
+            symbol=(attributes.get("fungible_info") or {}).get("symbol") or attributes.get("name") or "unknown",
+            chain_id=relationship_id(position, "chain") or "unknown",
+            protocol=relationship_id(position, "dapp") or attributes.get("protocol") or WALLET_PROTOCOL,
+            position_type=attributes.get("position_type") or "wallet"
+        )
+    return PositionSnapshot(states, time.time() if taken_at is None else taken_at)
+
+
+def _entry(position_id: str, state: PositionState) -> Dict[str, Any]:
+    return {
+        "id": position_id,
+        "symbol": state.symbol,
+        "chain_id": state.chain_id,
+        "protocol": state.protocol,
+        "position_type": state.position_type,
+        "quantity": state.quantity,
+        "value": round(state.value, 2)
+    }
+
+
+def diff_snapshots(
+    old: PositionSnapshot,
+    new: PositionSnapshot,
+    min_value_change: Optional[float] = None,
+    top: int = 50
+) -> Dict[str, Any]:
+    """Compare two snapshots by position id.
+
+    A position is changed when its quantity changed, or, if
+    min_value_change is given, when its value moved by at least that much
+    (e.g. from price alone).
+
+    Args:
+        old: Previous snapshot.
+        new: Current snapshot.
+        min_value_change: Report value-only changes of at least this amount.
+        top: Entries returned per list (largest value change first).
+
+    Returns:
+        Dict with added, removed and changed positions, their counts, the
+        number of unchanged positions and the total value change.
+    """
+    added: List[Dict[str, Any]] = []
+    changed: List[Dict[str, Any]] = []
+    unchanged = 0
+    for position_id, state in new.positions.items():
+        before = old.positions.get(position_id)
+        if before is None:
+            added.append(_entry(position_id, state))
+            continue
+        quantity_change = state.quantity - before.quantity
+        value_change = state.value - before.value
+        quantity_moved = abs(quantity_change) > QUANTITY_TOLERANCE * max(abs(before.quantity), abs(state.quantity))
+        value_moved = min_value_change is not None and abs(value_change) >= min_value_change
+        if quantity_moved or value_moved:
+            changed.append({
+                **_entry(position_id, state),
+                "quantity_change": quantity_change,
+                "value_change": round(value_change, 2)
+            })
+        else:
+            unchanged += 1
+    removed = [_entry(position_id, state) for position_id, state in old.positions.items() if position_id not in new.positions]
+
+    by_value = lambda key: lambda entry: -abs(entry[key])
+    old_total = sum(state.value for state in old.positions.values())
+    new_total = sum(state.value for state in new.positions.values())
+    return {
+        "previous_taken_at": _timestamp_text(old.taken_at),
+        "taken_at": _timestamp_text(new.taken_at),
+        "total_value": round(new_total, 2),
+        "total_value_change": round(new_total - old_total, 2),
+        "counts": {"added": len(added), "removed": len(removed), "changed": len(changed), "unchanged": unchanged},
+        "added": sorted(added, key=by_value("value"))[:top],
+        "removed": sorted(removed, key=by_value("value"))[:top],
+        "changed": sorted(changed, key=by_value("value_change"))[:top]
+    }
+
+
+class SnapshotStore:
+    """Last position snapshot per (wallet, filter set), least recently used dropped.
+
+    Attributes:
+        max_snapshots: Snapshots kept
+    """
+
+    def __init__(self, max_snapshots: int = 256):
+        """Initialize store.
+
+        Args:
+            max_snapshots: Maximum snapshots kept.
+        """
+        self.max_snapshots = max_snapshots
+        self._snapshots: "OrderedDict[str, PositionSnapshot]" = OrderedDict()
+
+    @staticmethod
+    def key(address: str, params: Dict[str, Any]) -> str:
+        """Snapshot key of a wallet and its query parameters."""
+        return json.dumps([address.lower(), params], sort_keys=True)
+
+    def swap(self, key: str, snapshot: PositionSnapshot) -> Optional[PositionSnapshot]:
+        """Store a snapshot, returning the one it replaces (None for the first)."""
+        previous = self._snapshots.pop(key, None)
+        self._snapshots[key] = snapshot
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+        return previous
+
+
+def diff_tool(client: Any, store: SnapshotStore, max_pages: int = 10) -> Any:
+    """Create the diffWalletPositions tool.
+
+    Args:
+        client: Upstream client for listWalletPositions requests.
+        store: SnapshotStore holding the previous snapshots.
+        max_pages: Page limit per wallet.
+
+    Returns:
+        fastmcp FunctionTool to add with mcp.add_tool().
+    """
+    from fastmcp.tools import Tool
+    from pydantic import Field
+
+    async def diff_wallet_positions(
+        address: Annotated[str, Field(description="Wallet address")],
+        positions: Annotated[
+            Literal["only_simple", "only_complex", "no_filter"],
+            Field(description="Wallet balances only, DeFi protocol positions only, or both")
+        ] = "no_filter",
+        chain_ids: Annotated[Optional[List[str]], Field(description="Only positions on these chains")] = None,
+        dapp_ids: Annotated[Optional[List[str]], Field(description="Only positions in these protocols")] = None,
+        min_value_change: Annotated[
+            Optional[float],
+            Field(ge=0, description="Also report positions whose value (e.g. from price) moved by at least this much")
+        ] = None,
+        top: Annotated[int, Field(ge=1, le=500, description="Entries returned per list")] = 50,
+        currency: Annotated[str, Field(description="Currency of values")] = "usd"
+    ) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"currency": currency, "filter[positions]": positions, "filter[trash]": "only_non_trash"}
+        if chain_ids:
+            params["filter[chain_ids]"] = ",".join(chain_ids)
+        if dapp_ids:
+            params["filter[dapp_ids]"] = ",".join(dapp_ids)
+
+        items = await fetch_wallet_positions(client, address, params, max_pages)
+        snapshot = snapshot_positions(items)
+        previous = store.swap(store.key(address, params), snapshot)
+        if previous is None:
+            # Nothing to compare with yet: this call records the baseline
+            return {
+                "address": address,
+                "baseline": True,
+                "taken_at": _timestamp_text(snapshot.taken_at),
+                "positions": len(snapshot.positions),
+                "total_value": round(sum(state.value for state in snapshot.positions.values()), 2)
+            }
+        diff = diff_snapshots(previous, snapshot, min_value_change, top)
+        logger.debug("Positions diffed", extra={"address": address, **diff["counts"]})
+        return {"address": address, "baseline": False, **diff}
+
+    return Tool.from_function(
+        diff_wallet_positions,
+        name=DIFF_TOOL,
+        description=(
+            "Report what changed in a wallet's positions since the previous call with "
+            "the same filters: added, removed and changed positions with quantity and "
+            "value deltas. The first call records a baseline. Value-only (price) "
+            "changes are reported when min_value_change is set."
+        ),
+        output_schema=None
+    )
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Batch fungible price lookup with a short-TTL price map.
+
+Pricing a basket of tokens otherwise takes one getFungibleById call per
+token. The getFungiblePrices tool answers the ids it has seen recently from
+an in-memory map of (currency, fungible id) to price, and asks for the
+rest in one listFungibles request with filter[fungible_ids]. That request
+goes through a SplittingToolClient, which splits it into as few
+concurrent requests as the filter's maxItems and the URL length limit
+allow. The result is a flat id -> price table.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Annotated, Any, Dict, Iterable, List, Optional, Tuple
+
+from .errors import APIError
+from .logger import get_logger
+from .priority import Priority, request_priority
+
+logger = get_logger(__name__)
+
+PRICES_TOOL = "getFungiblePrices"
+FUNGIBLES_URL = "/v1/fungibles/"
+
+
+class PriceCache:
+    """Recent fungible prices per currency, least recently used dropped.
+
+    Attributes:
+        ttl: Seconds a price is served
+        max_entries: Prices kept
+    """
+
+    def __init__(self, ttl: float = 30, max_entries: int = 4096):
+        """Initialize cache.
+
+        Args:
+            ttl: Seconds a price is served.
+            max_entries: Maximum prices kept.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._prices: "OrderedDict[Tuple[str, str], Tuple[Optional[float], float]]" = OrderedDict()
+
+    def lookup(self, currency: str, fungible_ids: Iterable[str]) -> Tuple[Dict[str, Optional[float]], List[str]]:
+        """Split ids into fresh cached prices and misses.
+
+        Returns:
+            Tuple of ({id: price} for cached ids, ids to fetch).
+        """
+        now = time.monotonic()
+        cached: Dict[str, Optional[float]] = {}
+        misses: List[str] = []
+        for fungible_id in fungible_ids:
+            entry = self._prices.get((currency, fungible_id))
+            if entry is not None and now - entry[1] < self.ttl:
+                self._prices.move_to_end((currency, fungible_id))
+                cached[fungible_id] = entry[0]
+            else:
+                misses.append(fungible_id)
+        return cached, misses
+
+    def store(self, currency: str, prices: Dict[str, Optional[float]]) -> None:
+        """Store fetched prices."""
+        now = time.monotonic()
+        for fungible_id, price in prices.items():
+            self._prices[(currency, fungible_id)] = (price, now)
+            self._prices.move_to_end((currency, fungible_id))
+        while len(self._prices) > self.max_entries:
+            self._prices.popitem(last=False)
+
+
+def fungible_prices(document: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Map fungible id to market_data.price in a listFungibles document."""
+    prices: Dict[str, Optional[float]] = {}
+    for item in document.get("data") or []:
+        fungible_id = item.get("id")
+        if fungible_id:
+            market_data = (item.get("attributes") or {}).get("market_data") or {}
+            price = market_data.get("price")
+            prices[fungible_id] = float(price) if price is not None else None
+    return prices
+
+
+def prices_tool(client: Any, cache: PriceCache, max_ids: int = 200) -> Any:
+    """Create the getFungiblePrices tool.
+
+    Args:
+        client: Upstream client for listFungibles requests; a
+            SplittingToolClient, so one request may carry every miss.
+        cache: PriceCache.
+        max_ids: Maximum fungible ids per call.
+
+    Returns:
+        fastmcp FunctionTool to add with mcp.add_tool().
+    """
+    from fastmcp.tools import Tool
+    from pydantic import Field
+
+    async def get_fungible_prices(
+        fungible_ids: Annotated[
+            List[str],
+            Field(min_length=1, max_length=max_ids, description="Fungible ids (e.g. 'eth' or a fungible's id)")
+        ],
+        currency: Annotated[str, Field(description="Currency of the prices")] = "usd"
+    ) -> Dict[str, Any]:
+        unique = list(dict.fromkeys(fungible_ids))
+        prices, misses = cache.lookup(currency, unique)
+        if misses:
+            params = {"currency": currency, "filter[fungible_ids]": ",".join(misses), "page[size]": 100}
+            # Fan-out on behalf of the interactive call
+            with request_priority(Priority.NORMAL):
+                response = await client.request("GET", FUNGIBLES_URL, params=params)
+            if not response.is_success:
+                raise APIError.from_response(response)
+            fetched = fungible_prices(response.json())
+            cache.store(currency, fetched)
+            prices.update(fetched)
+
+        missing = [fungible_id for fungible_id in unique if fungible_id not in prices]
+        logger.debug("Fungible prices looked up", extra={
+            "ids": len(unique),
+            "cached": len(unique) - len(misses),
+            "missing": len(missing)
+        })
+        result: Dict[str, Any] = {
+            "currency": currency,
+            "prices": {fungible_id: prices[fungible_id] for fungible_id in unique if fungible_id in prices}
+        }
+        if missing:
+            result["missing"] = missing
+        return result
+
+    return Tool.from_function(
+        get_fungible_prices,
+        name=PRICES_TOOL,
+        description=(
+            "Get current prices for many fungibles at once as a flat id -> price "
+            "table. Use instead of one getFungibleById call per token when pricing "
+            "a basket. Ids Zerion does not know are listed under missing."
+        ),
+        output_schema=None
+    )
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Request priority tagging for upstream calls."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Iterator
+
+
+class Priority(IntEnum):
+    """Priority of an upstream request (lower value = more important).
+
+    Attributes:
+        INTERACTIVE: Agent tool calls waiting on a direct answer
+        NORMAL: Fan-out work done on behalf of an interactive call
+        BACKGROUND: Auto-pagination, prefetch and sync jobs
+    """
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+_current_priority: ContextVar[Priority] = ContextVar(
+    "zerion_request_priority", default=Priority.INTERACTIVE
+)
+
+
+def current_priority() -> Priority:
+    """Get the priority of upstream requests made in the current context.
+
+    Returns:
+        Current priority (INTERACTIVE unless tagged otherwise).
+    """
+    return _current_priority.get()
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[Priority]:
+    """Tag upstream requests made inside the block with a priority.
+
+    Args:
+        priority: Priority for requests made in this context.
+
+    Yields:
+        The priority in effect.
+
+    Example:
+        ```python
+        with request_priority(Priority.BACKGROUND):
+            await client.get("/v1/wallets/0x.../transactions/")
+        ```
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield priority
+    finally:
+        _current_priority.reset(token)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""Persistent daily quota accounting and budget enforcement."""
+
+import asyncio
+import sqlite3
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .errors import QuotaExceededError
+from .logger import get_logger
+from .priority import Priority
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    day TEXT NOT NULL,
+    key_name TEXT NOT NULL,
+    operation_id TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, key_name, operation_id)
+)
+"""
+
+
+def _today() -> str:
+    """Get the current UTC day (Zerion quotas reset daily)."""
+    return datetime.now(UTC).strftime("%Y-%m-%d")
+
+
+class QuotaLedger:
+    """Counts upstream calls per API key, day and operationId in SQLite.
+
+    Counts survive restarts and are shared by every process using the same
+    ledger file. Increments are buffered in memory and flushed every
+    flush_every calls, at the latest flush_interval seconds after the first
+    buffered call (by a timer on the running event loop), and on close().
+
+    Budgets apply per key and per UTC day. BACKGROUND requests are refused
+    once a key reaches the soft budget; INTERACTIVE and NORMAL requests only
+    at the hard budget. A budget of None disables that limit.
+
+    Attributes:
+        path: SQLite ledger file
+        soft_limit: Daily per-key budget for background requests
+        hard_limit: Daily per-key budget for all requests
+    """
+
+    def __init__(
+        self,
+        path: str,
+        soft_limit: Optional[int] = None,
+        hard_limit: Optional[int] = None,
+        flush_every: int = 25,
+        flush_interval: float = 5.0
+    ):
+        """Open or create the ledger.
+
+        Args:
+            path: SQLite ledger file path ('~' is expanded).
+            soft_limit: Daily per-key budget for background requests.
+            hard_limit: Daily per-key budget for all requests.
+            flush_every: Flush after this many buffered calls.
+            flush_interval: Flush when the oldest buffered call is this old (seconds).
+        """
+        self.path = Path(path).expanduser()
+        self.soft_limit = soft_limit
+        self.hard_limit = hard_limit
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+
+        self._day = _today()
+        self._totals: Dict[str, int] = {}
+        self._pending: Dict[Tuple[str, str, str], int] = {}
+        self._pending_since: Optional[float] = None
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._reload_totals()
+
+        logger.debug("Quota ledger opened", extra={
+            "path": str(self.path),
+            "soft_limit": soft_limit,
+            "hard_limit": hard_limit
+        })
+
+    def _reload_totals(self) -> None:
+        """Load today's per-key totals from the ledger file."""
+        rows = self._db.execute(
+            "SELECT key_name, SUM(count) FROM usage WHERE day = ? GROUP BY key_name",
+            (self._day,)
+        ).fetchall()
+        self._totals = {key_name: total for key_name, total in rows}
+        for (day, key_name, _), count in self._pending.items():
+            if day == self._day:
+                self._totals[key_name] = self._totals.get(key_name, 0) + count
+
+    def _roll_day(self) -> None:
+        """Start a new day's totals when the UTC date changes."""
+        today = _today()
+        if today != self._day:
+            self.flush()
+            self._day = today
+            self._reload_totals()
+
+    def used(self, key_name: str) -> int:
+        """Get today's request count for a key."""
+        self._roll_day()
+        return self._totals.get(key_name, 0)
+
+    def limit_for(self, priority: Priority) -> Optional[int]:
+        """Get the budget that applies to a priority."""
+        if priority >= Priority.BACKGROUND and self.soft_limit is not None:
+            return self.soft_limit
+        return self.hard_limit
+
+    def allows(self, key_name: str, priority: Priority) -> bool:
+        """Check whether a key may make another request at a priority.
+
+        Args:
+            key_name: API key label.
+            priority: Request priority.
+
+        Returns:
+            True if the request fits in today's budget.
+        """
+        limit = self.limit_for(priority)
+        return limit is None or self.used(key_name) < limit
+
+    def exceeded_error(self, key_name: str, priority: Priority) -> QuotaExceededError:
+        """Build the error for a request refused by the budget.
+
+        Args:
+            key_name: API key label that was checked.
+            priority: Request priority.
+
+        Returns:
+            QuotaExceededError describing the budget.
+        """
+        limit = self.limit_for(priority)
+        used = self.used(key_name)
+        budget = "soft" if limit == self.soft_limit and priority >= Priority.BACKGROUND else "hard"
+        return QuotaExceededError(
+            f"Daily {budget} quota budget reached ({used}/{limit} requests today). "
+            f"{priority.name.lower()} requests are refused until the budget resets at 00:00 UTC.",
+            used=used,
+            limit=limit,
+            priority=priority.name.lower()
+        )
+
+    def record(self, key_name: str, operation_id: Optional[str]) -> None:
+        """Count one upstream call.
+
+        Args:
+            key_name: API key label used for the call.
+            operation_id: OpenAPI operationId, if known.
+        """
+        self._roll_day()
+        slot = (self._day, key_name, operation_id or "unknown")
+        self._pending[slot] = self._pending.get(slot, 0) + 1
+        self._totals[key_name] = self._totals.get(key_name, 0) + 1
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+            self._schedule_flush()
+
+        if (
+            sum(self._pending.values()) >= self.flush_every
+            or time.monotonic() - self._pending_since >= self.flush_interval
+        ):
+            self.flush()
+
+    def _schedule_flush(self) -> None:
+        """Flush flush_interval seconds from now, even if no other call is recorded."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside an event loop: flushed by a later record() or close()
+            return
+        self._flush_timer = loop.call_later(self.flush_interval, self.flush)
+
+    def flush(self) -> None:
+        """Write buffered counts and refresh totals shared with other processes."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        self._pending_since = None
+        try:
+            self._db.executemany(
+                "INSERT INTO usage (day, key_name, operation_id, count) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (day, key_name, operation_id) DO UPDATE SET count = count + excluded.count",
+                [(day, key_name, op, count) for (day, key_name, op), count in pending.items()]
+            )
+        except sqlite3.Error as e:
+            # Keep counting in memory; retry on the next flush
+            logger.warning("Failed to write quota ledger", extra={"error": str(e)})
+            for slot, count in pending.items():
+                self._pending[slot] = self._pending.get(slot, 0) + count
+            return
+        self._reload_totals()
+
+    def usage(self, day: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """Report request counts per key and operationId.
+
+        Args:
+            day: UTC day as YYYY-MM-DD (default: today).
+
+        Returns:
+            Mapping of key label to {operationId: count}.
+        """
+        self.flush()
+        rows = self._db.execute(
+            "SELECT key_name, operation_id, count FROM usage WHERE day = ? ORDER BY key_name, operation_id",
+            (day or _today(),)
+        ).fetchall()
+        report: Dict[str, Dict[str, int]] = {}
+        for key_name, operation_id, count in rows:
+            report.setdefault(key_name, {})[operation_id] = count
+        return report
+
+    def close(self) -> None:
+        """Flush buffered counts and close the ledger file."""
+        self.flush()
+        self._db.close()
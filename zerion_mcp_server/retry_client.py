@@ -2,17 +2,23 @@
 """HTTP client with automatic retry logic for rate limiting and wallet indexing."""
 
 import asyncio
-from typing import Optional, Any
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
 import httpx
 from tenacity import (
     retry,
     stop_after_attempt,
-    wait_exponential,
     retry_if_exception_type,
     RetryCallState
 )
 
 from .errors import RateLimitError, WalletIndexingError, APIError
+from .http_cache import CacheEntry, DiskCache
+from .indexing import IndexingTracker
+from .key_pool import ApiKeyPool
+from .operations import OperationIndex
+from .priority import current_priority
+from .quota import QuotaLedger
+from .scheduler import PriorityScheduler
 from .logger import get_logger
 
 logger = get_logger(__name__)
@@ -23,11 +29,20 @@ class RetryAsyncClient(httpx.AsyncClient):
 
     This client wraps httpx.AsyncClient and adds transparent retry handling for:
     - 429 Too Many Requests (rate limiting) - exponential backoff
-    - 202 Accepted (wallet indexing) - fixed delay retry
+    - 202 Accepted (wallet indexing) - shared per-address polling with
+      increasing interval
 
     Attributes:
         retry_config: Configuration for retry behavior
         indexing_config: Configuration for 202 handling
+        indexing_tracker: Shared per-address wallet indexing state
+        key_pool: Optional API key pool used to authorize each request
+        quota: Optional daily quota ledger
+        operations: Optional operationId index
+        scheduler: Optional priority scheduler in front of the key pool
+        cache: Optional persistent HTTP cache for GET responses
+        close_callbacks: Coroutine functions awaited by aclose() before the
+            client closes (e.g. to stop background pollers using it)
     """
 
     def __init__(
@@ -35,6 +50,11 @@ class RetryAsyncClient(httpx.AsyncClient):
         *args,
         retry_config: Optional[dict] = None,
         indexing_config: Optional[dict] = None,
+        key_pool: Optional[ApiKeyPool] = None,
+        quota: Optional[QuotaLedger] = None,
+        operations: Optional[OperationIndex] = None,
+        scheduler: Optional[PriorityScheduler] = None,
+        cache: Optional[DiskCache] = None,
         **kwargs
     ):
         """Initialize retry client.
@@ -46,12 +66,31 @@ class RetryAsyncClient(httpx.AsyncClient):
                 - max_delay: Maximum delay in seconds (default: 60)
                 - exponential_base: Backoff multiplier (default: 2)
             indexing_config: Wallet indexing configuration with keys:
-                - retry_delay: Delay between retries in seconds (default: 3)
-                - max_retries: Maximum retry attempts (default: 3)
+                - retry_delay: Initial polling interval in seconds (default: 1)
+                - max_delay: Maximum polling interval in seconds (default: 5)
+                - max_retries: Maximum retry attempts (default: 5)
+                - indexed_ttl: Seconds to remember indexed addresses (default: 300)
                 - auto_retry: Enable automatic retry (default: True)
+            key_pool: Optional API key pool. When set, each upstream request
+                is authorized with the key that has the most headroom.
+            quota: Optional daily quota ledger. Every upstream call is counted
+                and requests over budget are refused before being sent.
+            operations: Optional operationId index used to attribute calls.
+            scheduler: Optional priority scheduler. When set together with a
+                key pool, requests take rate-limit tokens in priority order.
+            cache: Optional disk cache. Fresh GET responses are served
+                without an upstream call and stale ones are revalidated
+                with If-None-Match / If-Modified-Since.
         """
         super().__init__(*args, **kwargs)
 
+        self.key_pool = key_pool
+        self.quota = quota
+        self.operations = operations
+        self.scheduler = scheduler
+        self.cache = cache
+        self.close_callbacks: List[Callable[[], Awaitable[None]]] = []
+
         # Default retry configuration
         self.retry_config = retry_config or {
             "max_attempts": 5,
@@ -62,11 +101,21 @@ class RetryAsyncClient(httpx.AsyncClient):
 
         # Default indexing configuration
         self.indexing_config = indexing_config or {
-            "retry_delay": 3,
-            "max_retries": 3,
+            "retry_delay": 1,
+            "max_delay": 5,
+            "max_retries": 5,
+            "indexed_ttl": 300,
             "auto_retry": True
         }
 
+        # Shared per-address 202 polling state
+        self.indexing_tracker = IndexingTracker(
+            retry_delay=self.indexing_config.get("retry_delay", 1),
+            max_delay=self.indexing_config.get("max_delay", 5),
+            max_retries=self.indexing_config.get("max_retries", 5),
+            indexed_ttl=self.indexing_config.get("indexed_ttl", 300)
+        )
+
         logger.debug("RetryAsyncClient initialized", extra={
             "retry_max_attempts": self.retry_config["max_attempts"],
             "indexing_auto_retry": self.indexing_config["auto_retry"]
@@ -89,7 +138,7 @@ class RetryAsyncClient(httpx.AsyncClient):
 
         This method wraps the parent request() and adds:
         - Rate limit detection and exponential backoff retry
-        - Wallet indexing detection and fixed delay retry
+        - Wallet indexing detection and shared polling retry
 
         Args:
             method: HTTP method
@@ -110,8 +159,15 @@ class RetryAsyncClient(httpx.AsyncClient):
             WalletIndexingError: If wallet indexing timeout after max retries
             APIError: For other API errors
         """
+        # Serve GETs from the disk cache; stale entries are revalidated
+        cache_request, entry = self._cache_lookup(method, url, params, headers)
+        if entry is not None and entry.fresh:
+            return entry.response(cache_request)
+        if entry is not None:
+            headers = {**dict(headers or {}), **entry.conditional_headers()}
+
         # Make initial request
-        response = await super().request(
+        response = await self._send(
             method, url,
             content=content,
             data=data,
@@ -138,7 +194,7 @@ class RetryAsyncClient(httpx.AsyncClient):
         # Handle 429 Too Many Requests (rate limiting)
         elif response.status_code == 429:
             response = await self._handle_429_rate_limit(
-                method, url,
+                response, method, url,
                 content=content,
                 data=data,
                 files=files,
@@ -148,15 +204,225 @@ class RetryAsyncClient(httpx.AsyncClient):
                 **kwargs
             )
 
+        if cache_request is not None:
+            response = self._cache_update(entry, response)
+        return response
+
+    async def stream_json(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        parser: Any,
+        on_item: Optional[Callable[[Any], Awaitable[None]]] = None,
+        **request_kwargs
+    ) -> httpx.Response:
+        """Make a request and decode its JSON body while it downloads.
+
+        Chunks of a successful JSON response are fed to the parser as they
+        arrive and on_item is awaited for each array element it completes,
+        so the first items are available before the body has finished.
+        202 and 429 responses go through the same retry handling as
+        request(); the final (small, already retried) body is then parsed in
+        one go. Error and non-JSON responses are read and returned unparsed.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            parser: JsonArrayParser receiving the body
+            on_item: Optional coroutine called with each decoded element
+            **request_kwargs: Request arguments
+
+        Returns:
+            The upstream response; its body has been consumed by the parser
+            if parser.finished is True.
+        """
+        async def emit(items: list) -> None:
+            if on_item is not None:
+                for item in items:
+                    await on_item(item)
+
+        async def emit_body(response: httpx.Response) -> None:
+            if response.is_success and "json" in response.headers.get("content-type", ""):
+                await emit(parser.feed(response.text) + parser.close())
+
+        cache_request, entry = self._cache_lookup(
+            method, url, request_kwargs.get("params"), request_kwargs.get("headers")
+        )
+        if entry is not None and entry.fresh:
+            response = entry.response(cache_request)
+            await emit_body(response)
+            return response
+        if entry is not None:
+            request_kwargs["headers"] = {
+                **dict(request_kwargs.get("headers") or {}),
+                **entry.conditional_headers()
+            }
+
+        response = await self._send(method, url, stream=True, **request_kwargs)
+
+        if response.status_code in (202, 304, 429):
+            # Retries and revalidations are buffered; the final body is parsed in one go
+            await response.aread()
+            if response.status_code == 202:
+                response = await self._handle_202_accepted(method, url, **request_kwargs)
+            elif response.status_code == 429:
+                response = await self._handle_429_rate_limit(response, method, url, **request_kwargs)
+            if cache_request is not None:
+                response = self._cache_update(entry, response)
+            await emit_body(response)
+            return response
+
+        if not response.is_success or "json" not in response.headers.get("content-type", ""):
+            await response.aread()
+            return response
+
+        # Keep the text for the disk cache only if the response will be stored
+        chunks = [] if self.cache is not None and self.cache.storable(response) else None
+        try:
+            async for chunk in response.aiter_text():
+                if chunks is not None:
+                    chunks.append(chunk)
+                await emit(parser.feed(chunk))
+            await emit(parser.close())
+        finally:
+            await response.aclose()
+        if chunks is not None:
+            self.cache.store(response, "".join(chunks).encode("utf-8"))
+        return response
+
+    def _cache_lookup(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        params: Any,
+        headers: Any
+    ) -> Tuple[Optional[httpx.Request], Optional[CacheEntry]]:
+        """Find the disk cache entry for a GET request.
+
+        Returns:
+            Tuple of (request used as the cache key, entry), or (None, None)
+            when the request is not cacheable.
+        """
+        if self.cache is None or method.upper() != "GET":
+            return None, None
+        request = self.build_request(method, url, params=params, headers=headers)
+        return request, self.cache.lookup(request)
+
+    def _cache_update(self, entry: Optional[CacheEntry], response: httpx.Response) -> httpx.Response:
+        """Store a fresh response, or serve the stored body after a 304."""
+        if response.status_code == 304 and entry is not None:
+            return self.cache.revalidate(entry, response)
+        self.cache.store(response, response.content)
+        return response
+
+    async def _send(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        stream: bool = False,
+        **request_kwargs
+    ) -> httpx.Response:
+        """Make a single upstream request.
+
+        When a key pool is configured, the request is authorized with the key
+        that has the most headroom and the outcome is recorded against it;
+        with a scheduler, keys are handed out in priority order. When a
+        quota ledger is configured, the request is checked against the daily
+        budget for its priority and counted once sent.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            stream: Return as soon as headers arrive, leaving the body unread
+            **request_kwargs: Request arguments
+
+        Returns:
+            httpx.Response object
+
+        Raises:
+            QuotaExceededError: If no API key has budget left for the request
+        """
+        priority = current_priority()
+
+        if self.key_pool is None:
+            key_name = "default"
+            if self.quota is not None and not self.quota.allows(key_name, priority):
+                raise self.quota.exceeded_error(key_name, priority)
+            response = await self._dispatch(method, url, stream, **request_kwargs)
+            self._record_quota(key_name, method, url)
+            return response
+
+        eligible = None
+        if self.quota is not None:
+            eligible = lambda k: self.quota.allows(k.name, priority)
+            if not any(eligible(k) for k in self.key_pool.keys):
+                raise self.quota.exceeded_error(self.key_pool.keys[0].name, priority)
+
+        if self.scheduler is not None:
+            async with self.scheduler.slot(priority):
+                api_key = await self.key_pool.acquire(eligible)
+        else:
+            api_key = await self.key_pool.acquire(eligible)
+        headers = dict(request_kwargs.pop("headers", None) or {})
+        headers["Authorization"] = api_key.key
+
+        response = await self._dispatch(method, url, stream, headers=headers, **request_kwargs)
+
+        self._record_quota(api_key.name, method, url)
+        self.key_pool.record(
+            api_key,
+            response.status_code,
+            retry_after=self._parse_retry_after(response) if response.status_code == 429 else None
+        )
         return response
 
+    async def _dispatch(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        stream: bool,
+        **request_kwargs
+    ) -> httpx.Response:
+        """Send one request, leaving the body unread when stream is True."""
+        if not stream:
+            return await super().request(method, url, **request_kwargs)
+        request = self.build_request(method, url, **request_kwargs)
+        return await self.send(request, stream=True)
+
+    def _record_quota(self, key_name: str, method: str, url: httpx.URL | str) -> None:
+        """Count an upstream call in the quota ledger, if configured."""
+        if self.quota is None:
+            return
+        operation_id = self.operations.resolve(method, url) if self.operations else None
+        self.quota.record(key_name, operation_id)
+
+    async def aclose(self) -> None:
+        """Close the client, logging per-key usage and flushing the quota ledger."""
+        for callback in self.close_callbacks:
+            await callback()
+        if self.key_pool is not None:
+            logger.info("API key usage", extra={"keys": self.key_pool.usage()})
+            self.key_pool.close()
+        if self.quota is not None:
+            logger.info("Daily quota usage", extra={"usage": self.quota.usage()})
+            self.quota.close()
+        if self.cache is not None:
+            logger.info("HTTP cache usage", extra=self.cache.stats())
+            self.cache.close()
+        await super().aclose()
+
     async def _handle_202_accepted(
         self,
         method: str,
         url: httpx.URL | str,
         **request_kwargs
     ) -> httpx.Response:
-        """Handle 202 Accepted response with fixed delay retry.
+        """Handle 202 Accepted response with shared per-address polling.
+
+        Only one request per wallet address polls Zerion; concurrent requests
+        for the same address wait on its outcome and then re-issue their own
+        request once. Addresses that recently finished indexing are retried
+        immediately.
 
         Args:
             method: HTTP method
@@ -179,77 +445,150 @@ class RetryAsyncClient(httpx.AsyncClient):
                 attempts=0
             )
 
-        retry_delay = self.indexing_config["retry_delay"]
-        max_retries = self.indexing_config["max_retries"]
+        address = self.indexing_tracker.address_from_url(str(url))
+
+        if address and self.indexing_tracker.recently_indexed(address):
+            # Indexing finished moments ago; the 202 is stale
+            logger.debug(
+                "Wallet recently indexed, retrying immediately",
+                extra={"url": str(url)}
+            )
+            response = await self._send(method, url, **request_kwargs)
+            if response.status_code != 202:
+                return response
+
+        if address and self.indexing_tracker.is_polling(address):
+            indexed = await self.indexing_tracker.wait_for(address)
+            if indexed is False:
+                raise self._indexing_timeout_error(self.indexing_tracker.total_wait)
+            if indexed:
+                response = await self._send(method, url, **request_kwargs)
+                if response.status_code != 202:
+                    return response
+            # Poller abandoned or this endpoint is still indexing: poll ourselves
+
+        return await self._poll_until_indexed(address, method, url, **request_kwargs)
+
+    async def _poll_until_indexed(
+        self,
+        address: Optional[str],
+        method: str,
+        url: httpx.URL | str,
+        **request_kwargs
+    ) -> httpx.Response:
+        """Poll a request with increasing interval until it stops returning 202.
+
+        Args:
+            address: Wallet address the request targets, if any
+            method: HTTP method
+            url: Request URL
+            **request_kwargs: Request arguments
+
+        Returns:
+            First non-202 response
+
+        Raises:
+            WalletIndexingError: If indexing timeout after max retries
+        """
+        tracker = self.indexing_tracker
+        max_retries = tracker.max_retries
+
+        owner = address is not None and not tracker.is_polling(address)
+        if owner:
+            tracker.start_polling(address)
 
         logger.info(
             "Wallet indexing in progress, will retry",
             extra={
                 "url": str(url),
-                "retry_delay_sec": retry_delay,
+                "retry_delay_sec": tracker.retry_delay,
                 "max_retries": max_retries
             }
         )
 
-        # Retry with fixed delay
-        for attempt in range(1, max_retries + 1):
-            await asyncio.sleep(retry_delay)
-
-            logger.info(
-                f"Retrying wallet indexing request",
-                extra={
-                    "attempt": f"{attempt}/{max_retries}",
-                    "url": str(url)
-                }
-            )
-
-            response = await super().request(method, url, **request_kwargs)
+        indexed: Optional[bool] = None
+        total_wait = 0.0
+        try:
+            for attempt in range(1, max_retries + 1):
+                delay = tracker.poll_interval(attempt)
+                await asyncio.sleep(delay)
+                total_wait += delay
 
-            if response.status_code == 200:
                 logger.info(
-                    "Wallet indexing completed successfully",
+                    f"Retrying wallet indexing request",
                     extra={
-                        "attempts": attempt,
-                        "total_wait_sec": attempt * retry_delay,
+                        "attempt": f"{attempt}/{max_retries}",
                         "url": str(url)
                     }
                 )
-                return response
-            elif response.status_code != 202:
-                # Different error, return it
-                return response
 
-        # Max retries exhausted
-        total_wait = max_retries * retry_delay
-        logger.warning(
-            "Wallet indexing timeout",
-            extra={
-                "url": str(url),
-                "attempts": max_retries,
-                "total_wait_sec": total_wait
-            }
-        )
+                response = await self._send(method, url, **request_kwargs)
+
+                if response.status_code == 200:
+                    indexed = True
+                    logger.info(
+                        "Wallet indexing completed successfully",
+                        extra={
+                            "attempts": attempt,
+                            "total_wait_sec": round(total_wait, 2),
+                            "url": str(url)
+                        }
+                    )
+                    return response
+                elif response.status_code != 202:
+                    # Different error, return it
+                    return response
+
+            # Max retries exhausted
+            indexed = False
+            logger.warning(
+                "Wallet indexing timeout",
+                extra={
+                    "url": str(url),
+                    "attempts": max_retries,
+                    "total_wait_sec": round(total_wait, 2)
+                }
+            )
+            raise self._indexing_timeout_error(total_wait)
+        finally:
+            if owner:
+                tracker.finish_polling(address, indexed)
 
-        raise WalletIndexingError(
+    def _indexing_timeout_error(self, total_wait: float) -> WalletIndexingError:
+        """Build the error raised when wallet indexing polling times out.
+
+        Args:
+            total_wait: Seconds spent polling
+
+        Returns:
+            WalletIndexingError with retry guidance
+        """
+        max_retries = self.indexing_tracker.max_retries
+        return WalletIndexingError(
             f"Wallet is still being indexed by Zerion. "
-            f"Tried {max_retries} times over {total_wait} seconds. "
+            f"Tried {max_retries} times over {total_wait:g} seconds. "
             f"Please retry in 30-60 seconds.",
-            retry_delay=retry_delay,
+            retry_delay=self.indexing_tracker.retry_delay,
             max_retries=max_retries,
             attempts=max_retries
         )
 
     async def _handle_429_rate_limit(
         self,
+        response: httpx.Response,
         method: str,
         url: httpx.URL | str,
         **request_kwargs
     ) -> httpx.Response:
         """Handle 429 Too Many Requests with exponential backoff retry.
 
-        Uses tenacity library for retry logic with exponential backoff.
+        The Retry-After header of the original 429 response drives the first
+        wait, so no extra upstream call is spent just to read it. Subsequent
+        retries use tenacity, honoring Retry-After from each new 429 response
+        and falling back to exponential backoff when the header is absent.
 
         Args:
+            response: The original 429 response
             method: HTTP method
             url: Request URL
             **request_kwargs: Request arguments
@@ -260,18 +599,8 @@ class RetryAsyncClient(httpx.AsyncClient):
         Raises:
             RateLimitError: If rate limit still exceeded after max retries
         """
-        # Get retry-after header if present
-        retry_after = None
-        response = await super().request(method, url, **request_kwargs)
-
-        if "retry-after" in response.headers:
-            try:
-                retry_after = int(response.headers["retry-after"])
-            except ValueError:
-                logger.warning(
-                    "Invalid Retry-After header value",
-                    extra={"value": response.headers["retry-after"]}
-                )
+        retry_after = self._parse_retry_after(response)
+        max_attempts = self.retry_config["max_attempts"]
 
         logger.warning(
             "Rate limit exceeded",
@@ -282,15 +611,16 @@ class RetryAsyncClient(httpx.AsyncClient):
             }
         )
 
+        # First wait is driven by the original response
+        await asyncio.sleep(self._rate_limit_delay(retry_after, attempt=1))
+
+        attempts = 0
+
         # Create retry decorator dynamically with config
         retry_decorator = retry(
             retry=retry_if_exception_type(RateLimitError),
-            wait=wait_exponential(
-                multiplier=self.retry_config["base_delay"],
-                min=self.retry_config["base_delay"],
-                max=self.retry_config["max_delay"]
-            ),
-            stop=stop_after_attempt(self.retry_config["max_attempts"]),
+            wait=self._rate_limit_wait,
+            stop=stop_after_attempt(max_attempts),
             reraise=True,
             before_sleep=self._log_retry_attempt
         )
@@ -298,11 +628,13 @@ class RetryAsyncClient(httpx.AsyncClient):
         @retry_decorator
         async def _retry_request():
             """Inner function to retry with exponential backoff."""
-            resp = await super(RetryAsyncClient, self).request(method, url, **request_kwargs)
+            nonlocal attempts, retry_after
+            attempts += 1
+            resp = await self._send(method, url, **request_kwargs)
 
             if resp.status_code == 429:
                 # Still rate limited, raise error to trigger retry
-                attempts = getattr(_retry_request.retry, 'statistics', {}).get('attempt_number', 0)
+                retry_after = self._parse_retry_after(resp)
                 raise RateLimitError(
                     f"Rate limit exceeded. Retry after {retry_after or 'unknown'} seconds.",
                     retry_after=retry_after,
@@ -341,6 +673,63 @@ class RetryAsyncClient(httpx.AsyncClient):
                 attempts=e.attempts
             )
 
+    def _parse_retry_after(self, response: httpx.Response) -> Optional[int]:
+        """Parse the Retry-After header of a response.
+
+        Args:
+            response: HTTP response
+
+        Returns:
+            Retry-After value in seconds, or None if absent or invalid
+        """
+        if "retry-after" not in response.headers:
+            return None
+        try:
+            return int(response.headers["retry-after"])
+        except ValueError:
+            logger.warning(
+                "Invalid Retry-After header value",
+                extra={"value": response.headers["retry-after"]}
+            )
+            return None
+
+    def _rate_limit_delay(self, retry_after: Optional[int], attempt: int) -> float:
+        """Compute the wait before a rate-limit retry.
+
+        Args:
+            retry_after: Server-provided Retry-After in seconds, if any
+            attempt: 1-based retry attempt number
+
+        Returns:
+            Delay in seconds, capped at max_delay. Zero when another pooled
+            API key is still in rotation.
+        """
+        if self.key_pool is not None and self.key_pool.available():
+            return 0.0
+
+        max_delay = self.retry_config["max_delay"]
+        if retry_after is not None:
+            return min(retry_after, max_delay)
+
+        base_delay = self.retry_config["base_delay"]
+        exponential_base = self.retry_config.get("exponential_base", 2)
+        return min(base_delay * exponential_base ** (attempt - 1), max_delay)
+
+    def _rate_limit_wait(self, retry_state: RetryCallState) -> float:
+        """Tenacity wait strategy honoring Retry-After from the last 429.
+
+        Args:
+            retry_state: Tenacity retry state
+
+        Returns:
+            Delay in seconds before the next attempt
+        """
+        retry_after = None
+        if retry_state.outcome and retry_state.outcome.failed:
+            retry_after = getattr(retry_state.outcome.exception(), "retry_after", None)
+        # The initial wait before the tenacity loop counts as attempt 1
+        return self._rate_limit_delay(retry_after, attempt=retry_state.attempt_number + 1)
+
     def _log_retry_attempt(self, retry_state: RetryCallState) -> None:
         """Log retry attempt information.
 
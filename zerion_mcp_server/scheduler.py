@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Priority-aware admission scheduler for upstream requests."""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from .logger import get_logger
+from .priority import Priority
+
+logger = get_logger(__name__)
+
+
+class _Waiter:
+    """A queued request waiting for a slot."""
+
+    __slots__ = ("priority", "enqueued", "seq", "future")
+
+    def __init__(self, priority: Priority, seq: int, future: asyncio.Future):
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.seq = seq
+        self.future = future
+
+
+class PriorityScheduler:
+    """Multi-level queue with aging in front of the rate limiter.
+
+    Requests acquire one of max_concurrency slots before taking a rate-limit
+    token. When slots are busy, waiters queue per priority level and the next
+    free slot goes to the waiter with the lowest effective priority, where
+    effective priority = level - waited_seconds / aging_interval. Interactive
+    calls therefore jump ahead of a long pagination backfill, while background
+    work still progresses because waiting raises its priority over time.
+
+    Attributes:
+        max_concurrency: Number of requests admitted to the limiter at once
+        aging_interval: Seconds of waiting that promote a waiter by one level
+    """
+
+    def __init__(self, max_concurrency: int = 1, aging_interval: float = 5.0):
+        """Initialize scheduler.
+
+        Args:
+            max_concurrency: Number of requests admitted to the limiter at once.
+            aging_interval: Seconds of waiting that promote a waiter by one level.
+        """
+        self.max_concurrency = max_concurrency
+        self.aging_interval = aging_interval
+
+        self._active = 0
+        self._queues: Dict[Priority, Deque[_Waiter]] = {p: deque() for p in Priority}
+        self._seq = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        """Number of queued requests."""
+        return sum(len(q) for q in self._queues.values())
+
+    def _effective_priority(self, waiter: _Waiter, now: float) -> float:
+        """Get a waiter's priority after aging."""
+        return waiter.priority - (now - waiter.enqueued) / self.aging_interval
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Pop the waiter with the best effective priority (FIFO within a level)."""
+        now = time.monotonic()
+        heads = [q[0] for q in self._queues.values() if q]
+        if not heads:
+            return None
+        best = min(heads, key=lambda w: (self._effective_priority(w, now), w.seq))
+        self._queues[best.priority].popleft()
+        return best
+
+    def _dispatch(self) -> None:
+        """Hand free slots to queued waiters."""
+        while self._active < self.max_concurrency:
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            if waiter.future.done():
+                # Cancelled while queued
+                continue
+            self._active += 1
+            waiter.future.set_result(None)
+
+    async def acquire(self, priority: Priority) -> None:
+        """Wait for a slot.
+
+        Args:
+            priority: Priority of the request.
+        """
+        if self._active < self.max_concurrency and not self.waiting:
+            self._active += 1
+            return
+
+        waiter = _Waiter(priority, next(self._seq), asyncio.get_running_loop().create_future())
+        self._queues[priority].append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot was granted as we were cancelled; pass it on
+                self.release()
+            else:
+                try:
+                    self._queues[priority].remove(waiter)
+                except ValueError:
+                    pass
+            raise
+
+        waited = time.monotonic() - waiter.enqueued
+        if waited > 1:
+            logger.debug("Request admitted after queueing", extra={
+                "priority": priority.name.lower(),
+                "waited_sec": round(waited, 2)
+            })
+
+    def release(self) -> None:
+        """Release a slot and admit the next waiter."""
+        self._active -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block.
+
+        Args:
+            priority: Priority of the request.
+        """
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
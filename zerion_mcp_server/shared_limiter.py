@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Cross-process token buckets for API keys, backed by SQLite."""
+
+import math
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key_name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    cooldown_until REAL NOT NULL DEFAULT 0
+)
+"""
+
+
+class SharedRateLimiter:
+    """Token buckets shared by every process using the same database file.
+
+    With several HTTP workers each process has its own ApiKeyPool, so
+    per-process buckets would let N workers spend N times a key's rate
+    budget. This keeps one bucket per key name in SQLite instead; a token is
+    taken inside a BEGIN IMMEDIATE transaction so concurrent workers never
+    spend the same token. 429 cooldowns are shared the same way. Times are
+    wall-clock (time.time()) because monotonic clocks differ per process.
+
+    Calls run on the caller's event loop, so SQLite waits at most
+    busy_timeout for another process's transaction and then raises
+    sqlite3.OperationalError; ApiKeyPool retries after an asyncio sleep
+    instead of blocking the loop.
+
+    Attributes:
+        path: SQLite database file
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 0.05):
+        """Open or create the limiter database.
+
+        Args:
+            path: SQLite file path ('~' is expanded).
+            busy_timeout: Seconds to wait for a lock held by another process.
+        """
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Setup may wait for other workers starting at the same time
+        self._db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(_SCHEMA)
+        self._db.execute(f"PRAGMA busy_timeout = {int(busy_timeout * 1000)}")
+
+    def _bucket(self, key_name: str, rate_limit: Optional[float], burst: float, now: float) -> Tuple[float, float]:
+        """Read and refill a bucket (must be called inside a transaction).
+
+        Returns:
+            Tuple of (tokens, cooldown_until).
+        """
+        row = self._db.execute(
+            "SELECT tokens, updated, cooldown_until FROM buckets WHERE key_name = ?",
+            (key_name,)
+        ).fetchone()
+        if row is None:
+            return burst, 0.0
+        tokens, updated, cooldown_until = row
+        if rate_limit is not None:
+            tokens = min(burst, tokens + max(0.0, now - updated) * rate_limit)
+        return tokens, cooldown_until
+
+    def _store(self, key_name: str, tokens: float, now: float, cooldown_until: float) -> None:
+        self._db.execute(
+            "INSERT INTO buckets (key_name, tokens, updated, cooldown_until) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(key_name) DO UPDATE SET tokens = excluded.tokens, "
+            "updated = excluded.updated, cooldown_until = excluded.cooldown_until",
+            (key_name, tokens, now, cooldown_until)
+        )
+
+    def headroom(self, key_name: str, rate_limit: Optional[float], burst: float) -> float:
+        """Get the requests a key can make right now across all processes.
+
+        Args:
+            key_name: Key label.
+            rate_limit: Requests per second, or None for unlimited.
+            burst: Bucket capacity.
+
+        Returns:
+            Available tokens, math.inf for unlimited keys, or 0 while cooling down.
+        """
+        now = time.time()
+        tokens, cooldown_until = self._bucket(key_name, rate_limit, burst, now)
+        if now < cooldown_until:
+            return 0.0
+        return math.inf if rate_limit is None else tokens
+
+    def take(self, key_name: str, rate_limit: Optional[float], burst: float) -> float:
+        """Try to take one token.
+
+        Args:
+            key_name: Key label.
+            rate_limit: Requests per second, or None for unlimited.
+            burst: Bucket capacity.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available.
+
+        Raises:
+            sqlite3.OperationalError: If another process held the database
+                for longer than busy_timeout.
+        """
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            tokens, cooldown_until = self._bucket(key_name, rate_limit, burst, now)
+            if now < cooldown_until:
+                wait = cooldown_until - now
+            elif rate_limit is None:
+                wait = 0.0
+            elif tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate_limit
+            self._store(key_name, tokens, now, cooldown_until)
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return wait
+
+    def cool_down(self, key_name: str, rate_limit: Optional[float], burst: float, seconds: float) -> None:
+        """Take a key out of rotation for every process.
+
+        Args:
+            key_name: Key label.
+            rate_limit: Requests per second, or None for unlimited.
+            burst: Bucket capacity.
+            seconds: Cooldown length.
+
+        Raises:
+            sqlite3.OperationalError: If another process held the database
+                for longer than busy_timeout.
+        """
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            tokens, cooldown_until = self._bucket(key_name, rate_limit, burst, now)
+            self._store(key_name, tokens, now, max(cooldown_until, now + seconds))
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""Per-host sidecar daemon owning the upstream client, for stdio servers.
+
+Every MCP session on a desktop spawns its own stdio server, and each would
+otherwise hold its own API key pool, rate limiter, HTTP cache and retry
+state. In sidecar mode one daemon per host owns the RetryAsyncClient and
+listens on a Unix socket; stdio servers send their upstream requests to it
+through SidecarClient, so all sessions share one rate budget, one quota view
+and one warm cache.
+
+The socket speaks plain HTTP: the request path and query are Zerion's, the
+request priority travels in X-Zerion-Priority, and errors raised by the
+daemon's client (rate limit exhausted, quota exceeded, indexing timeout)
+come back with X-Zerion-Error and are raised again in the stdio server.
+
+A stdio server only uses a daemon serving its own configuration: the daemon
+reports a fingerprint of its API keys, base URL and client settings at
+INFO_PATH, and connect() refuses a daemon whose fingerprint differs.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from .errors import (
+    APIError, NetworkError, QuotaExceededError, RateLimitError, WalletIndexingError, ZerionMCPError
+)
+from .logger import get_logger
+from .priority import Priority, current_priority, request_priority
+
+logger = get_logger(__name__)
+
+PRIORITY_HEADER = "X-Zerion-Priority"
+ERROR_HEADER = "X-Zerion-Error"
+
+# Answered by the daemon itself; Zerion paths all start with /v1
+INFO_PATH = "/.sidecar"
+
+# Set by the daemon's own client or meaningless across the socket
+_DROPPED_REQUEST_HEADERS = {
+    "host", "connection", "content-length", "transfer-encoding", "accept-encoding",
+    "user-agent", "authorization", PRIORITY_HEADER.lower()
+}
+_BODY_HEADERS = {"content-length", "content-encoding", "transfer-encoding"}
+
+
+def config_fingerprint(config: Any) -> str:
+    """Hash the settings that shape the daemon's upstream client.
+
+    Args:
+        config: Loaded ConfigManager.
+
+    Returns:
+        Hex digest of the API keys, base URL, spec URL and client settings.
+    """
+    settings = {
+        "base_url": config.base_url,
+        "oas_url": config.oas_url,
+        "api_keys": config.api_keys,
+        "key_cooldown": config.key_cooldown,
+        "retry": config.retry_config,
+        "indexing": config.indexing_config,
+        "quota": config.quota_config,
+        "scheduler": config.scheduler_config,
+        "http_cache": config.http_cache_config
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def error_payload(error: Exception) -> Dict[str, Any]:
+    """Serialize an error raised by the daemon's client.
+
+    Args:
+        error: ZerionMCPError or httpx.HTTPError.
+
+    Returns:
+        JSON-serializable description of the error.
+    """
+    if not isinstance(error, ZerionMCPError):
+        return {"type": "NetworkError", "message": f"Upstream request failed: {error}", "context": {}}
+    attributes = {
+        name: getattr(error, name)
+        for name in ("retry_after", "attempts", "retry_delay", "max_retries", "used", "limit", "priority")
+        if getattr(error, name, None) is not None
+    }
+    return {
+        "type": type(error).__name__,
+        "message": str(error),
+        "context": error.context,
+        "attributes": attributes
+    }
+
+
+def error_from_payload(payload: Dict[str, Any]) -> ZerionMCPError:
+    """Rebuild an error serialized by error_payload().
+
+    Args:
+        payload: Error description from the daemon.
+
+    Returns:
+        Exception of the original type (ZerionMCPError for unknown types).
+    """
+    kind = payload.get("type")
+    message = payload.get("message", "Sidecar request failed")
+    context = payload.get("context") or {}
+    attributes = payload.get("attributes") or {}
+    if kind == "RateLimitError":
+        return RateLimitError(
+            message,
+            retry_after=attributes.get("retry_after"),
+            attempts=attributes.get("attempts", 0),
+            context=context
+        )
+    if kind == "WalletIndexingError":
+        return WalletIndexingError(
+            message,
+            retry_delay=attributes.get("retry_delay", 3),
+            max_retries=attributes.get("max_retries", 3),
+            attempts=attributes.get("attempts", 0),
+            context=context
+        )
+    if kind == "QuotaExceededError":
+        return QuotaExceededError(
+            message,
+            used=attributes.get("used", 0),
+            limit=attributes.get("limit"),
+            priority=attributes.get("priority"),
+            context=context
+        )
+    if kind == "NetworkError":
+        return NetworkError(message, context=context)
+    if kind == "APIError":
+        return APIError(message, retry_after=attributes.get("retry_after"), context=context)
+    return ZerionMCPError(message, context)
+
+
+def _error_status(error: Exception) -> int:
+    if isinstance(error, (RateLimitError, QuotaExceededError)):
+        return 429
+    if isinstance(error, WalletIndexingError):
+        return 503
+    if isinstance(error, (NetworkError, httpx.HTTPError)):
+        return 502
+    return 500
+
+
+class SidecarApp:
+    """ASGI app forwarding requests from stdio servers to the upstream client.
+
+    Attributes:
+        client: RetryAsyncClient shared by every connected stdio server
+        fingerprint: config_fingerprint() of the daemon's configuration
+    """
+
+    def __init__(self, client: Any, fingerprint: Optional[str] = None):
+        """Initialize app.
+
+        Args:
+            client: RetryAsyncClient (closed when the app shuts down).
+            fingerprint: Configuration fingerprint reported at INFO_PATH.
+        """
+        self.client = client
+        self.fingerprint = fingerprint
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        if scope["path"] == INFO_PATH:
+            await self._respond(
+                send, 200, [("content-type", "application/json")],
+                json.dumps({"fingerprint": self.fingerprint}).encode()
+            )
+            return
+
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        headers = {}
+        priority = Priority.INTERACTIVE
+        for name, value in scope["headers"]:
+            name = name.decode("latin-1").lower()
+            if name == PRIORITY_HEADER.lower():
+                priority = Priority.__members__.get(value.decode("latin-1").upper(), priority)
+            elif name not in _DROPPED_REQUEST_HEADERS:
+                headers[name] = value.decode("latin-1")
+
+        raw_path = scope.get("raw_path") or scope["path"].encode()
+        if scope.get("query_string"):
+            raw_path += b"?" + scope["query_string"]
+        url = self.client.base_url.copy_with(raw_path=raw_path)
+
+        try:
+            with request_priority(priority):
+                response = await self.client.request(
+                    scope["method"], url, headers=headers, content=body or None
+                )
+        except (ZerionMCPError, httpx.HTTPError) as e:
+            logger.debug("Sidecar request failed", extra={"url": str(url), "error": str(e)})
+            await self._respond(
+                send,
+                _error_status(e),
+                [("content-type", "application/json"), (ERROR_HEADER, type(e).__name__)],
+                json.dumps(error_payload(e)).encode()
+            )
+            return
+
+        await self._respond(
+            send,
+            response.status_code,
+            [(k, v) for k, v in response.headers.items() if k.lower() not in _BODY_HEADERS],
+            response.content
+        )
+
+    async def _respond(self, send: Any, status: int, headers: list, body: bytes) -> None:
+        raw_headers = [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+        raw_headers.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive: Any, send: Any) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.client.aclose()
+                logger.info("Upstream HTTP client closed")
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+class SidecarClient(httpx.AsyncClient):
+    """HTTP client sending upstream requests through the host's sidecar.
+
+    Drop-in for RetryAsyncClient as far as the tool clients are concerned:
+    request(), stream_json() and the operations index. Retries, key
+    selection, quotas and caching all happen in the daemon.
+
+    Attributes:
+        socket_path: Unix socket of the sidecar
+        operations: Optional OperationIndex for passthrough resolution
+        close_callbacks: Coroutine functions awaited by aclose() before the
+            client closes
+    """
+
+    def __init__(self, socket_path: str, operations: Optional[Any] = None, **kwargs):
+        """Initialize client.
+
+        Args:
+            socket_path: Unix socket the sidecar listens on.
+            operations: Optional OperationIndex for the tool clients.
+            **kwargs: Arguments for httpx.AsyncClient (base_url, timeout).
+        """
+        self.socket_path = str(Path(socket_path).expanduser())
+        self.operations = operations
+        self.close_callbacks: List[Callable[[], Awaitable[None]]] = []
+        super().__init__(transport=httpx.AsyncHTTPTransport(uds=self.socket_path), **kwargs)
+
+    async def aclose(self) -> None:
+        """Run the close callbacks, then close the connection to the sidecar."""
+        for callback in self.close_callbacks:
+            await callback()
+        await super().aclose()
+
+    @staticmethod
+    def _with_priority(headers: Any) -> Dict[str, str]:
+        headers = dict(headers or {})
+        headers[PRIORITY_HEADER] = current_priority().name.lower()
+        return headers
+
+    @staticmethod
+    def _raise_for_sidecar_error(response: httpx.Response) -> None:
+        if ERROR_HEADER.lower() in response.headers:
+            raise error_from_payload(response.json())
+
+    async def request(self, method: str, url: httpx.URL | str, *, headers: Any = None, **kwargs) -> httpx.Response:
+        """Make a request through the sidecar.
+
+        Raises:
+            ZerionMCPError: The error the sidecar's client raised (RateLimitError,
+                QuotaExceededError, WalletIndexingError, NetworkError).
+        """
+        response = await super().request(method, url, headers=self._with_priority(headers), **kwargs)
+        self._raise_for_sidecar_error(response)
+        return response
+
+    async def stream_json(
+        self,
+        method: str,
+        url: httpx.URL | str,
+        parser: Any,
+        on_item: Optional[Callable[[Any], Awaitable[None]]] = None,
+        **request_kwargs
+    ) -> httpx.Response:
+        """Make a request through the sidecar, parsing the JSON body as it arrives.
+
+        See RetryAsyncClient.stream_json().
+        """
+        request_kwargs["headers"] = self._with_priority(request_kwargs.get("headers"))
+        request = self.build_request(method, url, **request_kwargs)
+        response = await self.send(request, stream=True)
+        try:
+            if ERROR_HEADER.lower() in response.headers or not response.is_success \
+                    or "json" not in response.headers.get("content-type", ""):
+                await response.aread()
+                self._raise_for_sidecar_error(response)
+                return response
+            async for chunk in response.aiter_text():
+                items = parser.feed(chunk)
+                if on_item is not None:
+                    for item in items:
+                        await on_item(item)
+            items = parser.close()
+            if on_item is not None:
+                for item in items:
+                    await on_item(item)
+        finally:
+            await response.aclose()
+        return response
+
+
+def is_running(socket_path: str) -> bool:
+    """Check whether a sidecar accepts connections on the socket."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(1)
+    try:
+        sock.connect(str(Path(socket_path).expanduser()))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def daemon_fingerprint(socket_path: str) -> Optional[str]:
+    """Ask the sidecar on the socket for its configuration fingerprint.
+
+    Returns:
+        The fingerprint, or None if the daemon does not report one.
+    """
+    transport = httpx.HTTPTransport(uds=str(Path(socket_path).expanduser()))
+    try:
+        with httpx.Client(transport=transport, timeout=5) as client:
+            response = client.get(f"http://sidecar{INFO_PATH}")
+            return response.json().get("fingerprint") if response.is_success else None
+    except (httpx.HTTPError, ValueError, AttributeError):
+        return None
+
+
+def start_daemon(socket_path: str, timeout: float) -> bool:
+    """Start a sidecar in the background and wait for its socket.
+
+    The daemon is started in its own session so it outlives the stdio
+    server that launched it; its log goes next to the socket. If several
+    servers start one at the same time, all but one exit on the lock.
+
+    Args:
+        socket_path: Unix socket the sidecar will listen on.
+        timeout: Seconds to wait for the socket.
+
+    Returns:
+        True once the sidecar accepts connections.
+    """
+    path = Path(socket_path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".log"), "ab") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "zerion_mcp_server", "--sidecar"],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True
+        )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if is_running(socket_path):
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def connect(
+    sidecar_config: Dict[str, Any],
+    base_url: str,
+    fingerprint: str,
+    operations: Optional[Any] = None
+) -> Optional[SidecarClient]:
+    """Get a client for the host's sidecar, starting it if configured to.
+
+    Args:
+        sidecar_config: ConfigManager.sidecar_config.
+        base_url: Zerion API base URL (its path prefix is kept).
+        fingerprint: config_fingerprint() of this server's configuration;
+            a daemon serving another configuration is not used.
+        operations: Optional OperationIndex for the tool clients.
+
+    Returns:
+        SidecarClient, or None if no matching sidecar is reachable.
+    """
+    socket_path = sidecar_config["socket_path"]
+    if not is_running(socket_path):
+        if not sidecar_config["autostart"]:
+            return None
+        logger.info("Starting sidecar", extra={"socket_path": socket_path})
+        try:
+            if not start_daemon(socket_path, sidecar_config["startup_timeout"]):
+                return None
+        except OSError as e:
+            logger.warning("Could not start sidecar", extra={"error": str(e)})
+            return None
+    if daemon_fingerprint(socket_path) != fingerprint:
+        # Other API keys, base URL or limits: its budget and cache are not ours
+        logger.warning("Sidecar serves a different configuration", extra={"socket_path": socket_path})
+        return None
+    # Plain HTTP over the socket; the daemon puts the upstream scheme and host back
+    local_url = httpx.URL(base_url).copy_with(scheme="http", host="sidecar", port=None)
+    return SidecarClient(socket_path, operations=operations, base_url=local_url, timeout=None)
+
+
+def serve(
+    make_client: Callable[[], Optional[Any]],
+    socket_path: str,
+    fingerprint: Optional[str] = None,
+    log_level: str = "INFO",
+    graceful_shutdown_timeout: float = 10
+) -> bool:
+    """Serve the sidecar on a Unix socket until SIGTERM/SIGINT.
+
+    A lock file next to the socket makes the daemon a per-host singleton;
+    the client is only created once the lock is held. The socket is only
+    accessible to the current user, since it hands out the API keys' budget.
+
+    Args:
+        make_client: Creates the RetryAsyncClient to share (closed on
+            shutdown); returns None if it cannot be created.
+        socket_path: Unix socket path ('~' is expanded).
+        fingerprint: config_fingerprint() reported to connecting servers.
+        log_level: uvicorn log level name.
+        graceful_shutdown_timeout: Seconds to finish in-flight requests.
+
+    Returns:
+        False if another sidecar already holds the socket or the client
+        could not be created.
+    """
+    import fcntl
+
+    import uvicorn
+
+    path = Path(socket_path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock = open(path.with_name(path.name + ".lock"), "w")
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        logger.info("Sidecar already running", extra={"socket_path": str(path)})
+        return False
+
+    try:
+        client = make_client()
+        if client is None:
+            return False
+        # Holding the lock, an existing socket file is left over from an earlier daemon
+        path.unlink(missing_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(str(path))
+        os.chmod(path, 0o600)
+        logger.info("Sidecar listening", extra={"socket_path": str(path)})
+        server = uvicorn.Server(uvicorn.Config(
+            SidecarApp(client, fingerprint),
+            log_level=log_level.lower(),
+            timeout_graceful_shutdown=graceful_shutdown_timeout
+        ))
+        server.run(sockets=[sock])
+    finally:
+        path.unlink(missing_ok=True)
+        lock.close()
+    return True
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""Operation allowlist and component pruning for the OpenAPI spec."""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .errors import ConfigError
+from .logger import get_logger
+from .operations import HTTP_METHODS
+
+logger = get_logger(__name__)
+
+_COMPONENT_REF = "#/components/"
+
+
+def _component_refs(node: Any) -> Set[Tuple[str, str]]:
+    """Collect (section, name) pairs for every #/components/ reference."""
+    refs: Set[Tuple[str, str]] = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            ref = current.get("$ref")
+            if isinstance(ref, str) and ref.startswith(_COMPONENT_REF):
+                parts = ref[len(_COMPONENT_REF):].split("/", 1)
+                if len(parts) == 2:
+                    refs.add((parts[0], parts[1]))
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+    return refs
+
+
+def _is_selected(
+    operation: Dict[str, Any],
+    include_operations: Set[str],
+    include_tags: Set[str],
+    exclude_operations: Set[str],
+    exclude_tags: Set[str]
+) -> bool:
+    """Apply include/exclude rules to one operation."""
+    operation_id = operation.get("operationId")
+    tags = set(operation.get("tags") or [])
+
+    if include_operations or include_tags:
+        if operation_id not in include_operations and not tags & include_tags:
+            return False
+    return operation_id not in exclude_operations and not tags & exclude_tags
+
+
+def filter_spec(
+    openapi_spec: Dict[str, Any],
+    include_operations: Optional[Iterable[str]] = None,
+    include_tags: Optional[Iterable[str]] = None,
+    exclude_operations: Optional[Iterable[str]] = None,
+    exclude_tags: Optional[Iterable[str]] = None
+) -> Dict[str, Any]:
+    """Keep only the selected operations and the components they reach.
+
+    An operation is kept if it matches an include rule (operationId or tag),
+    or if no include rules are given, and it matches no exclude rule.
+    Components (schemas, parameters, responses, ...) are then pruned to
+    those transitively referenced by the kept operations; securitySchemes
+    are always kept.
+
+    Args:
+        openapi_spec: Parsed OpenAPI specification (not modified).
+        include_operations: operationIds to keep.
+        include_tags: Tags whose operations are kept.
+        exclude_operations: operationIds to drop.
+        exclude_tags: Tags whose operations are dropped.
+
+    Returns:
+        A new, pruned specification.
+
+    Raises:
+        ConfigError: If no operation is left.
+    """
+    include_operations = set(include_operations or [])
+    include_tags = set(include_tags or [])
+    exclude_operations = set(exclude_operations or [])
+    exclude_tags = set(exclude_tags or [])
+
+    paths: Dict[str, Any] = {}
+    known_operations: Set[str] = set()
+    kept: List[str] = []
+    for path, path_item in (openapi_spec.get("paths") or {}).items():
+        if not isinstance(path_item, dict):
+            continue
+        new_item = {}
+        for method, operation in path_item.items():
+            if method.lower() not in HTTP_METHODS or not isinstance(operation, dict):
+                continue
+            known_operations.add(operation.get("operationId"))
+            if _is_selected(operation, include_operations, include_tags, exclude_operations, exclude_tags):
+                new_item[method] = operation
+                kept.append(operation.get("operationId") or f"{method.upper()} {path}")
+        if new_item:
+            # Path-level fields (parameters, summary, servers) apply to every method
+            new_item.update({k: v for k, v in path_item.items() if k.lower() not in HTTP_METHODS})
+            paths[path] = new_item
+
+    unknown = (include_operations | exclude_operations) - known_operations
+    if unknown:
+        logger.warning("Tool filter names operations not in the spec", extra={
+            "operations": sorted(unknown)
+        })
+    if not paths:
+        raise ConfigError(
+            "Tool filter leaves no operations to register",
+            context={
+                "include_operations": sorted(include_operations),
+                "include_tags": sorted(include_tags),
+                "suggestion": "Check operationIds and tags in the tools section of config.yaml"
+            }
+        )
+
+    # Transitive closure of component references from the kept operations
+    components = openapi_spec.get("components") or {}
+    reachable: Set[Tuple[str, str]] = set()
+    pending = list(_component_refs(paths))
+    while pending:
+        section, name = pending.pop()
+        if (section, name) in reachable:
+            continue
+        reachable.add((section, name))
+        pending.extend(_component_refs((components.get(section) or {}).get(name)))
+
+    pruned_components: Dict[str, Any] = {}
+    for section, entries in components.items():
+        if section == "securitySchemes" or not isinstance(entries, dict):
+            pruned_components[section] = entries
+            continue
+        kept_entries = {name: value for name, value in entries.items() if (section, name) in reachable}
+        if kept_entries:
+            pruned_components[section] = kept_entries
+
+    pruned = {k: v for k, v in openapi_spec.items() if k not in ("paths", "components")}
+    pruned["paths"] = paths
+    pruned["components"] = pruned_components
+
+    logger.info("OpenAPI spec filtered", extra={
+        "operations": len(kept),
+        "schemas": len(pruned_components.get("schemas", {})),
+        "schemas_total": len(components.get("schemas", {}))
+    })
+    return pruned
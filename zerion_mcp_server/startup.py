@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Startup phase timing for --profile-startup."""
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+
+class StartupProfiler:
+    """Records how long each startup phase takes.
+
+    Phases are timed with time.perf_counter(). first_ready is measured from
+    origin (normally the moment the package started importing) to the point
+    the server is about to accept requests, so it includes every phase plus
+    the glue between them.
+
+    Attributes:
+        enabled: Whether phases are being recorded
+        origin: perf_counter() value first_ready is measured from
+    """
+
+    def __init__(self, enabled: bool = False, origin: Optional[float] = None):
+        """Initialize startup profiler.
+
+        Args:
+            enabled: Record phases when True; otherwise phase() is a no-op.
+            origin: Reference time for first_ready (default: now).
+        """
+        self.enabled = enabled
+        self.origin = origin if origin is not None else time.perf_counter()
+        self._phases: List[Tuple[str, float]] = []
+        self._ready: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a named phase.
+
+        Args:
+            name: Phase name (e.g. 'spec_parse').
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record a phase measured elsewhere.
+
+        Args:
+            name: Phase name.
+            seconds: Phase duration.
+        """
+        if self.enabled:
+            self._phases.append((name, seconds))
+
+    def mark_ready(self) -> None:
+        """Record the moment the server is ready to accept requests."""
+        self._ready = time.perf_counter()
+
+    def report(self) -> Dict[str, Any]:
+        """Get recorded timings.
+
+        Returns:
+            Dict with per-phase durations in milliseconds and first_ready_ms.
+        """
+        result: Dict[str, Any] = {
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self._phases}
+        }
+        if self._ready is not None:
+            result["first_ready_ms"] = round((self._ready - self.origin) * 1000, 1)
+        return result
+
+    def print_report(self, stream: Optional[TextIO] = None) -> None:
+        """Write a human-readable timing table.
+
+        Args:
+            stream: Output stream (default stderr, which stdio clients ignore).
+        """
+        stream = stream or sys.stderr
+        report = self.report()
+        print("Startup profile:", file=stream)
+        for name, ms in report["phases_ms"].items():
+            print(f"  {name:<16} {ms:>9.1f} ms", file=stream)
+        if "first_ready_ms" in report:
+            print(f"  {'first_ready':<16} {report['first_ready_ms']:>9.1f} ms", file=stream)
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Incremental parsing and forwarding of large list responses.
+
+Zerion list endpoints return {"links": ..., "data": [...]} documents where
+data can hold hundreds of transactions with full transfer arrays. Instead of
+buffering the body, decoding it and only then answering, the body is parsed
+as it arrives: each element of the top-level data array is decoded on its
+own, so the raw body is never held in full and every item can be forwarded
+to the MCP client as a progress notification while the rest is downloading.
+"""
+
+import json
+import re
+from typing import Any, List, Optional
+
+import httpx
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_WHITESPACE = " \t\n\r"
+
+# Returned by JsonArrayParser._decode() when the value is not complete yet
+_INCOMPLETE = object()
+
+# Text and complete strings up to the next bracket; a lone quote starts a
+# string the buffer cuts off, an empty group means the buffer ran out
+_STRUCTURE = re.compile(r'[^"\[\]{}]*+(?:"(?:[^"\\]++|\\.)*+"[^"\[\]{}]*+)*+([\[\]{}"]|\Z)', re.DOTALL)
+
+# Responses with these headers are not re-emitted by StreamedResponse
+_BODY_HEADERS = {"content-length", "content-encoding", "transfer-encoding"}
+
+
+class JsonArrayParser:
+    """Push parser yielding the elements of one top-level array member.
+
+    Text is fed in chunks as it arrives; feed() returns the elements of the
+    array under array_key that became complete. Other top-level members
+    (links, meta) are decoded whole. Documents that are not JSON objects are
+    buffered and decoded by close().
+
+    Attributes:
+        array_key: Top-level member whose elements are streamed
+        document: The decoded document (complete after close())
+        items: Number of array elements decoded so far
+    """
+
+    def __init__(self, array_key: str = "data"):
+        """Initialize parser.
+
+        Args:
+            array_key: Top-level member to stream element by element.
+        """
+        self.array_key = array_key
+        self.document: Any = {}
+        self.items = 0
+
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+        self._eof = False
+        # A partially received item: its scanned text set aside, where it
+        # starts in the buffer, how far it was scanned and the bracket depth
+        self._parts: List[str] = []
+        self._item_start = 0
+        self._scan_pos = 0
+        self._depth = 0
+
+    @property
+    def finished(self) -> bool:
+        """Whether a complete document has been parsed."""
+        return self._state == "done"
+
+    def feed(self, text: str) -> List[Any]:
+        """Add text and decode what is complete.
+
+        Args:
+            text: Next chunk of the response body.
+
+        Returns:
+            Array elements completed by this chunk.
+
+        Raises:
+            ValueError: If the text is not valid JSON.
+        """
+        if self._depth:
+            # Keep the scanned part of the item aside instead of copying it per chunk
+            self._parts.append(self._buffer[self._item_start:self._scan_pos])
+            self._buffer = self._buffer[self._scan_pos:] + text
+            self._item_start = 0
+        else:
+            self._buffer = self._buffer[self._pos:] + text
+        self._scan_pos = 0
+        self._pos = 0
+        return self._parse()
+
+    def close(self) -> List[Any]:
+        """Signal the end of the body and decode what is left.
+
+        Returns:
+            Remaining array elements.
+
+        Raises:
+            ValueError: If the document is truncated or not valid JSON.
+        """
+        self._eof = True
+        if self._state == "raw":
+            self.document = json.loads(self._buffer)
+            self._state = "done"
+            return []
+        items = self._parse()
+        if self._state != "done":
+            raise ValueError("Truncated JSON document")
+        if self._buffer[self._pos:].strip(_WHITESPACE):
+            raise ValueError("Extra data after JSON document")
+        return items
+
+    def _next_char(self) -> Optional[str]:
+        """Skip whitespace and peek at the next character (None if buffer is empty)."""
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+            self._pos += 1
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else None
+
+    def _decode(self) -> Any:
+        """Decode one value at the current position.
+
+        Returns:
+            The value, or _INCOMPLETE if more text is needed.
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            return _INCOMPLETE
+        # A number or literal ending exactly at the buffer end may continue
+        if end >= len(self._buffer) and not self._eof:
+            return _INCOMPLETE
+        self._pos = end
+        return value
+
+    def _decode_item(self) -> Any:
+        """Decode the array or object item at the current position once its end has arrived.
+
+        Text is scanned for the closing bracket only once, and the item is
+        decoded once, so an item spread over many chunks costs one pass, not
+        one per chunk.
+
+        Returns:
+            The item, or _INCOMPLETE if more text is needed.
+
+        Raises:
+            ValueError: If the item is not valid JSON.
+        """
+        depth = self._depth
+        if not depth:
+            self._item_start = self._scan_pos = self._pos
+        pos = self._scan_pos
+        while True:
+            match = _STRUCTURE.match(self._buffer, pos)
+            token = match.group(1)
+            if token in ('"', ""):
+                # Scan an unterminated string again once more text arrives
+                self._scan_pos, self._depth = match.start(1), depth
+                return _INCOMPLETE
+            depth += 1 if token in "{[" else -1
+            pos = match.end()
+            if depth == 0:
+                break
+
+        if self._parts:
+            text = "".join(self._parts) + self._buffer[self._item_start:pos]
+            self._parts = []
+            item = self._decoder.raw_decode(text)[0]
+        else:
+            item = self._decoder.raw_decode(self._buffer, self._item_start)[0]
+        self._depth = 0
+        self._pos = pos
+        return item
+
+    def _expect(self, char: str, allowed: str) -> None:
+        if char not in allowed:
+            raise ValueError(f"Unexpected {char!r} in JSON document at position {self._pos}")
+
+    def _parse(self) -> List[Any]:
+        items: List[Any] = []
+        while self._state not in ("raw", "done"):
+            char = self._next_char()
+            if char is None:
+                break
+
+            if self._state == "start":
+                if char != "{":
+                    # Not an object: nothing to stream, decode it whole on close
+                    self._state = "raw"
+                    break
+                self._pos += 1
+                self._state = "key"
+            elif self._state == "key":
+                if char == "}" and not self.document:
+                    self._pos += 1
+                    self._state = "done"
+                    continue
+                self._expect(char, '"')
+                key = self._decode()
+                if key is _INCOMPLETE:
+                    break
+                self._key = key
+                self._state = "colon"
+            elif self._state == "colon":
+                self._expect(char, ":")
+                self._pos += 1
+                self._state = "value"
+            elif self._state == "value":
+                if self._key == self.array_key and char == "[":
+                    self._pos += 1
+                    self.document[self._key] = []
+                    self._state = "item"
+                    continue
+                value = self._decode()
+                if value is _INCOMPLETE:
+                    break
+                self.document[self._key] = value
+                self._state = "member_end"
+            elif self._state == "item":
+                if not self._depth:
+                    if char == "]" and not self.document[self.array_key]:
+                        self._pos += 1
+                        self._state = "member_end"
+                        continue
+                    self._expect(char, '{["-0123456789tfn')
+                if self._depth or (char in "{[" and not self._eof):
+                    item = self._decode_item()
+                else:
+                    item = self._decode()
+                if item is _INCOMPLETE:
+                    break
+                self.document[self.array_key].append(item)
+                self.items += 1
+                items.append(item)
+                self._state = "item_end"
+            elif self._state == "item_end":
+                self._expect(char, ",]")
+                self._pos += 1
+                self._state = "item" if char == "," else "member_end"
+            elif self._state == "member_end":
+                self._expect(char, ",}")
+                self._pos += 1
+                self._state = "key" if char == "," else "done"
+        return items
+
+
+class StreamedResponse(httpx.Response):
+    """Response whose JSON body was already decoded while streaming.
+
+    The raw body is not kept; json() returns the decoded document.
+    """
+
+    def __init__(self, response: httpx.Response, document: Any):
+        """Initialize from a consumed streaming response.
+
+        Args:
+            response: Upstream response (status, headers, request).
+            document: Decoded JSON body.
+        """
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _BODY_HEADERS]
+        super().__init__(response.status_code, headers=headers, content=b"", request=response.request)
+        self._document = document
+
+    def json(self, **kwargs: Any) -> Any:
+        return self._document
+
+
+async def _report_item(item: Any, count: int, forward_items: bool) -> None:
+    """Send a progress notification for a streamed item, if the client asked for progress."""
+    from fastmcp.server.dependencies import get_context
+
+    try:
+        ctx = get_context()
+        await ctx.report_progress(
+            progress=count,
+            message=json.dumps(item, separators=(",", ":")) if forward_items else None
+        )
+    except (RuntimeError, LookupError, ValueError):
+        # No MCP request in flight (e.g. direct client use)
+        return
+
+
+class StreamingToolClient:
+    """Client for OpenAPI tools that streams GET responses.
+
+    OpenAPITool only calls request() on its client and json() on the
+    response. GET requests go through RetryAsyncClient.stream_json(), which
+    forwards every element of the data array as an MCP progress
+    notification (progress = items so far, message = the item as JSON) as
+    soon as it is decoded. Everything else is delegated to the wrapped
+    client.
+
+    Attributes:
+        client: Wrapped RetryAsyncClient
+        forward_items: Include each item in its progress notification;
+            when False only the running count is reported
+    """
+
+    def __init__(self, client: Any, forward_items: bool = True):
+        """Initialize streaming client.
+
+        Args:
+            client: RetryAsyncClient the tools send requests with.
+            forward_items: Put each item in the progress message.
+        """
+        self.client = client
+        self.forward_items = forward_items
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    async def request(self, method: str, url: Any, **kwargs: Any) -> httpx.Response:
+        """Make a request, streaming the body of GET responses.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            **kwargs: Request arguments.
+
+        Returns:
+            StreamedResponse for streamed JSON bodies, otherwise the
+            upstream response.
+        """
+        if method.upper() != "GET":
+            return await self.client.request(method, url, **kwargs)
+
+        parser = JsonArrayParser()
+        forwarded = 0
+
+        async def on_item(item: Any) -> None:
+            nonlocal forwarded
+            forwarded += 1
+            await _report_item(item, forwarded, self.forward_items)
+
+        response = await self.client.stream_json(method, url, parser, on_item=on_item, **kwargs)
+        if not parser.finished:
+            return response
+        logger.debug("Streamed response", extra={"url": str(url), "items": parser.items})
+        return StreamedResponse(response, parser.document)
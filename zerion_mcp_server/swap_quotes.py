@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""Short-lived swap quote cache and multi-amount quote tool.
+
+swapOffers asks several exchange providers and takes 5-10 seconds, and
+agents often ask for the same pair again moments later, or for slightly
+different amounts. Quotes are kept for a few seconds per (input, output,
+chain, amount bucket): amounts within amount_tolerance of each other on
+a log scale share a bucket, and the cached quote, which states the input
+quantity it was made for, is served for all of them. Requests with
+input[from] get signable transactions for the exact amount and are keyed
+on it. Concurrent identical requests share one upstream call.
+
+The compareSwapQuotes tool quotes several amounts of a pair concurrently
+and returns one row per amount with the best offer and its price impact
+relative to the smallest amount, instead of N sequential swapOffers calls
+with full offer lists.
+"""
+
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Annotated, Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import httpx
+
+from .errors import APIError, ZerionMCPError
+from .logger import get_logger
+from .priority import Priority, request_priority
+from .streaming import StreamedResponse
+
+logger = get_logger(__name__)
+
+SWAP_OPERATION = "swapOffers"
+SWAP_OFFERS_URL = "/v1/swap/offers/"
+SWAP_QUOTES_TOOL = "compareSwapQuotes"
+
+_AMOUNT_PARAMS = ("input[amount]", "output[amount]")
+
+
+class _Quote(NamedTuple):
+    response: httpx.Response
+    fetched_at: float
+
+
+def amount_bucket(amount: Any, tolerance: float) -> Any:
+    """Bucket of an amount: equal for amounts within tolerance on a log scale.
+
+    Args:
+        amount: Amount as sent (number or numeric string).
+        tolerance: Relative bucket width (0 keeps amounts exact).
+
+    Returns:
+        Integer bucket, or the amount itself when it is not a positive number.
+    """
+    try:
+        value = float(amount)
+    except (TypeError, ValueError):
+        return amount
+    if tolerance <= 0 or not value > 0 or math.isinf(value):
+        return amount
+    return round(math.log(value) / math.log1p(tolerance))
+
+
+class SwapQuoteCache:
+    """Recent swapOffers responses with request coalescing.
+
+    Attributes:
+        ttl: Seconds a quote is served from memory
+        amount_tolerance: Relative amount difference sharing a cached quote
+        max_entries: Quotes kept (least recently used dropped)
+    """
+
+    def __init__(self, ttl: float = 5, amount_tolerance: float = 0.001, max_entries: int = 512):
+        """Initialize cache.
+
+        Args:
+            ttl: Seconds a quote is served from memory (0 only coalesces).
+            amount_tolerance: Relative amount difference sharing a cached quote.
+            max_entries: Maximum quotes kept.
+        """
+        self.ttl = ttl
+        self.amount_tolerance = amount_tolerance
+        self.max_entries = max_entries
+        self._quotes: "OrderedDict[str, _Quote]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.coalesced = 0
+        self.fetches = 0
+
+    def key(self, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, Any]] = None) -> str:
+        """Cache key of a swapOffers request (amounts replaced by their bucket).
+
+        With input[from] set the offers carry transaction calldata for the
+        exact amount, so amounts are kept exact.
+        """
+        params = dict(params or {})
+        if params.get("input[from]") is None:
+            for name in _AMOUNT_PARAMS:
+                if params.get(name) is not None:
+                    params[name] = amount_bucket(params[name], self.amount_tolerance)
+        env = {k.lower(): v for k, v in (headers or {}).items()}.get("x-env")
+        return json.dumps([params, env], sort_keys=True, default=str)
+
+    async def get(self, key: str, fetch: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Serve a fresh quote, join an identical request in flight, or fetch.
+
+        Args:
+            key: key() of the request.
+            fetch: Makes the upstream request.
+
+        Returns:
+            The quote response. Successful JSON responses are cached and
+            shared decoded; others are shared with concurrent callers only.
+        """
+        quote = self._quotes.get(key)
+        if quote is not None and time.monotonic() - quote.fetched_at < self.ttl:
+            self._quotes.move_to_end(key)
+            self.hits += 1
+            return quote.response
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            # Waiting does not cancel the shared request if this caller is cancelled
+            await asyncio.wait([pending])
+            if not pending.cancelled():
+                self.coalesced += 1
+                return pending.result()
+            # The caller that owned it was cancelled: fetch again
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            response = await fetch()
+            self.fetches += 1
+            if response.is_success:
+                try:
+                    response = StreamedResponse(response, response.json())
+                except json.JSONDecodeError:
+                    # Passthrough body: shared but not cached
+                    pass
+                else:
+                    self._store(key, _Quote(response, time.monotonic()))
+            future.set_result(response)
+            return response
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Marks the exception retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+    def _store(self, key: str, quote: _Quote) -> None:
+        self._quotes[key] = quote
+        self._quotes.move_to_end(key)
+        while len(self._quotes) > self.max_entries:
+            self._quotes.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Report cached quotes and hit counters."""
+        return {"quotes": len(self._quotes), "hits": self.hits, "coalesced": self.coalesced, "fetches": self.fetches}
+
+
+class SwapQuoteToolClient:
+    """Client for OpenAPI tools that serves swapOffers through a SwapQuoteCache.
+
+    Attributes:
+        client: Wrapped tool client
+        cache: SwapQuoteCache
+        operations: OperationIndex mapping requests to operationIds
+    """
+
+    def __init__(self, client: Any, cache: SwapQuoteCache, operations: Any):
+        """Initialize swap quote client.
+
+        Args:
+            client: Tool client making the upstream requests.
+            cache: SwapQuoteCache shared with the compareSwapQuotes tool.
+            operations: OperationIndex.
+        """
+        self.client = client
+        self.cache = cache
+        self.operations = operations
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    async def request(self, method: str, url: Any, **kwargs: Any) -> httpx.Response:
+        """Make a request, serving swapOffers from the quote cache.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            **kwargs: Request arguments.
+
+        Returns:
+            Cached or coalesced quote response for swapOffers, otherwise the
+            wrapped client's response.
+        """
+        operation_id = self.operations.resolve(method, url) if self.operations is not None else None
+        if operation_id != SWAP_OPERATION:
+            return await self.client.request(method, url, **kwargs)
+        key = self.cache.key(kwargs.get("params"), kwargs.get("headers"))
+        return await self.cache.get(key, lambda: self.client.request(method, url, **kwargs))
+
+
+def _float(quantity: Any) -> Optional[float]:
+    value = (quantity or {}).get("float") if isinstance(quantity, dict) else None
+    return float(value) if value is not None else None
+
+
+def best_offer(document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The offer with the largest estimated output of a swapOffers document.
+
+    Returns:
+        Compact offer (input and output quantity, source, gas, seconds and
+        the number of offers), or None if there is no usable offer.
+    """
+    best = None
+    offers = document.get("data") or []
+    for offer in offers:
+        attributes = offer.get("attributes") or {}
+        estimation = attributes.get("estimation") or {}
+        output = _float(estimation.get("output_quantity"))
+        if output is None or (best is not None and output <= best["output"]):
+            continue
+        best = {
+            "input": _float(estimation.get("input_quantity")),
+            "output": output,
+            "output_min": _float(attributes.get("output_quantity_min")),
+            "source": (attributes.get("liquidity_source") or {}).get("id"),
+            "gas": estimation.get("gas"),
+            "seconds": estimation.get("seconds")
+        }
+    if best is not None:
+        best["offers"] = len(offers)
+    return best
+
+
+def price_impact_table(quotes: List[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]) -> List[Dict[str, Any]]:
+    """Rows of best offers per amount with price impact.
+
+    The rate of each amount (output per input) is compared with the rate
+    of the smallest amount that has an offer; price_impact_pct is how much
+    worse it is, in percent.
+
+    Args:
+        quotes: (amount, best_offer() or None, error or None) per amount.
+
+    Returns:
+        Rows ordered by amount.
+    """
+    rows = []
+    reference = None
+    for amount, offer, error in sorted(quotes, key=lambda quote: quote[0]):
+        if error is not None:
+            rows.append({"amount": amount, "error": error})
+            continue
+        if offer is None:
+            rows.append({"amount": amount, "offers": 0})
+            continue
+        rate = offer["output"] / offer["input"] if offer["input"] else None
+        if reference is None and rate:
+            reference = rate
+        rows.append({
+            "amount": amount,
+            **offer,
+            "rate": rate,
+            "price_impact_pct": round(100 * (1 - rate / reference), 4) if rate and reference else None
+        })
+    return rows
+
+
+def swap_quotes_tool(client: Any, cache: SwapQuoteCache, max_amounts: int = 10) -> Any:
+    """Create the compareSwapQuotes tool.
+
+    Args:
+        client: Upstream client for swapOffers requests.
+        cache: SwapQuoteCache shared with the swapOffers tool.
+        max_amounts: Maximum amounts per call.
+
+    Returns:
+        fastmcp FunctionTool to add with mcp.add_tool().
+    """
+    from fastmcp.tools import Tool
+    from pydantic import Field
+
+    async def quote(params: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        try:
+            # Fan-out on behalf of the interactive call
+            with request_priority(Priority.NORMAL):
+                response = await cache.get(
+                    cache.key(params), lambda: client.request("GET", SWAP_OFFERS_URL, params=params)
+                )
+            if not response.is_success:
+                raise APIError.from_response(response)
+            return best_offer(response.json()), None
+        except (ZerionMCPError, httpx.HTTPError) as e:
+            return None, str(e)
+
+    async def compare_swap_quotes(
+        input_chain_id: Annotated[str, Field(description="Chain to swap from (e.g. 'ethereum')")],
+        input_fungible_id: Annotated[str, Field(description="Fungible id to send (e.g. 'eth')")],
+        output_fungible_id: Annotated[str, Field(description="Fungible id to receive")],
+        amounts: Annotated[
+            List[Annotated[int, Field(gt=0)]],
+            Field(min_length=1, max_length=max_amounts, description="Input amounts to quote, in the asset's lowest units")
+        ],
+        output_chain_id: Annotated[
+            Optional[str], Field(description="Chain to receive on (default: the input chain)")
+        ] = None,
+        from_address: Annotated[Optional[str], Field(description="Wallet that would trade (omit for rates only)")] = None,
+        slippage_percent: Annotated[Optional[float], Field(ge=0, le=3, description="Maximum slippage")] = None,
+        liquidity_source_id: Annotated[Optional[str], Field(description="Exchange source (default: all)")] = None
+    ) -> Dict[str, Any]:
+        base: Dict[str, Any] = {
+            "input[chain_id]": input_chain_id,
+            "input[fungible_id]": input_fungible_id,
+            "output[chain_id]": output_chain_id or input_chain_id,
+            "output[fungible_id]": output_fungible_id
+        }
+        for name, value in (
+            ("input[from]", from_address),
+            ("slippage_percent", slippage_percent),
+            ("liquidity_source_id", liquidity_source_id)
+        ):
+            if value is not None:
+                base[name] = value
+
+        unique = list(dict.fromkeys(amounts))
+        results = await asyncio.gather(*(quote({**base, "input[amount]": amount}) for amount in unique))
+        rows = price_impact_table([(amount, offer, error) for amount, (offer, error) in zip(unique, results)])
+        logger.debug("Swap quotes compared", extra={"amounts": len(unique), **cache.stats()})
+        return {
+            "input": {"chain_id": input_chain_id, "fungible_id": input_fungible_id},
+            "output": {"chain_id": base["output[chain_id]"], "fungible_id": output_fungible_id},
+            "quotes": rows
+        }
+
+    return Tool.from_function(
+        compare_swap_quotes,
+        name=SWAP_QUOTES_TOOL,
+        description=(
+            "Quote a swap or bridge for several input amounts at once and compare them: "
+            "one row per amount with the best offer's output, rate, source, gas and "
+            "price impact relative to the smallest amount. Use instead of repeated "
+            "swapOffers calls to size a trade."
+        ),
+        output_schema=None
+    )
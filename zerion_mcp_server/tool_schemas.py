@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Fixups for tool components generated from the OpenAPI spec."""
+
+from typing import Any
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def drop_output_schema(route: Any, component: Any) -> None:
+    """Remove the output schema FastMCP derives from a route's 200 response.
+
+    Tools with an output schema have their structured result validated
+    against it, and the response schemas generated from the Zerion spec do
+    not validate real payloads: nested $defs get pruned (PointerToNowhere),
+    some references point at property names, and several oneOf branches
+    overlap (e.g. gas prices match both the classic and Optimism shapes).
+    Every call to those tools then fails even though the API answered 200.
+    The server passes upstream JSON through unchanged, so the result is
+    returned without a declared schema instead. Meant to be passed as
+    mcp_component_fn to FastMCP.from_openapi.
+
+    Args:
+        route: HTTPRoute the component was generated from.
+        component: Generated tool, resource or template.
+    """
+    if getattr(component, "output_schema", None) is not None:
+        component.output_schema = None
+        logger.debug("Dropped generated output schema", extra={
+            "tool": getattr(component, "name", None)
+        })
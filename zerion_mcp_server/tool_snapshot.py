@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Precompiled tool registry snapshot keyed by spec hash.
+
+FastMCP.from_openapi parses the spec into routes, resolves $refs and builds
+parameter schemas for every operation on each launch. The result only
+depends on the spec text and the FastMCP version, so it is serialized once
+(tool names, descriptions, input schemas and HTTP route templates) and later
+launches register the tools straight from the snapshot, skipping both YAML
+parsing and route generation.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from fastmcp import FastMCP
+from fastmcp import __version__ as fastmcp_version
+from fastmcp.server.openapi import OpenAPITool
+from fastmcp.utilities.openapi import HTTPRoute
+
+from .logger import get_logger
+from .operations import HTTP_METHODS
+
+logger = get_logger(__name__)
+
+# Bump when the snapshot layout or the way tools are rebuilt changes
+SNAPSHOT_FORMAT = 2
+
+# HTTPRoute fields OpenAPITool.run() does not use; responses and the full
+# component schema map only feed the description and output schema
+_ROUTE_EXCLUDE = {"responses", "schema_definitions"}
+
+
+def spec_hash(spec_content: str, variant: Optional[Dict[str, Any]] = None) -> str:
+    """Get the snapshot key for a spec.
+
+    Args:
+        spec_content: Raw OpenAPI spec text.
+        variant: Settings that change which tools are generated from the
+            same spec (e.g. the tool filter).
+
+    Returns:
+        Hex digest covering the spec, variant, FastMCP version and snapshot format.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{SNAPSHOT_FORMAT}:{fastmcp_version}:".encode())
+    digest.update(json.dumps(variant or {}, sort_keys=True).encode())
+    digest.update(spec_content.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SnapshotRecorder:
+    """mcp_component_fn that records the tools from_openapi generates.
+
+    Wraps another component hook (applied first) so the snapshot stores
+    tools exactly as they are registered.
+    """
+
+    def __init__(self, component_fn: Optional[Callable[[Any, Any], None]] = None):
+        """Initialize recorder.
+
+        Args:
+            component_fn: Component hook to apply before recording.
+        """
+        self.component_fn = component_fn
+        self.components: List[Tuple[HTTPRoute, Any]] = []
+
+    def __call__(self, route: HTTPRoute, component: Any) -> None:
+        if self.component_fn is not None:
+            self.component_fn(route, component)
+        if isinstance(component, OpenAPITool):
+            self.components.append((route, component))
+
+    def snapshot(self, digest: str, parameter_rules: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Serialize the recorded tools.
+
+        Args:
+            digest: spec_hash() of the spec the tools were built from.
+            parameter_rules: Request parameter rules to store alongside
+                (see param_validation.parameter_rules).
+
+        Returns:
+            JSON-serializable snapshot.
+        """
+        tools = []
+        paths: Dict[str, Dict[str, Any]] = {}
+        for route, tool in self.components:
+            tools.append({
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": tool.parameters,
+                "output_schema": tool.output_schema,
+                "tags": sorted(tool.tags),
+                "route": route.model_dump(mode="json", by_alias=True, exclude=_ROUTE_EXCLUDE)
+            })
+            if route.operation_id:
+                paths.setdefault(route.path, {})[route.method.lower()] = {
+                    "operationId": route.operation_id
+                }
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "spec_hash": digest,
+            "fastmcp_version": fastmcp_version,
+            "tools": tools,
+            # Minimal spec for OperationIndex when the full spec is not parsed
+            "paths": paths,
+            "parameter_rules": parameter_rules or {}
+        }
+
+
+def load_snapshot(path: str, digest: str) -> Optional[Dict[str, Any]]:
+    """Load a snapshot if it matches the current spec.
+
+    Args:
+        path: Snapshot file path ('~' is expanded).
+        digest: spec_hash() of the current spec.
+
+    Returns:
+        The snapshot, or None if it is missing, unreadable or stale.
+    """
+    snapshot_path = Path(path).expanduser()
+    try:
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable tool snapshot", extra={
+            "path": str(snapshot_path),
+            "error": str(e)
+        })
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get("spec_hash") != digest or not snapshot.get("tools"):
+        logger.info("Tool snapshot is stale, rebuilding from spec", extra={"path": str(snapshot_path)})
+        return None
+    return snapshot
+
+
+def save_snapshot(path: str, snapshot: Dict[str, Any]) -> None:
+    """Write a snapshot atomically.
+
+    Args:
+        path: Snapshot file path ('~' is expanded).
+        snapshot: Snapshot from SnapshotRecorder.snapshot().
+
+    Raises:
+        OSError: If the snapshot cannot be written.
+    """
+    snapshot_path = Path(path).expanduser()
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(tmp_path, snapshot_path)
+    logger.info("Tool snapshot written", extra={
+        "path": str(snapshot_path),
+        "tools": len(snapshot["tools"])
+    })
+
+
+def snapshot_operations(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """Get a minimal spec (paths and operationIds) from a snapshot.
+
+    Args:
+        snapshot: Loaded snapshot.
+
+    Returns:
+        Dict with a 'paths' mapping usable by OperationIndex.
+    """
+    return {
+        "paths": {
+            path: {m: op for m, op in methods.items() if m in HTTP_METHODS}
+            for path, methods in snapshot.get("paths", {}).items()
+        }
+    }
+
+
+def server_from_snapshot(
+    snapshot: Dict[str, Any],
+    client: httpx.AsyncClient,
+    name: str,
+    timeout: Optional[float] = None
+) -> FastMCP:
+    """Create an MCP server with tools registered from a snapshot.
+
+    Args:
+        snapshot: Loaded snapshot.
+        client: HTTP client the tools send requests with.
+        name: Server name.
+        timeout: Optional per-request timeout for all tools.
+
+    Returns:
+        FastMCP server equivalent to FastMCP.from_openapi on the same spec.
+    """
+    mcp = FastMCP(name=name)
+    for entry in snapshot["tools"]:
+        mcp.add_tool(OpenAPITool(
+            client=client,
+            route=HTTPRoute.model_validate(entry["route"]),
+            name=entry["name"],
+            description=entry["description"],
+            parameters=entry["parameters"],
+            output_schema=entry.get("output_schema"),
+            tags=set(entry.get("tags") or []),
+            timeout=timeout
+        ))
+    return mcp